@@ -6,6 +6,7 @@ import os
 import six
 import json
 import logging
+import multiprocessing
 from glob import glob
 
 """
@@ -216,7 +217,8 @@ class ProposalFunctions(object):
     not be used from the outside to avoid mismatching units.
     """
 
-    def __init__(self, config_file='SouthPole', log_level=logging.INFO, tables_path=None, seed=12, upper_energy_limit=1e14*units.MeV):
+    def __init__(self, config_file='SouthPole', log_level=logging.INFO, tables_path=None, seed=12, upper_energy_limit=1e14*units.MeV,
+                 n_workers=None):
         """
         Parameters
         ----------
@@ -243,6 +245,16 @@ class ProposalFunctions(object):
             upper_energy_limit of tables that will be created by PROPOSAL, in NuRadioMC units (eV).
             There will be an error if primaries with energies above this energy will be injected.
             Note that PROPOSAL will have to regenerate tables for a new values of upper_energy_limit
+        n_workers: int or None (default None)
+            If None, all leptons are propagated in this process with the random generator of PROPOSAL that is
+            seeded once with `seed`.
+            If an integer, the random generator is seeded for every lepton with a seed derived from `seed` and the
+            number of leptons propagated so far, and the leptons of `get_secondaries_array` are distributed over
+            `n_workers` processes. Each process initializes its own propagators from the tables on disk (the tables
+            are created or downloaded by this process first). The secondaries do not depend on the number of
+            workers, i.e., they are the same as for a serial run with `n_workers=1`.
+            As the class is a Singleton, the argument is ignored if the object already exists, use `set_n_workers`
+            to change the number of workers of an existing object.
         create_new: bool (default:False)
             Can be used to force the creation of a new ProposalFunctions object.
             By default, the __init__ will only create a new object if none already exists.
@@ -286,6 +298,11 @@ class ProposalFunctions(object):
 
 
         self.__propagators = {}
+        self.__seed = seed
+        self.__init_arguments = (config_file, log_level, tables_path, seed, upper_energy_limit)
+        self.__n_workers = n_workers
+        self.__n_propagated_leptons = 0
+        self.__pool = None
         self.__config_file = config_file
         self.__config_file_full_path = config_file_full_path
         self.__tables_path = tables_path
@@ -565,6 +582,107 @@ class ProposalFunctions(object):
         return None
 
 
+    def __get_secondaries(self,
+                          energy_lepton,
+                          lepton_code,
+                          lepton_position,
+                          lepton_direction,
+                          low,
+                          propagation_length,
+                          min_energy_loss,
+                          propagate_decay_muons):
+        """
+        Propagates a single lepton and returns the shower-inducing secondaries (see `get_secondaries_array`),
+        all arguments are in PROPOSAL units
+        """
+        secondaries = self.__propagate_particle(energy_lepton, lepton_code,
+                                                lepton_position, lepton_direction,
+                                                propagation_length, low=low)
+
+        shower_inducing_prods = self.__filter_secondaries(secondaries.stochastic_losses(),
+                                                          min_energy_loss, lepton_position)
+
+        decay_products = secondaries.decay_products() # array of decay particles
+        # Checking if there is a muon in the decay products
+        if propagate_decay_muons:
+
+            for decay_particle in list(decay_products):
+
+                if abs(decay_particle.type) == 13:
+                    mu_energy = decay_particle.energy
+                    if mu_energy <= low:
+                        continue
+
+                    mu_position = (decay_particle.position.x, decay_particle.position.y, decay_particle.position.z)
+                    mu_direction = (decay_particle.direction.x, decay_particle.direction.y, decay_particle.direction.z)
+
+                    muon_secondaries = self.__propagate_particle(mu_energy, decay_particle.type,
+                                                                 mu_position, mu_direction,
+                                                                 propagation_length, low=low)
+
+                    shower_inducing_muon_secondaries = self.__filter_secondaries(muon_secondaries.stochastic_losses(),
+                                                                                 min_energy_loss, lepton_position)
+
+                    shower_inducing_prods.extend(shower_inducing_muon_secondaries)
+
+                    # We have already handled the muon, remove it to avoid double counting.
+                    decay_products.remove(decay_particle)
+
+        decay_energy = secondaries.final_state().energy / pp_MeV * units.MeV  # energy of the lepton before decay
+        grouped_decay_products = self.__group_decay_products(decay_products, min_energy_loss, lepton_position, decay_energy)
+
+        if grouped_decay_products is not None:
+            shower_inducing_prods.append(grouped_decay_products)
+
+        return shower_inducing_prods
+
+    def __get_lepton_seeds(self, n_leptons):
+        """
+        returns a seed for each of the next `n_leptons` leptons, derived from the seed of this class and the
+        number of leptons that were propagated before (the seeds are positive 32 bit integers as required by the
+        random generator of PROPOSAL)
+        """
+        seeds = [int(np.random.SeedSequence([self.__seed, self.__n_propagated_leptons + i]).generate_state(1)[0] >> 1)
+                 for i in range(n_leptons)]
+        self.__n_propagated_leptons += n_leptons
+        return seeds
+
+    def __get_pool(self):
+        if self.__pool is None:
+            self.__logger.info(f"starting {self.__n_workers} processes for the lepton propagation")
+            self.__pool = multiprocessing.Pool(self.__n_workers, initializer=_init_worker, initargs=self.__init_arguments)
+        return self.__pool
+
+    def get_n_workers(self):
+        """
+        returns the number of processes of the parallel lepton propagation (see `n_workers`)
+        """
+        return self.__n_workers
+
+    def set_n_workers(self, n_workers):
+        """
+        changes the number of processes of the parallel lepton propagation (see `n_workers` of the constructor),
+        the running worker processes are stopped if the number changes
+
+        Parameters
+        ----------
+        n_workers: int or None
+            the number of processes, None to propagate all leptons in this process with the global random generator
+        """
+        if n_workers != self.__n_workers:
+            self.__logger.info(f"changing the number of processes for the lepton propagation from {self.__n_workers} to {n_workers}")
+            self.close()
+            self.__n_workers = n_workers
+
+    def close(self):
+        """
+        stops the worker processes of the parallel lepton propagation (see `n_workers`)
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+
     def get_secondaries_array(self,
                               energy_leptons_nu,
                               lepton_codes,
@@ -573,7 +691,8 @@ class ProposalFunctions(object):
                               low_nu=0.5 * units.PeV,
                               propagation_length_nu=1000 * units.km,
                               min_energy_loss_nu=0.5 * units.PeV,
-                              propagate_decay_muons=True):
+                              propagate_decay_muons=True,
+                              seeds=None):
         """
         Propagates a set of leptons and returns a list with the properties for
         all the properties of the shower-inducing secondary particles
@@ -599,6 +718,9 @@ class ProposalFunctions(object):
         propagate_decay_muons: bool
             If True, muons created by tau decay are propagated and their induced
             showers are stored
+        seeds: array of integers or None (default)
+            If not None, the random generator of PROPOSAL is seeded with the corresponding seed before each lepton
+            is propagated. If None and `n_workers` was set, the seeds are derived from the seed of this class.
 
         Returns
         -------
@@ -608,6 +730,28 @@ class ProposalFunctions(object):
             navigates through the secondaries produced by that primary (time-ordered). The SecondaryProperties
             properties are in NuRadioMC units.
         """
+        if seeds is None and self.__n_workers is not None:
+            seeds = self.__get_lepton_seeds(len(energy_leptons_nu))
+
+        if self.__n_workers is not None and self.__n_workers > 1 and len(energy_leptons_nu) > 1:
+            # initialize the propagators here first, such that the tables exist on disk when the workers start
+            for lepton_code in np.unique(lepton_codes):
+                self.__get_propagator(int(lepton_code))
+                if propagate_decay_muons and abs(lepton_code) == 15:
+                    self.__get_propagator(13)
+                    self.__get_propagator(-13)
+
+            kwargs = dict(low_nu=low_nu, propagation_length_nu=propagation_length_nu,
+                          min_energy_loss_nu=min_energy_loss_nu, propagate_decay_muons=propagate_decay_muons)
+            chunks = np.array_split(np.arange(len(energy_leptons_nu)), min(len(energy_leptons_nu), 4 * self.__n_workers))
+            arguments = [(np.asarray(energy_leptons_nu)[chunk], np.asarray(lepton_codes)[chunk],
+                          None if lepton_positions_nu is None else np.asarray(lepton_positions_nu)[chunk],
+                          None if lepton_directions is None else np.asarray(lepton_directions)[chunk],
+                          [seeds[i] for i in chunk], kwargs) for chunk in chunks]
+            secondaries_array = []
+            for secondaries in self.__get_pool().map(_get_secondaries_array_worker, arguments):
+                secondaries_array.extend(secondaries)
+            return secondaries_array
 
         # Converting to PROPOSAL units
         low = low_nu * pp_eV
@@ -626,49 +770,14 @@ class ProposalFunctions(object):
 
         secondaries_array = []
 
-        for energy_lepton, lepton_code, lepton_position, lepton_direction in zip(energy_leptons,
-            lepton_codes, lepton_positions, lepton_directions):
-
-            secondaries = self.__propagate_particle(energy_lepton, lepton_code,
-                                                    lepton_position, lepton_direction,
-                                                    propagation_length, low=low)
-
-            shower_inducing_prods = self.__filter_secondaries(secondaries.stochastic_losses(), 
-                                                              min_energy_loss, lepton_position)
-
-            decay_products = secondaries.decay_products() # array of decay particles
-            # Checking if there is a muon in the decay products
-            if propagate_decay_muons:
-
-                for decay_particle in list(decay_products):
+        for iL, (energy_lepton, lepton_code, lepton_position, lepton_direction) in enumerate(zip(energy_leptons,
+            lepton_codes, lepton_positions, lepton_directions)):
 
-                    if abs(decay_particle.type) == 13:
-                        mu_energy = decay_particle.energy
-                        if mu_energy <= low:
-                            continue
-                        
-                        mu_position = (decay_particle.position.x, decay_particle.position.y, decay_particle.position.z)
-                        mu_direction = (decay_particle.direction.x, decay_particle.direction.y, decay_particle.direction.z)
+            if seeds is not None:
+                pp.RandomGenerator.get().set_seed(int(seeds[iL]))
 
-                        muon_secondaries = self.__propagate_particle(mu_energy, decay_particle.type,
-                                                                     mu_position, mu_direction,
-                                                                     propagation_length, low=low)
-
-                        shower_inducing_muon_secondaries = self.__filter_secondaries(muon_secondaries.stochastic_losses(),
-                                                                                     min_energy_loss, lepton_position)
-
-                        shower_inducing_prods.extend(shower_inducing_muon_secondaries)
-
-                        # We have already handled the muon, remove it to avoid double counting.
-                        decay_products.remove(decay_particle)
-
-            decay_energy = secondaries.final_state().energy / pp_MeV * units.MeV  # energy of the lepton before decay
-            grouped_decay_products = self.__group_decay_products(decay_products, min_energy_loss, lepton_position, decay_energy)
-
-            if grouped_decay_products is not None:
-                shower_inducing_prods.append(grouped_decay_products)
-
-            secondaries_array.append(shower_inducing_prods)
+            secondaries_array.append(self.__get_secondaries(energy_lepton, lepton_code, lepton_position, lepton_direction,
+                                                            low, propagation_length, min_energy_loss, propagate_decay_muons))
 
         return secondaries_array
 
@@ -749,3 +858,19 @@ class ProposalFunctions(object):
                 decays_array.append(decay_prop)
 
         return np.array(decays_array)
+
+
+# the ProposalFunctions object of a worker process of the parallel lepton propagation
+_worker_proposal_functions = None
+
+
+def _init_worker(config_file, log_level, tables_path, seed, upper_energy_limit):
+    global _worker_proposal_functions
+    _worker_proposal_functions = ProposalFunctions(config_file=config_file, log_level=log_level, tables_path=tables_path,
+                                                   seed=seed, upper_energy_limit=upper_energy_limit, create_new=True)
+
+
+def _get_secondaries_array_worker(arguments):
+    energy_leptons_nu, lepton_codes, lepton_positions_nu, lepton_directions, seeds, kwargs = arguments
+    return _worker_proposal_functions.get_secondaries_array(energy_leptons_nu, lepton_codes, lepton_positions_nu,
+                                                            lepton_directions, seeds=seeds, **kwargs)
@@ -34,7 +34,8 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
                                 flavor=[12, -12, 14, -14, 16, -16],
                                 n_events_per_file=None,
                                 spectrum='log_uniform',
-                                start_file_id=0):
+                                start_file_id=0,
+                                tabulated_cross_sections=False):
     """
     Event generator
 
@@ -96,6 +97,9 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
         in case the data set is distributed over several files, this number specifies the id of the first file
         (useful if an existing data set is extended)
         if True, generate deposited energies instead of primary neutrino energies
+    tabulated_cross_sections: bool (default False)
+        if True, the interaction lengths are calculated with cross sections interpolated from precalculated tables
+        (see `cross_sections.get_nu_cross_section`)
     """
 
     attributes = {}
@@ -314,7 +318,7 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
     # az = np.ones(n_events) * (R_earth - .5 * h_cylinder)  # move plane to the center of the cylinder
 
     # calculate grammage (g/cm^2) after which neutrino interacted
-    Lint = np.random.exponential(cs.get_interaction_length(Enu, 1, flavors, "total"), n_events)
+    Lint = np.random.exponential(cs.get_interaction_length(Enu, 1, flavors, "total", tabulated=tabulated_cross_sections), n_events)
 
     mask = (Lint < get_Lmax(zen)) & (Lint > get_Lmin(zen))
     print(f"{np.sum(mask)}/{n_events} = {np.sum(mask)/n_events:.2g} can potentially interact in simulation volume")
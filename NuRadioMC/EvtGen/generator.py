@@ -213,6 +213,146 @@ def write_events_to_hdf5(filename, data_sets, attributes, n_events_per_file=None
     logger.info("wrote {} events in total".format(n_events_total))
 
 
+class streamingEventListWriterHDF5:
+    """
+    writes the event list batch by batch into (appendable) hdf5 files
+
+    The output is the same as the one of `write_events_to_hdf5`, i.e., the event list is split into files of
+    `n_events_per_file` event groups (an event group is never split between two files), the event group ids are made
+    consecutive (starting at `start_event_id`) and every shower gets a unique shower id. In contrast to
+    `write_events_to_hdf5`, only one batch of events needs to be held in memory.
+    """
+
+    def __init__(self, filename, attributes, n_events_per_file=None, start_file_id=0):
+        """
+        Parameters
+        ----------
+        filename: string
+            the desired output filename (if multiple files are generated, a 'part000x' is appended to the filename
+        attributes: dict
+            a dictionary containing the meta attributes
+        n_events_per_file: int (optional, default None)
+            the number of events per file
+        start_file_id: int (default 0)
+            the id of the first file
+        """
+        self._filename = filename
+        self._attributes = attributes
+        if "start_event_id" not in attributes:
+            attributes["start_event_id"] = 0  # backward compatibility
+        self._n_events = attributes['n_events']
+        if(n_events_per_file is None):
+            self._n_events_per_file = self._n_events
+        else:
+            self._n_events_per_file = int(n_events_per_file)
+        self._start_file_id = start_file_id
+
+        self._fout = None
+        self._iFile = -1
+        self._evt_id_first = None  # the first event id of the current file
+        self._evt_id_last = None  # the last event id of the current file
+        self._evt_id_last_previous = None  # the last event id of the previous file
+        self._n_entries = 0  # the number of entries of the current file
+        self._next_event_group_id = attributes['start_event_id']
+        self._next_shower_id = 0
+        self._n_events_total = 0
+
+    def add_events(self, data_sets):
+        """
+        writes a batch of events
+
+        Parameters
+        ----------
+        data_sets: dict
+            the data sets of the batch, the event group ids of the batch need to be larger than the ones of all
+            previous batches. The event group ids are made consecutive and shower ids are added.
+        """
+        data_sets = {key: np.asarray(value) for key, value in data_sets.items()}
+        n_showers = len(data_sets['event_group_ids'])
+        if(n_showers == 0):
+            return
+        data_sets["shower_ids"] = np.arange(self._next_shower_id, self._next_shower_id + n_showers, dtype=int)
+        self._next_shower_id += n_showers
+        uegids, uegids_inverse = np.unique(data_sets['event_group_ids'], return_inverse=True)
+        data_sets['event_group_ids'] = uegids_inverse + self._next_event_group_id
+        self._next_event_group_id += len(uegids)
+
+        # the index of the file of each shower
+        start_event_id = self._attributes['start_event_id']
+        file_index = (data_sets['event_group_ids'] - start_event_id) // self._n_events_per_file
+        for iFile in np.unique(file_index):
+            mask = file_index == iFile
+            if(iFile != self._iFile):
+                self.__open_file(iFile)
+            for key, value in data_sets.items():
+                value = value[mask]
+                if(key not in self._fout):
+                    if value.dtype.kind == 'U':
+                        dtype = h5py.string_dtype(encoding='utf-8')
+                    else:
+                        dtype = value.dtype
+                    self._fout.create_dataset(key, shape=(0,) + value.shape[1:], maxshape=(None,) + value.shape[1:],
+                                              dtype=dtype, chunks=True)
+                dataset = self._fout[key]
+                dataset.resize(self._n_entries + len(value), axis=0)
+                dataset[self._n_entries:] = value
+            self._n_entries += np.sum(mask)
+            if(self._evt_id_first is None):
+                self._evt_id_first = data_sets['event_group_ids'][mask][0]
+            self._evt_id_last = data_sets['event_group_ids'][mask][-1]
+
+    def __open_file(self, iFile):
+        if(self._fout is not None):
+            self.__close_file(last_file=False)
+        self._iFile = iFile
+        filename = self._filename
+        if((iFile > 0) or (self._n_events_per_file < self._n_events)):
+            filename = self._filename + ".part{:04}".format(iFile + self._start_file_id)
+        self._fout = h5py.File(filename, 'w')
+        self._fout.attrs['VERSION_MAJOR'] = VERSION_MAJOR
+        self._fout.attrs['VERSION_MINOR'] = VERSION_MINOR
+        self._fout.attrs['header'] = HEADER
+        for key, value in self._attributes.items():
+            self._fout.attrs[key] = value
+        self._fout.attrs['total_number_of_events'] = self._n_events
+        self._n_entries = 0
+        self._evt_id_first = None
+
+    def __close_file(self, last_file):
+        # determine the number of events in this file in the same way as `write_events_to_hdf5`
+        if(self._iFile == 0 and last_file):
+            n_events_this_file = self._n_events
+        elif(last_file):
+            n_events_this_file = self._n_events - (self._evt_id_last_previous + 1) + self._attributes['start_event_id']
+        elif(self._iFile == 0):
+            n_events_this_file = self._evt_id_last - self._attributes['start_event_id'] + 1
+        else:
+            n_events_this_file = self._evt_id_last - self._evt_id_last_previous
+        logger.status('writing file {} with {} events (id {} - {}) and {} entries'.format(self._fout.filename, n_events_this_file, self._evt_id_first,
+                                                                                  self._evt_id_last, self._n_entries))
+        self._fout.attrs['n_events'] = n_events_this_file
+        self._fout.close()
+        self._fout = None
+        self._n_events_total += n_events_this_file
+        self._evt_id_last_previous = self._evt_id_last
+
+    def get_number_of_showers(self):
+        """
+        returns the number of showers written so far
+        """
+        return self._next_shower_id
+
+    def close(self):
+        """
+        finishes the last file
+        """
+        if(self._fout is None):
+            logger.warning("no events to write")
+            return
+        self.__close_file(last_file=True)
+        logger.info("wrote {} events in total".format(self._n_events_total))
+
+
 def primary_energy_from_deposited(Edep, ccnc, flavor, inelasticity):
     """
     Calculates the primary energy of the neutrino from the deposited
@@ -711,7 +851,8 @@ def generate_surface_muons(filename, n_events, Emin, Emax,
                            proposal_kwargs={},
                            log_level=None,
                            max_n_events_batch=1e5,
-                           seed=None):
+                           seed=None,
+                           proposal_n_workers=None):
     """
     Event generator for surface muons
 
@@ -834,6 +975,11 @@ def generate_surface_muons(filename, n_events, Emin, Emax,
         the maximum numbe of events that get generated per batch. Relevant if a fiducial volume cut is applied)
     seed: None of int
         seed of the random state
+    proposal_n_workers: int or None (default None)
+        the number of processes that propagate the muons with PROPOSAL (see the `n_workers` argument of
+        `NuRadioProposal.ProposalFunctions`). If None, the muons are propagated in this process. If set, the
+        random generator of PROPOSAL is seeded for every muon with a seed drawn from the random generator of the
+        event generation, i.e., the event list only depends on `seed` and not on the number of workers.
     """
     rnd = Generator(Philox(seed))
     if(log_level is not None):
@@ -841,7 +987,9 @@ def generate_surface_muons(filename, n_events, Emin, Emax,
     t_start = time.time()
     max_n_events_batch = int(max_n_events_batch)
     from NuRadioMC.EvtGen.NuRadioProposal import ProposalFunctions
-    proposal_functions = ProposalFunctions(config_file=config_file, tables_path=tables_path)
+    proposal_functions = ProposalFunctions(config_file=config_file, tables_path=tables_path, n_workers=proposal_n_workers)
+    # the ProposalFunctions object is a Singleton, an already existing object needs to be updated
+    proposal_functions.set_n_workers(proposal_n_workers)
 
     attributes = {}
     n_events = int(n_events)
@@ -930,23 +1078,29 @@ def generate_surface_muons(filename, n_events, Emin, Emax,
         else:
             mask_phi = np.ones(len(data_sets["event_group_ids"]), dtype=np.bool)
         # TODO: combine with `get_intersection_volume_neutrino` function
+        # calculate if the lepton/neutrino direction intersects the fiducial simulation volume and propagate all
+        # selected muons with one call (the muons are distributed over several processes if `proposal_n_workers` is set)
+        mask_propagate = np.array([mask_phi[iE] and get_intersection_volume_neutrino(attributes, lepton_positions[iE], lepton_directions[iE])
+                                   for iE in range(len(mask_phi))], dtype=bool)
+        lepton_seeds = None
+        if proposal_n_workers is not None:
+            # the seeds of the muons are drawn from the random generator of the event generation, such that the
+            # secondaries only depend on `seed` and not on the muons that were propagated before
+            lepton_seeds = rnd.integers(0, 2 ** 31, size=np.sum(mask_propagate)).tolist()
+        products_array = proposal_functions.get_secondaries_array(np.array(E_all_leptons)[mask_propagate],
+                                                                   np.array(lepton_codes)[mask_propagate],
+                                                                   np.array(lepton_positions).reshape(-1, 3)[mask_propagate],
+                                                                   np.array(lepton_directions).reshape(-1, 3)[mask_propagate],
+                                                                   seeds=lepton_seeds, **proposal_kwargs)
+        products_array = dict(zip(np.arange(len(mask_propagate))[mask_propagate], products_array))
         for iE, event_id in enumerate(data_sets["event_group_ids"]):
             if not mask_phi[iE]:
                 continue
 
-            # calculate if the lepton/neutrino direction intersects the fiducial simulation volume
-            geometry_selection = get_intersection_volume_neutrino(attributes,
-                                                                  [data_sets['xx'][iE], data_sets['yy'][iE], data_sets['zz'][iE]],
-                                                                  lepton_directions[iE])
-    #         geometry_selection = True
+            geometry_selection = mask_propagate[iE]
             if geometry_selection:
 
-                products_array = proposal_functions.get_secondaries_array(np.array([E_all_leptons[iE]]),
-                                                                           np.array([lepton_codes[iE]]),
-                                                                           np.array([lepton_positions[iE]]),
-                                                                           np.array([lepton_directions[iE]]),
-                                                                           **proposal_kwargs)
-                products = products_array[0]  # get secondaries from first (and only) lepton
+                products = products_array[iE]
 
                 n_interaction = 1
 
@@ -980,6 +1134,8 @@ def generate_surface_muons(filename, n_events, Emin, Emax,
                         # Flavors are particle codes taken from NuRadioProposal.py
                         data_sets_fiducial['flavors'][-1] = product.code
         proposal_time += time.time() - init_time
+    # stop the worker processes of the lepton propagation
+    proposal_functions.close()
 
     time_per_evt = proposal_time / len(data_sets_fiducial['flavors'])
     logger.info(f"Time per event: {time_per_evt*1e3:.01f}ms")
@@ -1025,7 +1181,9 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
                                 max_n_events_batch=1e5,
                                 write_events=True,
                                 seed=None,
-                                interaction_type="ccnc"):
+                                interaction_type="ccnc",
+                                stream_to_file=False,
+                                proposal_n_workers=None):
     """
     Event generator
 
@@ -1169,6 +1327,15 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
     interaction_type: string
         the interaction type. default is "ccnc" which randomly choses neutral current (NC) or charged-current (CC) interactions.
         The use can also specify "nc" or "cc" to exclusively simulate NC or CC interactions
+    stream_to_file: bool (default False)
+        if True, every batch of events is written to the output file(s) directly after it was generated (see
+        `streamingEventListWriterHDF5`), i.e., only one batch of events is kept in memory which allows to generate
+        event lists that do not fit into memory. The output is the same as for False. Only relevant if `write_events` is True.
+    proposal_n_workers: int or None (default None)
+        the number of processes that propagate the leptons with PROPOSAL (see the `n_workers` argument of
+        `NuRadioProposal.ProposalFunctions`). If None, the leptons are propagated in this process. If set, the
+        random generator of PROPOSAL is seeded for every lepton with a seed drawn from the random generator of the
+        event generation, i.e., the event list only depends on `seed` and not on the number of workers.
     """
     rnd = Generator(Philox(seed))
     t_start = time.time()
@@ -1178,7 +1345,10 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
     
     if proposal:
         from NuRadioMC.EvtGen.NuRadioProposal import ProposalFunctions
-        proposal_functions = ProposalFunctions(config_file=proposal_config, tables_path=proposal_tables_path)
+        proposal_functions = ProposalFunctions(config_file=proposal_config, tables_path=proposal_tables_path,
+                                               n_workers=proposal_n_workers)
+        # the ProposalFunctions object is a Singleton, an already existing object needs to be updated
+        proposal_functions.set_n_workers(proposal_n_workers)
     max_n_events_batch = int(max_n_events_batch)
     attributes = {}
     n_events = int(n_events)
@@ -1211,6 +1381,9 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
 
     set_volume_attributes(volume, proposal=proposal, attributes=attributes)
     n_events = attributes['n_events']  # important! the number of events might have been increased by the generate vertex function
+    writer = None
+    if(stream_to_file and write_events):
+        writer = streamingEventListWriterHDF5(filename, attributes, n_events_per_file=n_events_per_file, start_file_id=start_file_id)
     n_batches = int(np.ceil(n_events / max_n_events_batch))
     for i_batch in range(n_batches):  # do generation of events in batches
         n_events_batch = max_n_events_batch
@@ -1318,6 +1491,21 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
                 [-np.sin(theta) * np.cos(phi), -np.sin(theta) * np.sin(phi), -np.cos(theta)]
                     for theta, phi in zip(data_sets["zeniths"], data_sets["azimuths"])])
 
+            # propagate all leptons whose direction intersects the fiducial volume with one call (the leptons are
+            # distributed over several processes if `proposal_n_workers` is set)
+            mask_propagate = np.array([mask_tracks[iE] and get_intersection_volume_neutrino(attributes, lepton_positions[iE], lepton_directions[iE])
+                                       for iE in range(len(mask_tracks))], dtype=bool)
+            lepton_seeds = None
+            if proposal_n_workers is not None:
+                # the seeds of the leptons are drawn from the random generator of the event generation, such that the
+                # secondaries only depend on `seed` and not on the leptons that were propagated before
+                lepton_seeds = rnd.integers(0, 2 ** 31, size=np.sum(mask_propagate)).tolist()
+            products_array = proposal_functions.get_secondaries_array(
+                E_all_leptons[mask_propagate], lepton_codes[mask_propagate],
+                lepton_positions[mask_propagate], lepton_directions[mask_propagate], seeds=lepton_seeds,
+                **proposal_kwargs)
+            products_array = dict(zip(np.arange(len(mask_propagate))[mask_propagate], products_array))
+
             for iE, event_id in enumerate(data_sets["event_group_ids"]):
                 first_inserted = False
 
@@ -1333,16 +1521,10 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
                     first_inserted = True
 
                 if mask_tracks[iE]:
-                    geometry_selection = get_intersection_volume_neutrino(
-                        attributes, [x_nu, y_nu, z_nu], lepton_directions[iE])
-                    
+                    geometry_selection = mask_propagate[iE]
+
                     if geometry_selection:
-                        products_array = proposal_functions.get_secondaries_array(
-                            np.array([E_all_leptons[iE]]), np.array([lepton_codes[iE]]),
-                            np.array([lepton_positions[iE]]), np.array([lepton_directions[iE]]),
-                                                                                   **proposal_kwargs)
-                        
-                        products = products_array[0]
+                        products = products_array[iE]
                         n_interaction = 2
                         for product in products:
 
@@ -1387,7 +1569,7 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
             
             time_proposal = time.time() - init_time
         else:
-            if(n_batches == 1):
+            if(n_batches == 1 or writer is not None):
                 data_sets_fiducial = data_sets
             else:
                 for key in data_sets:
@@ -1395,10 +1577,23 @@ def generate_eventlist_cylinder(filename, n_events, Emin, Emax,
                         data_sets_fiducial[key] = []
                     data_sets_fiducial[key].extend(data_sets[key])
 
+        if(writer is not None):
+            writer.add_events(data_sets_fiducial)
+            data_sets_fiducial = {}
+    if proposal:
+        # stop the worker processes of the lepton propagation
+        proposal_functions.close()
+
     time_per_evt = time_proposal / (n_events + 1)
     logger.info(f"Time per event (PROPOSAL only): {time_per_evt*1e3:.4f} ms")
     logger.info(f"Total time (PROPOSAL only) {pretty_time_delta(time_proposal)}")
 
+    if(writer is not None):
+        writer.close()
+        logger.info(f"number of fiducial showers {writer.get_number_of_showers()}")
+        logger.status(f"finished in {pretty_time_delta(time.time() - t_start)}")
+        return
+
     logger.info(f"number of fiducial showers {len(data_sets_fiducial['xx'])}")
 
     # assign every shower a unique id
@@ -6,7 +6,11 @@ from scipy import interpolate as intp
 from scipy import integrate
 from radiotools import coordinatesystems as cstrafo
 from NuRadioReco.utilities.metaclasses import Singleton
+from collections.abc import Mapping
 import os
+import shutil
+import hashlib
+import json
 import logging
 import six
 try:
@@ -278,6 +282,180 @@ def get_vector_potential(
 if numba_available:
     get_vector_potential_numba = jit(get_vector_potential, nopython=True, cache=True)
 
+
+def _refine_profile(tt, profile_dense, profile_ce_interp, interp_factor2):
+    """
+    upsamples the charge-excess profile in the intervals where the form factor is evaluated within +- 1ns of its peak
+    (same as in `get_vector_potential`)
+
+    Returns None if the profile does not need to be refined for the given observer times `tt`.
+    """
+    tmask = (tt < 1 * units.ns) & (tt > -1 * units.ns)
+    gaps = (tmask[1:] ^ tmask[:-1])  # xor
+    indices = np.arange(len(gaps))[gaps]  # the indices in between tt is within -+ 1ns
+    if(len(indices) == 0):
+        return None
+    # add the corner cases of having the tt array start or end with an entry fulfilling the condition
+    if(len(indices) % 2 != 0):
+        if((tt[0] < 1 * units.ns) and (tt[0] > -1 * units.ns) and indices[0] != 0):
+            indices = np.append(0, indices)
+        else:
+            if(indices[-1] != (len(tt) - 1)):
+                indices = np.append(indices, len(tt) - 1)
+    if(len(indices) % 2 != 0):  # this rejects the cases where only the first or the last entry fulfills the -1 < tt < 1 condition
+        return None
+    dp = profile_dense[1] - profile_dense[0]
+    profile_dense2 = []
+    profile_ce_interp2 = []
+    i_last = 0
+    for i_start, i_stop in indices.reshape(-1, 2):
+        profile_dense_interval = np.arange(profile_dense[i_start], profile_dense[i_stop], dp / interp_factor2)
+        profile_dense2.extend([profile_dense[i_last:i_start], profile_dense_interval])
+        profile_ce_interp2.extend([profile_ce_interp[i_last:i_start],
+                                   np.interp(profile_dense_interval, profile_dense[i_start:i_stop], profile_ce_interp[i_start:i_stop])])
+        i_last = i_stop
+    profile_dense2.append(profile_dense[i_last:])
+    profile_ce_interp2.append(profile_ce_interp[i_last:])
+    return np.concatenate(profile_dense2), np.concatenate(profile_ce_interp2)
+
+
+def get_vector_potentials(
+    shower_energy, thetas, N, dt, profile_depth, profile_ce,
+    Af, freq_pos, freq_neg, exp_pos, exp_neg, t0_pos, t0_neg,
+    shower_type="HAD", n_index=1.78, distances=1 * units.m,
+    interp_factor=1., interp_factor2=100., shift_for_xmax=False,
+    em_factor=1., use_numba=False, chunk_size=2 ** 20):
+    """
+    calculates the vector potentials of the Askaryan pulse of one charge-excess profile for many observers
+
+    Same as `get_vector_potential` but for arrays of viewing angles and distances. The interpolated charge-excess
+    profile and the form factor are shared between all observers. For each observer, the integral over the shower
+    depth is evaluated for chunks of time bins at once, only the time bins that require the upsampled profile around
+    the peak of the form factor (see `interp_factor2`) are integrated individually.
+
+    Parameters
+    ----------
+    thetas: float or array of floats
+        viewing angles, i.e., the angles between shower axis and launch angle of the signal (the ray path)
+    distances: float or array of floats
+        observation distances
+    use_numba: bool (default False)
+        if True, the vector potential of each observer is calculated with `get_vector_potential_numba` instead
+    chunk_size: int (default 2 ** 20)
+        the maximum number of (time bin, shower depth) pairs of the integrand that are evaluated at once, which
+        limits the memory of the calculation
+    all other parameters: see `get_vector_potential`
+
+    Returns
+    -------
+    vector potentials: array of floats
+        array of shape (number of observers, N + 1, 3)
+    """
+    if(shower_type == "TAU"):
+        raise NotImplementedError("Tau showers are not yet implemented")
+    elif(shower_type not in ["HAD", "EM"]):
+        raise NotImplementedError("Only shower types 'HAD', 'EM' or 'TAU' are implemented")
+    thetas, distances = np.broadcast_arrays(np.atleast_1d(thetas), np.atleast_1d(distances))
+    if(use_numba):
+        vp = np.zeros((len(thetas), N + 1, 3))
+        for iO, (theta, distance) in enumerate(zip(thetas, distances)):
+            vp[iO] = get_vector_potential_numba(
+                shower_energy, theta, N, dt, profile_depth, profile_ce,
+                Af, freq_pos, freq_neg, exp_pos, exp_neg, t0_pos, t0_neg,
+                shower_type=shower_type, n_index=n_index, distance=distance,
+                interp_factor=interp_factor, interp_factor2=interp_factor2, shift_for_xmax=shift_for_xmax,
+                em_factor=em_factor)
+        return vp
+    if shower_type != "HAD":
+        em_factor = 1.
+    ttt = np.arange(0, (N + 1) * dt, dt)
+    ttt = ttt + 0.5 * dt - ttt.mean()
+    if(len(ttt) != N + 1):
+        ttt = ttt[:-1]
+    N = len(ttt)
+
+    xn = n_index
+    cher = np.arccos(1. / n_index)
+    beta = 1.
+
+    profile_dense = profile_depth
+    profile_ce_interp = profile_ce
+    if(interp_factor != 1):
+        n_pts_profile_dense = int(interp_factor * len(profile_depth))
+        profile_dense = np.linspace(min(profile_depth), max(profile_depth), n_pts_profile_dense)
+        profile_ce_interp = np.interp(profile_dense, profile_depth, profile_ce)
+    length = profile_dense / rho
+    dxmax = length[np.argmax(profile_ce_interp)]
+
+    # calculate total charged track length
+    xntot = np.sum(profile_ce_interp) * (length[1] - length[0])
+    factor = -xmu / (4. * np.pi)
+    fc = 4. * np.pi / (xmu * np.sin(cher))
+    E_TeV = shower_energy / units.TeV
+
+    def get_form_factor(tt):
+        """
+        Function F_p Eq.(15) PRD paper with Acher from Eq.(16), evaluated within +- 20ns of the observer time
+        """
+        F_p = np.zeros_like(tt)
+        mask = (tt < 20. * units.ns) & (tt > - 20. * units.ns)
+        mask_pos = mask & (tt > 0)
+        F_p[mask_pos] = Af * E_TeV * (np.exp(-np.abs(tt[mask_pos]) / t0_pos) +
+                                      (1. + freq_pos * np.abs(tt[mask_pos])) ** exp_pos)
+        mask_neg = mask & (tt <= 0)
+        F_p[mask_neg] = Af * E_TeV * (np.exp(-np.abs(tt[mask_neg]) / t0_neg) +
+                                      (1. + freq_neg * np.abs(tt[mask_neg])) ** exp_neg)
+        return F_p * fc / xntot * em_factor, mask
+
+    def get_integrand_factors(X, z):
+        # distance from the shower depth z to the antenna (Denominator in Eq. (22) PRD paper) and the
+        # component of the unit vector perpendicular to the shower axis
+        R = (X[0] ** 2 + X[1] ** 2 + (X[2] - z) ** 2) ** 0.5
+        u_x = X[0] / R
+        u_y = X[1] / R
+        u_z = (X[2] - z) / R
+        v = np.array([u_x * u_z, u_y * u_z, -(u_x * u_x + u_y * u_y)])
+        return R, v
+
+    # the integrand of a chunk of time bins is an array of shape (3, n_chunk, len(length))
+    n_chunk = max(1, int(chunk_size // len(length)))
+    vp = np.zeros((len(thetas), N, 3))
+    for iO, (theta, distance) in enumerate(zip(thetas, distances)):
+        # calculate antenna position in ARZ reference frame (see `get_vector_potential`)
+        X = np.array([distance * np.sin(theta), 0., distance * np.cos(theta)])
+        if(shift_for_xmax):
+            X = np.array([distance * np.sin(theta), 0., distance * np.cos(theta) + dxmax])
+
+        tobs = ttt + ((X[0] ** 2 + X[1] ** 2 + X[2] ** 2) ** 0.5 / c * xn)
+        z = length
+        R, v = get_integrand_factors(X, z)
+        integrand = -v * profile_ce_interp / R
+        for it_start in range(0, N, n_chunk):
+            arg = z - (beta * c * tobs[it_start:it_start + n_chunk, None] - xn * R)
+            # Note that Acher peaks at tt=0 which corresponds to the observer time.
+            tt = (-arg / (c * beta))
+            F_p, mask = get_form_factor(tt)
+            active = np.any(mask, axis=1)  # all other time bins have a vanishing vector potential
+            its = it_start + np.arange(len(tt))[active]
+            vp[iO, its] = np.trapz(integrand[:, None, :] * F_p[active], z, axis=-1).T
+
+            if(interp_factor2 != 1):
+                for it, tt_it in zip(its, tt[active]):
+                    refined_profile = _refine_profile(tt_it, profile_dense, profile_ce_interp, interp_factor2)
+                    if refined_profile is None:
+                        continue
+                    profile_dense2, profile_ce_interp2 = refined_profile
+                    # recalculate parameters for interpolated values
+                    z2 = profile_dense2 / rho
+                    R2, v2 = get_integrand_factors(X, z2)
+                    arg2 = z2 - (beta * c * tobs[it] - xn * R2)
+                    F_p2 = get_form_factor(-arg2 / (c * beta))[0]
+                    vp[iO, it] = np.trapz(-v2 * profile_ce_interp2 * F_p2 / R2, z2)
+
+    vp *= factor
+
+    return vp
+
 def thetaprime_to_theta(thetaprime, xmax, R_prime):
     """
     converts a viewing angle relative to the shower maximum to a viewing angle relative to the start of the shower.
@@ -316,6 +494,186 @@ def theta_to_thetaprime(theta, xmax, R):
     return np.arctan2(b, a)
 
 
+def get_file_hash(path):
+    """
+    returns the sha1 hash of a file
+
+    Hashing the shower library takes a few seconds, hence the hash is stored in a small json file next to the file
+    (`<path>.sha1.json`) together with the size and the modification time of the file. The file is only hashed again
+    if its size or modification time changed.
+
+    Parameters
+    ----------
+    path: string
+        the path to the file
+
+    Returns
+    -------
+    string: the hex digest of the sha1 hash
+    """
+    stat = os.stat(path)
+    cache_file = path + ".sha1.json"
+    try:
+        with open(cache_file, 'r') as fin:
+            cache = json.load(fin)
+        if(cache['size'] == stat.st_size and cache['mtime_ns'] == stat.st_mtime_ns):
+            return cache['sha1']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    BUF_SIZE = 65536 * 2 ** 4  # lets read stuff in 1MB chunks!
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(BUF_SIZE)
+            if not data:
+                break
+            sha1.update(data)
+    try:
+        tmp_file = "{}.{:d}.tmp".format(cache_file, os.getpid())
+        with open(tmp_file, 'w') as fout:
+            json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': sha1.hexdigest()}, fout)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        logger.warning("could not cache the hash of {}".format(path))
+    return sha1.hexdigest()
+
+
+class memoryMappedProfiles(Mapping):
+    """
+    the profiles of one shower type of a memory-mapped shower library (see `load_shower_library`),
+    the profiles of an energy are mapped into memory on first access
+    """
+
+    def __init__(self, path, files):
+        """
+        Parameters
+        ----------
+        path: string
+            the directory of the binary shower library
+        files: dict
+            the file names of the arrays of each energy, i.e. {energy: {'depth': file name, 'charge_excess': file name}}
+        """
+        self._path = path
+        self._files = files
+        self._profiles = {}
+
+    def __getitem__(self, energy):
+        if energy not in self._profiles:
+            self._profiles[energy] = {key: np.load(os.path.join(self._path, filename), mmap_mode='r')
+                                      for key, filename in self._files[energy].items()}
+        return self._profiles[energy]
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+
+class memoryMappedShowerLibrary(Mapping):
+    """
+    a shower library in the binary format of `load_shower_library`, i.e., {shower type: {energy: profiles}}
+    """
+
+    def __init__(self, path, index):
+        """
+        Parameters
+        ----------
+        path: string
+            the directory of the binary shower library
+        index: dict
+            the content of the index file of the library
+        """
+        self._path = path
+        self._shower_types = {}
+        for shower_type, entries in index['profiles'].items():
+            self._shower_types[shower_type] = memoryMappedProfiles(path, {energy: files for energy, files in entries})
+
+    def __getitem__(self, shower_type):
+        return self._shower_types[shower_type]
+
+    def __iter__(self):
+        return iter(self._shower_types)
+
+    def __len__(self):
+        return len(self._shower_types)
+
+
+def _read_library_index(path):
+    try:
+        with open(os.path.join(path, "index.json"), 'r') as fin:
+            return json.load(fin)
+    except (OSError, ValueError):
+        return None
+
+
+def _convert_shower_library(library, path, sha1):
+    """
+    converts a pickled shower library into the binary format: one .npy file per array and an index file
+    """
+    logger.warning("converting shower library {} into a memory-mappable format ({})".format(library, path))
+    library_dict = io_utilities.read_pickle(library)
+    tmp_path = "{}.{:d}.tmp".format(path, os.getpid())
+    os.makedirs(tmp_path, exist_ok=True)
+    index = {'source_sha1': sha1, 'profiles': {}}
+    for shower_type, profiles in library_dict.items():
+        entries = []
+        for iE, (energy, arrays) in enumerate(profiles.items()):
+            files = {}
+            for key, array in arrays.items():
+                filename = "{}_{:d}_{}.npy".format(shower_type, iE, key)
+                np.save(os.path.join(tmp_path, filename), np.ascontiguousarray(array))
+                files[key] = filename
+            entries.append([float(energy), files])
+        index['profiles'][shower_type] = entries
+    with open(os.path.join(tmp_path, "index.json"), 'w') as fout:
+        json.dump(index, fout)
+    if(os.path.exists(path)):
+        shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # another process converted the library at the same time
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_shower_library(library):
+    """
+    loads a shower library as read-only memory-mapped arrays
+
+    The pickled shower library is converted once into a directory next to it (with the same name without the .pkl
+    extension) that holds one .npy file per array and an index file. The library is then opened without reading
+    any profile, the profiles of a shower type and energy are memory-mapped on first access. Hence, only the profiles
+    that are used are read from disk and the pages are shared between all processes that use the library.
+    The binary library is converted again if the hash of the pickled library changes.
+    If the binary library can not be written (e.g. read-only file system), the pickled library is loaded into memory.
+
+    Parameters
+    ----------
+    library: string
+        the path to the pickled shower library
+
+    Returns
+    -------
+    the shower library, i.e. {shower type: {energy: {'depth': array, 'charge_excess': array}}}
+    """
+    path = os.path.splitext(library)[0]
+    sha1 = get_file_hash(library)
+    index = _read_library_index(path)
+    if(index is None or index.get('source_sha1') != sha1):
+        try:
+            _convert_shower_library(library, path, sha1)
+        except (OSError, AttributeError, TypeError) as e:
+            logger.warning("converting the shower library failed ({}), loading shower library ({}) into memory".format(e, library))
+            return io_utilities.read_pickle(library)
+        index = _read_library_index(path)
+        if(index is None or index.get('source_sha1') != sha1):
+            logger.warning("reading the converted shower library failed, loading shower library ({}) into memory".format(library))
+            return io_utilities.read_pickle(library)
+    return memoryMappedShowerLibrary(path, index)
+
+
 @six.add_metaclass(Singleton)
 class ARZ(object):
 
@@ -327,18 +685,18 @@ class ARZ(object):
         self._interp_factor2 = interp_factor2
         self._random_numbers = {}
         self._version = (1, 2)
-        # # load shower library into memory
+        # # load shower library (memory-mapped, see `load_shower_library`)
         if(library is None):
             library = os.path.join(os.path.dirname(__file__), "shower_library/library_v{:d}.{:d}.pkl".format(*self._version))
+            self.__check_and_get_library()
         else:
             if(not os.path.exists(library)):
                 logger.error("user specified shower library {} not found.".format(library))
                 raise FileNotFoundError("user specified shower library {} not found.".format(library))
-        self.__check_and_get_library()
         self.__set_model_parameters(arz_version)
 
-        logger.warning("loading shower library ({}) into memory".format(library))
-        self._library = io_utilities.read_pickle(library)
+        logger.warning("loading shower library ({})".format(library))
+        self._library = load_shower_library(library)
         self._use_numba = use_numba
         if use_numba & (not numba_available):
             logger.warning('Numba implementation was requested, but Numba is unavailable. Using Python implementation instead.')
@@ -349,6 +707,7 @@ class ARZ(object):
         """
         checks if shower library exists and is up to date by comparing the sha1sum. If the library does not exist
         or changes on the server, a new library will be downloaded.
+        The sha1sum is cached together with the size and modification time of the library (see `get_file_hash`).
         """
         path = os.path.join(os.path.dirname(__file__), "shower_library/library_v{:d}.{:d}.pkl".format(*self._version))
 
@@ -358,22 +717,13 @@ class ARZ(object):
             download_file = True
 
         if(os.path.exists(path)):
-            BUF_SIZE = 65536 * 2 ** 4  # lets read stuff in 64kb chunks!
-            import hashlib
-            import json
-            sha1 = hashlib.sha1()
-            with open(path, 'rb') as f:
-                while True:
-                    data = f.read(BUF_SIZE)
-                    if not data:
-                        break
-                    sha1.update(data)
+            sha1 = get_file_hash(path)
 
             shower_directory = os.path.join(os.path.dirname(__file__), "shower_library/")
             with open(os.path.join(shower_directory, 'shower_lib_hash.json'), 'r') as fin:
                 lib_hashs = json.load(fin)
                 if("{:d}.{:d}".format(*self._version) in lib_hashs.keys()):
-                    if(sha1.hexdigest() != lib_hashs["{:d}.{:d}".format(*self._version)]):
+                    if(sha1 != lib_hashs["{:d}.{:d}".format(*self._version)]):
                         logger.warning("shower library {} has changed on the server. downloading newest version...".format(self._version))
                         download_file = True
                 else:
@@ -456,6 +806,21 @@ class ARZ(object):
         """
         self._random_generator.seed(seed)
 
+    def get_random_state(self):
+        """
+        returns the state of the random number generator and the cached shower realizations, which can be restored
+        with `set_random_state`
+        """
+        return {'random_generator': self._random_generator.get_state(),
+                'random_numbers': dict(self._random_numbers)}
+
+    def set_random_state(self, state):
+        """
+        restores the state returned by `get_random_state`
+        """
+        self._random_generator.set_state(state['random_generator'])
+        self._random_numbers = dict(state['random_numbers'])
+
     def set_interpolation_factor(self, interp_factor):
         """
         set interpolation factor of charge-excess profiles
@@ -468,6 +833,78 @@ class ARZ(object):
         """
         self._interp_factor2 = interp_factor
 
+    def __get_charge_excess_profile(self, shower_energy, shower_type, same_shower=False, iN=None):
+        """
+        returns the depth and the charge-excess profile of a shower realization from the shower library,
+        the realization is chosen randomly if `iN` is None (see `get_time_trace`)
+        """
+        if not shower_type in self._library.keys():
+            raise KeyError("shower type {} not present in library. Available shower types are {}".format(shower_type, *self._library.keys()))
+
+        # determine closes available energy in shower library
+        energies = np.array([*self._library[shower_type]])
+        iE = np.argmin(np.abs(energies - shower_energy))
+        rescaling_factor = shower_energy / energies[iE]
+        logger.info("shower energy of {:.3g}eV requested, closest available energy is {:.3g}eV. The amplitude of the charge-excess profile will be rescaled accordingly by a factor of {:.2f}".format(shower_energy / units.eV, energies[iE] / units.eV, rescaling_factor))
+        profiles = self._library[shower_type][energies[iE]]
+        N_profiles = len(profiles['charge_excess'])
+
+        if(iN is None or np.isnan(iN)):
+            if(same_shower):
+                if(shower_type in self._random_numbers):
+                    iN = self._random_numbers[shower_type]
+                    logger.info("using previously used shower {}/{}".format(iN, N_profiles))
+                else:
+                    logger.warning("no previous random number for shower type {} exists. Generating a new random number.".format(shower_type))
+                    iN = self._random_generator.randint(N_profiles)
+                    self._random_numbers[shower_type] = iN
+                    logger.info("picking profile {}/{} randomly".format(iN, N_profiles))
+            else:
+                iN = self._random_generator.randint(N_profiles)
+                self._random_numbers[shower_type] = iN
+                logger.info("picking profile {}/{} randomly".format(iN, N_profiles))
+        else:
+            iN = int(iN)  # saveguard against iN being a float
+            logger.info("using shower {}/{} as specified by user".format(iN, N_profiles))
+            self._random_numbers[shower_type] = iN
+
+        return profiles['depth'], profiles['charge_excess'][iN] * rescaling_factor
+
+    def __get_model_parameters(self, shower_energy, shower_type):
+        """
+        returns the parameters of the form factor and the electromagnetic energy fraction of the shower
+        """
+        if shower_type == "HAD":
+            model_parameters = dict(
+                Af = self._Af_p,
+                t0_pos = self._t0_p_pos,
+                freq_pos = self._freq_p_pos,
+                exp_pos = self._exp_p_pos,
+                t0_neg = self._t0_p_neg,
+                freq_neg = self._freq_p_neg,
+                exp_neg = self._exp_p_neg
+            )
+            em_factor = self.em_fraction(shower_energy)
+        elif shower_type == "EM":
+            model_parameters = dict(
+                Af = self._Af_e,
+                t0_pos = self._t0_e_pos,
+                freq_pos = self._freq_e_pos,
+                exp_pos = self._exp_e_pos,
+                t0_neg = self._t0_e_neg,
+                freq_neg = self._freq_e_neg,
+                exp_neg = self._exp_e_neg
+            )
+            em_factor = 1.
+        elif(shower_type == "TAU"):
+            logger.error("Tau showers are not yet implemented")
+            raise NotImplementedError("Tau showers are not yet implemented")
+        else:
+            msg = "showers of type {} are not implemented. Use 'HAD', 'EM' or 'TAU'".format(shower_type)
+            logger.error(msg)
+            raise NotImplementedError(msg)
+        return model_parameters, em_factor
+
     def get_time_trace(self, shower_energy, theta, N, dt, shower_type, n_index, R, shift_for_xmax=False,
                        same_shower=False, iN=None, output_mode='trace', maximum_angle=20 * units.deg):
         """
@@ -521,8 +958,7 @@ class ARZ(object):
         efield_trace: array of floats
             array of electric-field time trace in 'on-sky' coordinate system eR, eTheta, ePhi
         """
-        if not shower_type in self._library.keys():
-            raise KeyError("shower type {} not present in library. Available shower types are {}".format(shower_type, *self._library.keys()))
+        profile_depth, profile_ce = self.__get_charge_excess_profile(shower_energy, shower_type, same_shower, iN)
 
         # Due to the oscillatory nature of the ARZ integral, some numerical instabilities arise
         #  for angles near the axis and near 90 degrees. This creates some waveforms with large
@@ -531,33 +967,6 @@ class ARZ(object):
         # should not trigger, we return an empty trace for angular differences > 20 degrees.
         cherenkov_angle = np.arccos(1 / n_index)
 
-        # determine closes available energy in shower library
-        energies = np.array([*self._library[shower_type]])
-        iE = np.argmin(np.abs(energies - shower_energy))
-        rescaling_factor = shower_energy / energies[iE]
-        logger.info("shower energy of {:.3g}eV requested, closest available energy is {:.3g}eV. The amplitude of the charge-excess profile will be rescaled accordingly by a factor of {:.2f}".format(shower_energy / units.eV, energies[iE] / units.eV, rescaling_factor))
-        profiles = self._library[shower_type][energies[iE]]
-        N_profiles = len(profiles['charge_excess'])
-
-        if(iN is None or np.isnan(iN)):
-            if(same_shower):
-                if(shower_type in self._random_numbers):
-                    iN = self._random_numbers[shower_type]
-                    logger.info("using previously used shower {}/{}".format(iN, N_profiles))
-                else:
-                    logger.warning("no previous random number for shower type {} exists. Generating a new random number.".format(shower_type))
-                    iN = self._random_generator.randint(N_profiles)
-                    self._random_numbers[shower_type] = iN
-                    logger.info("picking profile {}/{} randomly".format(iN, N_profiles))
-            else:
-                iN = self._random_generator.randint(N_profiles)
-                self._random_numbers[shower_type] = iN
-                logger.info("picking profile {}/{} randomly".format(iN, N_profiles))
-        else:
-            iN = int(iN)  # saveguard against iN being a float
-            logger.info("using shower {}/{} as specified by user".format(iN, N_profiles))
-            self._random_numbers[shower_type] = iN
-
         # we always need to generate a random shower realization. The second ray tracing solution might be closer
         # to the cherenkov angle, but NuRadioMC will reuse the shower realization of the first ray tracing solution.
         if np.abs(theta - cherenkov_angle) > maximum_angle:
@@ -565,41 +974,9 @@ class ARZ(object):
             empty_trace = np.zeros((3, N))
             return empty_trace
 
-        profile_depth = profiles['depth']
-        profile_ce = profiles['charge_excess'][iN] * rescaling_factor
-
         xmax = profile_depth[np.argmax(profile_ce)]
 
-        # get the appropriate model parameters
-        if shower_type == "HAD":
-            model_parameters = dict(
-                Af = self._Af_p,
-                t0_pos = self._t0_p_pos,
-                freq_pos = self._freq_p_pos,
-                exp_pos = self._exp_p_pos,
-                t0_neg = self._t0_p_neg,
-                freq_neg = self._freq_p_neg,
-                exp_neg = self._exp_p_neg
-            )
-            em_factor = self.em_fraction(shower_energy)
-        elif shower_type == "EM":
-            model_parameters = dict(
-                Af = self._Af_e,
-                t0_pos = self._t0_e_pos,
-                freq_pos = self._freq_e_pos,
-                exp_pos = self._exp_e_pos,
-                t0_neg = self._t0_e_neg,
-                freq_neg = self._freq_e_neg,
-                exp_neg = self._exp_e_neg
-            )
-            em_factor = 1.
-        elif(shower_type == "TAU"):
-            logger.error("Tau showers are not yet implemented")
-            raise NotImplementedError("Tau showers are not yet implemented")
-        else:
-            msg = "showers of type {} are not implemented. Use 'HAD', 'EM' or 'TAU'".format(shower_type)
-            logger.error(msg)
-            raise NotImplementedError(msg)
+        model_parameters, em_factor = self.__get_model_parameters(shower_energy, shower_type)
         if self._use_numba:
             vp = get_vector_potential_numba(
                 shower_energy, theta, N, dt, profile_depth, profile_ce,
@@ -632,6 +1009,60 @@ class ARZ(object):
             return trace_onsky, Lmax
         return trace_onsky
 
+    def get_time_traces(self, shower_energy, thetas, N, dt, shower_type, n_index, Rs, shift_for_xmax=False,
+                        same_shower=False, iN=None, maximum_angle=20 * units.deg):
+        """
+        calculates the electric-field Askaryan pulses of one shower for many observers
+
+        Same as `get_time_trace` but for arrays of viewing angles and distances. All observers see the same shower
+        realization, and the vector potentials are calculated with `get_vector_potentials` which shares the
+        interpolated charge-excess profile between the observers.
+
+        Parameters
+        ----------
+        thetas: float or array of floats
+            viewing angles, i.e., the angles between shower axis and launch angle of the signal (the ray paths)
+        Rs: float or array of floats
+            observation distances
+        all other parameters: see `get_time_trace`
+
+        Returns
+        -------
+        efield_traces: array of floats
+            array of shape (number of observers, 3, N) with the electric-field time traces in 'on-sky' coordinate
+            system eR, eTheta, ePhi
+        """
+        thetas, Rs = np.broadcast_arrays(np.atleast_1d(thetas), np.atleast_1d(Rs))
+        profile_depth, profile_ce = self.__get_charge_excess_profile(shower_energy, shower_type, same_shower, iN)
+
+        # return empty traces for angular differences > maximum_angle (see `get_time_trace`)
+        cherenkov_angle = np.arccos(1 / n_index)
+        traces_onsky = np.zeros((len(thetas), 3, N))
+        mask = np.abs(thetas - cherenkov_angle) <= maximum_angle
+        if not np.any(mask):
+            return traces_onsky
+
+        xmax = profile_depth[np.argmax(profile_ce)]
+
+        model_parameters, em_factor = self.__get_model_parameters(shower_energy, shower_type)
+        vp = get_vector_potentials(
+            shower_energy, thetas[mask], N, dt, profile_depth, profile_ce,
+            shower_type=shower_type, n_index=n_index, distances=Rs[mask],
+            interp_factor=self._interp_factor, interp_factor2=self._interp_factor2,
+            shift_for_xmax=shift_for_xmax, **model_parameters, em_factor=em_factor, use_numba=self._use_numba
+        )
+        traces = -np.diff(vp, axis=1) / dt
+
+        # use viewing angle relative to shower maximum for rotation into spherical coordinate system (that reduced eR component)
+        if shift_for_xmax:
+            thetaprimes = thetas[mask]
+        else:
+            thetaprimes = theta_to_thetaprime(thetas[mask], xmax, Rs[mask])
+        for i, thetaprime, trace in zip(np.arange(len(thetas))[mask], thetaprimes, traces):
+            cs = cstrafo.cstrafo(zenith=thetaprime, azimuth=0)
+            traces_onsky[i] = cs.transform_from_ground_to_onsky(trace.T)
+        return traces_onsky
+
     def get_last_shower_profile_id(self):
         """
         returns dict
@@ -1120,6 +1551,21 @@ class ARZ_tabulated(object):
         """
         self._random_generator.seed(seed)
 
+    def get_random_state(self):
+        """
+        returns the state of the random number generator and the cached shower realizations, which can be restored
+        with `set_random_state`
+        """
+        return {'random_generator': self._random_generator.get_state(),
+                'random_numbers': dict(self._random_numbers)}
+
+    def set_random_state(self, state):
+        """
+        restores the state returned by `get_random_state`
+        """
+        self._random_generator.set_state(state['random_generator'])
+        self._random_numbers = dict(state['random_numbers'])
+
     def get_time_trace(self, shower_energy, theta, N, dt, shower_type, n_index, R,
                        same_shower=False, iN=None, output_mode='trace', theta_reference='X0'):
         """
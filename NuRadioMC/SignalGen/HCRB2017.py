@@ -95,6 +95,59 @@ def get_frequency_spectrum(energy, theta, N, dt, is_em_shower, n, R, LPM=True, a
     return np.array([fft.time2freq(eR, 1./dt), fft.time2freq(eTheta, 1./dt), fft.time2freq(ePhi, 1./dt)])
 
 
+def get_frequency_spectra(energies, thetas, N, dt, is_em_showers, n_indices, Rs, LPM=True, a=None):
+    """
+    returns the complex amplitudes of the frequency spectra of many showers and/or observers at once
+
+    This is the vectorized version of `get_frequency_spectrum`. The shower width is calculated only once per
+    shower energy and type, all observers are calculated in one numpy pass.
+
+    Parameters
+    ----------
+    energies : float or array of floats
+        energies of the showers
+    thetas: float or array of floats
+        viewangles: angles between shower axis (neutrino direction) and the line
+        of sight between interaction and detector
+    N : int
+        number of samples in the time domain
+    dt: float
+        time bin width, i.e. the inverse of the sampling rate
+    is_em_showers: bool or array of bools
+        true if EM shower, false otherwise
+    n_indices: float or array of floats
+        indices of refraction at interaction vertices
+    Rs: float or array of floats
+        distances from vertex to observer
+    LPM: bool (default True)
+        enable/disable LPD effect
+    a: float or None (default Nont)
+        if variable set, the shower width is manually set to this value
+
+    Returns
+    -------
+    spectra: 3D array
+        the spectra of the eR, eTheta and ePhi components with shape (number of observers, 3, N // 2 + 1)
+    """
+    energies, thetas, is_em_showers, n_indices, Rs = np.broadcast_arrays(
+        np.atleast_1d(energies), np.atleast_1d(thetas), np.atleast_1d(is_em_showers), np.atleast_1d(n_indices), np.atleast_1d(Rs))
+    Nmax = np.zeros(len(energies))
+    askaryanDepthA = np.zeros(len(energies))
+    showers, inverse = np.unique(np.array([energies, is_em_showers], dtype=float), axis=1, return_inverse=True)
+    for i_shower, (energy, is_em_shower) in enumerate(showers.T):
+        Nmax[inverse == i_shower], askaryanDepthA[inverse == i_shower] = get_N_AskDepthA(energy, bool(is_em_shower), LPM)
+    if(a is not None):
+        askaryanDepthA[:] = a
+
+    freqs = np.fft.rfftfreq(N, dt)
+    eR, eTheta = _get_E_omega_from_shower_width(freqs, Nmax[:, None], askaryanDepthA[:, None], Rs[:, None],
+                                                thetas[:, None], n_indices[:, None])
+    traceR = np.fft.irfft(eR, axis=-1) / dt
+    traceTheta = np.fft.irfft(eTheta, axis=-1) / dt
+    traces = np.stack([traceR, traceTheta, np.zeros_like(traceTheta)], axis=1)
+    return fft.time2freq(traces, 1. / dt)
+
+
 def _get_k(ff, n_index):
     return 2 * np.pi * ff / speed_of_light * n_index
 
@@ -164,12 +217,22 @@ def _get_E_omega(ff, E, R, theta, n_index, EM=True,
     _Nmax, _askaryanDepthA = get_N_AskDepthA(E, EM, LPM, fudge_LPM=fudge_LPM)
     if(a is not None):
         _askaryanDepthA = a
+    return _get_E_omega_from_shower_width(ff, _Nmax, _askaryanDepthA, R, theta, n_index,
+                                          use_form_factor=use_form_factor, _rho0=_rho0)
+
+
+def _get_E_omega_from_shower_width(ff, _Nmax, _askaryanDepthA, R, theta, n_index, use_form_factor=True,
+                                   _rho0=1. / (np.sqrt(2.0 * np.pi) * 0.03 * units.m)):
+    """
+    calculates the frequency spectrum of an Askaryan pulse for a given shower maximum and shower width,
+    see `_get_E_omega`. All arguments can be numpy arrays that are broadcastable against the frequencies.
+    """
     COS_THETA_C = 1. / n_index
     k = _get_k(ff, n_index)
     eta = _get_eta(k, _askaryanDepthA, R, theta)
     I_FF = _get_Iff(ff, n_index, _askaryanDepthA, R, theta)
     nu = speed_of_light * k / (2.0 * np.pi)
-    logger.debug("a {}, nmax {}, R {}".format(_askaryanDepthA, _Nmax, R))
+    logger.debug("a %s, nmax %s, R %s", _askaryanDepthA, _Nmax, R)
     norm = 2.52e-7 * 1e3 * _askaryanDepthA * _Nmax * nu / R / NORM  # the additional *1e3 comes from putting all the units in the constant of Eq. (10). The left side of the equation is in MHz, whereas the right side is in GHz
     # Kinematic factor, psi...checked JCH March 8th, 2016...fixed missing sin(theta)
     psi = np.sin(theta) * np.sin(k * R) + 1j * (-np.sin(theta) * np.cos(k * R))
@@ -180,7 +243,7 @@ def _get_E_omega(ff, E, R, theta, n_index, EM=True,
     thetaComp_num = 1 + eta**2 / (1 + eta)**2 * COS_THETA_C / np.sin(theta)**2 * (np.cos(theta) - COS_THETA_C) + \
         1j * (-eta / (1 + eta)**2 * COS_THETA_C / np.sin(theta)**2 * (np.cos(theta) - COS_THETA_C))
     thetaComp = I_FF * norm * psi * thetaComp_num
-    logger.debug("IFF[0] {:.2g}, norm {:.2g}, psi[0] {:.2g}, thetaComp_num {:.2g}".format(I_FF[1], norm[1], psi[1], thetaComp_num[1]))
+    logger.debug("IFF[0] %s, norm %s, psi[0] %s, thetaComp_num %s", I_FF[..., 1], norm[..., 1], psi[..., 1], thetaComp_num[..., 1])
 
     if use_form_factor:
         a = k / _rho0
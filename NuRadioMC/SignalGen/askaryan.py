@@ -11,6 +11,63 @@ def set_log_level(level):
     par.set_log_level(level)
 
 
+def set_seed(model, seed):
+    """
+    (re)sets the random seed of the signal model
+
+    Only the ARZ models and the Alvarez2009 parametrization have random components (the shower realization), for
+    all other models this function has no effect.
+
+    Parameters
+    ----------
+    model: string
+        specifies the signal model
+    seed: None or int
+        the random seed
+    """
+    if model in par.get_parametrizations():
+        par.set_seed(model, seed)
+    elif(model == 'ARZ2019' or model == 'ARZ2020'):
+        from NuRadioMC.SignalGen.ARZ import ARZ
+        ARZ.ARZ(arz_version=model, seed=seed).set_seed(seed)
+
+
+def get_random_state(model):
+    """
+    returns the state of the random number generator of the signal model (None for models without random
+    components), which can be restored with `set_random_state`
+
+    Parameters
+    ----------
+    model: string
+        specifies the signal model
+    """
+    if model in par.get_parametrizations():
+        return par.get_random_state(model)
+    elif(model == 'ARZ2019' or model == 'ARZ2020'):
+        from NuRadioMC.SignalGen.ARZ import ARZ
+        return ARZ.ARZ(arz_version=model).get_random_state()
+    return None
+
+
+def set_random_state(model, state):
+    """
+    restores the state of the random number generator of the signal model returned by `get_random_state`
+
+    Parameters
+    ----------
+    model: string
+        specifies the signal model
+    state: object
+        the state returned by `get_random_state`
+    """
+    if model in par.get_parametrizations():
+        par.set_random_state(model, state)
+    elif((model == 'ARZ2019' or model == 'ARZ2020') and state is not None):
+        from NuRadioMC.SignalGen.ARZ import ARZ
+        ARZ.ARZ(arz_version=model).set_random_state(state)
+
+
 def get_time_trace(energy, theta, N, dt, shower_type, n_index, R, model, interp_factor=None, interp_factor2=None,
                    same_shower=False, seed=None, full_output=False, **kwargs):
     """
@@ -215,3 +272,92 @@ def get_frequency_spectrum(energy, theta, N, dt, shower_type, n_index, R, model,
         return fft.time2freq(tmp[0], 1 / dt), tmp[1]
     else:
         return fft.time2freq(tmp, 1 / dt)
+
+
+def get_frequency_spectra(energies, thetas, N, dt, shower_types, n_indices, Rs, model, full_output=False, **kwargs):
+    """
+    returns the complex amplitudes of the frequency spectra of many showers and/or observers at once
+
+    The parametric models (ZHS1992, Alvarez2000, Alvarez2009) and the HCRB2017 model calculate all spectra in
+    one vectorized numpy pass. The ARZ models calculate the spectra of many observers of the same shower (i.e. the
+    same energy, shower type and index of refraction) from one charge-excess profile. For all other cases,
+    `get_frequency_spectrum` is called for each observer.
+    The spectra are identical to the ones obtained from `get_frequency_spectrum`.
+
+    Parameters
+    ----------
+    energies : float or array of floats
+        energies of the showers
+    thetas: float or array of floats
+        viewangles: angles between shower axis (neutrino direction) and the line
+        of sight between interaction and detector
+    N : int
+        number of samples in the time domain
+    dt: float
+        time bin width, i.e. the inverse of the sampling rate
+    shower_types: string or array of strings
+        types of showers, either "HAD" (hadronic), "EM" (electromagnetic)
+        or "TAU" (tau lepton induced)
+    n_indices: float or array of floats
+        indices of refraction at interaction vertices
+    Rs: float or array of floats
+        distances from vertex to observer
+    model: string
+        specifies the signal model, see `get_frequency_spectrum`
+    full_output: bool (default False)
+        if True, askaryan modules can return additional output. If `get_frequency_spectrum` is called for each
+        observer, the additional output is a list with the output of each observer.
+
+    Returns
+    -------
+    spectra: 2D array
+        the complex amplitudes of the frequency spectra with shape (number of observers, N // 2 + 1)
+    additional information: dict or list of dicts
+        only available if `full_output` enabled
+    """
+    energies, thetas, shower_types, n_indices, Rs = np.broadcast_arrays(
+        np.atleast_1d(energies), np.atleast_1d(thetas), np.char.upper(np.atleast_1d(shower_types).astype(str)),
+        np.atleast_1d(n_indices), np.atleast_1d(Rs))
+    if model in par.get_parametrizations():
+        return par.get_frequency_spectra(energies, thetas, N, dt, shower_types, n_indices, Rs, model,
+                                         full_output=full_output, **kwargs)
+    elif(model == 'HCRB2017'):
+        from NuRadioMC.SignalGen import HCRB2017
+        if(not np.all((shower_types == "HAD") | (shower_types == "EM"))):
+            raise NotImplementedError("shower type {} not implemented in {} Askaryan module".format(
+                shower_types[(shower_types != "HAD") & (shower_types != "EM")][0], model))
+        spectra = HCRB2017.get_frequency_spectra(energies, thetas, N, dt, shower_types == "EM", n_indices, Rs,
+                                                 kwargs.get('LPM', True), kwargs.get('a', None))[:, 1]
+        if(full_output):
+            return spectra, {}
+        else:
+            return spectra
+    elif(model in ['ARZ2019', 'ARZ2020'] and len(np.unique(energies)) == 1 and len(np.unique(shower_types)) == 1
+         and len(np.unique(n_indices)) == 1):
+        # all observers see the same shower, the vector potentials are calculated from the same charge-excess profile
+        from NuRadioMC.SignalGen.ARZ import ARZ
+        gARZ = ARZ.ARZ(arz_version=model, seed=kwargs.pop('seed', None))
+        if(kwargs.get('interp_factor', None) is not None):
+            gARZ.set_interpolation_factor(kwargs['interp_factor'])
+        if(kwargs.get('interp_factor2', None) is not None):
+            gARZ.set_interpolation_factor2(kwargs['interp_factor2'])
+        kwargs.pop('interp_factor', None)
+        kwargs.pop('interp_factor2', None)
+        traces = gARZ.get_time_traces(energies[0], thetas, N, dt, shower_types[0], n_indices[0], Rs, **kwargs)[:, 1]
+        spectra = fft.time2freq(traces, 1 / dt)
+        if(full_output):
+            return spectra, {'iN': gARZ.get_last_shower_profile_id()[shower_types[0]]}
+        else:
+            return spectra
+
+    spectra = []
+    additional_output = []
+    for i in range(len(energies)):
+        tmp = get_frequency_spectrum(energies[i], thetas[i], N, dt, shower_types[i], n_indices[i], Rs[i], model,
+                                     full_output=True, **kwargs)
+        spectra.append(tmp[0])
+        additional_output.append(tmp[1])
+    if(full_output):
+        return np.array(spectra), additional_output
+    else:
+        return np.array(spectra)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 import numpy as np
-from NuRadioReco.utilities import units
+from NuRadioReco.utilities import units, fft
 from scipy import constants
 import logging
 logger = logging.getLogger("SignalGen.parametrizations")
@@ -30,6 +30,41 @@ def get_parametrizations():
     return ['ZHS1992', 'Alvarez2000', 'Alvarez2009']
 
 
+def set_seed(model, seed):
+    """
+    (re)initializes the random number generator of a parametrization with a new seed
+
+    Parameters
+    ----------
+    model: string
+        the name of the parametrization
+    seed: None or int
+        the random seed
+    """
+    _random_generators[model] = np.random.RandomState(seed)
+
+
+def get_random_state(model):
+    """
+    returns the state of the random number generator of a parametrization (None if it was not used yet), which can
+    be restored with `set_random_state`
+    """
+    if(model not in _random_generators):
+        return None
+    return _random_generators[model].get_state()
+
+
+def set_random_state(model, state):
+    """
+    restores the state of the random number generator of a parametrization returned by `get_random_state`
+    """
+    if(state is None):
+        _random_generators.pop(model, None)
+    else:
+        _random_generators[model] = np.random.RandomState()
+        _random_generators[model].set_state(state)
+
+
 def get_time_trace(energy, theta, N, dt, shower_type, n_index, R, model, seed=None, same_shower=False,
                    k_L=None, full_output=False, average_shower=False):
     """
@@ -91,29 +126,117 @@ def get_time_trace(energy, theta, N, dt, shower_type, n_index, R, model, seed=No
         only available if `full_output` enabled
 
     """
+    traces, additional_output = _get_time_traces(energy, theta, N, dt, shower_type, n_index, R, model, seed=seed,
+                                                 same_shower=same_shower, k_L=k_L, average_shower=average_shower)
+    if(full_output):
+        return traces[0], {key: value[0] for key, value in additional_output.items()}
+    else:
+        return traces[0]
+
+
+def get_frequency_spectra(energies, thetas, N, dt, shower_types, n_indices, Rs, model, seed=None, same_shower=False,
+                          k_L=None, full_output=False, average_shower=False):
+    """
+    returns the frequency spectra of the eTheta component for many showers and/or observers at once
+
+    This is the vectorized version of `get_time_trace` (followed by an FFT into the frequency domain). All
+    observers are calculated in one numpy pass, `get_time_trace` uses the same implementation for a single observer.
+
+    Parameters
+    ----------
+    energies : float or array of floats
+        energies of the showers
+    thetas: float or array of floats
+        viewing angles: angles between shower axis (neutrino direction) and the line
+        of sight between interaction and detector
+    N : int
+        number of samples in the time domain
+    dt: float
+        time bin width, i.e. the inverse of the sampling rate
+    shower_types: string or array of strings
+        types of showers, either "HAD" (hadronic), "EM" (electromagnetic)
+    n_indices: float or array of floats
+        indices of refraction at interaction vertices
+    Rs: float or array of floats
+        distances from vertex to observer
+    model: string
+        specifies the signal model, see `get_time_trace`
+    seed: None or int
+        the random seed for the Askaryan modules
+    same_shower: bool (default False)
+        if False, for each observer a new random shower realization is choosen.
+        if True, the shower from the last request is used.
+    k_L: None, float or array of floats
+        the k_L parameter for EM showers of the Alvarez2009 model. If a this parameter is provided, this value is used
+        and the parameter will not be drawn from a random distribution.
+        This setting overrides the `same_shower` setting
+    full_output: bool (default False)
+        if True, an additional dictionary is returned (see `get_time_trace`), for the Alvarez2009 model the key
+        'k_L' contains an array with the k_L parameter of each observer.
+    average_shower: bool (default False)
+        if True, for the Alvarez2009 model electromagnetic showers, no random shower is generated, but the average shower is choosen.
+
+    Returns
+    -------
+    spectra: 2D array
+        the complex amplitudes of the frequency spectra with shape (number of observers, N // 2 + 1)
+    additional information: dict
+        only available if `full_output` enabled
+    """
+    traces, additional_output = _get_time_traces(energies, thetas, N, dt, shower_types, n_indices, Rs, model, seed=seed,
+                                                 same_shower=same_shower, k_L=k_L, average_shower=average_shower)
+    spectra = fft.time2freq(traces, 1 / dt)
+    if(full_output):
+        return spectra, additional_output
+    else:
+        return spectra
+
+
+def _get_time_traces(energies, thetas, N, dt, shower_types, n_indices, Rs, model, seed=None, same_shower=False,
+                     k_L=None, average_shower=False):
+    """
+    calculates the time traces of the eTheta component of many observers, this is the implementation of
+    `get_time_trace` and `get_frequency_spectra`
+
+    Returns
+    -------
+    traces: 2D array
+        the time traces with shape (number of observers, N)
+    additional information: dict
+        the additional output of the model with one entry per observer
+    """
     if(model not in _random_generators):
         _random_generators[model] = np.random.RandomState(seed)
+    energies, thetas, shower_types, n_indices, Rs = np.broadcast_arrays(
+        np.atleast_1d(energies), np.atleast_1d(thetas), np.atleast_1d(shower_types), np.atleast_1d(n_indices), np.atleast_1d(Rs))
+    shower_types = np.char.upper(shower_types.astype(str))
+    is_had = shower_types == 'HAD'
+    is_em = shower_types == 'EM'
+    # the observers are along the first axis, the frequencies along the second axis
+    energy = energies[:, None].astype(float)
+    theta = thetas[:, None].astype(float)
+    n_index = n_indices[:, None].astype(float)
+    R = Rs[:, None].astype(float)
+    additional_output = {}
+
     if(model == 'ZHS1992'):
-        """ Parametrization from E. Zas, F. Halzen, and T. Stanev, Phys. Rev. D 45, 362 (1992)."""
         freqs = np.fft.rfftfreq(N, dt)
         vv0 = freqs / (0.5 * units.GHz)
         cherenkov_angle = np.arccos(1. / n_index)
         domega = (theta - cherenkov_angle)
         tmp = np.exp(+0.5j * np.pi)  # set phases to 90deg
-        tmp *= 1.1e-7 * energy / units.TeV * vv0 * 1. / \
-            (1 + 0.4 * (vv0) ** 2) * np.exp(-0.5 * (domega / (2.4 * units.deg / vv0)) ** 2) * \
-            units.V / units.m / (R / units.m) / units.MHz
+        with np.errstate(divide='ignore'):
+            tmp *= 1.1e-7 * energy / units.TeV * vv0 * 1. / \
+                (1 + 0.4 * (vv0) ** 2) * np.exp(-0.5 * (domega / (2.4 * units.deg / vv0)) ** 2) * \
+                units.V / units.m / (R / units.m) / units.MHz
         # the factor 0.5 is introduced to compensate the unusual fourier transform normalization used in the ZHS code
-        trace = 0.5 * np.fft.irfft(tmp) / dt
-        trace = np.roll(trace, int(2 * units.ns / dt))
-        if(full_output):
-            return trace, {}
-        else:
-            return trace
+        traces = 0.5 * np.fft.irfft(tmp, axis=-1) / dt
+        traces = np.roll(traces, int(2 * units.ns / dt), axis=-1)
 
     elif(model == 'Alvarez2009'):
-        # This parameterisation is not very accurate for energies above 10 EeV
-        # The ARZ model should be used instead
+        if(not np.all(is_had | is_em)):
+            raise NotImplementedError("shower type {} is not implemented in Alvarez2009 model.".format(shower_types[~(is_had | is_em)][0]))
+        had = is_had[:, None]
         freqs = np.fft.rfftfreq(N, dt)[1:]  # exclude zero frequency
 
         E_C = 73.1 * units.MeV
@@ -123,160 +246,118 @@ def get_time_trace(energy, theta, N, dt, shower_type, n_index, R, model, seed=No
         c = constants.c * units.m / units.s
 
         # calculate A
-        if (shower_type == 'HAD'):
-            k_E_0 = 4.13e-16 * units.V / units.cm / units.MHz ** 2
-            k_E_1 = 2.54
-            log10_E_E = 10.60
-            k_E_bar = k_E_0 * np.tanh((np.log10(energy / units.eV) - log10_E_E) / k_E_1)
-        elif (shower_type == 'EM'):
-            k_E_bar = 4.65e-16 * units.V / units.cm / units.MHz ** 2
-        else:
-            raise NotImplementedError("shower type {} is not implemented in Alvarez2009 model.".format(shower_type))
-
+        k_E_0 = 4.13e-16 * units.V / units.cm / units.MHz ** 2
+        k_E_1 = 2.54
+        log10_E_E = 10.60
+        k_E_bar = np.where(had, k_E_0 * np.tanh((np.log10(energy / units.eV) - log10_E_E) / k_E_1),
+                           4.65e-16 * units.V / units.cm / units.MHz ** 2)
         A = k_E_bar * energy / E_C * X_0 / rho * np.sin(theta) * freqs
 
         # calculate nu_L
-        if (shower_type == 'HAD'):
-            k_L_0 = 31.25
-            gamma = 3.01e-2
-            E_L = 1.e15 * units.eV
-            k_L = k_L_0 * (energy / E_L) ** gamma
-        elif (shower_type == 'EM'):
+        k_L_0 = 31.25
+        gamma = 3.01e-2
+        E_L = 1.e15 * units.eV
+        k_Ls = k_L_0 * (energies.astype(float) / E_L) ** gamma
+        if(np.any(is_em)):
             sigma_0 = 3.39e-2
             log10_E_sigma = 14.99
             delta_0 = 0
             delta_1 = 2.25e-2
-            log10_E_0 = np.log10(energy / units.eV)
-            if (log10_E_0 < log10_E_sigma):
-                sigma_k_L = sigma_0 + delta_0 * (log10_E_0 - log10_E_sigma)
-            else:
-                sigma_k_L = sigma_0 + delta_1 * (log10_E_0 - log10_E_sigma)
+            log10_E_0 = np.log10(energies[is_em].astype(float) / units.eV)
+            sigma_k_L = np.where(log10_E_0 < log10_E_sigma, sigma_0 + delta_0 * (log10_E_0 - log10_E_sigma),
+                                 sigma_0 + delta_1 * (log10_E_0 - log10_E_sigma))
 
             log10_k_0 = 1.52
             log10_E_LPM = 16.61
             gamma_0 = 5.59e-2
             gamma_1 = 0.39
-            if (log10_E_0 < log10_E_LPM):
-                log10_k_L_bar = log10_k_0 + gamma_0 * (log10_E_0 - log10_E_LPM)
-            else:
-                log10_k_L_bar = log10_k_0 + gamma_1 * (log10_E_0 - log10_E_LPM)
+            log10_k_L_bar = np.where(log10_E_0 < log10_E_LPM, log10_k_0 + gamma_0 * (log10_E_0 - log10_E_LPM),
+                                     log10_k_0 + gamma_1 * (log10_E_0 - log10_E_LPM))
 
             global _Alvarez2009_k_L
-            if(k_L is None):
-                if(average_shower):
-                    k_L = 10 ** log10_k_L_bar
-                elif(same_shower):
-                    if _Alvarez2009_k_L is None:
-                        logger.error("the same shower was requested but the function hasn't been called before.")
-                        raise AttributeError("the same shower was requested but the function hasn't been called before.")
-                    else:
-                        k_L = _Alvarez2009_k_L
-
-                else:
-                    _Alvarez2009_k_L = 10 ** _random_generators[model].normal(log10_k_L_bar, sigma_k_L)
-                    k_L = _Alvarez2009_k_L
-        else:
-            raise NotImplementedError("shower type {} is not implemented in Alvarez2009 model.".format(shower_type))
-        nu_L = rho / k_L / X_0
+            if(k_L is not None):
+                k_Ls[is_em] = np.broadcast_to(k_L, energies.shape)[is_em]
+            elif(average_shower):
+                k_Ls[is_em] = 10 ** log10_k_L_bar
+            elif(same_shower):
+                if _Alvarez2009_k_L is None:
+                    logger.error("the same shower was requested but the function hasn't been called before.")
+                    raise AttributeError("the same shower was requested but the function hasn't been called before.")
+                k_Ls[is_em] = _Alvarez2009_k_L
+            else:
+                # the random numbers are drawn in the order of the observers, i.e., the same realizations are
+                # obtained as for successive calls of `get_time_trace`
+                k_Ls[is_em] = 10 ** _random_generators[model].normal(log10_k_L_bar, sigma_k_L)
+                _Alvarez2009_k_L = k_Ls[is_em][-1]
+        nu_L = rho / k_Ls[:, None] / X_0
         cher_cut = 1.e-8
-        if (np.abs(1 - n_index * np.cos(theta)) < cher_cut):
-            nu_L *= c / cher_cut
-        else:
-            nu_L *= c / np.abs(1 - n_index * np.cos(theta))
-
-        # calculate d_L
-        if (shower_type == "HAD"):
-            beta = 2.57
-        elif (shower_type == "EM"):
-            beta = 2.74
-        else:
-            raise NotImplementedError("shower type {} is not implemented in Alvarez2009 model.".format(shower_type))
-
+        nu_L = nu_L * c / np.maximum(np.abs(1 - n_index * np.cos(theta)), cher_cut)
+        beta = np.where(had, 2.57, 2.74)
         d_L = 1 / (1 + (freqs / nu_L) ** beta)
 
         # calculate d_R
-        if (shower_type == "HAD"):
-            k_R_0 = 2.73
-            k_R_1 = 1.72
-            log10_E_R = 12.92
-            k_R_bar = k_R_0 + np.tanh((log10_E_R - np.log10(energy / units.eV)) / k_R_1)
-        elif (shower_type == "EM"):
-            k_R_bar = 1.54
-        else:
-            raise NotImplementedError("shower type {} is not implemented in Alvarez2009 model.".format(shower_type))
+        k_R_0 = 2.73
+        k_R_1 = 1.72
+        log10_E_R = 12.92
+        k_R_bar = np.where(had, k_R_0 + np.tanh((log10_E_R - np.log10(energy / units.eV)) / k_R_1), 1.54)
         nu_R = rho / k_R_bar / R_M * c / np.sqrt(n_index ** 2 - 1)
 
         alpha = 1.27
         d_R = 1 / (1 + (freqs / nu_R) ** alpha)
 
-        spectrum = A * d_L * d_R
-        spectrum *= 0.5  #  ZHS Fourier transform normalisation
-        spectrum /= R
-        spectrum = np.insert(spectrum, 0, 0)
+        spectra = np.zeros((len(energies), len(freqs) + 1))
+        spectra[:, 1:] = A * d_L * d_R
+        spectra *= 0.5  #  ZHS Fourier transform normalisation
+        spectra /= R
 
-        trace = np.fft.irfft(spectrum * np.exp(0.5j * np.pi)) / dt  # set phases to 90deg
-        trace = np.roll(trace, len(trace) // 2)
-        if(full_output):
-            return trace, {'k_L': k_L}
-        else:
-            return trace
+        traces = np.fft.irfft(spectra * np.exp(0.5j * np.pi), axis=-1) / dt  # set phases to 90deg
+        traces = np.roll(traces, traces.shape[-1] // 2, axis=-1)
+        additional_output['k_L'] = k_Ls
 
     elif(model == 'Alvarez2000'):
+        if(not np.all(is_had | is_em)):
+            raise NotImplementedError("shower type {} not implemented in {} Askaryan module".format(shower_types[~(is_had | is_em)][0], model))
         freqs = np.fft.rfftfreq(N, dt)[1:]  # exclude zero frequency
         cherenkov_angle = np.arccos(1. / n_index)
 
         Elpm = 2e15 * units.eV
         dThetaEM = 2.7 * units.deg * 500 * units.MHz / freqs * (Elpm / (0.14 * energy + Elpm)) ** 0.3
-#         logger.debug("dThetaEM = {}".format(dThetaEM))
 
         epsilon = np.log10(energy / units.TeV)
-        dThetaHad = 0
-        if (epsilon >= 0 and epsilon <= 2):
-            dThetaHad = 500 * units.MHz / freqs * (2.07 - 0.33 * epsilon + 7.5e-2 * epsilon ** 2) * units.deg
-        elif (epsilon > 2 and epsilon <= 5):
-            dThetaHad = 500 * units.MHz / freqs * (1.74 - 1.21e-2 * epsilon) * units.deg
-        elif(epsilon > 5 and epsilon <= 7):
-            dThetaHad = 500 * units.MHz / freqs * (4.23 - 0.785 * epsilon + 5.5e-2 * epsilon ** 2) * units.deg
-        elif(epsilon > 7):
-            dThetaHad = 500 * units.MHz / freqs * (4.23 - 0.785 * 7 + 5.5e-2 * 7 ** 2) * \
-                (1 + (epsilon - 7) * 0.075) * units.deg
+        dThetaHad = np.select([(epsilon >= 0) & (epsilon <= 2), (epsilon > 2) & (epsilon <= 5),
+                               (epsilon > 5) & (epsilon <= 7), epsilon > 7],
+                              [2.07 - 0.33 * epsilon + 7.5e-2 * epsilon ** 2, 1.74 - 1.21e-2 * epsilon,
+                               4.23 - 0.785 * epsilon + 5.5e-2 * epsilon ** 2,
+                               (4.23 - 0.785 * 7 + 5.5e-2 * 7 ** 2) * (1 + (epsilon - 7) * 0.075)], 0)
+        dThetaHad = 500 * units.MHz / freqs * dThetaHad * units.deg
 
         f0 = 1.15 * units.GHz
         E = 2.53e-7 * energy / units.TeV * freqs / f0 / (1 + (freqs / f0) ** 1.44)
         E *= units.V / units.m / units.MHz
         E *= np.sin(theta) / np.sin(cherenkov_angle)
 
-        tmp = np.zeros(len(freqs) + 1)
-        if(shower_type == "EM"):
-            tmp[1:] = E * np.exp(-np.log(2) * ((theta - cherenkov_angle) / dThetaEM) ** 2) / R
-        elif(shower_type == "HAD"):
-            if(np.any(dThetaHad != 0)):
-                tmp[1:] = E * np.exp(-np.log(2) * ((theta - cherenkov_angle) / dThetaHad) ** 2) / R
-
-                def missing_energy_factor(E_0):
-                    # Missing energy factor for hadronic cascades
-                    # Taken from DOI: 10.1016/S0370-2693(98)00905-8
-                    epsilon = np.log10(E_0 / units.TeV)
-                    f_epsilon = -1.27e-2 - 4.76e-2 * (epsilon + 3)
-                    f_epsilon += -2.07e-3 * (epsilon + 3) ** 2 + 0.52 * np.sqrt(epsilon + 3)
-                    return f_epsilon
-
-                tmp[1:] *= missing_energy_factor(energy)
-            else:
-                pass
-                # energy is below a TeV, setting Askaryan pulse to zero
-        else:
-            raise NotImplementedError("shower type {} not implemented in {} Askaryan module".format(shower_type, model))
+        def missing_energy_factor(E_0):
+            # Missing energy factor for hadronic cascades
+            # Taken from DOI: 10.1016/S0370-2693(98)00905-8
+            epsilon = np.log10(E_0 / units.TeV)
+            f_epsilon = -1.27e-2 - 4.76e-2 * (epsilon + 3)
+            f_epsilon += -2.07e-3 * (epsilon + 3) ** 2 + 0.52 * np.sqrt(epsilon + 3)
+            return f_epsilon
+
+        # energies below a TeV have dThetaHad = 0, the Askaryan pulse of hadronic showers is set to zero
+        had = is_had[:, None] & np.any(dThetaHad != 0, axis=-1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tmp = np.zeros((len(energies), len(freqs) + 1))
+            tmp[:, 1:] = np.where(is_em[:, None], E * np.exp(-np.log(2) * ((theta - cherenkov_angle) / dThetaEM) ** 2) / R, 0)
+            tmp[:, 1:] += np.where(had, E * np.exp(-np.log(2) * ((theta - cherenkov_angle) / dThetaHad) ** 2) / R *
+                                   missing_energy_factor(energy), 0)
 
         tmp *= 0.5  # the factor 0.5 is introduced to compensate the unusual fourier transform normalization used in the ZHS code
 
-#         df = np.mean(freqs[1:] - freqs[:-1])
-        trace = np.fft.irfft(tmp * np.exp(0.5j * np.pi)) / dt  # set phases to 90deg
-        trace = np.roll(trace, len(trace) // 2)
-        if(full_output):
-            return trace, {}
-        else:
-            return trace
+        traces = np.fft.irfft(tmp * np.exp(0.5j * np.pi), axis=-1) / dt  # set phases to 90deg
+        traces = np.roll(traces, traces.shape[-1] // 2, axis=-1)
 
     else:
         raise NotImplementedError("model {} unknown".format(model))
+
+    return traces, additional_output
@@ -864,6 +864,13 @@ vector <vector <double> > find_solutions(double x1[2], double x2[2], double n_ic
 	// printf("%f (%d solutions)\n", 1000* elapsed_secs, nSolutions);
  }
 
+ void free_solutions2(double* C0s, double* C1s, int* types) {
+	// releases the arrays allocated by find_solutions2
+ 	delete[] C0s;
+ 	delete[] C1s;
+ 	delete[] types;
+ }
+
 void get_path(double n_ice, double delta_n, double z_0, double x1[2], double x2[2], double C0, vector<double> &res, vector<double> &zs, int n_points=100){
 
 	//will return the ray tracing path between x1 and x2
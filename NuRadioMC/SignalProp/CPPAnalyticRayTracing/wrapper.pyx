@@ -12,6 +12,7 @@ cdef extern from "numpy/arrayobject.h":
 
 cdef extern from "analytic_raytracing.cpp":
     void find_solutions2(double * &, double * &, int * &, int & , double, double, double, double, double, double, double, int, int, double)
+    void free_solutions2(double *, double *, int *)
     double get_attenuation_along_path2(double, double, double, double, double, double, double, double, double, int)
 
 
@@ -54,6 +55,34 @@ cpdef find_solutions(x1, x2, n_ice, delta_n, z_0, reflection, reflection_case, i
     return s
 
 
+cpdef find_solutions_batch(double[:, :] x1, double[:, :] x2, n_ice, delta_n, z_0, reflection, reflection_case, ice_reflection):
+    """
+    finds the solutions of many pairs of start and stop points in one call, returns a list of the solutions (same
+    format as `find_solutions`) of every pair
+    """
+    cdef:
+        double * C0s
+        double * C1s
+        int * types
+        int size
+        int i, j
+
+    results = []
+    for i in range(x1.shape[0]):
+        find_solutions2(C0s, C1s, types, size, x1[i, 0], x1[i, 1], x2[i, 0], x2[i, 1], n_ice, delta_n, z_0, reflection, reflection_case, ice_reflection)
+        solutions = []
+        for j in range(size):
+            solutions.append({'type': types[j],
+                              'C0': C0s[j],
+                              'C1': C1s[j],
+                              'reflection': reflection,
+                              'reflection_case': reflection_case})
+        # the arrays are allocated with new[] in find_solutions2 and need to be released with delete[]
+        free_solutions2(C0s, C1s, types)
+        results.append(sorted(solutions, key=itemgetter('reflection', 'C0')))
+    return results
+
+
 cpdef get_attenuation_along_path(x1, x2, C0, frequency, n_ice, delta_n, z_0, model):
 
 #     t = time.time()
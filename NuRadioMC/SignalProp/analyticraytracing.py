@@ -558,8 +558,36 @@ class ray_tracing_2D(ray_tracing_base):
 
 
     def get_attenuation_along_path(self, x1, x2, C_0, frequency, max_detector_freq, 
-                                   reflection=0, reflection_case=1):
-        
+                                   reflection=0, reflection_case=1, exact=True):
+        """
+        calculates the signal attenuation along the ray path
+
+        Parameters
+        ----------
+        x1: tuple
+            (y,z) coordinate of start point
+        x2: tuple
+            (y,z) coordinate of stop point
+        C_0: float
+            C_0 parameter of the solution
+        frequency: array of floats
+            the frequencies for which the attenuation is calculated
+        max_detector_freq: float or None
+            the maximum frequency of the final detector sampling
+        reflection: int
+            the number of bottom reflections of the solution
+        reflection_case: int
+            the reflection case of the solution
+        exact: bool
+            if True (default), the attenuation is integrated numerically (C++ or scipy.integrate.quad) for every
+            frequency. If False, a Gauss-Legendre quadrature with tabulated attenuation lengths is used for all
+            frequencies at once (see `get_attenuation_integral`).
+
+        Returns
+        -------
+        attenuation: array of floats
+            the fraction of the signal that reaches the observer
+        """
         attenuation = np.ones_like(frequency)
 
         output = f"calculating attenuation for n_ref = {int(reflection):d}: "
@@ -579,7 +607,14 @@ class ray_tracing_2D(ray_tracing_base):
             else:
                 x11, x1, x22, x2, C_0, C_1 = segment
                 
-            if cpp_available:
+            if not exact:
+                mask = frequency > 0
+                freqs = self.__get_frequencies_for_attenuation(frequency, max_detector_freq)
+                tmp = np.exp(-1 * self.get_attenuation_integral([x1], [x2], [C_0], freqs)[0])
+                tmp_attenuation = np.ones_like(frequency)
+                tmp_attenuation[mask] = np.interp(frequency[mask], freqs, tmp)
+
+            elif cpp_available:
                 mask = frequency > 0
                 freqs = self.__get_frequencies_for_attenuation(frequency, max_detector_freq)
                 tmp = np.zeros_like(freqs)
@@ -1019,6 +1054,194 @@ class ray_tracing_2D(ray_tracing_base):
             else:
                 return solution_types_revert['refracted']
 
+    def get_turning_points(self, C_0, x1):
+        """
+        vectorized calculation of the turning points (see `get_turning_point` and `get_y_turn`) and the C_1
+        parameters (see `get_C_1`) of many solutions
+
+        Parameters
+        ----------
+        C_0: array of shape (n,)
+            C_0 values of the ray tracing solutions
+        x1: array of shape (n, 2)
+            (y, z) coordinates of the start points
+
+        Returns
+        -------
+        tuple of arrays of shape (n,): (gamma, z coordinate, y coordinate) of the turning points and C_1
+        """
+        C_0 = np.asarray(C_0, dtype=float)
+        x1 = np.asarray(x1, dtype=float)
+        # turning point (see `get_turning_point`)
+        c = self.medium.n_ice ** 2 - C_0 ** -2
+        gamma_turn = self.__b * 0.5 - (0.25 * self.__b ** 2 - c) ** 0.5
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_turn = np.log(gamma_turn / self.medium.delta_n) * self.medium.z_0
+        above_surface = z_turn > 0
+        z_turn[above_surface] = 0
+        gamma_turn[above_surface] = self.get_gamma(0)
+
+        # C_1 and y coordinate of the turning point (see `get_C_1` and `get_y_with_z_mirror`)
+        y_turn0 = self.get_y(gamma_turn, C_0, 0)
+        mask = x1[:, 1] < z_turn
+        y1_0 = self.get_y(self.get_gamma(np.where(mask, x1[:, 1], 2 * z_turn - x1[:, 1])), C_0, 0)
+        y1_0 = np.where(mask, y1_0, 2 * y_turn0 - y1_0)
+        C_1 = x1[:, 0] - y1_0
+        return gamma_turn, z_turn, y_turn0 + C_1, C_1
+
+    def get_attenuation_integral(self, x1, x2, C_0, frequencies, n_points=32):
+        """
+        vectorized calculation of the attenuation exponent int ds / L(z, f) along many ray paths without
+        bottom reflections
+
+        The path element is ds = C_0 n(z) / sqrt(C_0^2 n(z)^2 - 1) dz. The integral is split at the turning point
+        and every part [a, b] is integrated with a Gauss-Legendre quadrature in u with z = b - u^2, which removes the
+        (integrable) singularity of ds/dz at the turning point. The attenuation length is obtained from a table
+        (see `attenuation.get_attenuation_length_table`).
+
+        Parameters
+        ----------
+        x1: array of shape (n, 2)
+            (y, z) coordinates of the start points
+        x2: array of shape (n, 2)
+            (y, z) coordinates of the stop points, x2 needs to be above x1
+        C_0: array of shape (n,)
+            C_0 values of the ray tracing solutions
+        frequencies: array of shape (m,)
+            the frequencies at which the attenuation is calculated
+        n_points: int
+            the number of points of the Gauss-Legendre quadrature per part of the path
+
+        Returns
+        -------
+        array of shape (n, m): the attenuation exponent, i.e., the attenuation is exp(-result)
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        C_0 = np.asarray(C_0, dtype=float)
+        table = attenuation_util.get_attenuation_length_table(self.attenuation_model, tuple(frequencies))
+        gamma_turn, z_turn, y_turn, C_1 = self.get_turning_points(C_0, x1)
+        # the ray passes the turning point if it reaches x2 after the turning point (see `get_z_mirrored`)
+        mirrored = y_turn < x2[:, 0]
+        u_nodes, u_weights = np.polynomial.legendre.leggauss(n_points)
+
+        def integrate(a, b):
+            length = np.sqrt(np.maximum(b - a, 0))
+            u = 0.5 * (u_nodes[None, :] + 1) * length[:, None]
+            weights = 0.5 * u_weights[None, :] * length[:, None] * 2 * u
+            z = b[:, None] - u ** 2
+            C0n = C_0[:, None] * self.n(z)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # parts of zero length have vanishing weights
+                ds = np.where(weights > 0, weights * C0n / np.abs(C0n ** 2 - 1) ** 0.5, 0)
+            return np.einsum('ij,ijk->ik', ds, table.get_inverse_attenuation_length(z))
+
+        return np.where(mirrored[:, None],
+                        integrate(x1[:, 1], z_turn) + integrate(x2[:, 1], z_turn),
+                        integrate(x1[:, 1], x2[:, 1]))
+
+    def get_solution_properties(self, x1, x2, C_0):
+        """
+        vectorized calculation of the properties of many ray tracing solutions without bottom reflections
+
+        The calculation follows `determine_solution_type`, `get_launch_angle`, `get_receive_angle`,
+        `get_path_length_analytic` and `get_travel_time_analytic` but operates on arrays of solutions.
+
+        Parameters
+        ----------
+        x1: array of shape (n, 2)
+            (y, z) coordinates of the start points
+        x2: array of shape (n, 2)
+            (y, z) coordinates of the stop points
+        C_0: array of shape (n,)
+            C_0 values of the ray tracing solutions
+
+        Returns
+        -------
+        dictionary with arrays of shape (n,) with the keys 'solution_type', 'launch_angle', 'receive_angle',
+        'path_length' and 'travel_time'. The path length and travel time are NaN if the analytic calculation failed
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        C_0 = np.asarray(C_0, dtype=float)
+        n_ice, z_0, delta_n = self.medium.n_ice, self.medium.z_0, self.medium.delta_n
+        y1, z1 = x1[:, 0], x1[:, 1]
+        y2, z2 = x2[:, 0], x2[:, 1]
+        c = n_ice ** 2 - C_0 ** -2
+        gamma_turn, z_turn, y_turn, C_1 = self.get_turning_points(C_0, x1)
+
+        solution_type = np.where(y2 < y_turn, solution_types_revert['direct'],
+                                 np.where(z_turn == 0, solution_types_revert['reflected'], solution_types_revert['refracted']))
+
+        def get_angle(y, z):
+            # see `get_angle`, `get_z_mirrored` and `get_y_diff`
+            z_mirrored = np.where(y_turn < y, z1 + np.abs(z_turn - z1) + np.abs(z_turn - z), z)
+            mirrored = z_mirrored > z_turn
+            z_unmirrored = np.where(mirrored, 2 * z_turn - z_mirrored, z_mirrored)
+            exp = np.exp(z_unmirrored / z_0)
+            B = (2 * np.sqrt(c) * np.sqrt(-self.__b * delta_n * exp + delta_n ** 2 * np.exp(2 * z_unmirrored / z_0) + c) -
+                 self.__b * delta_n * exp + 2 * c)
+            D = n_ice ** 2 * C_0 ** 2 - 1
+            E = -self.__b * delta_n * exp + delta_n ** 2 * np.exp(2 * z_unmirrored / z_0) + c
+            dy = (-np.sqrt(c) * exp * self.__b * delta_n +
+                  2 * np.sqrt(-self.__b * delta_n * exp + delta_n ** 2 * np.exp(2 * z_unmirrored / z_0) + c) * c +
+                  2 * c ** 1.5) / B * E ** -0.5 * (D ** (-0.5))
+            dy = np.where(mirrored, -dy, dy)
+            angle = np.arctan(dy)
+            return np.where(angle < 0, np.pi + angle, angle)
+
+        launch_angle = get_angle(y1, z1)
+        receive_angle = np.pi - get_angle(y2, z2)
+
+        # analytic path length and travel time (see `get_path_length_analytic` and `get_travel_time_analytic`)
+        z_deep = get_z_deep((n_ice, z_0, delta_n))
+        beta = self.n(z1) * np.sin(launch_angle)
+        alpha = n_ice ** 2 - beta ** 2
+
+        def get_logs(z):
+            gamma = self.n(z) ** 2 - beta ** 2
+            gamma = np.where(gamma < 0, 0, gamma)
+            l1 = n_ice * self.n(z) - beta ** 2 - (alpha * gamma) ** 0.5
+            l2 = self.n(z) + gamma ** 0.5
+            return gamma, np.log(l1), np.log(l2)
+
+        def get_s(z, deep):
+            gamma, log_1, log_2 = get_logs(z)
+            s_shallow = n_ice / alpha ** 0.5 * (-z + log_1 * z_0) + log_2 * z_0
+            s_deep = n_ice * z / alpha ** 0.5
+            return np.where(deep, s_deep, s_shallow)
+
+        def get_t(z, deep):
+            gamma, log_1, log_2 = get_logs(z)
+            t_shallow = (((np.sqrt(gamma) + n_ice * log_2 + n_ice ** 2 * log_1 / np.sqrt(alpha)) * z_0) -
+                         z * n_ice ** 2 / np.sqrt(alpha)) / speed_of_light
+            t_deep = n_ice * (self.n(z) + n_ice * (z / z_0 - 1)) / (np.sqrt(alpha) / z_0 * speed_of_light)
+            return np.where(deep, t_deep, t_shallow)
+
+        def get_direct(get_integral, za, zb):
+            int1 = get_integral(za, za < z_deep)
+            int2 = get_integral(zb, zb < z_deep)
+            z_deeps = np.full_like(za, z_deep)
+            int_diff = get_integral(z_deeps, True) - get_integral(z_deeps, False)
+            int_diff = np.where(np.isinf(int_diff), np.nan, int_diff)
+            crossing = (za < z_deep) != (zb < z_deep)
+            result = int2 - int1 + np.where(crossing, np.where(za < zb, int_diff, -int_diff), 0)
+            return np.where(np.isinf(int1) | np.isinf(int2), np.nan, result)
+
+        z_turn_path = np.where(solution_type == solution_types_revert['reflected'], 0, z_turn)
+        is_direct = solution_type == solution_types_revert['direct']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            path_length = np.where(is_direct, get_direct(get_s, z1, z2),
+                                   get_direct(get_s, z1, z_turn_path) + get_direct(get_s, z2, z_turn_path))
+            travel_time = np.where(is_direct, get_direct(get_t, z1, z2),
+                                   get_direct(get_t, z1, z_turn_path) + get_direct(get_t, z2, z_turn_path))
+
+        return {'solution_type': solution_type,
+                'launch_angle': launch_angle,
+                'receive_angle': receive_angle,
+                'path_length': path_length,
+                'travel_time': travel_time}
+
     def find_solutions(self, x1, x2, plot=False, reflection=0, reflection_case=1):
         """
         this function finds all ray tracing solutions
@@ -1149,6 +1372,40 @@ class ray_tracing_2D(ray_tracing_base):
 
             return sorted(results, key=itemgetter('reflection', 'C0'))
 
+    def find_solutions_batch(self, x1, x2, reflection=0, reflection_case=1):
+        """
+        finds the ray tracing solutions for many pairs of start and stop points
+
+        If the CPP implementation is available, all pairs are processed in a single call to the CPP module.
+
+        Parameters
+        ----------
+        x1: array of shape (n, 2)
+            (y,z) coordinates of the start points
+        x2: array of shape (n, 2)
+            (y,z) coordinates of the stop points
+        reflection: int (default 0)
+            how many reflections off the reflective layer (bottom of ice shelf) should be simulated
+        reflection_case: int (default 1)
+            only relevant if `reflection` is larger than 0
+
+        Returns
+        -------
+        list with the solutions (see `find_solutions`) of every pair of points
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        if(cpp_available and hasattr(wrapper, 'find_solutions_batch')):
+            if(reflection > 0 and self.medium.reflection is None):
+                self.__logger.error("a solution for {:d} reflection(s) off the bottom reflective layer is requested, but ice model does not specify a reflective layer".format(reflection))
+                raise AttributeError("a solution for {:d} reflection(s) off the bottom reflective layer is requested, but ice model does not specify a reflective layer".format(reflection))
+            tmp_reflection = copy.copy(self.medium.reflection)
+            if(tmp_reflection is None):
+                tmp_reflection = 100
+            return wrapper.find_solutions_batch(np.ascontiguousarray(x1), np.ascontiguousarray(x2), self.medium.n_ice,
+                                                self.medium.delta_n, self.medium.z_0, reflection, reflection_case, tmp_reflection)
+        return [self.find_solutions(x1[i], x2[i], reflection=reflection, reflection_case=reflection_case) for i in range(len(x1))]
+
     def plot_result(self, x1, x2, C_0, ax):
         """
         helper function to visualize results
@@ -1692,6 +1949,146 @@ class ray_tracing(ray_tracing_base):
             self.__logger.error(f"{self.get_number_of_solutions()} were found but only {self.get_number_of_raytracing_solutions()} are allowed! Returning zero solutions")
             self._results = []
 
+    def find_solutions_batch(self, x1, x2, analytic=True):
+        """
+        finds the ray tracing solutions between many pairs of start and stop points at once
+
+        The geometry (coordinate transformation into the 2D plane of the ray, launch and receive vectors, and the
+        analytic path lengths and travel times) is calculated vectorized for all pairs. The result for pair i is the
+        same as the one obtained from `set_start_and_end_point(x1[i], x2[i])` and `find_solutions()` followed by the
+        getter functions. The state of the ray tracer (i.e. the current start and end point) is not changed.
+
+        Parameters
+        ----------
+        x1: array of shape (n, 3)
+            start points of the rays
+        x2: array of shape (n, 3)
+            stop points of the rays
+        analytic: bool
+            If True the analytic solution is used to calculate the path length and travel time (a numerical
+            integration is used if it fails). If False, a numerical integration is used. (default: True)
+
+        Returns
+        -------
+        dictionary with the following entries, the second dimension is the maximum number of ray tracing
+        solutions (see `get_number_of_raytracing_solutions`) and entries of non existing solutions are NaN (-1 for
+        the integer arrays)
+
+            * 'n_solutions': array of shape (n,), the number of solutions of each pair
+            * 'ray_tracing_C0', 'ray_tracing_C1', 'ray_tracing_reflection', 'ray_tracing_reflection_case',
+              'ray_tracing_solution_type': arrays of shape (n, n_max), the ray tracing solutions in the format of
+              `get_raytracing_output`, i.e., the solutions of a pair can be passed to `set_solution`
+            * 'launch_vectors', 'receive_vectors': arrays of shape (n, n_max, 3)
+            * 'travel_distances', 'travel_times': arrays of shape (n, n_max)
+        """
+        X1 = np.array(x1, dtype=float).reshape(-1, 3)
+        X2 = np.array(x2, dtype=float).reshape(-1, 3)
+        n_pairs = len(X1)
+        if(self._n_reflections):
+            if(np.any(X1[:, 2] < self._medium.reflection) or np.any(X2[:, 2] < self._medium.reflection)):
+                self.__logger.error("start or stop point is below the reflective bottom layer at {:.1f}m".format(
+                    self._medium.reflection / units.m))
+                raise AttributeError("start or stop point is below the reflective bottom layer at {:.1f}m".format(
+                    self._medium.reflection / units.m))
+
+        # transform into the 2D coordinate system of the ray (see `set_start_and_end_point`)
+        swap = X2[:, 2] < X1[:, 2]
+        X1, X2 = np.where(swap[:, None], X2, X1), np.where(swap[:, None], X1, X2)
+        dX = X2 - X1
+        dPhi = -np.arctan2(dX[:, 1], dX[:, 0])
+        cos, sin = np.cos(dPhi), np.sin(dPhi)
+        x1_2d = np.array([X1[:, 0], X1[:, 2]]).T
+        x2_2d = np.array([cos * dX[:, 0] - sin * dX[:, 1] + X1[:, 0], dX[:, 2] + X1[:, 2]]).T
+
+        results = self._r2d.find_solutions_batch(x1_2d, x2_2d)
+        for i in range(self._n_reflections):
+            for j in range(2):
+                results_reflection = self._r2d.find_solutions_batch(x1_2d, x2_2d, reflection=i + 1, reflection_case=j + 1)
+                for iP in range(n_pairs):
+                    results[iP].extend(results_reflection[iP])
+
+        n_max = self.get_number_of_raytracing_solutions()
+        output = {'n_solutions': np.zeros(n_pairs, dtype=int)}
+        for key in ['ray_tracing_C0', 'ray_tracing_C1', 'travel_distances', 'travel_times']:
+            output[key] = np.full((n_pairs, n_max), np.nan)
+        for key in ['ray_tracing_reflection', 'ray_tracing_reflection_case', 'ray_tracing_solution_type']:
+            output[key] = np.full((n_pairs, n_max), -1, dtype=int)
+        output['launch_vectors'] = np.full((n_pairs, n_max, 3), np.nan)
+        output['receive_vectors'] = np.full((n_pairs, n_max, 3), np.nan)
+        i_pair = []
+        i_solution = []
+        for iP, result in enumerate(results):
+            if(len(result) > n_max):
+                self.__logger.error(f"{len(result)} were found but only {n_max} are allowed! Returning zero solutions")
+                continue
+            output['n_solutions'][iP] = len(result)
+            for iS, solution in enumerate(result):
+                output['ray_tracing_C0'][iP, iS] = solution['C0']
+                output['ray_tracing_C1'][iP, iS] = solution['C1']
+                output['ray_tracing_reflection'][iP, iS] = solution['reflection']
+                output['ray_tracing_reflection_case'][iP, iS] = solution['reflection_case']
+                i_pair.append(iP)
+                i_solution.append(iS)
+        if(len(i_pair) == 0):
+            return output
+        i_pair = np.array(i_pair)
+        i_solution = np.array(i_solution)
+
+        C0 = output['ray_tracing_C0'][i_pair, i_solution]
+        properties = self._r2d.get_solution_properties(x1_2d[i_pair], x2_2d[i_pair], C0)
+        launch_angle = properties['launch_angle']
+        receive_angle = properties['receive_angle']
+        path_length = properties['path_length']
+        travel_time = properties['travel_time']
+        reflection = output['ray_tracing_reflection'][i_pair, i_solution]
+        reflection_case = output['ray_tracing_reflection_case'][i_pair, i_solution]
+        # solutions with bottom reflections, failed analytic calculations or numerical integration are calculated one by one
+        for i in range(len(i_pair)):
+            x1_i, x2_i = x1_2d[i_pair[i]], x2_2d[i_pair[i]]
+            kwargs = {'reflection': reflection[i], 'reflection_case': reflection_case[i]}
+            if(reflection[i] > 0):
+                launch_angle[i] = self._r2d.get_launch_angle(x1_i, C0[i], **kwargs)
+                receive_angle[i] = self._r2d.get_receive_angle(x1_i, x2_i, C0[i], **kwargs)
+                if(analytic):
+                    try:
+                        path_length[i] = self._r2d.get_path_length_analytic(x1_i, x2_i, C0[i], **kwargs)
+                    except:
+                        path_length[i] = np.nan
+                    try:
+                        travel_time[i] = self._r2d.get_travel_time_analytic(x1_i, x2_i, C0[i], **kwargs)
+                    except:
+                        travel_time[i] = np.nan
+            if(not analytic or np.isnan(path_length[i])):
+                if(analytic):
+                    self.__logger.warning("analytic calculation of path length failed, switching to numerical integration")
+                path_length[i] = self._r2d.get_path_length(x1_i, x2_i, C0[i], **kwargs)
+            if(not analytic or np.isnan(travel_time[i])):
+                if(analytic):
+                    self.__logger.warning("analytic calculation of travel time failed, switching to numerical integration")
+                travel_time[i] = self._r2d.get_travel_time(x1_i, x2_i, C0[i], **kwargs)
+
+        # launch and receive vectors (see `get_launch_vector` and `get_receive_vector`)
+        swap = swap[i_pair]
+        launch_vector_2d = np.where(swap[:, None],
+                                    np.array([-np.sin(receive_angle), np.zeros_like(receive_angle), np.cos(receive_angle)]).T,
+                                    np.array([np.sin(launch_angle), np.zeros_like(launch_angle), np.cos(launch_angle)]).T)
+        receive_vector_2d = np.where(swap[:, None],
+                                     np.array([np.sin(launch_angle), np.zeros_like(launch_angle), np.cos(launch_angle)]).T,
+                                     np.array([-np.sin(receive_angle), np.zeros_like(receive_angle), np.cos(receive_angle)]).T)
+        # rotation matrices R.T of every pair
+        RT = np.zeros((len(i_pair), 3, 3))
+        RT[:, 0, 0] = cos[i_pair]
+        RT[:, 0, 1] = sin[i_pair]
+        RT[:, 1, 0] = -sin[i_pair]
+        RT[:, 1, 1] = cos[i_pair]
+        RT[:, 2, 2] = 1
+        output['launch_vectors'][i_pair, i_solution] = np.einsum('nij,nj->ni', RT, launch_vector_2d)
+        output['receive_vectors'][i_pair, i_solution] = np.einsum('nij,nj->ni', RT, receive_vector_2d)
+        output['ray_tracing_solution_type'][i_pair, i_solution] = properties['solution_type']
+        output['travel_distances'][i_pair, i_solution] = path_length
+        output['travel_times'][i_pair, i_solution] = travel_time
+        return output
+
     def get_solution_type(self, iS):
         """ returns the type of the solution
 
@@ -1899,6 +2296,9 @@ class ray_tracing(ray_tracing_base):
         """
         calculates the signal attenuation due to attenuation in the medium (ice)
 
+        If the config option `propagation/exact_attenuation` is False, the attenuation is calculated with tabulated
+        attenuation lengths and cached (see `get_cached_attenuation`).
+
         Parameters
         ----------
         iS: int
@@ -1925,9 +2325,17 @@ class ray_tracing(ray_tracing_base):
             raise IndexError
 
         result = self._results[iS]
-        return self._r2d.get_attenuation_along_path(self._x1, self._x2, result['C0'], frequency, max_detector_freq,
-                                                     reflection=result['reflection'],
-                                                     reflection_case=result['reflection_case'])
+        if self.use_exact_attenuation():
+            return self._r2d.get_attenuation_along_path(self._x1, self._x2, result['C0'], frequency, max_detector_freq,
+                                                         reflection=result['reflection'],
+                                                         reflection_case=result['reflection_case'])
+
+        # the path is fully defined by C_0, the depths, the horizontal distance and the reflection parameters
+        key = ('analytic', self._attenuation_model, result['C0'], self._x1[1], self._x2[1], self._x2[0] - self._x1[0],
+               result['reflection'], result['reflection_case'], hash(frequency.tobytes()), max_detector_freq)
+        return self.get_cached_attenuation(key, lambda: self._r2d.get_attenuation_along_path(
+            self._x1, self._x2, result['C0'], frequency, max_detector_freq, reflection=result['reflection'],
+            reflection_case=result['reflection_case'], exact=False))
 
     def get_focusing(self, iS, dz=-1. * units.cm, limit=2.):
         """
@@ -2102,5 +2510,6 @@ class ray_tracing(ray_tracing_base):
             self._config['propagation']['attenuate_ice'] = True
             self._config['propagation']['focusing_limit'] = 2
             self._config['propagation']['focusing'] = False
+            self._config['propagation']['exact_attenuation'] = True
         else:
             self._config = config
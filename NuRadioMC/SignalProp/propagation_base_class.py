@@ -2,6 +2,7 @@ from __future__ import absolute_import, division, print_function
 from NuRadioReco.utilities import units
 from NuRadioMC.SignalProp.propagation import solution_types, solution_types_revert
 import numpy as np
+import collections
 import logging
 logging.basicConfig()
 
@@ -71,6 +72,11 @@ class ray_tracing_base:
         self._X2 = None
         self._results = None
 
+        # cache of the attenuation of recently calculated ray paths (see `get_cached_attenuation`)
+        self._attenuation_cache = collections.OrderedDict()
+        self._attenuation_cache_size = 1000
+        self._attenuation_cache_statistics = {'hits': 0, 'misses': 0}
+
     def reset_solutions(self):
         self._X1 = None
         self._X2 = None
@@ -306,6 +312,51 @@ class ray_tracing_base:
         self.__logger.error('function not defined')
         raise NotImplementedError
 
+    def use_exact_attenuation(self):
+        """
+        returns True if the attenuation should be integrated numerically along the ray path for every solution and
+        frequency (config option `propagation/exact_attenuation`, the default). Otherwise the ray tracers use
+        tabulated attenuation lengths and cache the attenuation of already calculated ray paths.
+        """
+        if self._config is None:
+            return True
+        return self._config['propagation'].get('exact_attenuation', True)
+
+    def get_cached_attenuation(self, key, calculate_attenuation):
+        """
+        returns the attenuation of a ray path from the cache or calculates and caches it
+
+        The cache holds the attenuation of the most recently used ray paths, e.g., of the different showers of an
+        event that share the same vertex.
+
+        Parameters
+        ----------
+        key: tuple
+            identifies the ray path and the frequencies, e.g. (C_0, z1, z2, attenuation model, frequency grid)
+        calculate_attenuation: function
+            function without arguments that calculates the attenuation if it is not in the cache
+
+        Returns
+        -------
+        attenuation: array of floats
+        """
+        if key in self._attenuation_cache:
+            self._attenuation_cache.move_to_end(key)
+            self._attenuation_cache_statistics['hits'] += 1
+            return np.copy(self._attenuation_cache[key])
+        self._attenuation_cache_statistics['misses'] += 1
+        attenuation = calculate_attenuation()
+        self._attenuation_cache[key] = np.copy(attenuation)
+        if len(self._attenuation_cache) > self._attenuation_cache_size:
+            self._attenuation_cache.popitem(last=False)
+        return attenuation
+
+    def get_attenuation_cache_statistics(self):
+        """
+        returns the number of hits and misses of the attenuation cache
+        """
+        return dict(self._attenuation_cache_statistics)
+
     def apply_propagation_effects(self, efield, i_solution):
         """
         Apply propagation effects to the electric field
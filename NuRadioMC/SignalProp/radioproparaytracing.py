@@ -887,6 +887,9 @@ class radiopropa_ray_tracing(ray_tracing_base):
         """
         calculates the signal attenuation due to attenuation in the medium (ice)
 
+        If the config option `propagation/exact_attenuation` is False, the attenuation is calculated with tabulated
+        attenuation lengths and cached (see `get_cached_attenuation`).
+
         Parameters
         ----------
         iS: int
@@ -914,24 +917,38 @@ class radiopropa_ray_tracing(ray_tracing_base):
             raise IndexError
 
         path = self.get_path(iS)
+        exact = self.use_exact_attenuation()
 
-        mask = frequency > 0
-        freqs = self.get_frequencies_for_attenuation(frequency, self._max_detector_frequency)
-        integral = np.zeros(len(freqs))
-        
-        def dt(depth, freqs):
-            ds = np.sqrt((path[:, 0][depth] - path[:, 0][depth+1])**2 + (path[:, 1][depth] - path[:, 1][depth+1])**2 + (path[:, 2][depth] - path[:, 2][depth+1])**2) # get step size
-            return ds / attenuation_util.get_attenuation_length(path[:, 2][depth], freqs, self._attenuation_model)
-        
-        for z_position in range(len(path[:, 2]) - 1):
-            integral += dt(z_position, freqs)
-        
-        att_func = interpolate.interp1d(freqs, integral)
-        tmp = att_func(frequency[mask])
-        attenuation = np.ones_like(frequency)
-        tmp = np.exp(-1 * tmp)
-        attenuation[mask] = tmp
-        return attenuation
+        def calculate_attenuation():
+            mask = frequency > 0
+            freqs = self.get_frequencies_for_attenuation(frequency, self._max_detector_frequency)
+            if exact:
+                integral = np.zeros(len(freqs))
+
+                def dt(depth, freqs):
+                    ds = np.sqrt((path[:, 0][depth] - path[:, 0][depth+1])**2 + (path[:, 1][depth] - path[:, 1][depth+1])**2 + (path[:, 2][depth] - path[:, 2][depth+1])**2) # get step size
+                    return ds / attenuation_util.get_attenuation_length(path[:, 2][depth], freqs, self._attenuation_model)
+
+                for z_position in range(len(path[:, 2]) - 1):
+                    integral += dt(z_position, freqs)
+            else:
+                # sum over all steps of the path at once with tabulated attenuation lengths
+                table = attenuation_util.get_attenuation_length_table(self._attenuation_model, tuple(freqs))
+                ds = np.linalg.norm(np.diff(path, axis=0), axis=1)
+                integral = np.dot(ds, table.get_inverse_attenuation_length(path[:-1, 2]))
+
+            att_func = interpolate.interp1d(freqs, integral)
+            tmp = att_func(frequency[mask])
+            attenuation = np.ones_like(frequency)
+            tmp = np.exp(-1 * tmp)
+            attenuation[mask] = tmp
+            return attenuation
+
+        if exact:
+            return calculate_attenuation()
+        key = ('radiopropa', self._attenuation_model, hash(path.tobytes()), hash(frequency.tobytes()),
+               self._max_detector_frequency)
+        return self.get_cached_attenuation(key, calculate_attenuation)
 
     def get_focusing(self, iS, dz=-1. * units.cm, limit=2.):
         """
@@ -1127,7 +1144,8 @@ class radiopropa_ray_tracing(ray_tracing_base):
                     iter_steps_channel = [25., 2., .5], #unit is meter
                     iter_steps_zenith = [.5, .05, .005], #unit is degree
                     auto_step_size = False,
-                    max_traj_length = 10000) #unit is meter
+                    max_traj_length = 10000), #unit is meter
+                exact_attenuation = True
             )
             config['speedup'] = dict(
                 delta_C_cut = 40 * units.degree
@@ -0,0 +1,463 @@
+from __future__ import absolute_import, division, print_function
+import numpy as np
+import itertools
+import hashlib
+import json
+import os
+import h5py
+
+from NuRadioReco.utilities import units
+from NuRadioMC.SignalProp.analyticraytracing import ray_tracing, ray_tracing_2D
+
+import logging
+logging.basicConfig()
+
+"""
+tabulated ray tracing: the analytic ray tracing solutions (without bottom reflections) are precomputed on a grid of
+horizontal distances, emitter depths and receiver depths and stored in a lookup table on disk. The table provides the
+start values of the root finding and the attenuation along the path.
+"""
+
+table_version = 1
+
+
+class ray_tracing_table:
+    """
+    lookup table of the ray tracing solutions without bottom reflections
+
+    The table covers a regular grid of horizontal distances d and depths (z1, z2) of the two end points in the 2D
+    coordinate system of the ray. For every grid point it stores the number of solutions, the C_0 parameters
+    and the attenuation exponents at a fixed set of frequencies. The table is
+    symmetric in (z1, z2). It is calculated once and stored in a hdf5 file whose name is a hash of the ice model
+    parameters, the attenuation model and the grid.
+    """
+
+    def __init__(self, r2d, distances, depths, frequencies, table_path=None):
+        """
+        Parameters
+        ----------
+        r2d: ray_tracing_2D
+            the 2D analytic ray tracer used to calculate the table
+        distances: array of floats
+            the grid of horizontal distances (ascending)
+        depths: array of floats
+            the grid of depths (ascending)
+        frequencies: array of floats
+            the frequencies at which the attenuation is tabulated (ascending)
+        table_path: string or None
+            the folder where the table is stored. If None, the folder 'tables' next to this file is used
+        """
+        self.__logger = logging.getLogger('ray_tracing_table')
+        self._r2d = r2d
+        self.distances = np.asarray(distances, dtype=float)
+        self.depths = np.asarray(depths, dtype=float)
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        if table_path is None:
+            table_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+        self._filename = os.path.join(table_path, "raytracing_table_{}.hdf5".format(self.get_hash()))
+        if os.path.exists(self._filename):
+            self.__logger.info(f"reading ray tracing table {self._filename}")
+            self._load()
+        else:
+            self.__logger.warning(f"ray tracing table {self._filename} does not exist, calculating table. "
+                                  "This needs to be done only once.")
+            self._calculate()
+            self._save()
+        self.inverse_C0 = 1. / self.C0
+
+    def get_hash(self):
+        """
+        returns the hash of all parameters that define the table
+        """
+        medium = self._r2d.medium
+        parameters = {'version': table_version,
+                      'n_ice': medium.n_ice,
+                      'z_0': medium.z_0,
+                      'delta_n': medium.delta_n,
+                      'attenuation_model': self._r2d.attenuation_model,
+                      'distances': self.distances.tolist(),
+                      'depths': self.depths.tolist(),
+                      'frequencies': self.frequencies.tolist()}
+        return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:16]
+
+    def get_filename(self):
+        return self._filename
+
+    def _calculate(self):
+        n_d, n_z = len(self.distances), len(self.depths)
+        self.n_solutions = np.zeros((n_d, n_z, n_z), dtype=np.int8)
+        self.C0 = np.full((n_d, n_z, n_z, 2), np.nan)
+        self.attenuation_exponent = np.full((n_d, n_z, n_z, 2, len(self.frequencies)), np.nan, dtype=np.float32)
+        iz1, iz2 = np.triu_indices(n_z)
+        for iD, distance in enumerate(self.distances):
+            self.__logger.info(f"calculating ray tracing table for distance {distance / units.m:.0f}m ({iD + 1}/{n_d})")
+            x1 = np.array([np.zeros(len(iz1)), self.depths[iz1]]).T
+            x2 = np.array([np.full(len(iz1), distance), self.depths[iz2]]).T
+            results = self._r2d.find_solutions_batch(x1, x2)
+            i_pair, i_solution, C0 = [], [], []
+            for iP, result in enumerate(results):
+                if len(result) > 2:
+                    self.__logger.warning(f"{len(result)} solutions found for d = {distance:.1f}, z1 = {x1[iP, 1]:.1f}, "
+                                          f"z2 = {x2[iP, 1]:.1f}, the table entry is marked as invalid")
+                    self.n_solutions[iD, iz1[iP], iz2[iP]] = -1
+                    self.n_solutions[iD, iz2[iP], iz1[iP]] = -1
+                    continue
+                self.n_solutions[iD, iz1[iP], iz2[iP]] = len(result)
+                self.n_solutions[iD, iz2[iP], iz1[iP]] = len(result)
+                for iS, solution in enumerate(result):
+                    i_pair.append(iP)
+                    i_solution.append(iS)
+                    C0.append(solution['C0'])
+            if len(i_pair) == 0:
+                continue
+            i_pair, i_solution, C0 = np.array(i_pair), np.array(i_solution), np.array(C0)
+            attenuation_exponent = self._r2d.get_attenuation_integral(x1[i_pair], x2[i_pair], C0, self.frequencies)
+            for iz_a, iz_b in [(iz1, iz2), (iz2, iz1)]:
+                self.C0[iD, iz_a[i_pair], iz_b[i_pair], i_solution] = C0
+                self.attenuation_exponent[iD, iz_a[i_pair], iz_b[i_pair], i_solution] = attenuation_exponent
+
+    def _save(self):
+        folder = os.path.dirname(self._filename)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        medium = self._r2d.medium
+        tmp_filename = self._filename + ".tmp{:d}".format(os.getpid())
+        with h5py.File(tmp_filename, 'w') as fout:
+            fout.attrs['version'] = table_version
+            fout.attrs['n_ice'] = medium.n_ice
+            fout.attrs['z_0'] = medium.z_0
+            fout.attrs['delta_n'] = medium.delta_n
+            fout.attrs['attenuation_model'] = self._r2d.attenuation_model
+            fout['distances'] = self.distances
+            fout['depths'] = self.depths
+            fout['frequencies'] = self.frequencies
+            fout.create_dataset('n_solutions', data=self.n_solutions, compression='gzip')
+            fout.create_dataset('C0', data=self.C0, compression='gzip')
+            fout.create_dataset('attenuation_exponent', data=self.attenuation_exponent, compression='gzip')
+        os.replace(tmp_filename, self._filename)
+        self.__logger.warning(f"ray tracing table saved to {self._filename}")
+
+    def _load(self):
+        with h5py.File(self._filename, 'r') as fin:
+            if fin.attrs['version'] != table_version:
+                msg = f"ray tracing table {self._filename} has version {fin.attrs['version']} but version {table_version} is required"
+                self.__logger.error(msg)
+                raise IOError(msg)
+            self.n_solutions = fin['n_solutions'][...]
+            self.C0 = fin['C0'][...]
+            self.attenuation_exponent = fin['attenuation_exponent'][...]
+
+    def get_cell(self, x1, x2):
+        """
+        determines the grid cells of many pairs of points
+
+        Parameters
+        ----------
+        x1: array of shape (n, 2)
+            (y, z) coordinates of the start points
+        x2: array of shape (n, 2)
+            (y, z) coordinates of the stop points
+
+        Returns
+        -------
+        index: array of shape (n, 3)
+            the lower grid indices of the cell in (d, z1, z2)
+        fraction: array of shape (n, 3)
+            the relative position within the cell
+        n_solutions: array of shape (n,)
+            the number of solutions of the cell. -1 if the points are outside of the table or if not all corners of
+            the cell have the same number of solutions
+        """
+        values = [x2[:, 0] - x1[:, 0], x1[:, 1], x2[:, 1]]
+        grids = [self.distances, self.depths, self.depths]
+        index = np.zeros((len(x1), 3), dtype=int)
+        fraction = np.zeros((len(x1), 3))
+        inside = np.ones(len(x1), dtype=bool)
+        for i in range(3):
+            inside &= (values[i] >= grids[i][0]) & (values[i] <= grids[i][-1])
+            index[:, i] = np.clip(np.searchsorted(grids[i], values[i], side='right') - 1, 0, len(grids[i]) - 2)
+            fraction[:, i] = (values[i] - grids[i][index[:, i]]) / (grids[i][index[:, i] + 1] - grids[i][index[:, i]])
+        n_solutions = self.n_solutions[index[:, 0], index[:, 1], index[:, 2]].astype(int)
+        for corner in itertools.product((0, 1), repeat=3):
+            n_corner = self.n_solutions[index[:, 0] + corner[0], index[:, 1] + corner[1], index[:, 2] + corner[2]]
+            n_solutions[n_corner != n_solutions] = -1
+        n_solutions[~inside] = -1
+        return index, fraction, n_solutions
+
+    def interpolate(self, values, index, fraction):
+        """
+        trilinear interpolation of a table (e.g. `inverse_C0` or `attenuation_exponent`) within the grid cells
+        determined by `get_cell`
+        """
+        result = 0
+        for corner in itertools.product((0, 1), repeat=3):
+            weight = np.prod(np.where(np.array(corner)[None, :] == 1, fraction, 1 - fraction), axis=1)
+            corner_values = values[index[:, 0] + corner[0], index[:, 1] + corner[1], index[:, 2] + corner[2]]
+            result = result + weight.reshape((-1,) + (1,) * (corner_values.ndim - 1)) * corner_values
+        return result
+
+
+class tabulated_ray_tracing_2D(ray_tracing_2D):
+    """
+    2D ray tracer that finds the solutions without bottom reflections using a lookup table
+
+    The tabulated C_0 values are interpolated to the requested points and refined with a vectorized secant
+    method, i.e., the solutions are exact and not limited by the table resolution. Points outside of the table,
+    cells at the boundary of regions with different number of solutions and failed refinements are passed to the
+    analytic root finding of `ray_tracing_2D`.
+    """
+
+    def __init__(self, medium, attenuation_model="SP1", log_level=logging.WARNING,
+                 n_frequencies_integration=25, use_optimized_start_values=False,
+                 distances=None, depths=None, frequencies=None, table_path=None):
+        """
+        Parameters
+        ----------
+        medium: medium class
+            class describing the index-of-refraction profile
+        attenuation_model: string
+            signal attenuation model
+        log_level: logging object
+            specify the log level of the ray tracing class
+        n_frequencies_integration: int
+            specify the number for frequencies that are used to calculate the attenuation for solutions that are
+            not covered by the table
+        use_optimized_start_values: bool
+            see `ray_tracing_2D`
+        distances, depths, frequencies: arrays of floats
+            the grid of the lookup table (see `ray_tracing_table`)
+        table_path: string or None
+            the folder where the lookup table is stored
+        """
+        super().__init__(medium, attenuation_model=attenuation_model, log_level=log_level,
+                         n_frequencies_integration=n_frequencies_integration,
+                         use_optimized_start_values=use_optimized_start_values)
+        self.__logger = logging.getLogger('ray_tracing_2D_tabulated')
+        self.__logger.setLevel(log_level)
+        r2d = ray_tracing_2D(medium, attenuation_model=attenuation_model, log_level=log_level,
+                             n_frequencies_integration=n_frequencies_integration,
+                             use_optimized_start_values=use_optimized_start_values)
+        self.table = ray_tracing_table(r2d, distances, depths, frequencies, table_path=table_path)
+        self.__n_tabulated = 0
+        self.__n_fallback = 0
+
+    def get_statistics(self):
+        """
+        returns the number of point pairs whose solutions were obtained from the table and from the
+        analytic root finding
+        """
+        return {'tabulated': self.__n_tabulated, 'fallback': self.__n_fallback}
+
+    def _get_delta_y(self, logC_0, x1, x2):
+        # vectorized version of `get_delta_y` without bottom reflections
+        y2, z2 = x2[:, 0], x2[:, 1]
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            C_0 = self.get_C0_from_log(logC_0)
+            gamma_turn, z_turn, y_turn, C_1 = self.get_turning_points(C_0, x1)
+            y2_fit = self.get_y(self.get_gamma(z2), C_0, C_1)
+            diff = np.where(y_turn > y2, y2 - y2_fit, -(y2 - (2 * y_turn - y2_fit)))
+            diff_unreachable = -(((z_turn - z2) ** 2 + (y_turn - y2) ** 2) ** 0.5 + 10 * np.abs(z_turn - z2))
+        return np.where(z_turn < z2, diff_unreachable, diff)
+
+    def _refine(self, logC_0, x1, x2, n_iterations=30, tol=1e-5 * units.m):
+        # vectorized secant method to find the root of delta_y starting from the interpolated log(C_0) values
+        l0 = logC_0
+        f0 = self._get_delta_y(l0, x1, x2)
+        l1 = logC_0 + 1e-4
+        f1 = self._get_delta_y(l1, x1, x2)
+        active = np.isfinite(f0) & np.isfinite(f1)
+        for i in range(n_iterations):
+            if not np.any(active):
+                break
+            denominator = f1[active] - f0[active]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                step = np.where(denominator == 0, 0, f1[active] * (l1[active] - l0[active]) / denominator)
+            l0[active], f0[active] = l1[active], f1[active]
+            l1[active] = l1[active] - step
+            f1[active] = self._get_delta_y(l1[active], x1[active], x2[active])
+            done = (np.abs(step) <= 1e-14 * np.maximum(1, np.abs(l1[active]))) | (f1[active] == 0) | ~np.isfinite(f1[active])
+            active[np.flatnonzero(active)[done]] = False
+        success = np.isfinite(l1) & (np.abs(f1) < tol)
+        return l1, success
+
+    def find_solutions(self, x1, x2, plot=False, reflection=0, reflection_case=1):
+        """
+        this function finds all ray tracing solutions, see `ray_tracing_2D.find_solutions`
+
+        Solutions without bottom reflections are obtained from the lookup table if possible.
+        """
+        if(reflection > 0 or plot):
+            return super().find_solutions(x1, x2, plot=plot, reflection=reflection, reflection_case=reflection_case)
+        return self.find_solutions_batch(np.array([x1], dtype=float), np.array([x2], dtype=float))[0]
+
+    def find_solutions_batch(self, x1, x2, reflection=0, reflection_case=1):
+        """
+        finds the ray tracing solutions for many pairs of start and stop points, see
+        `ray_tracing_2D.find_solutions_batch`
+
+        Solutions without bottom reflections are obtained from the lookup table if possible.
+        """
+        if(reflection > 0):
+            return super().find_solutions_batch(x1, x2, reflection=reflection, reflection_case=reflection_case)
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        index, fraction, n_solutions = self.table.get_cell(x1, x2)
+        # 1/C_0 = n(z) sin(theta) varies smoothly over the grid, also towards small distances
+        inverse_C0 = self.table.interpolate(self.table.inverse_C0, index, fraction)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            logC0_start = np.log(1. / inverse_C0 - 1. / self.medium.n_ice)
+        logC0 = np.full((len(x1), 2), np.nan)
+        for iS in range(2):
+            mask = n_solutions > iS
+            if np.any(mask):
+                logC0[mask, iS], success = self._refine(logC0_start[mask, iS], x1[mask], x2[mask])
+                n_solutions[np.flatnonzero(mask)[~success]] = -1
+        # the same solution must not be found twice
+        duplicate = (n_solutions == 2) & (np.abs(logC0[:, 0] - logC0[:, 1]) < 1e-3)
+        n_solutions[duplicate] = -1
+
+        results = [[] for i in range(len(x1))]
+        i_pair, i_solution = np.nonzero(np.arange(2)[None, :] < n_solutions[:, None])
+        if len(i_pair):
+            C0 = self.get_C0_from_log(logC0[i_pair, i_solution])
+            solution_type = self.get_solution_properties(x1[i_pair], x2[i_pair], C0)['solution_type']
+            for i in np.argsort(C0, kind='stable'):
+                results[i_pair[i]].append({'type': int(solution_type[i]),
+                                           'C0': C0[i],
+                                           'C1': self.get_C_1(x1[i_pair[i]], C0[i]),
+                                           'reflection': 0,
+                                           'reflection_case': 1})
+        fallback = np.flatnonzero(n_solutions < 0)
+        for i in fallback:
+            results[i] = super().find_solutions(x1[i], x2[i])
+        self.__n_tabulated += len(x1) - len(fallback)
+        self.__n_fallback += len(fallback)
+        self.__logger.debug(f"{len(x1) - len(fallback)} of {len(x1)} solutions obtained from the table")
+        return results
+
+    def get_attenuation_from_table(self, x1, x2, C_0, frequency):
+        """
+        interpolates the attenuation of a solution without bottom reflections from the lookup table
+
+        Parameters
+        ----------
+        x1: tuple
+            (y,z) coordinate of start point
+        x2: tuple
+            (y,z) coordinate of stop point
+        C_0: float
+            C_0 parameter of the solution
+        frequency: array of floats
+            the frequencies for which the attenuation is calculated
+
+        Returns
+        -------
+        attenuation: array of floats or None
+            the attenuation factor, None if the solution is not covered by the table
+        """
+        index, fraction, n_solutions = self.table.get_cell(np.array([x1], dtype=float), np.array([x2], dtype=float))
+        if(n_solutions[0] <= 0):
+            return None
+        inverse_C0 = self.table.interpolate(self.table.inverse_C0, index, fraction)[0, :n_solutions[0]]
+        # the tabulated solution that is closest to the requested one
+        iS = np.argmin(np.abs(inverse_C0 - 1. / C_0))
+        attenuation_exponent = self.table.interpolate(self.table.attenuation_exponent[:, :, :, iS], index, fraction)[0]
+        mask = frequency > 0
+        attenuation = np.ones_like(frequency)
+        attenuation[mask] = np.exp(-np.interp(frequency[mask], self.table.frequencies, attenuation_exponent))
+        return attenuation
+
+
+class tabulated_ray_tracing(ray_tracing):
+    """
+    ray tracer that serves the analytic ray tracing solutions from a precomputed lookup table
+
+    The lookup table is calculated once for every ice model, attenuation model and grid (see `ray_tracing_table`)
+    and stored on disk. Only ice models of the type 'IceModelSimple' are supported. Solutions with bottom
+    reflections are always calculated with the analytic ray tracer.
+    """
+
+    def __init__(self, medium, attenuation_model="SP1", log_level=logging.WARNING,
+                 n_frequencies_integration=100, n_reflections=0, config=None,
+                 detector=None):
+        """
+        class initilization
+
+        Parameters
+        ----------
+        medium: medium class
+            class describing the index-of-refraction profile
+        attenuation_model: string
+            signal attenuation model
+        log_level: logging object
+            specify the log level of the ray tracing class
+        n_frequencies_integration: int
+            the number of frequencies for which the frequency dependent attenuation
+            length is being calculated for solutions that are not covered by the table.
+        n_reflections: int (default 0)
+            in case of a medium with a reflective layer at the bottom, how many reflections should be considered
+        config: dict
+            a dictionary with the optional config settings. The grid of the lookup table is specified in
+            config['propagation']['tabulated'] (see `set_config` for the default settings)
+        detector: detector object
+        """
+        super().__init__(medium, attenuation_model=attenuation_model, log_level=log_level,
+                         n_frequencies_integration=n_frequencies_integration, n_reflections=n_reflections,
+                         config=config, detector=detector)
+        settings = self._config['propagation']['tabulated']
+        distance_step = settings['distance_step'] * units.m
+        depth_step = settings['depth_step'] * units.m
+        distances = np.arange(0, settings['max_distance'] * units.m + 0.5 * distance_step, distance_step)
+        depths = np.arange(0, settings['min_depth'] * units.m - 0.5 * depth_step, -depth_step)[::-1]
+        # the number of solutions changes at zero distance and at the surface (where the direct and reflected
+        # solutions coincide), so the first/last grid point is moved away from it
+        distances[0] = 1 * units.cm
+        depths[-1] = -1 * units.m
+        frequencies = np.linspace(settings['min_frequency'] * units.MHz, settings['max_frequency'] * units.MHz,
+                                  settings['n_frequencies'])
+        self._r2d = tabulated_ray_tracing_2D(self._medium, self._attenuation_model, log_level=log_level,
+                                             n_frequencies_integration=self._n_frequencies_integration,
+                                             distances=distances, depths=depths, frequencies=frequencies,
+                                             table_path=settings['table_path'])
+
+    def get_attenuation(self, iS, frequency, max_detector_freq=None):
+        """
+        calculates the signal attenuation due to attenuation in the medium (ice)
+
+        The attenuation of solutions without bottom reflections is interpolated from the lookup table if the
+        config option `propagation/exact_attenuation` is False, see `ray_tracing.get_attenuation` for the parameters.
+        """
+        n = self.get_number_of_solutions()
+        if(iS < n and self._results[iS]['reflection'] == 0 and not self.use_exact_attenuation()):
+            attenuation = self._r2d.get_attenuation_from_table(self._x1, self._x2, self._results[iS]['C0'], frequency)
+            if attenuation is not None:
+                return attenuation
+        return super().get_attenuation(iS, frequency, max_detector_freq)
+
+    def set_config(self, config):
+        """
+        Change the configuration file used by the raytracer
+
+        Parameters
+        ----------
+        config: dict or None
+            The new configuration settings
+            If None, the default config settings will be applied. The grid of the lookup table is only set
+            at initialization.
+        """
+        if(config is None):
+            config = {'propagation': {}}
+            config['propagation']['attenuate_ice'] = True
+            config['propagation']['focusing_limit'] = 2
+            config['propagation']['focusing'] = False
+            config['propagation']['exact_attenuation'] = True
+            config['propagation']['tabulated'] = dict(
+                table_path=None,
+                max_distance=5000,  # unit is meter
+                distance_step=100,  # unit is meter
+                min_depth=-3000,  # unit is meter
+                depth_step=50,  # unit is meter
+                n_frequencies=32,
+                min_frequency=10,  # unit is MHz
+                max_frequency=2500)  # unit is MHz
+        super().set_config(config)
@@ -0,0 +1,127 @@
+import numpy as np
+from NuRadioMC.SignalGen import askaryan
+from NuRadioMC.SignalGen import parametrizations as par
+import logging
+logger = logging.getLogger("NuRadioMC.askaryan_cache")
+
+# the signal models whose spectrum depends on the distance R only through a global 1/R scaling
+_inverse_distance_models = set(par.get_parametrizations()) | {'spherical'}
+
+# the signal models with random shower realizations and the keyword argument that specifies the realization
+_realization_arguments = {'Alvarez2009': 'k_L', 'ARZ2019': 'iN', 'ARZ2020': 'iN'}
+
+
+class askaryanSpectrumCache:
+    """
+    caches the Askaryan frequency spectra of the showers of an event group
+
+    The spectrum of a shower is calculated separately for every channel and ray tracing solution although
+    neighbouring channels see almost the same viewing angle. The spectra are cached with the key
+    (shower index, signal model, shower energy, shower type, index of refraction, viewing angle, shower realization)
+    and the sampling of the trace.
+    The viewing angle can be quantized to a configurable step size, the spectrum is then calculated for the center
+    of the viewing angle bin. For signal models whose amplitude scales as 1/R, the cached spectrum is rescaled to the
+    requested distance, for all other models the distance is part of the key.
+
+    A spectrum of a model with random shower realizations (ARZ2019, ARZ2020 and Alvarez2009) is only taken from the
+    cache if the shower realization is specified, i.e., drawing a new realization always calculates the spectrum.
+    """
+
+    def __init__(self, viewing_angle_step=0):
+        """
+        Parameters
+        ----------
+        viewing_angle_step: float (default 0)
+            the step size of the viewing angle quantization. If 0, the viewing angle is not quantized, i.e., a spectrum
+            is only reused for exactly the same viewing angle.
+        """
+        self._viewing_angle_step = viewing_angle_step
+        self._spectra = {}
+        self._precalculated = set()
+        self._statistics = {'hits': 0, 'misses': 0}
+
+    def clear(self):
+        """
+        removes all cached spectra (the statistics is kept)
+        """
+        self._spectra = {}
+        self._precalculated = set()
+
+    def get_statistics(self):
+        """
+        returns the number of cache hits and misses
+        """
+        return dict(self._statistics)
+
+    def __get_key(self, shower_index, energy, theta, N, dt, shower_type, n_index, R, model, kwargs):
+        key = (shower_index, model, energy, shower_type, n_index, theta, N, dt, tuple(sorted(kwargs.items())))
+        if model not in _inverse_distance_models:
+            key += (R,)
+        return key
+
+    def get_frequency_spectrum(self, shower_index, energy, theta, N, dt, shower_type, n_index, R, model, **kwargs):
+        """
+        returns the frequency spectrum of a shower and the additional output of the signal model
+
+        The arguments are the same as for `askaryan.get_frequency_spectrum` (called with `full_output=True`) plus
+        the index of the shower in the event group.
+        """
+        if self._viewing_angle_step > 0:
+            theta = np.round(theta / self._viewing_angle_step) * self._viewing_angle_step
+        realization_argument = _realization_arguments.get(model)
+        if realization_argument is not None and realization_argument not in kwargs:
+            # a new shower realization is drawn, the spectrum is calculated and cached for this realization
+            key = None
+        else:
+            key = self.__get_key(shower_index, energy, theta, N, dt, shower_type, n_index, R, model, kwargs)
+            if key in self._spectra:
+                spectrum, additional_output, R_cache = self._spectra[key]
+                if key in self._precalculated:
+                    # the first request of a spectrum that was calculated with `add_frequency_spectra`
+                    self._precalculated.remove(key)
+                else:
+                    self._statistics['hits'] += 1
+                return spectrum * (R_cache / R), dict(additional_output)
+
+        self._statistics['misses'] += 1
+        spectrum, additional_output = askaryan.get_frequency_spectrum(energy, theta, N, dt, shower_type, n_index, R, model,
+                                                                      full_output=True, **kwargs)
+        if key is None:
+            kwargs = dict(kwargs)
+            kwargs[realization_argument] = additional_output[realization_argument]
+            key = self.__get_key(shower_index, energy, theta, N, dt, shower_type, n_index, R, model, kwargs)
+        self._spectra[key] = (spectrum, dict(additional_output), R)
+        return spectrum.copy(), additional_output
+
+    def add_frequency_spectra(self, shower_index, energy, thetas, N, dt, shower_type, n_index, Rs, model, **kwargs):
+        """
+        calculates the spectra of one shower for many observers at once (see `askaryan.get_frequency_spectra`) and
+        adds them to the cache, such that the following requests of `get_frequency_spectrum` for these observers are
+        served from the cache. For models with random shower realizations, all observers need to see the same
+        realization, i.e., the realization is either specified or the model draws one realization per call (ARZ).
+
+        Returns the additional output of the signal model, e.g. the drawn shower realization.
+        """
+        thetas, Rs = np.broadcast_arrays(np.atleast_1d(thetas), np.atleast_1d(Rs))
+        if self._viewing_angle_step > 0:
+            thetas = np.round(thetas / self._viewing_angle_step) * self._viewing_angle_step
+        spectra, additional_output = askaryan.get_frequency_spectra(energy, thetas, N, dt, shower_type, n_index, Rs, model,
+                                                                    full_output=True, **kwargs)
+        if not isinstance(additional_output, dict):
+            # the spectra were calculated individually
+            additional_output = additional_output[0] if len(additional_output) else {}
+        realization_argument = _realization_arguments.get(model)
+        if realization_argument is not None and realization_argument not in kwargs:
+            if np.ndim(additional_output[realization_argument]) != 0:
+                msg = f"the {model} model draws a different shower realization for each observer, the shower realization needs to be specified"
+                logger.error(msg)
+                raise ValueError(msg)
+            kwargs = dict(kwargs)
+            kwargs[realization_argument] = additional_output[realization_argument]
+        self._statistics['misses'] += len(thetas)
+        for theta, R, spectrum in zip(thetas, Rs, spectra):
+            key = self.__get_key(shower_index, energy, theta, N, dt, shower_type, n_index, R, model, kwargs)
+            if key not in self._spectra:
+                self._spectra[key] = (spectrum, dict(additional_output), R)
+                self._precalculated.add(key)
+        return additional_output
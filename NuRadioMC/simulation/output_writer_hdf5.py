@@ -0,0 +1,211 @@
+import numpy as np
+import h5py
+import os
+import logging
+logger = logging.getLogger("NuRadioMC.output_writer_hdf5")
+
+
+class outputWriterHDF5:
+    """
+    writes the per station output of the simulation into the hdf5 output file while the simulation is running
+
+    The data of every station group is appended to resizable, chunked datasets while the simulation is running,
+    so that the output does not need to be kept in memory until the end of the simulation. The appended arrays are
+    buffered and written in blocks of `buffer_size` rows, i.e., the datasets are resized only once per block and
+    not for every event group. The datasets are chunked along the first (event) axis only, with `buffer_size` rows
+    per chunk. The data is written into the temporary file `<filename>.tmp`, which is repacked into `filename` with
+    contiguous datasets of their final size when the writer is closed, i.e., the output file has the same layout as
+    if all data was written at once, and an incomplete output file never appears under the final filename.
+    """
+
+    def __init__(self, filename, station_ids, checkpoint=None, buffer_size=1000):
+        """
+        Parameters
+        ----------
+        filename: string
+            the hdf5 output filename
+        station_ids: list of ints
+            the station ids, a (possibly empty) group is created for every station
+        checkpoint: dict or None
+            if a checkpoint (see `get_checkpoint`) is given, the temporary file of a previous (interrupted) run is
+            opened and all data written after the checkpoint was taken is discarded
+        buffer_size: int
+            the number of rows of a dataset that are buffered before the data of the group is written to the file
+        """
+        self._filename = filename
+        self._tmp_filename = filename + ".tmp"
+        self._buffer_size = buffer_size
+        # the arrays that are not written yet and their number of rows per group and dataset
+        self._buffers = {}
+        self._buffered_rows = {}
+        folder = os.path.dirname(filename)
+        if not os.path.exists(folder) and folder != '':
+            logger.warning(f"output folder {folder} does not exist, creating folder...")
+            os.makedirs(folder)
+        if checkpoint is None:
+            self._fout = h5py.File(self._tmp_filename, 'w')
+        else:
+            self._fout = h5py.File(self._tmp_filename, 'r+')
+            self.__restore_checkpoint(checkpoint)
+        for station_id in station_ids:
+            if self.__get_group_name(station_id) not in self._fout:
+                self._fout.create_group(self.__get_group_name(station_id))
+
+    def __get_group_name(self, station_id):
+        return "station_{:d}".format(station_id)
+
+    def __restore_checkpoint(self, checkpoint):
+        for group_name, group in self._fout.items():
+            for key in list(group.keys()):
+                if key not in checkpoint.get(group_name, {}):
+                    del group[key]
+                else:
+                    group[key].resize(checkpoint[group_name][key])
+
+    def append(self, station_id, data):
+        """
+        appends data to the datasets of a station group
+
+        Parameters
+        ----------
+        station_id: int
+            the station id
+        data: dict
+            the arrays that are appended to the dataset with the same name (the arrays are copied). The first
+            dimension is the one that is extended. If the other dimensions of an array are larger than the ones of
+            the existing dataset (e.g. because a new trigger was added), the dataset is enlarged and the missing
+            entries are filled with NaN (floats) or zeros/False (other types).
+        """
+        self.append_to_group(self.__get_group_name(station_id), data)
+
+    def append_to_group(self, group_name, data):
+        """
+        appends data to the datasets of a group, the group is created if it does not exist yet (see `append`)
+
+        Parameters
+        ----------
+        group_name: string
+            the name of the group
+        data: dict
+            the arrays that are appended to the dataset with the same name
+        """
+        if group_name not in self._fout:
+            self._fout.create_group(group_name)
+        buffers = self._buffers.setdefault(group_name, {})
+        buffered_rows = self._buffered_rows.setdefault(group_name, {})
+        for key, value in data.items():
+            value = np.array(value)
+            buffers.setdefault(key, []).append(value)
+            buffered_rows[key] = buffered_rows.get(key, 0) + value.shape[0]
+        if max(buffered_rows.values(), default=0) >= self._buffer_size:
+            self.__write_group(group_name)
+
+    def __write_group(self, group_name):
+        """
+        writes the buffered arrays of a group to the file
+        """
+        group = self._fout[group_name]
+        self._buffered_rows.pop(group_name, None)
+        for key, values in self._buffers.pop(group_name, {}).items():
+            # combine the buffered arrays into one block, the arrays are padded to the largest shape like the dataset
+            block_shape = tuple(max(n) for n in zip(*[value.shape[1:] for value in values]))
+            if len(values) == 1 and values[0].shape[1:] == block_shape:
+                value = values[0]
+            else:
+                value = np.zeros((sum(value.shape[0] for value in values),) + block_shape, dtype=np.result_type(*values))
+                if value.dtype.kind == 'f':
+                    value[:] = np.nan
+                n = 0
+                for tmp in values:
+                    value[(slice(n, n + tmp.shape[0]),) + tuple(slice(0, x) for x in tmp.shape[1:])] = tmp
+                    n += tmp.shape[0]
+            if key not in group:
+                fillvalue = np.nan if value.dtype.kind == 'f' else None
+                # the chunks span the full trailing dimensions, such that the rows of an event are stored together
+                chunks = (self._buffer_size,) + tuple(max(1, x) for x in value.shape[1:])
+                group.create_dataset(key, shape=(0,) + value.shape[1:], maxshape=(None,) * value.ndim,
+                                     dtype=value.dtype, chunks=chunks, fillvalue=fillvalue)
+            dataset = group[key]
+            n = dataset.shape[0]
+            shape = (n + value.shape[0],) + tuple(np.maximum(dataset.shape[1:], value.shape[1:]))
+            dataset.resize(shape)
+            if value.shape[0] > 0:
+                dataset[(slice(n, n + value.shape[0]),) + tuple(slice(0, x) for x in value.shape[1:])] = value
+
+    def flush(self):
+        """
+        writes all buffered data to the file
+        """
+        for group_name in list(self._buffers.keys()):
+            self.__write_group(group_name)
+        self._fout.flush()
+
+    def get_checkpoint(self):
+        """
+        flushes the output file and returns the shapes of all datasets, which allows to continue writing after a
+        restart (see `__init__`)
+        """
+        self.flush()
+        checkpoint = {}
+        for group_name, group in self._fout.items():
+            if isinstance(group, h5py.Group):
+                checkpoint[group_name] = {key: dataset.shape for key, dataset in group.items()}
+        return checkpoint
+
+    def get_file(self):
+        """
+        returns the h5py file object, e.g. to add the datasets and attributes that are only known at the end of
+        the simulation. The buffered data is written to the file first.
+        """
+        self.flush()
+        return self._fout
+
+    def close(self, repack=True):
+        """
+        closes the output file and moves it to its final location
+
+        Parameters
+        ----------
+        repack: bool (default True)
+            if True, the datasets are copied into contiguous datasets of their final size, otherwise the file keeps
+            the resizable, chunked datasets (and the unused rows of their last chunks)
+        """
+        self.flush()
+        if repack:
+            repack_filename = self._tmp_filename + ".repack"
+            with h5py.File(repack_filename, 'w') as fout:
+                self.__copy_group(self._fout, fout)
+            self._fout.close()
+            os.replace(repack_filename, self._filename)
+            os.remove(self._tmp_filename)
+        else:
+            self._fout.close()
+            os.replace(self._tmp_filename, self._filename)
+
+    def __copy_group(self, source, destination):
+        """
+        copies the attributes, groups and datasets of a group, the datasets are copied in blocks of `buffer_size`
+        rows into contiguous datasets
+        """
+        for key, value in source.attrs.items():
+            destination.attrs[key] = value
+        for key, value in source.items():
+            if isinstance(value, h5py.Group):
+                self.__copy_group(value, destination.create_group(key))
+            elif value.chunks is None:
+                source.copy(value, destination, name=key)
+            else:
+                dataset = destination.create_dataset(key, shape=value.shape, dtype=value.dtype)
+                for i in range(0, value.shape[0], self._buffer_size):
+                    dataset[i:i + self._buffer_size] = value[i:i + self._buffer_size]
+                for attr_key, attr_value in value.attrs.items():
+                    dataset.attrs[attr_key] = attr_value
+
+    def discard(self):
+        """
+        closes and removes the temporary file without moving it to the final location
+        """
+        self._buffers = {}
+        self._buffered_rows = {}
+        self._fout.close()
+        os.remove(self._tmp_filename)
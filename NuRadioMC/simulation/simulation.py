@@ -9,6 +9,8 @@ from NuRadioMC.utilities import medium
 from NuRadioReco.utilities import fft
 from NuRadioMC.utilities.earth_attenuation import get_weight
 from NuRadioMC.SignalProp import propagation
+from NuRadioMC.simulation.output_writer_hdf5 import outputWriterHDF5
+from NuRadioMC.simulation.askaryan_cache import askaryanSpectrumCache
 import h5py
 import time
 import six
@@ -30,6 +32,8 @@ import NuRadioReco.framework.sim_station
 import NuRadioReco.framework.electric_field
 import NuRadioReco.framework.particle
 import NuRadioReco.framework.event
+import NuRadioReco.framework.station
+import NuRadioReco.framework.channel
 from NuRadioReco.detector import antennapattern
 from NuRadioReco.utilities import geometryUtilities as geo_utl
 from NuRadioReco.framework.parameters import channelParameters as chp
@@ -44,7 +48,9 @@ import logging
 from six import iteritems
 import yaml
 import os
+import glob
 import collections
+import pickle
 from NuRadioMC.utilities.Veff import remove_duplicate_triggers
 
 STATUS = 31
@@ -84,6 +90,15 @@ def pretty_time_delta(seconds):
         return '%ds' % (seconds,)
 
 
+# the simulation instance of a sharded run. It is set before the worker processes are forked, so that the workers
+# inherit the fully initialized simulation (including user defined detector simulation methods)
+_sharded_simulation = None
+
+
+def _run_shard(shard):
+    return _sharded_simulation._run_shard(*shard)
+
+
 def merge_config(user, default):
     if isinstance(user, dict) and isinstance(default, dict):
         for k, v in iteritems(default):
@@ -111,6 +126,7 @@ class simulation:
                  event_list=None,
                  log_level_propagation=logging.WARNING,
                  ice_model=None,
+                 n_workers=None,
                  **kwargs):
         """
         initialize the NuRadioMC end-to-end simulation
@@ -155,6 +171,13 @@ class simulation:
             the log level of the propagation module
         ice_model: medium object (default None)
             allows to specify a custom ice model. This model is used if the config file specifies the ice model as "custom".
+        n_workers: int or None (default None)
+            if set, the event groups are distributed over `n_workers` processes and the results are merged into the
+            same output files as a serial run. In this mode, the random seeds are derived per event group, so that
+            the result does not depend on the number of workers (`n_workers=1` gives the same result as any other
+            number). The random numbers (noise, shower realizations of the ARZ model) differ from a run with
+            `n_workers=None` though, i.e., the result depends on whether the sharded mode is used.
+            Requires the 'fork' start method of multiprocessing (i.e. Linux or macOS).
         """
         logger.setLevel(log_level)
         if 'write_mode' in kwargs.keys():
@@ -194,6 +217,15 @@ class simulation:
         self.__write_detector = write_detector
         logger.status("setting event time to {}".format(evt_time))
         self._event_group_list = event_list
+        self._n_workers = n_workers
+        self._shard = None  # the event groups and the output of a worker process of a sharded run
+        self._output_writer = None
+        self._checkpoint_interval = self._cfg['output']['checkpoint_interval']
+        self._checkpoint_writer = None
+        self._checkpoint_shower_indices = []
+        # the random seeds are derived per event group if the result must not depend on which event groups are
+        # simulated in the same process
+        self._seed_per_event_group = self._n_workers is not None
 
         self._antenna_pattern_provider = antennapattern.AntennaPatternProvider()
 
@@ -252,6 +284,7 @@ class simulation:
             self._fin = inputfilename[0]
             self._fin_attrs = inputfilename[1]
             self._fin_stations = {}
+            self._build_event_group_index()
         # store all relevant attributes of the input file in a dictionary
         self._generator_info = {}
         for enum_entry in genattrs:
@@ -306,7 +339,7 @@ class simulation:
             self._amplification_per_channel[self._station_id] = {}
             for channel_id in range(self._det.get_number_of_channels(self._station_id)):
                 ff = np.linspace(0, 0.5 / self._dt, 10000)
-                filt = np.ones_like(ff, dtype=np.complex)
+                filt = np.ones_like(ff, dtype=complex)
                 for i, (name, instance, kwargs) in enumerate(self._evt.iter_modules(self._station_id)):
                     if hasattr(instance, "get_filter"):
                         filt *= instance.get_filter(ff, self._station_id, channel_id, self._det, **kwargs)
@@ -383,6 +416,8 @@ class simulation:
             self._write_output_file(empty=True)
             logger.status(f"terminating simulation")
             return 0
+        if self._n_workers is not None and self._shard is None:
+            return self._run_sharded()
         logger.status(f"Starting NuRadioMC simulation")
         t_start = time.time()
         t_last_update = t_start
@@ -398,11 +433,12 @@ class simulation:
         channelResampler = NuRadioReco.modules.channelResampler.channelResampler()
         electricFieldResampler = NuRadioReco.modules.electricFieldResampler.electricFieldResampler()
         if self._outputfilenameNuRadioReco is not None:
-            self._eventWriter.begin(self._outputfilenameNuRadioReco, log_level=self._log_level)
-        unique_event_group_ids = np.unique(self._fin['event_group_ids'])
+            # a worker process of a sharded run only uses the event writer to serialize the events (see `_run_shard`)
+            self._eventWriter.begin(self._outputfilenameNuRadioReco, log_level=self._log_level,
+                                    async_write=self._cfg['output']['nur_async_write'] and self._shard is None)
+        unique_event_group_ids = self._unique_event_group_ids
         self._n_showers = len(self._fin['event_group_ids'])
         self._shower_ids = np.array(self._fin['shower_ids'])
-        self._shower_index_array = {}  # this array allows to convert the shower id to an index that starts from 0 to be used to access the arrays in the hdf5 file.
 
         self._raytracer = self._prop(
             self._ice, self._cfg['propagation']['attenuation_model'],
@@ -412,17 +448,39 @@ class simulation:
             config=self._cfg,
             detector=self._det
         )
-        for shower_index, shower_id in enumerate(self._shower_ids):
-            self._shower_index_array[shower_id] = shower_index
-
         self._create_meta_output_datastructures()
 
+        # resume from the checkpoint of an interrupted run
+        use_checkpoints = self._checkpoint_interval is not None and self._shard is None
+        last_event_group_id = None
+        checkpoint = None
+        if use_checkpoints:
+            checkpoint = self._read_checkpoint('serial')
+            self._open_checkpoint_output(checkpoint)
+            if checkpoint is not None:
+                last_event_group_id = checkpoint['last_event_group_id']
+                self._mout_attrs = checkpoint['state']['mout_attrs']
+                # continue the random sequences where the interrupted run stopped, so that the result is the same
+                # as the one of an uninterrupted run
+                channelGenericNoiseAdder.set_random_state(checkpoint['state']['random_states']['noise'])
+                askaryan.set_random_state(self._cfg['signal']['model'], checkpoint['state']['random_states']['signal'])
+                if self._outputfilenameNuRadioReco is not None:
+                    self._eventWriter.resume(checkpoint['event_writer'])
+        if self._shard is None:
+            # the station output is written to the hdf5 file while the simulation is running
+            self._output_writer = outputWriterHDF5(self._outputfilename, self._station_ids,
+                                                   checkpoint['output_writer'] if checkpoint is not None else None)
+        t_last_checkpoint = time.time()
+
         # check if the same detector was simulated before (then we can save the ray tracing part)
         pre_simulated = self._check_if_was_pre_simulated()
 
         # Check if vertex_times exists:
         self._check_vertex_times()
 
+        # the Askaryan spectra of the showers of an event group are reused for other channels and ray tracing solutions
+        spectrum_cache = askaryanSpectrumCache(self._cfg['speedup']['spectrum_cache_viewing_angle_step'])
+
         input_time = 0.0
         askaryan_time = 0.0
         rayTracingTime = 0.0
@@ -436,19 +494,53 @@ class simulation:
 
         # calculate bary centers of station
         self._station_barycenter = np.zeros((len(self._station_ids), 3))
+        self._channel_positions = {}
         for iSt, station_id in enumerate(self._station_ids):
             pos = []
             for channel_id in range(self._det.get_number_of_channels(station_id)):
                 pos.append(self._det.get_relative_position(station_id, channel_id))
             self._station_barycenter[iSt] = np.mean(np.array(pos), axis=0) + self._det.get_absolute_position(station_id)
+            self._channel_positions[station_id] = np.array(pos) + self._det.get_absolute_position(station_id)
+
+        # the indices of the event groups that are simulated, a worker process of a sharded run only simulates the
+        # event groups of its shard
+        if self._shard is not None:
+            event_group_indices = self._shard['event_group_indices']
+        else:
+            event_group_indices = np.arange(len(unique_event_group_ids))
+            if self._event_group_list is not None:
+                event_group_indices = event_group_indices[np.isin(unique_event_group_ids, list(self._event_group_list))]
+        if last_event_group_id is not None:
+            event_group_indices = event_group_indices[unique_event_group_ids[event_group_indices] > last_event_group_id]
+
+        t1 = time.time()
+        primary_weights = self._get_primary_weights(event_group_indices)
+        weightTime += time.time() - t1
 
         # loop over event groups
-        for i_event_group_id, event_group_id in enumerate(unique_event_group_ids):
+        for iG, i_event_group_id in enumerate(event_group_indices):
+            event_group_id = unique_event_group_ids[i_event_group_id]
+            if use_checkpoints and iG > 0 and (time.time() - t_last_checkpoint) > self._checkpoint_interval:
+                event_writer = self._eventWriter if self._outputfilenameNuRadioReco is not None else None
+                random_states = {'noise': channelGenericNoiseAdder.get_random_state(),
+                                 'signal': askaryan.get_random_state(self._cfg['signal']['model'])}
+                self._write_checkpoint('serial', unique_event_group_ids[event_group_indices[iG - 1]],
+                                       {'mout_attrs': self._mout_attrs, 'random_states': random_states}, event_writer)
+                t_last_checkpoint = time.time()
             logger.debug(f"simulating event group id {event_group_id}")
-            if self._event_group_list is not None and event_group_id not in self._event_group_list:
-                logger.debug(f"skipping event group {event_group_id} because it is not in the event group list provided to the __init__ function")
-                continue
-            event_indices = np.atleast_1d(np.squeeze(np.argwhere(self._fin['event_group_ids'] == event_group_id)))
+            event_group_slice = slice(self._event_group_offsets[i_event_group_id], self._event_group_offsets[i_event_group_id + 1])
+            event_indices = self._event_group_shower_indices[event_group_slice]
+            spectrum_cache.clear()
+            if use_checkpoints:
+                # the per shower output of these showers is saved with the next checkpoint
+                self._checkpoint_shower_indices.append(event_indices)
+
+            if self._seed_per_event_group:
+                # derive the random seeds from the event group id, so that the result of a sharded run does not
+                # depend on how the event groups are distributed over the workers
+                event_group_seed = self._get_event_group_seed(event_group_id)
+                channelGenericNoiseAdder.begin(seed=event_group_seed)
+                askaryan.set_seed(self._cfg['signal']['model'], event_group_seed)
 
             # the weight calculation is independent of the station, so we do this calculation only once
             # the weight also depends just on the "mother" particle, i.e. the incident neutrino which determines
@@ -472,13 +564,7 @@ class simulation:
                 elif self._cfg['weights']['weight_mode'] is None:
                     self.primary[simp.weight] = 1.
                 else:
-                    self.primary[simp.weight] = get_weight(self.primary[simp.zenith],
-                                                           self.primary[simp.energy],
-                                                           self.primary[simp.flavor],
-                                                           mode=self._cfg['weights']['weight_mode'],
-                                                           cross_section_type=self._cfg['weights']['cross_section_type'],
-                                                           vertex_position=self.primary[simp.vertex],
-                                                           phi_nu=self.primary[simp.azimuth])
+                    self.primary[simp.weight] = primary_weights[iG]
                 # all entries for the event for this primary get the calculated primary's weight
                 self._mout['weights'][event_indices] = self.primary[simp.weight]
 
@@ -493,10 +579,8 @@ class simulation:
             # the shower energies of closeby showers will be added as they can constructively interfere
             if self._cfg['speedup']['distance_cut']:
                 t_tmp = time.time()
-                shower_energies = np.array(self._fin['shower_energies'])[event_indices]
-                vertex_positions = np.array([np.array(self._fin['xx'])[event_indices],
-                                             np.array(self._fin['yy'])[event_indices],
-                                             np.array(self._fin['zz'])[event_indices]]).T
+                shower_energies = self._event_group_shower_energies[event_group_slice]
+                vertex_positions = self._event_group_vertices[event_group_slice]
                 vertex_distances = np.linalg.norm(vertex_positions - vertex_positions[0], axis=1)
                 distance_cut_time += time.time() - t_tmp
 
@@ -627,6 +711,39 @@ class simulation:
                     t2 = time.time()
 #                     input_time += (time.time() - t1)
 
+                    # if the ray tracer supports it, all channels of the station are traced at once
+                    ray_tracing_batch = None
+                    if hasattr(self._raytracer, 'find_solutions_batch') and not \
+                            (pre_simulated and ray_tracing_performed and not self._cfg['speedup']['redo_raytracing']):
+                        channel_positions = self._channel_positions[self._station_id]
+                        if self._cfg['speedup']['distance_cut']:
+                            channel_mask = np.linalg.norm(x1 - channel_positions, axis=1) <= self._get_distance_cut(shower_energy_sum)
+                        else:
+                            channel_mask = np.ones(len(channel_positions), dtype=bool)
+                        ray_tracing_batch_index = np.cumsum(channel_mask) - 1
+                        ray_tracing_batch = self._raytracer.find_solutions_batch(np.tile(x1, (np.sum(channel_mask), 1)),
+                                                                                 channel_positions[channel_mask])
+
+                        # for the ARZ models, the Askaryan pulses of all channels and ray tracing solutions of the
+                        # station are calculated at once from the same charge-excess profile
+                        if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"] and \
+                                ("simulation_mode" not in self._fin_attrs or self._fin_attrs['simulation_mode'] == "neutrino"):
+                            t_ask = time.time()
+                            i_batch, i_solution = np.nonzero(np.arange(ray_tracing_batch['launch_vectors'].shape[1]) <
+                                                             ray_tracing_batch['n_solutions'][:, None])
+                            viewing_angles = np.array([hp.get_angle(self._shower_axis, launch_vector)
+                                                       for launch_vector in ray_tracing_batch['launch_vectors'][i_batch, i_solution]])
+                            mask = np.abs(viewing_angles - cherenkov_angle) <= self._cfg['speedup']['delta_C_cut']
+                            if np.any(mask):
+                                additional_output = spectrum_cache.add_frequency_spectra(self._shower_index,
+                                                self._fin['shower_energies'][self._shower_index], viewing_angles[mask],
+                                                self._n_samples, self._dt, self._fin['shower_type'][self._shower_index], n_index,
+                                                ray_tracing_batch['travel_distances'][i_batch, i_solution][mask],
+                                                self._cfg['signal']['model'], seed=self._cfg['seed'],
+                                                **self._get_shower_realization_kwargs())
+                                self._save_shower_realization(additional_output)
+                            askaryan_time += (time.time() - t_ask)
+
                     for channel_id in range(self._det.get_number_of_channels(self._station_id)):
                         x2 = self._det.get_relative_position(self._station_id, channel_id) + self._det.get_absolute_position(self._station_id)
                         logger.debug(f"simulating channel {channel_id} at {x2}")
@@ -656,6 +773,9 @@ class simulation:
                             for output_parameter in self._raytracer.get_output_parameters():
                                 ray_tracing_solution[output_parameter['name']] = sg_pre[output_parameter['name']][self._shower_index, channel_id]
                             self._raytracer.set_solution(ray_tracing_solution)
+                        elif ray_tracing_batch is not None:
+                            i_batch = ray_tracing_batch_index[channel_id]
+                            self._raytracer.set_solution({key: value[i_batch] for key, value in iteritems(ray_tracing_batch)})
                         else:
                             self._raytracer.find_solutions()
 
@@ -669,7 +789,10 @@ class simulation:
                         for iS in range(self._raytracer.get_number_of_solutions()):
                             for key, value in self._raytracer.get_raytracing_output(iS).items():
                                 sg[key][iSh, channel_id, iS] = value
-                            self._launch_vector = self._raytracer.get_launch_vector(iS)
+                            if ray_tracing_batch is not None:
+                                self._launch_vector = ray_tracing_batch['launch_vectors'][i_batch, iS]
+                            else:
+                                self._launch_vector = self._raytracer.get_launch_vector(iS)
                             sg['launch_vectors'][iSh, channel_id, iS] = self._launch_vector
                             # calculates angle between shower axis and launch vector
                             viewing_angle = hp.get_angle(self._shower_axis, self._launch_vector)
@@ -695,6 +818,11 @@ class simulation:
                                 sg_pre = self._fin_stations["station_{:d}".format(self._station_id)]
                                 R = sg_pre['travel_distances'][self._shower_index, channel_id, iS]
                                 T = sg_pre['travel_times'][self._shower_index, channel_id, iS]
+                            elif ray_tracing_batch is not None:
+                                R = ray_tracing_batch['travel_distances'][i_batch, iS]
+                                T = ray_tracing_batch['travel_times'][i_batch, iS]
+                                if np.isnan(R) or np.isnan(T):  # same as the None check of the per channel ray tracing
+                                    continue
                             else:
                                 R = self._raytracer.get_path_length(iS)  # calculate path length
                                 T = self._raytracer.get_travel_time(iS)  # calculate travel time
@@ -702,8 +830,12 @@ class simulation:
                                     continue
                             sg['travel_distances'][iSh, channel_id, iS] = R
                             sg['travel_times'][iSh, channel_id, iS] = T
-                            self._launch_vector = self._raytracer.get_launch_vector(iS)
-                            receive_vector = self._raytracer.get_receive_vector(iS)
+                            if ray_tracing_batch is not None:
+                                self._launch_vector = ray_tracing_batch['launch_vectors'][i_batch, iS]
+                                receive_vector = ray_tracing_batch['receive_vectors'][i_batch, iS]
+                            else:
+                                self._launch_vector = self._raytracer.get_launch_vector(iS)
+                                receive_vector = self._raytracer.get_receive_vector(iS)
                             # save receive vector
                             sg['receive_vectors'][iSh, channel_id, iS] = receive_vector
                             zenith, azimuth = hp.cartesian_to_spherical(*receive_vector)
@@ -713,42 +845,12 @@ class simulation:
 
                             if "simulation_mode" not in self._fin_attrs or self._fin_attrs['simulation_mode'] == "neutrino":
                                 # first consider in-ice showers
-                                kwargs = {}
-                                # if the input file specifies a specific shower realization, use that realization
-                                if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"] and "shower_realization_ARZ" in self._fin:
-                                    kwargs['iN'] = self._fin['shower_realization_ARZ'][self._shower_index]
-                                    logger.debug(f"reusing shower {kwargs['iN']} ARZ shower library")
-                                elif self._cfg['signal']['model'] == "Alvarez2009" and "shower_realization_Alvarez2009" in self._fin:
-                                    kwargs['k_L'] = self._fin['shower_realization_Alvarez2009'][self._shower_index]
-                                    logger.debug(f"reusing k_L parameter of Alvarez2009 model of k_L = {kwargs['k_L']:.4g}")
-                                else:
-                                    # check if the shower was already simulated (e.g. for a different channel or ray tracing solution)
-                                    if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"]:
-                                        if self._sim_shower.has_parameter(shp.charge_excess_profile_id):
-                                            kwargs = {'iN': self._sim_shower.get_parameter(shp.charge_excess_profile_id)}
-                                    if self._cfg['signal']['model'] == "Alvarez2009":
-                                        if self._sim_shower.has_parameter(shp.k_L):
-                                            kwargs = {'k_L': self._sim_shower.get_parameter(shp.k_L)}
-                                            logger.debug(f"reusing k_L parameter of Alvarez2009 model of k_L = {kwargs['k_L']:.4g}")
-
-                                spectrum, additional_output = askaryan.get_frequency_spectrum(self._fin['shower_energies'][self._shower_index], viewing_angles[iS],
+                                kwargs = self._get_shower_realization_kwargs()
+                                spectrum, additional_output = spectrum_cache.get_frequency_spectrum(self._shower_index,
+                                                self._fin['shower_energies'][self._shower_index], viewing_angles[iS],
                                                 self._n_samples, self._dt, self._fin['shower_type'][self._shower_index], n_index, R,
-                                                self._cfg['signal']['model'], seed=self._cfg['seed'], full_output=True, **kwargs)
-                                # save shower realization to SimShower and hdf5 file
-                                if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"]:
-                                    if 'shower_realization_ARZ' not in self._mout:
-                                        self._mout['shower_realization_ARZ'] = np.zeros(self._n_showers)
-                                    if not self._sim_shower.has_parameter(shp.charge_excess_profile_id):
-                                        self._sim_shower.set_parameter(shp.charge_excess_profile_id, additional_output['iN'])
-                                        self._mout['shower_realization_ARZ'][self._shower_index] = additional_output['iN']
-                                        logger.debug(f"setting shower profile for ARZ shower library to i = {additional_output['iN']}")
-                                if self._cfg['signal']['model'] == "Alvarez2009":
-                                    if 'shower_realization_Alvarez2009' not in self._mout:
-                                        self._mout['shower_realization_Alvarez2009'] = np.zeros(self._n_showers)
-                                    if not self._sim_shower.has_parameter(shp.k_L):
-                                        self._sim_shower.set_parameter(shp.k_L, additional_output['k_L'])
-                                        self._mout['shower_realization_Alvarez2009'][self._shower_index] = additional_output['k_L']
-                                        logger.debug(f"setting k_L parameter of Alvarez2009 model to k_L = {additional_output['k_L']:.4g}")
+                                                self._cfg['signal']['model'], seed=self._cfg['seed'], **kwargs)
+                                self._save_shower_realization(additional_output)
                                 askaryan_time += (time.time() - t_ask)
 
                                 polarization_direction_onsky = self._calculate_polarization_vector()
@@ -981,7 +1083,10 @@ class simulation:
                                        'ElectricFields': self._cfg['output']['electric_field_traces'],
                                        'SimChannels': self._cfg['output']['sim_channel_traces'],
                                        'SimElectricFields': self._cfg['output']['sim_electric_field_traces']}
-                        if self.__write_detector:
+                        if self._shard is not None:
+                            # the events of a worker process are copied into the output file by the main process
+                            self._write_shard_event(output_mode)
+                        elif self.__write_detector:
                             self._eventWriter.run(self._evt, self._det, mode=output_mode)
                         else:
                             self._eventWriter.run(self._evt, mode=output_mode)
@@ -989,14 +1094,7 @@ class simulation:
                 # end sub events loop
 
                 # add local sg array to output data structure if any
-                if event_group_has_triggered:
-                    if self._station_id not in self._mout_groups:
-                        self._mout_groups[self._station_id] = {}
-                    for key in sg:
-                        if key not in self._mout_groups[self._station_id]:
-                            self._mout_groups[self._station_id][key] = list(sg[key])
-                        else:
-                            self._mout_groups[self._station_id][key].extend(sg[key])
+                self._write_station_output(self._station_id, sg if event_group_has_triggered else None)
 
                 detSimTime += time.time() - t1
 
@@ -1004,6 +1102,10 @@ class simulation:
 
         # end event group loop
 
+        if self._shard is not None:
+            # worker process of a sharded run, the output is merged and written by the main process
+            return None
+
         # Create trigger structures if there are no triggering events.
         # This is done to ensure that files with no triggering n_events
         # merge properly.
@@ -1015,6 +1117,8 @@ class simulation:
         if self._outputfilenameNuRadioReco is not None:
             self._eventWriter.end()
             logger.debug("closing nur file")
+        if use_checkpoints:
+            self._remove_checkpoint()
 
         try:
             self.calculate_Veff()
@@ -1043,10 +1147,415 @@ class simulation:
                                                                                          100 * detSimTime / t_total,
                                                                                          100 * outputTime / t_total,
                                                                                          100 * weightTime / t_total))
+        spectrum_cache_statistics = spectrum_cache.get_statistics()
+        n_spectra = spectrum_cache_statistics['hits'] + spectrum_cache_statistics['misses']
+        if n_spectra > 0:
+            logger.status("askaryan spectrum cache: {:d} hits, {:d} misses ({:.1f}% of the spectra reused)".format(
+                spectrum_cache_statistics['hits'], spectrum_cache_statistics['misses'],
+                100. * spectrum_cache_statistics['hits'] / n_spectra))
         triggered = remove_duplicate_triggers(self._mout['triggered'], self._fin['event_group_ids'])
         n_triggered = np.sum(triggered)
         return n_triggered
 
+    def _get_event_group_seed(self, event_group_id):
+        """
+        returns the random seed of an event group which is derived from the global seed and the event group id
+        """
+        return np.random.SeedSequence([int(self._cfg['seed']), int(event_group_id)]).generate_state(1)[0]
+
+    def _set_mout_rows(self, key, shower_indices, values):
+        """
+        sets the rows `shower_indices` of the per shower output array `key`
+
+        The array is created if it does not exist yet and enlarged if `values` has more columns (e.g. because a
+        new trigger was added). Missing trigger times are NaN, all other missing entries are zeros/False.
+        """
+        fill_value = np.nan if key == 'trigger_times' else 0
+        values = np.asarray(values)
+        if key not in self._mout:
+            self._mout[key] = np.full((self._n_showers,) + values.shape[1:], fill_value, dtype=values.dtype)
+        elif self._mout[key].shape[1:] != values.shape[1:]:
+            shape = (self._n_showers,) + tuple(np.maximum(self._mout[key].shape[1:], values.shape[1:]))
+            tmp = np.full(shape, fill_value, dtype=self._mout[key].dtype)
+            tmp[(slice(None),) + tuple(slice(0, n) for n in self._mout[key].shape[1:])] = self._mout[key]
+            self._mout[key] = tmp
+        self._mout[key][(shower_indices,) + tuple(slice(0, n) for n in values.shape[1:])] = values
+
+    def _get_checkpoint_filename(self):
+        return self._outputfilename + ".checkpoint"
+
+    def _write_checkpoint(self, mode, last_event_group_id, state, event_writer=None):
+        """
+        saves the state of the simulation, so that it can be resumed after the event group `last_event_group_id`
+
+        The per shower output of the showers that were simulated since the last checkpoint is appended to the
+        file <outputfilename>.checkpoint.hdf5.tmp, the checkpoint itself only contains the sizes of the output
+        files and the (small) state that is needed to continue the simulation.
+
+        Parameters
+        ----------
+        mode: string
+            'serial' or 'sharded', a checkpoint can only be resumed by a run of the same mode
+        last_event_group_id: int
+            the id of the last event group that is completely simulated
+        state: dict
+            the data structures needed to continue the simulation
+        event_writer: eventWriter or None
+            the event writer of the nur output
+        """
+        if len(self._checkpoint_shower_indices):
+            shower_indices = np.concatenate(self._checkpoint_shower_indices)
+            self._checkpoint_shower_indices = []
+            fout = self._checkpoint_writer.get_file()
+            saved_shower_indices = None
+            if 'showers' in fout and 'shower_indices' in fout['showers']:
+                saved_shower_indices = fout['showers']['shower_indices'][...]
+            data = {'shower_indices': shower_indices}
+            for key, value in iteritems(self._mout):
+                if saved_shower_indices is not None and key not in fout['showers']:
+                    # the array was created after the last checkpoint, so the rows of the showers saved before
+                    # are needed as well
+                    data[key] = value[np.concatenate([saved_shower_indices, shower_indices])]
+                else:
+                    data[key] = value[shower_indices]
+            self._checkpoint_writer.append_to_group('showers', data)
+        checkpoint = {'mode': mode,
+                      'config': self._cfg,
+                      'inputfilename': self._inputfilename,
+                      'n_showers': len(self._fin['event_group_ids']),
+                      'last_event_group_id': last_event_group_id,
+                      'state': state,
+                      'event_writer': None,
+                      'output_writer': None,
+                      'checkpoint_writer': self._checkpoint_writer.get_checkpoint()}
+        if self._output_writer is not None:
+            checkpoint['output_writer'] = self._output_writer.get_checkpoint()
+        if event_writer is not None:
+            checkpoint['event_writer'] = event_writer.get_checkpoint()
+        # write to a temporary file first, so that an interruption during writing does not corrupt the checkpoint
+        filename = self._get_checkpoint_filename()
+        with open(filename + ".tmp", 'wb') as fout:
+            pickle.dump(checkpoint, fout, protocol=4)
+        os.replace(filename + ".tmp", filename)
+        logger.status(f"saved checkpoint after event group {last_event_group_id} to {filename}")
+
+    def _read_checkpoint(self, mode):
+        """
+        reads the checkpoint of an interrupted run and restores the random seed of the interrupted run
+
+        Parameters
+        ----------
+        mode: string
+            'serial' or 'sharded', a checkpoint can only be resumed by a run of the same mode
+
+        Returns
+        -------
+        the checkpoint dictionary or None if no checkpoint exists
+        """
+        filename = self._get_checkpoint_filename()
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'rb') as fin:
+            checkpoint = pickle.load(fin)
+        cfg = copy.deepcopy(self._cfg)
+        cfg_checkpoint = copy.deepcopy(checkpoint['config'])
+        cfg['seed'] = cfg_checkpoint['seed'] = None  # a random seed is generated for every start
+        if cfg != cfg_checkpoint or checkpoint['inputfilename'] != self._inputfilename or \
+                checkpoint['n_showers'] != len(self._fin['event_group_ids']):
+            msg = f"checkpoint {filename} was written for a different config or input file. Remove the checkpoint to restart the simulation."
+            logger.error(msg)
+            raise ValueError(msg)
+        if checkpoint['mode'] != mode:
+            msg = f"checkpoint {filename} was written by a {checkpoint['mode']} run and can not be resumed by a {mode} run."
+            logger.error(msg)
+            raise ValueError(msg)
+        self._cfg['seed'] = checkpoint['config']['seed']
+        logger.status(f"resuming simulation from checkpoint {filename} after event group {checkpoint['last_event_group_id']}")
+        return checkpoint
+
+    def _open_checkpoint_output(self, checkpoint=None):
+        """
+        opens the file that collects the per shower output for the checkpoints and restores the per shower output
+        of the showers that were simulated before the `checkpoint` (see `_read_checkpoint`) was saved
+        """
+        self._checkpoint_shower_indices = []
+        self._checkpoint_writer = outputWriterHDF5(self._get_checkpoint_filename() + ".hdf5", [],
+                                                   checkpoint['checkpoint_writer'] if checkpoint is not None else None)
+        fout = self._checkpoint_writer.get_file()
+        if 'showers' in fout and 'shower_indices' in fout['showers']:
+            shower_indices = fout['showers']['shower_indices'][...]
+            for key, dataset in fout['showers'].items():
+                if key != 'shower_indices':
+                    self._set_mout_rows(key, shower_indices, dataset[...])
+
+    def _remove_checkpoint(self):
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.discard()
+            self._checkpoint_writer = None
+        if os.path.exists(self._get_checkpoint_filename()):
+            os.remove(self._get_checkpoint_filename())
+
+    def _run_shard(self, i_shard, event_group_indices):
+        """
+        simulates a subset of the event groups (called in the worker processes of a sharded run)
+
+        The station output and the per shower output are written to the hdf5 file <outputfilename>.shard<i_shard>
+        and the events to the file <outputfilenameNuRadioReco>.shard<i_shard>. Both files are merged into the output
+        files by the main process.
+
+        Parameters
+        ----------
+        i_shard: int
+            the index of the shard
+        event_group_indices: array of ints
+            the indices of the (unique) event groups that should be simulated
+
+        Returns
+        -------
+        dict with the filenames of the shard, the trigger names and the information the main process needs to copy
+        the events into the nur file
+        """
+        output_writer = self._output_writer
+        mout = self._mout  # the merged output of the main process if the shards are simulated in the same process
+        filename = f"{self._outputfilename}.shard{i_shard:d}"
+        self._output_writer = outputWriterHDF5(filename, self._station_ids)
+        self._mout_attrs = collections.OrderedDict()
+        self._shard = {'event_group_indices': event_group_indices, 'nur_file': None, 'nur_events': []}
+        nur_filename = None
+        if self._outputfilenameNuRadioReco is not None:
+            nur_filename = f"{self._outputfilenameNuRadioReco}.shard{i_shard:d}"
+            self._shard['nur_file'] = open(nur_filename, 'wb')
+        try:
+            self.run()
+        finally:
+            if self._shard['nur_file'] is not None:
+                self._shard['nur_file'].close()
+        shower_indices = np.concatenate([self._event_group_shower_indices[self._event_group_offsets[i]:self._event_group_offsets[i + 1]]
+                                         for i in event_group_indices])
+        data = {key: value[shower_indices] for key, value in iteritems(self._mout)}
+        data['shower_indices'] = shower_indices
+        self._output_writer.append_to_group('showers', data)
+        self._output_writer.close(repack=False)
+        output = {'filename': filename,
+                  'nur_filename': nur_filename,
+                  'nur_events': self._shard['nur_events'],
+                  'trigger_names': list(self._mout_attrs.get('trigger_names', [])),
+                  'last_event_group_id': self._unique_event_group_ids[event_group_indices[-1]]}
+        self._output_writer = output_writer
+        self._mout = mout
+        self._shard = None
+        return output
+
+    def _write_shard_event(self, output_mode):
+        """
+        serializes the current event into the nur file of the shard (see `_run_shard`)
+
+        Besides the length of the record, the ids of the event, stations and channels are kept, because the main
+        process needs them to write the detector description.
+        """
+        record = self._eventWriter.get_event_record(self._evt, output_mode)
+        self._shard['nur_file'].write(record)
+        stations = [(station.get_id(), station.get_station_time(), [channel.get_id() for channel in station.iter_channels()])
+                    for station in self._evt.get_stations()]
+        self._shard['nur_events'].append((len(record), self._evt.get_run_number(), self._evt.get_id(), stations))
+
+    def _copy_shard_events(self, result, event_writer):
+        """
+        copies the events of a shard into the nur file without deserializing them
+        """
+        with open(result['nur_filename'], 'rb') as fin:
+            for n_bytes, run_number, event_id, stations in result['nur_events']:
+                # an event without traces, which provides the ids needed to write the detector description
+                evt = NuRadioReco.framework.event.Event(run_number, event_id)
+                for station_id, station_time, channel_ids in stations:
+                    station = NuRadioReco.framework.station.Station(station_id)
+                    station.set_station_time(station_time)
+                    for channel_id in channel_ids:
+                        station.add_channel(NuRadioReco.framework.channel.Channel(channel_id))
+                    evt.set_station(station)
+                event_writer.write_event_record(fin.read(n_bytes), evt, self._det if self.__write_detector else None)
+        os.remove(result['nur_filename'])
+
+    def _run_sharded(self):
+        """
+        runs the simulation with the event groups distributed over `n_workers` processes
+
+        The event groups are split into contiguous shards which are simulated by the worker processes. Each worker
+        writes the output of its shard into separate files (see `_run_shard`), which are merged in the order of the
+        event groups, i.e., the output files contain the same data as a serial run with the same (per event group)
+        random seeds.
+        """
+        global _sharded_simulation
+        logger.status(f"Starting NuRadioMC simulation with {self._n_workers} workers")
+        t_start = time.time()
+        event_group_indices = np.arange(len(self._unique_event_group_ids))
+        if self._event_group_list is not None:
+            event_group_indices = event_group_indices[np.isin(self._unique_event_group_ids, list(self._event_group_list))]
+
+        # the shard files of an interrupted run are not needed anymore
+        for filename in [self._outputfilename, self._outputfilenameNuRadioReco]:
+            if filename is not None:
+                for shard_filename in glob.glob(glob.escape(filename) + ".shard*"):
+                    os.remove(shard_filename)
+
+        # the random seed of an interrupted run needs to be restored before the worker processes are started
+        checkpoint = None
+        if self._checkpoint_interval is not None:
+            checkpoint = self._read_checkpoint('sharded')
+
+        pool = None
+        if self._n_workers > 1:
+            # the worker processes are started before the output files are opened. Otherwise, they would inherit
+            # the hdf5 file handle and could overwrite the output of the main process with an outdated state when
+            # they release it.
+            import multiprocessing
+            _sharded_simulation = self
+            pool = multiprocessing.get_context('fork').Pool(self._n_workers)
+        try:
+            if self._outputfilenameNuRadioReco is not None:
+                event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+                event_writer.begin(self._outputfilenameNuRadioReco, async_write=self._cfg['output']['nur_async_write'],
+                                   log_level=self._log_level)
+            else:
+                event_writer = None
+
+            # collect the results of all shards in the order of the event groups. The events and the station output are
+            # written to the output files directly, the per shower quantities are merged into the output arrays.
+            self._n_showers = len(self._fin['event_group_ids'])
+            self._shower_ids = np.array(self._fin['shower_ids'])
+            self._create_meta_output_datastructures()
+            trigger_names = []
+            if self._checkpoint_interval is not None:
+                self._open_checkpoint_output(checkpoint)
+            if checkpoint is not None:
+                trigger_names = checkpoint['state']['trigger_names']
+                if event_writer is not None:
+                    event_writer.resume(checkpoint['event_writer'])
+                event_group_indices = event_group_indices[self._unique_event_group_ids[event_group_indices] > checkpoint['last_event_group_id']]
+            self._output_writer = outputWriterHDF5(self._outputfilename, self._station_ids,
+                                                   checkpoint['output_writer'] if checkpoint is not None else None)
+            t_last_checkpoint = time.time()
+
+            n_shards = max(1, min(len(event_group_indices), 10 * self._n_workers))
+            shards = [(i_shard, shard) for i_shard, shard in enumerate(np.array_split(event_group_indices, n_shards)) if len(shard)]
+
+            def extend_trigger_columns(values, names, fill_value):
+                # the columns of the trigger arrays of each shard follow the order in which the shard encountered the
+                # triggers, so we need to map them to the columns of the merged trigger names
+                values = np.atleast_1d(values)
+                tmp = np.full(values.shape[:-1] + (len(trigger_names),), fill_value, dtype=values.dtype)
+                columns = [trigger_names.index(name) for name in names[:values.shape[-1]]]
+                tmp[..., columns] = values
+                return tmp
+
+            trigger_fill_values = {'multiple_triggers': False, 'trigger_times': np.nan,
+                                   'multiple_triggers_per_event': False, 'trigger_times_per_event': np.nan}
+
+            def collect(result):
+                nonlocal t_last_checkpoint
+                for trigger_name in result['trigger_names']:
+                    if trigger_name not in trigger_names:
+                        trigger_names.append(trigger_name)
+                # the station output is appended to the hdf5 file and the per shower quantities are merged into the
+                # output arrays
+                with h5py.File(result['filename'], 'r') as fshard:
+                    for group_name in fshard:
+                        data = {}
+                        for key, value in iteritems(fshard[group_name]):
+                            value = value[...]
+                            if key in trigger_fill_values:
+                                value = extend_trigger_columns(value, result['trigger_names'], trigger_fill_values[key])
+                            data[key] = value
+                        if group_name == 'showers':
+                            shower_indices = data.pop('shower_indices')
+                            for key, value in iteritems(data):
+                                self._set_mout_rows(key, shower_indices, value)
+                        else:
+                            self._output_writer.append_to_group(group_name, data)
+                os.remove(result['filename'])
+                if self._checkpoint_interval is not None:
+                    self._checkpoint_shower_indices.append(shower_indices)
+                if result['nur_filename'] is not None:
+                    self._copy_shard_events(result, event_writer)
+                if self._checkpoint_interval is not None and (time.time() - t_last_checkpoint) > self._checkpoint_interval:
+                    self._write_checkpoint('sharded', result['last_event_group_id'], {'trigger_names': trigger_names}, event_writer)
+                    t_last_checkpoint = time.time()
+
+            if pool is None:
+                for shard in shards:
+                    collect(self._run_shard(*shard))
+            else:
+                for result in pool.imap(_run_shard, shards):
+                    collect(result)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                _sharded_simulation = None
+
+        self._mout_attrs = collections.OrderedDict()
+        if len(trigger_names) > 0:
+            self._mout_attrs['trigger_names'] = trigger_names
+
+        self._write_output_file()
+        if self._outputfilenameNuRadioReco is not None:
+            event_writer.end()
+            logger.debug("closing nur file")
+        if self._checkpoint_interval is not None:
+            self._remove_checkpoint()
+
+        try:
+            self.calculate_Veff()
+        except:
+            logger.error("error in calculating effective volume")
+
+        t_total = time.time() - t_start
+        logger.status(f"{self._n_showers:d} events processed in {pretty_time_delta(t_total)} = {1.e3 * t_total / self._n_showers:.2f}ms/event using {self._n_workers} workers")
+        triggered = remove_duplicate_triggers(self._mout['triggered'], self._fin['event_group_ids'])
+        n_triggered = np.sum(triggered)
+        return n_triggered
+
+    def _get_shower_realization_kwargs(self):
+        """
+        returns the keyword arguments of the signal model that specify the shower realization of the current shower
+        """
+        kwargs = {}
+        # if the input file specifies a specific shower realization, use that realization
+        if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"] and "shower_realization_ARZ" in self._fin:
+            kwargs['iN'] = self._fin['shower_realization_ARZ'][self._shower_index]
+            logger.debug(f"reusing shower {kwargs['iN']} ARZ shower library")
+        elif self._cfg['signal']['model'] == "Alvarez2009" and "shower_realization_Alvarez2009" in self._fin:
+            kwargs['k_L'] = self._fin['shower_realization_Alvarez2009'][self._shower_index]
+            logger.debug(f"reusing k_L parameter of Alvarez2009 model of k_L = {kwargs['k_L']:.4g}")
+        else:
+            # check if the shower was already simulated (e.g. for a different channel or ray tracing solution)
+            if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"]:
+                if self._sim_shower.has_parameter(shp.charge_excess_profile_id):
+                    kwargs = {'iN': self._sim_shower.get_parameter(shp.charge_excess_profile_id)}
+            if self._cfg['signal']['model'] == "Alvarez2009":
+                if self._sim_shower.has_parameter(shp.k_L):
+                    kwargs = {'k_L': self._sim_shower.get_parameter(shp.k_L)}
+                    logger.debug(f"reusing k_L parameter of Alvarez2009 model of k_L = {kwargs['k_L']:.4g}")
+        return kwargs
+
+    def _save_shower_realization(self, additional_output):
+        """
+        saves the shower realization of the signal model to the SimShower and the hdf5 file
+        """
+        if self._cfg['signal']['model'] in ["ARZ2019", "ARZ2020"]:
+            if 'shower_realization_ARZ' not in self._mout:
+                self._mout['shower_realization_ARZ'] = np.zeros(self._n_showers)
+            if not self._sim_shower.has_parameter(shp.charge_excess_profile_id):
+                self._sim_shower.set_parameter(shp.charge_excess_profile_id, additional_output['iN'])
+                self._mout['shower_realization_ARZ'][self._shower_index] = additional_output['iN']
+                logger.debug(f"setting shower profile for ARZ shower library to i = {additional_output['iN']}")
+        if self._cfg['signal']['model'] == "Alvarez2009":
+            if 'shower_realization_Alvarez2009' not in self._mout:
+                self._mout['shower_realization_Alvarez2009'] = np.zeros(self._n_showers)
+            if not self._sim_shower.has_parameter(shp.k_L):
+                self._sim_shower.set_parameter(shp.k_L, additional_output['k_L'])
+                self._mout['shower_realization_Alvarez2009'][self._shower_index] = additional_output['k_L']
+                logger.debug(f"setting k_L parameter of Alvarez2009 model to k_L = {additional_output['k_L']:.4g}")
+
     def _calculate_emitter_output(self):
         pass
 
@@ -1124,6 +1633,62 @@ class simulation:
             self._fin_attrs[key] = value
 
         fin.close()
+        self._build_event_group_index()
+
+    def _get_primary_weights(self, event_group_indices):
+        """
+        calculates the weights (due to the Earth absorption) of the primary particles of the event groups at once
+
+        Parameters
+        ----------
+        event_group_indices: array of ints
+            the indices of the (unique) event groups
+
+        Returns
+        -------
+        array of floats or None
+            the weight of the primary particle (the first shower) of each event group, None if the weights are not
+            calculated (emitter simulation, or weight mode None or 'existing')
+        """
+        if "simulation_mode" in self._fin_attrs and self._fin_attrs['simulation_mode'] == "emitter":
+            return None
+        if self._cfg['weights']['weight_mode'] in [None, "existing"]:
+            return None
+        if len(event_group_indices) == 0:
+            return np.zeros(0)
+        primary_offsets = self._event_group_offsets[event_group_indices]
+        primary_indices = self._event_group_shower_indices[primary_offsets]
+        weights = get_weight(np.asarray(self._fin['zeniths'])[primary_indices],
+                             np.asarray(self._fin['energies'])[primary_indices],
+                             np.asarray(self._fin['flavors'])[primary_indices],
+                             mode=self._cfg['weights']['weight_mode'],
+                             cross_section_type=self._cfg['weights']['cross_section_type'],
+                             vertex_position=self._event_group_vertices[primary_offsets],
+                             phi_nu=np.asarray(self._fin['azimuths'])[primary_indices],
+                             tabulated_cross_sections=self._cfg['weights']['tabulated_cross_sections'])
+        return np.ones(len(primary_indices)) * weights
+
+    def _build_event_group_index(self):
+        """
+        builds an index of the showers belonging to each event group
+
+        The shower indices are sorted by event group id (keeping the order of the input file within an event group),
+        so that the showers of the i-th unique event group are
+        `self._event_group_shower_indices[self._event_group_offsets[i]:self._event_group_offsets[i + 1]]`.
+        The vertex positions and shower energies are stored in the same order, so that the quantities of an event
+        group are contiguous slices and don't need to be looked up for every event group again.
+        """
+        event_group_ids = np.asarray(self._fin['event_group_ids'])
+        self._event_group_shower_indices = np.argsort(event_group_ids, kind='stable')
+        self._unique_event_group_ids, counts = np.unique(event_group_ids, return_counts=True)
+        self._event_group_offsets = np.zeros(len(counts) + 1, dtype=int)
+        self._event_group_offsets[1:] = np.cumsum(counts)
+        self._event_group_vertices = np.array([self._fin['xx'], self._fin['yy'], self._fin['zz']], dtype=float).T[self._event_group_shower_indices]
+        self._event_group_shower_energies = None
+        if 'shower_energies' in self._fin:
+            self._event_group_shower_energies = np.asarray(self._fin['shower_energies'])[self._event_group_shower_indices]
+        # this array allows to convert the shower id to an index that starts from 0 to be used to access the arrays in the hdf5 file.
+        self._shower_index_array = dict(zip(np.asarray(self._fin['shower_ids']).tolist(), range(len(event_group_ids))))
 
     def _check_vertex_times(self):
 
@@ -1149,12 +1714,12 @@ class simulation:
     def _create_empty_multiple_triggers(self):
         if 'trigger_names' not in self._mout_attrs:
             self._mout_attrs['trigger_names'] = np.array([])
-            self._mout['multiple_triggers'] = np.zeros((self._n_showers, 1), dtype=np.bool)
+            self._mout['multiple_triggers'] = np.zeros((self._n_showers, 1), dtype=bool)
             for station_id in self._station_ids:
                 sg = self._mout_groups[station_id]
                 n_showers = sg['launch_vectors'].shape[0]
-                sg['multiple_triggers'] = np.zeros((n_showers, 1), dtype=np.bool)
-                sg['triggered'] = np.zeros(n_showers, dtype=np.bool)
+                sg['multiple_triggers'] = np.zeros((n_showers, 1), dtype=bool)
+                sg['triggered'] = np.zeros(n_showers, dtype=bool)
 
     def _create_trigger_structures(self):
 
@@ -1169,13 +1734,13 @@ class simulation:
         # simulated triggers is unknown at the beginning. So we check if the key already exists and if not,
         # we first create this data structure
         if 'multiple_triggers' not in self._mout:
-            self._mout['multiple_triggers'] = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+            self._mout['multiple_triggers'] = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
             self._mout['trigger_times'] = np.nan * np.zeros_like(self._mout['multiple_triggers'], dtype=float)
 #             for station_id in self._station_ids:
 #                 sg = self._mout_groups[station_id]
-#                 sg['multiple_triggers'] = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+#                 sg['multiple_triggers'] = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
         elif extend_array:
-            tmp = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+            tmp = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
             nx, ny = self._mout['multiple_triggers'].shape
             tmp[:, 0:ny] = self._mout['multiple_triggers']
             self._mout['multiple_triggers'] = tmp
@@ -1185,7 +1750,7 @@ class simulation:
             self._mout['trigger_times'] = tmp_t
 #             for station_id in self._station_ids:
 #                 sg = self._mout_groups[station_id]
-#                 tmp = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+#                 tmp = np.zeros((self._n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
 #                 nx, ny = sg['multiple_triggers'].shape
 #                 tmp[:, 0:ny] = sg['multiple_triggers']
 #                 sg['multiple_triggers'] = tmp
@@ -1198,10 +1763,10 @@ class simulation:
         # the information fo the current station and event group
         n_showers = sg['launch_vectors'].shape[0]
         if 'multiple_triggers' not in sg:
-            sg['multiple_triggers'] = np.zeros((n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+            sg['multiple_triggers'] = np.zeros((n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
             sg['trigger_times'] = np.nan * np.zeros_like(sg['multiple_triggers'], dtype=float)
         elif extend_array:
-            tmp = np.zeros((n_showers, len(self._mout_attrs['trigger_names'])), dtype=np.bool)
+            tmp = np.zeros((n_showers, len(self._mout_attrs['trigger_names'])), dtype=bool)
             nx, ny = sg['multiple_triggers'].shape
             tmp[:, 0:ny] = sg['multiple_triggers']
             sg['multiple_triggers'] = tmp
@@ -1212,7 +1777,7 @@ class simulation:
 
         self._output_event_group_ids[self._station_id].append(self._evt.get_run_number())
         self._output_sub_event_ids[self._station_id].append(self._evt.get_id())
-        multiple_triggers = np.zeros(len(self._mout_attrs['trigger_names']), dtype=np.bool)
+        multiple_triggers = np.zeros(len(self._mout_attrs['trigger_names']), dtype=bool)
         trigger_times = np.nan*np.zeros_like(multiple_triggers)
         for iT, trigger_name in enumerate(self._mout_attrs['trigger_names']):
             if self._station.has_trigger(trigger_name):
@@ -1233,6 +1798,51 @@ class simulation:
         self._output_trigger_times_station[self._station_id].append(trigger_times)
         self._output_triggered_station[self._station_id].append(np.any(multiple_triggers))
 
+    def _write_station_output(self, station_id, sg=None):
+        """
+        appends the output of a station to the hdf5 output file
+
+        The triggered showers of `sg` are saved together with the "per event" quantities that were collected
+        since the last call. The lists of the "per event" quantities are cleared afterwards.
+
+        Parameters
+        ----------
+        station_id: int
+            the station id
+        sg: dict or None
+            the station output of an event group
+        """
+        data = {}
+        if sg is not None:
+            triggered = np.array(sg['triggered'], dtype=bool)
+            for key, value in iteritems(sg):
+                data[key] = np.array(value)[triggered]
+        n_events_for_station = len(self._output_triggered_station[station_id])
+        if n_events_for_station > 0:
+            data['event_group_ids'] = np.array(self._output_event_group_ids[station_id])
+            data['event_ids'] = np.array(self._output_sub_event_ids[station_id])
+            data['maximum_amplitudes'] = np.array(self._output_maximum_amplitudes[station_id])
+            data['maximum_amplitudes_envelope'] = np.array(self._output_maximum_amplitudes_envelope[station_id])
+            data['triggered_per_event'] = np.array(self._output_triggered_station[station_id])
+
+            # the multiple triggeres 2d array might have different number of entries per event
+            # because the number of different triggers can increase dynamically
+            # therefore we first create an array with the right size and then fill it
+            n_triggers = max([len(values) for values in self._output_multiple_triggers_station[station_id]])
+            tmp = np.zeros((n_events_for_station, n_triggers), dtype=bool)
+            for iE, values in enumerate(self._output_multiple_triggers_station[station_id]):
+                tmp[iE, :len(values)] = values
+            data['multiple_triggers_per_event'] = tmp
+            tmp_t = np.nan * np.zeros_like(tmp, dtype=float)
+            for iE, values in enumerate(self._output_trigger_times_station[station_id]):
+                tmp_t[iE, :len(values)] = values
+            data['trigger_times_per_event'] = tmp_t
+            for key in ['output_event_group_ids', 'output_sub_event_ids', 'output_triggered_station',
+                        'output_multiple_triggers_station', 'output_trigger_times_station',
+                        'output_maximum_amplitudes', 'output_maximum_amplitudes_envelope']:
+                getattr(self, '_' + key)[station_id] = []
+        self._output_writer.append(station_id, data)
+
     def get_Vrms(self):
         return self._Vrms
 
@@ -1261,8 +1871,8 @@ class simulation:
         self._mout = {}
         self._mout_attributes = {}
         self._mout['weights'] = np.zeros(self._n_showers)
-        self._mout['triggered'] = np.zeros(self._n_showers, dtype=np.bool)
-#         self._mout['multiple_triggers'] = np.zeros((self._n_showers, self._number_of_triggers), dtype=np.bool)
+        self._mout['triggered'] = np.zeros(self._n_showers, dtype=bool)
+#         self._mout['multiple_triggers'] = np.zeros((self._n_showers, self._number_of_triggers), dtype=bool)
         self._mout_attributes['trigger_names'] = None
         self._amplitudes = {}
         self._amplitudes_envelope = {}
@@ -1288,7 +1898,7 @@ class simulation:
     def _create_station_output_structure(self, n_showers, n_antennas):
         nS = self._raytracer.get_number_of_raytracing_solutions()  # number of possible ray-tracing solutions
         sg = {}
-        sg['triggered'] = np.zeros(n_showers, dtype=np.bool)
+        sg['triggered'] = np.zeros(n_showers, dtype=bool)
         # we need the reference to the shower id to be able to find the correct shower in the upper level hdf5 file
         sg['shower_id'] = np.zeros(n_showers, dtype=int) * -1
         sg['event_id_per_shower'] = np.zeros(n_showers, dtype=int) * -1
@@ -1374,11 +1984,15 @@ class simulation:
         self._sim_shower[shp.parent_id] = self.primary.get_id()
 
     def _write_output_file(self, empty=False):
-        folder = os.path.dirname(self._outputfilename)
-        if not os.path.exists(folder) and folder != '':
-            logger.warning(f"output folder {folder} does not exist, creating folder...")
-            os.makedirs(folder)
-        fout = h5py.File(self._outputfilename, 'w')
+        if self._output_writer is not None:
+            # the station groups were already written during the simulation
+            fout = self._output_writer.get_file()
+        else:
+            folder = os.path.dirname(self._outputfilename)
+            if not os.path.exists(folder) and folder != '':
+                logger.warning(f"output folder {folder} does not exist, creating folder...")
+                os.makedirs(folder)
+            fout = h5py.File(self._outputfilename, 'w')
 
         if not empty:
             # here we add the first interaction to the saved events
@@ -1390,48 +2004,28 @@ class simulation:
             saved = np.copy(self._mout['triggered'])
             if 'n_interaction' in self._fin:  # if n_interactions is not specified, there are not parents
                 parent_mask = self._fin['n_interaction'] == 1
-                for event_id in np.unique(self._fin['event_group_ids']):
-                    event_mask = self._fin['event_group_ids'] == event_id
-                    if True in self._mout['triggered'][event_mask]:
-                        saved[parent_mask & event_mask] = True
+                # use the event group index to determine which event groups have any triggered shower
+                triggered_sorted = self._mout['triggered'][self._event_group_shower_indices]
+                group_triggered = np.logical_or.reduceat(triggered_sorted, self._event_group_offsets[:-1])
+                group_triggered = np.repeat(group_triggered, np.diff(self._event_group_offsets))
+                saved[self._event_group_shower_indices[group_triggered]] |= parent_mask[self._event_group_shower_indices[group_triggered]]
 
             logger.status("start saving events")
             # save data sets
             for (key, value) in iteritems(self._mout):
                 fout[key] = value[saved]
 
-            # save all data sets of the station groups
-            for (key, value) in iteritems(self._mout_groups):
-                sg = fout.create_group("station_{:d}".format(key))
-                for (key2, value2) in iteritems(value):
-                    sg[key2] = np.array(value2)[np.array(value['triggered'])]
-
-            # save "per event" quantities
+            # the trigger arrays of a station only have the triggers that were known when the station triggered
+            # the last time, so we enlarge them to the final number of triggers
             if 'trigger_names' in self._mout_attrs:
                 n_triggers = len(self._mout_attrs['trigger_names'])
-                for station_id in self._mout_groups:
-                    n_events_for_station = len(self._output_triggered_station[station_id])
-                    if n_events_for_station > 0:
-                        n_channels = self._det.get_number_of_channels(station_id)
-                        sg = fout["station_{:d}".format(station_id)]
-                        sg['event_group_ids'] = np.array(self._output_event_group_ids[station_id])
-                        sg['event_ids'] = np.array(self._output_sub_event_ids[station_id])
-                        sg['maximum_amplitudes'] = np.array(self._output_maximum_amplitudes[station_id])
-                        sg['maximum_amplitudes_envelope'] = np.array(self._output_maximum_amplitudes_envelope[station_id])
-                        sg['triggered_per_event'] = np.array(self._output_triggered_station[station_id])
-
-                        # the multiple triggeres 2d array might have different number of entries per event
-                        # because the number of different triggers can increase dynamically
-                        # therefore we first create an array with the right size and then fill it
-                        tmp = np.zeros((n_events_for_station, n_triggers), dtype=np.bool)
-                        for iE, values in enumerate(self._output_multiple_triggers_station[station_id]):
-                            tmp[iE] = values
-                        sg['multiple_triggers_per_event'] = tmp
-                        tmp_t = np.nan * np.zeros_like(tmp, dtype=float)
-                        for iE, values in enumerate(self._output_trigger_times_station[station_id]):
-                            tmp_t[iE] = values
-                        sg['trigger_times_per_event'] = tmp_t
-
+                for station_id in self._station_ids:
+                    sg = fout["station_{:d}".format(station_id)]
+                    data = {}
+                    for key in ['multiple_triggers', 'trigger_times', 'multiple_triggers_per_event', 'trigger_times_per_event']:
+                        if key in sg:
+                            data[key] = np.zeros((0, n_triggers), dtype=sg[key].dtype)
+                    self._output_writer.append(station_id, data)
 
         # save meta arguments
         for (key, value) in iteritems(self._mout_attrs):
@@ -1442,7 +2036,7 @@ class simulation:
 
         if not empty:
             # save antenna position separately to hdf5 output
-            for station_id in self._mout_groups:
+            for station_id in self._station_ids:
                 n_channels = self._det.get_number_of_channels(station_id)
                 positions = np.zeros((n_channels, 3))
                 for channel_id in range(n_channels):
@@ -1451,10 +2045,10 @@ class simulation:
                 fout["station_{:d}".format(station_id)].attrs['Vrms'] = list(self._Vrms_per_channel[station_id].values())
                 fout["station_{:d}".format(station_id)].attrs['bandwidth'] = list(self._bandwidth_per_channel[station_id].values())
 
-            fout.attrs.create("Tnoise", self._noise_temp, dtype=np.float)
-            fout.attrs.create("Vrms", self._Vrms, dtype=np.float)
-            fout.attrs.create("dt", self._dt, dtype=np.float)
-            fout.attrs.create("bandwidth", self._bandwidth, dtype=np.float)
+            fout.attrs.create("Tnoise", self._noise_temp, dtype=float)
+            fout.attrs.create("Vrms", self._Vrms, dtype=float)
+            fout.attrs.create("dt", self._dt, dtype=float)
+            fout.attrs.create("bandwidth", self._bandwidth, dtype=float)
             fout.attrs['n_samples'] = self._n_samples
         fout.attrs['config'] = yaml.dump(self._cfg)
 
@@ -1480,7 +2074,11 @@ class simulation:
             if not key in fout.attrs.keys():  # only save atrributes sets that havn't been recomputed and saved already
                 if key not in ["trigger_names", "Tnoise", "Vrms", "bandwidth", "n_samples", "dt", "detector", "config"]:  # don't write trigger names from input to output file, this will lead to problems with incompatible trigger names when merging output files
                     fout.attrs[key] = self._fin_attrs[key]
-        fout.close()
+        if self._output_writer is not None:
+            self._output_writer.close()
+            self._output_writer = None
+        else:
+            fout.close()
 
     def calculate_Veff(self):
         # calculate effective
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+import numpy as np
+from numpy import testing
+import tempfile
+import shutil
+import glob
+import os
+import h5py
+from NuRadioReco.utilities import units
+from NuRadioMC.EvtGen.generator import generate_eventlist_cylinder
+
+"""
+this unit test checks that the event list that is written batch by batch (`stream_to_file=True`) is identical to
+the event list that is generated in memory and written at the end
+"""
+
+volume = {'fiducial_rmax': 4 * units.km, 'fiducial_zmin': -2.7 * units.km, 'fiducial_zmax': 0}
+path = tempfile.mkdtemp()
+for n_events_per_file in [None, 250]:
+    for stream_to_file in [False, True]:
+        generate_eventlist_cylinder(os.path.join(path, f"stream{stream_to_file}.hdf5"), 1000, 1e18 * units.eV, 1e19 * units.eV,
+                                    volume, seed=3, max_n_events_batch=300, n_events_per_file=n_events_per_file,
+                                    stream_to_file=stream_to_file)
+    files = sorted(glob.glob(os.path.join(path, "streamFalse.hdf5*")))
+    files_stream = sorted(glob.glob(os.path.join(path, "streamTrue.hdf5*")))
+    testing.assert_equal(len(files), 1 if n_events_per_file is None else 4)
+    testing.assert_equal([f.replace("streamTrue", "streamFalse") for f in files_stream], files)
+    for filename, filename_stream in zip(files, files_stream):
+        with h5py.File(filename, 'r') as fin, h5py.File(filename_stream, 'r') as fin_stream:
+            testing.assert_equal(list(fin_stream.keys()), list(fin.keys()))
+            for key in fin:
+                testing.assert_equal(fin_stream[key].dtype, fin[key].dtype)
+                testing.assert_equal(fin_stream[key][()], fin[key][()])
+            testing.assert_equal(sorted(fin_stream.attrs.keys()), sorted(fin.attrs.keys()))
+            for key in fin.attrs:
+                testing.assert_equal(fin_stream.attrs[key], fin.attrs[key])
+        os.remove(filename)
+        os.remove(filename_stream)
+shutil.rmtree(path)
+print("T01test_streaming_generation passed without issues")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import multiprocessing
+import tempfile
+import shutil
+import os
+import h5py
+from numpy import testing
+from NuRadioReco.utilities import units
+from NuRadioMC.EvtGen.generator import generate_eventlist_cylinder
+from NuRadioMC.EvtGen.NuRadioProposal import ProposalFunctions
+
+"""
+this unit test checks that the leptons propagated with PROPOSAL in several processes give the same event list
+as a serial propagation, that a changed number of workers is applied to the existing ProposalFunctions object
+and that the worker processes are stopped at the end of the generation
+"""
+
+volume = {'fiducial_rmax': 3 * units.km, 'fiducial_zmin': -2.7 * units.km, 'fiducial_zmax': 0}
+path = tempfile.mkdtemp()
+for n_workers in [1, 3]:
+    generate_eventlist_cylinder(os.path.join(path, f"workers{n_workers}.hdf5"), 50, 1e18 * units.eV, 1e19 * units.eV,
+                                volume, flavor=[16, -16, 14, -14], seed=5, proposal=True, proposal_config='Greenland',
+                                proposal_n_workers=n_workers)
+    testing.assert_equal(ProposalFunctions().get_n_workers(), n_workers)
+    testing.assert_equal(len(multiprocessing.active_children()), 0)
+
+with h5py.File(os.path.join(path, "workers1.hdf5"), 'r') as fin, h5py.File(os.path.join(path, "workers3.hdf5"), 'r') as fin_parallel:
+    testing.assert_equal(sorted(fin_parallel.keys()), sorted(fin.keys()))
+    for key in fin:
+        testing.assert_equal(fin_parallel[key][()], fin[key][()])
+shutil.rmtree(path)
+print("T02test_proposal_workers passed without issues")
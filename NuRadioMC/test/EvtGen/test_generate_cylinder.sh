@@ -3,4 +3,8 @@ FILE=NuRadioMC/test/EvtGen/test.hdf5
 if test -f "$FILE"; then
 	rm $FILE
 fi
-python NuRadioMC/EvtGen/generate_cylinder.py $FILE 1000 1e18 1e18 0 3000 -2700 0
\ No newline at end of file
+python NuRadioMC/EvtGen/generate_cylinder.py $FILE 1000 1e18 1e18 0 3000 -2700 0
+python NuRadioMC/test/EvtGen/T01test_streaming_generation.py
+
+# cleanup
+rm $FILE
@@ -4,3 +4,7 @@ if test -f "$FILE"; then
 	rm $FILE
 fi
 python NuRadioMC/EvtGen/generate_cylinder.py $FILE 100 1e18 1e18 0 3000 -2700 0 --proposal --proposal_config "Greenland"
+python NuRadioMC/test/EvtGen/T02test_proposal_workers.py
+
+# cleanup
+rm $FILE
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+from NuRadioMC.SignalGen import askaryan
+from NuRadioReco.utilities import units
+import numpy as np
+from numpy import testing
+
+"""
+this unit test checks that the vectorized calculation of many frequency spectra returns the same spectra as
+individual calls of `get_frequency_spectrum`
+"""
+
+np.random.seed(0)
+
+n_index = 1.78
+dt = 0.5 * units.ns
+n_samples = 256
+
+Es = 10 ** np.linspace(12.5, 19, 5) * units.eV
+thetas = np.arccos(1. / n_index) + np.linspace(-5, 5, 10) * units.deg
+Es, thetas, shower_types = [x.ravel() for x in np.meshgrid(Es, thetas, ['EM', 'HAD'], indexing='ij')]
+Rs = np.random.uniform(100, 3000, len(Es)) * units.m
+
+for model in ['ZHS1992', 'Alvarez2000', 'Alvarez2009', 'HCRB2017']:
+    print(f"testing model {model}")
+    askaryan.set_seed(model, 1234)
+    spectra = np.array([askaryan.get_frequency_spectrum(Es[i], thetas[i], n_samples, dt, shower_types[i], n_index, Rs[i], model)
+                        for i in range(len(Es))])
+    askaryan.set_seed(model, 1234)
+    spectra_vectorized = askaryan.get_frequency_spectra(Es, thetas, n_samples, dt, shower_types, n_index, Rs, model)
+    testing.assert_equal(spectra_vectorized.shape, (len(Es), n_samples // 2 + 1))
+    testing.assert_allclose(spectra_vectorized, spectra, rtol=1e-10, atol=1e-10 * np.max(np.abs(spectra)))
+
+print('SignalGen vectorized spectra test passed without any issues!')
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+from NuRadioMC.SignalGen.ARZ import ARZ
+from NuRadioReco.utilities import units
+import numpy as np
+from numpy import testing
+import os
+
+"""
+this unit test checks that the vector potentials of many observers calculated at once from the same charge-excess
+profile are identical to the ones calculated individually for each observer
+"""
+
+library_path = os.path.join(os.path.dirname(ARZ.__file__), "shower_library")
+bins, depth_e, N_e = np.loadtxt(os.path.join(library_path, "nue_1EeV_CC_1_s0001.t1005"), unpack=True)
+bins, depth_p, N_p = np.loadtxt(os.path.join(library_path, "nue_1EeV_CC_1_s0001.t1006"), unpack=True)
+profile_depth = (depth_e - 1000) * units.g / units.cm ** 2  # all simulations have an artificial offset of 1000 g/cm^2
+profile_ce = N_e - N_p
+
+model_parameters = dict(Af=-4.071e-14 * units.V * units.s, t0_pos=0.0391 * units.ns, freq_pos=2.338 / units.ns,
+                        exp_pos=-3.320, t0_neg=0.0234 * units.ns, freq_neg=2.686 / units.ns, exp_neg=-3.687)
+n_index = 1.78
+thetas = np.arccos(1. / n_index) + np.array([-3, -0.2, 0, 1, 10]) * units.deg
+distances = np.array([100, 1500, 800, 300, 2000]) * units.m
+N = 512
+dt = 0.1 * units.ns
+
+test_kwargs = [{'interp_factor': 1, 'interp_factor2': 100}, {'interp_factor': 2, 'interp_factor2': 1, 'shift_for_xmax': True},
+               {'interp_factor': 1, 'interp_factor2': 100, 'chunk_size': 10000}]
+if ARZ.numba_available:
+    test_kwargs.append({'interp_factor': 1, 'interp_factor2': 100, 'use_numba': True})
+for kwargs in test_kwargs:
+    print(f"testing {kwargs}")
+    vps = ARZ.get_vector_potentials(1 * units.EeV, thetas, N, dt, profile_depth, profile_ce, shower_type="HAD",
+                                    n_index=n_index, distances=distances, em_factor=0.9, **model_parameters, **kwargs)
+    testing.assert_equal(vps.shape, (len(thetas), N + 1, 3))
+    for i in range(len(thetas)):
+        vp = ARZ.get_vector_potential(1 * units.EeV, thetas[i], N, dt, profile_depth, profile_ce, shower_type="HAD",
+                                      n_index=n_index, distance=distances[i], em_factor=0.9, **model_parameters,
+                                      **{key: value for key, value in kwargs.items() if key not in ['chunk_size', 'use_numba']})
+        testing.assert_allclose(vps[i], vp, rtol=1e-10, atol=1e-10 * np.max(np.abs(vp)))
+
+print('ARZ vector potential test passed without any issues!')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+from NuRadioMC.SignalGen.ARZ import ARZ
+from NuRadioReco.utilities import units
+import numpy as np
+from numpy import testing
+import tempfile
+import shutil
+import pickle
+import time
+import os
+
+"""
+this unit test checks that the memory-mapped shower library returns the same profiles as the pickled library, that
+the conversion and the hash are cached and that the ARZ model calculates the same signals from both libraries
+"""
+
+library_path = os.path.join(os.path.dirname(ARZ.__file__), "shower_library")
+bins, depth_e, N_e = np.loadtxt(os.path.join(library_path, "nue_1EeV_CC_1_s0001.t1005"), unpack=True)
+bins, depth_p, N_p = np.loadtxt(os.path.join(library_path, "nue_1EeV_CC_1_s0001.t1006"), unpack=True)
+profile_depth = (depth_e - 1000) * units.g / units.cm ** 2  # all simulations have an artificial offset of 1000 g/cm^2
+profile_ce = N_e - N_p
+
+np.random.seed(42)
+library_dict = {}
+for shower_type in ['HAD', 'EM']:
+    library_dict[shower_type] = {}
+    for energy in [1e17 * units.eV, 1e18 * units.eV, 1e19 * units.eV]:
+        library_dict[shower_type][energy] = {'depth': profile_depth,
+                                             'charge_excess': np.array([profile_ce * energy / units.EeV * np.random.uniform(0.8, 1.2)
+                                                                        for i in range(5)])}
+
+tmp_dir = tempfile.mkdtemp()
+library = os.path.join(tmp_dir, "library_v1.2.pkl")
+with open(library, 'wb') as fout:
+    pickle.dump(library_dict, fout, protocol=4)
+
+mmap_library = ARZ.load_shower_library(library)
+assert os.path.exists(library + ".sha1.json")
+index_file = os.path.join(tmp_dir, "library_v1.2", "index.json")
+mtime = os.stat(index_file).st_mtime_ns
+testing.assert_equal(sorted(mmap_library.keys()), sorted(library_dict.keys()))
+for shower_type in library_dict:
+    testing.assert_equal(list(mmap_library[shower_type]), list(library_dict[shower_type]))
+    for energy in library_dict[shower_type]:
+        for key in ['depth', 'charge_excess']:
+            testing.assert_equal(mmap_library[shower_type][energy][key], library_dict[shower_type][energy][key])
+            assert isinstance(mmap_library[shower_type][energy][key], np.memmap)
+
+# the second call neither converts nor hashes the library
+mmap_library = ARZ.load_shower_library(library)
+assert os.stat(index_file).st_mtime_ns == mtime
+
+# a changed library is converted again
+library_dict['HAD'][1e18 * units.eV]['charge_excess'][0] *= 2
+time.sleep(0.01)
+with open(library, 'wb') as fout:
+    pickle.dump(library_dict, fout, protocol=4)
+mmap_library = ARZ.load_shower_library(library)
+testing.assert_equal(mmap_library['HAD'][1e18 * units.eV]['charge_excess'], library_dict['HAD'][1e18 * units.eV]['charge_excess'])
+
+arz = ARZ.ARZ(library=library, use_numba=False)
+n_index = 1.78
+theta = np.arccos(1. / n_index) + 0.5 * units.deg
+for shower_type in ['HAD', 'EM']:
+    for energy in [2e17 * units.eV, 1e18 * units.eV]:
+        arz._library = mmap_library
+        trace = arz.get_time_trace(energy, theta, 256, 0.1 * units.ns, shower_type, n_index, 1 * units.km, iN=3)
+        arz._library = library_dict
+        trace_dict = arz.get_time_trace(energy, theta, 256, 0.1 * units.ns, shower_type, n_index, 1 * units.km, iN=3)
+        testing.assert_equal(trace, trace_dict)
+
+shutil.rmtree(tmp_dir)
+print('ARZ shower library test passed without any issues!')
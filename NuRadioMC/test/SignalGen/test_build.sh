@@ -2,3 +2,6 @@
 
 set -e
 NuRadioMC/test/SignalGen/U01unit_test.py NuRadioMC/test/SignalGen/reference_v1.pkl
+NuRadioMC/test/SignalGen/U02test_frequency_spectra.py
+NuRadioMC/test/SignalGen/U03test_ARZ_vector_potentials.py
+NuRadioMC/test/SignalGen/U04test_ARZ_shower_library.py
@@ -0,0 +1,88 @@
+import argparse
+import sys
+import numpy as np
+from numpy import testing
+from NuRadioMC.SignalProp import analyticraytracing as ray
+from NuRadioMC.utilities import medium
+from NuRadioReco.utilities import units
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+"""
+this unit test compares the batched ray tracing of many pairs of points (`find_solutions_batch`) with the
+results of the ray tracing of every pair separately. If the C++ ray tracer is available, the batched C++ ray tracing
+is also compared to the ray tracing of the python implementation.
+"""
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--require_cpp', action='store_true',
+                    help='fail if the C++ implementation of the batched ray tracing is not available')
+args = parser.parse_args()
+
+cpp_available = ray.cpp_available and hasattr(ray.wrapper, 'find_solutions_batch')
+if not cpp_available:
+    if args.require_cpp:
+        print('the C++ implementation of the batched ray tracing is not available')
+        sys.exit(-1)
+    print('the C++ implementation of the batched ray tracing is not available, only the python implementation is tested')
+
+
+def get_results(r, x1, x2, batch):
+    """
+    ray tracing of every pair of points separately, the results are returned in the format of `find_solutions_batch`
+    """
+    results = {key: np.full_like(value, np.nan, dtype=float) for key, value in batch.items() if key != 'n_solutions'}
+    results['n_solutions'] = np.zeros(len(x1), dtype=int)
+    for iX in range(len(x1)):
+        r.set_start_and_end_point(x1[iX], x2[iX])
+        r.find_solutions()
+        results['n_solutions'][iX] = r.get_number_of_solutions()
+        for iS in range(r.get_number_of_solutions()):
+            output = r.get_raytracing_output(iS)
+            for key in ['ray_tracing_C0', 'ray_tracing_C1', 'ray_tracing_reflection', 'ray_tracing_reflection_case',
+                        'ray_tracing_solution_type']:
+                results[key][iX, iS] = output[key]
+            results['launch_vectors'][iX, iS] = r.get_launch_vector(iS)
+            results['receive_vectors'][iX, iS] = r.get_receive_vector(iS)
+            results['travel_distances'][iX, iS] = r.get_path_length(iS)
+            results['travel_times'][iX, iS] = r.get_travel_time(iS)
+    return results
+
+
+def compare(batch, results, rtol, atol):
+    testing.assert_equal(batch['n_solutions'], results['n_solutions'])
+    for key in ['ray_tracing_C0', 'ray_tracing_C1', 'launch_vectors', 'receive_vectors']:
+        testing.assert_allclose(batch[key], results[key], rtol=rtol, atol=atol)
+    for key in ['ray_tracing_reflection', 'ray_tracing_reflection_case', 'ray_tracing_solution_type']:
+        mask = ~np.isnan(results[key])
+        testing.assert_equal(batch[key][mask], results[key][mask])
+    # the analytic path length and travel time formulas are sensitive to rounding, the vectorized calculation
+    # agrees to a precision much better than the accuracy of the analytic formula (see T02test_analytic_D_T.py)
+    testing.assert_allclose(batch['travel_distances'], results['travel_distances'], rtol=max(rtol, 1e-7))
+    testing.assert_allclose(batch['travel_times'], results['travel_times'], rtol=max(rtol, 1e-7))
+
+
+np.random.seed(0)  # set seed to have reproducible results
+n_events = 200
+
+for ice, n_reflections, zmax in [(medium.southpole_simple(), 0, -3. * units.km),
+                                 (medium.mooresbay_simple(), 1, -570. * units.m)]:
+    rr = np.random.triangular(50. * units.m, 3. * units.km, 3. * units.km, n_events)
+    phiphi = np.random.uniform(0, 2 * np.pi, n_events)
+    x1 = np.array([rr * np.cos(phiphi), rr * np.sin(phiphi), np.random.uniform(-1 * units.m, zmax, n_events)]).T
+    x2 = np.array([np.random.uniform(-20, 20, n_events), np.random.uniform(-20, 20, n_events),
+                   np.random.uniform(-5, -1, n_events)]).T * units.m
+    # also test emitters above the receiver
+    x1[::3], x2[::3] = x2[::3].copy(), x1[::3].copy()
+
+    r = ray.ray_tracing(ice, n_reflections=n_reflections)
+    batch = r.find_solutions_batch(x1, x2)
+    compare(batch, get_results(r, x1, x2, batch), rtol=1e-10, atol=1e-10)
+    if cpp_available:
+        # the C++ and python implementations find the roots with a different numerical precision
+        # (see T01test_python_vs_cpp.py)
+        ray.cpp_available = False
+        compare(batch, get_results(r, x1, x2, batch), rtol=1e-5, atol=1e-5)
+        ray.cpp_available = True
+
+print('T07test_batch_raytracing passed without issues')
@@ -0,0 +1,61 @@
+import numpy as np
+import tempfile
+import shutil
+import time
+from numpy import testing
+from NuRadioReco.utilities import units
+from NuRadioMC.utilities import medium
+from NuRadioMC.SignalProp import propagation
+from NuRadioMC.SignalProp.analyticraytracing import ray_tracing
+
+"""
+this unit test checks that the tabulated ray tracer (with a small lookup table) returns the same solutions as the
+analytic ray tracer
+"""
+
+np.random.seed(42)
+
+ice = medium.get_ice_model('southpole_2015')
+table_path = tempfile.mkdtemp()
+config = {'propagation': {'attenuate_ice': True, 'focusing': False, 'focusing_limit': 2,
+                          'tabulated': {'table_path': table_path,
+                                        'max_distance': 1000, 'distance_step': 100,
+                                        'min_depth': -1000, 'depth_step': 50,
+                                        'n_frequencies': 50, 'min_frequency': 10, 'max_frequency': 1000}}}
+
+t0 = time.time()
+tabulated = propagation.get_propagation_module('tabulated')(ice, config=config)
+t_create = time.time() - t0
+analytic = ray_tracing(ice)
+
+n_events = 100
+x1 = np.array([np.random.uniform(-700, 700, n_events), np.random.uniform(-700, 700, n_events),
+               np.random.uniform(-950, -5, n_events)]).T * units.m
+x2 = np.array([0, 0, -5]) * units.m
+x2 = np.array([x2 + [0, 0, -dz] for dz in np.random.uniform(0, 150, n_events)])
+frequencies = np.linspace(0, 1000, 51) * units.MHz
+
+for i in range(n_events):
+    analytic.set_start_and_end_point(x1[i], x2[i])
+    analytic.find_solutions()
+    tabulated.set_start_and_end_point(x1[i], x2[i])
+    tabulated.find_solutions()
+    testing.assert_equal(tabulated.get_number_of_solutions(), analytic.get_number_of_solutions())
+    for iS in range(analytic.get_number_of_solutions()):
+        testing.assert_equal(tabulated.get_solution_type(iS), analytic.get_solution_type(iS))
+        testing.assert_allclose(tabulated.get_results()[iS]['C0'], analytic.get_results()[iS]['C0'], rtol=1e-5)
+        testing.assert_allclose(tabulated.get_launch_vector(iS), analytic.get_launch_vector(iS), atol=1e-5)
+        testing.assert_allclose(tabulated.get_travel_time(iS), analytic.get_travel_time(iS), rtol=1e-6)
+        testing.assert_allclose(tabulated.get_attenuation(iS, frequencies), analytic.get_attenuation(iS, frequencies),
+                                rtol=1e-2)
+
+statistics = tabulated._r2d.get_statistics()
+print(f"{statistics['tabulated']} solutions obtained from the table, {statistics['fallback']} from the analytic ray tracer")
+assert statistics['tabulated'] > statistics['fallback']
+
+# the second initialization reads the table from disk
+t0 = time.time()
+tabulated = propagation.get_propagation_module('tabulated')(ice, config=config)
+assert time.time() - t0 < 0.1 * t_create
+shutil.rmtree(table_path)
+print("T08test_tabulated_raytracing passed without issues")
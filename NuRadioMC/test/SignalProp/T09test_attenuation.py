@@ -0,0 +1,40 @@
+import numpy as np
+from numpy import testing
+from NuRadioReco.utilities import units
+from NuRadioMC.utilities import medium
+from NuRadioMC.SignalProp.analyticraytracing import ray_tracing
+
+"""
+this unit test checks that the attenuation calculated with tabulated attenuation lengths (`exact_attenuation: False`) agrees
+with the exact numerical integration along the ray path, and that the attenuation of repeated ray paths is cached
+"""
+
+np.random.seed(42)
+
+frequencies = np.fft.rfftfreq(2048, 1. / (5 * units.GHz))
+for ice_model, attenuation_model, n_reflections in [('southpole_2015', 'SP1', 0), ('mooresbay_simple', 'MB1', 1)]:
+    ice = medium.get_ice_model(ice_model)
+    config = {'propagation': {'attenuate_ice': True, 'focusing': False, 'focusing_limit': 2, 'exact_attenuation': True}}
+    exact = ray_tracing(ice, attenuation_model, n_reflections=n_reflections, config=config)
+    config_cached = {'propagation': {'attenuate_ice': True, 'focusing': False, 'focusing_limit': 2, 'exact_attenuation': False}}
+    cached = ray_tracing(ice, attenuation_model, n_reflections=n_reflections, config=config_cached)
+
+    n_events = 20
+    z_min = -2500 if ice_model == 'southpole_2015' else -500
+    x1 = np.array([np.random.uniform(-1000, 1000, n_events), np.random.uniform(-1000, 1000, n_events),
+                   np.random.uniform(z_min, -5, n_events)]).T * units.m
+    x2 = np.array([0, 0, -5]) * units.m
+    for i in range(n_events):
+        for rt in [exact, cached]:
+            rt.set_start_and_end_point(x1[i], x2)
+            rt.find_solutions()
+        for iS in range(exact.get_number_of_solutions()):
+            attenuation = cached.get_attenuation(iS, frequencies, 0.5 * units.GHz)
+            # the numerical integration of the exact calculation has a relative precision of 1%
+            testing.assert_allclose(attenuation, exact.get_attenuation(iS, frequencies, 0.5 * units.GHz),
+                                    rtol=1e-2, atol=1e-6)
+            # the second calculation is obtained from the cache
+            testing.assert_equal(cached.get_attenuation(iS, frequencies, 0.5 * units.GHz), attenuation)
+    statistics = cached.get_attenuation_cache_statistics()
+    assert statistics['hits'] == statistics['misses'] > 0
+print("T09test_attenuation passed without issues")
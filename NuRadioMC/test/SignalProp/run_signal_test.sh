@@ -5,6 +5,9 @@ python3 T02test_analytic_D_T.py
 python3 T04MooresBay.py
 python3 T05unit_test_C0_SP.py
 python3 T06unit_test_C0_mooresbay.py
+python3 T07test_batch_raytracing.py
+python3 T08test_tabulated_raytracing.py
+python3 T09test_attenuation.py
 cd ../../SignalProp/examples
 python3 example_3d.py
 python3 A01IceCubePulserToARA.py
\ No newline at end of file
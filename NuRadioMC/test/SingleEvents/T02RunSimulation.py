@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 from __future__ import absolute_import, division, print_function
 import argparse
+import os
+import signal
 # import detector simulation modules
 import NuRadioReco.modules.efieldToVoltageConverter
 import NuRadioReco.modules.trigger.highLowThreshold
@@ -60,6 +62,12 @@ class mySimulation(simulation.simulation):
                                     set_not_triggered=(not station.has_triggered("simple_threshold")))  # calculate more time consuming ARIANNA trigger only if station passes simple trigger
         triggerTimeAdjuster.run(evt, station, det)
 
+        if args.kill_after is not None:
+            # simulate an interrupted run, the process is killed without any cleanup
+            self._n_simulated_triggers = getattr(self, '_n_simulated_triggers', 0) + 1
+            if self._n_simulated_triggers >= args.kill_after:
+                os.kill(os.getpid(), signal.SIGKILL)
+
 
 parser = argparse.ArgumentParser(description='Run NuRadioMC simulation')
 parser.add_argument('inputfilename', type=str,
@@ -72,6 +80,10 @@ parser.add_argument('outputfilename', type=str,
                     help='hdf5 output filename')
 parser.add_argument('outputfilenameNuRadioReco', type=str, nargs='?', default=None,
                     help='outputfilename of NuRadioReco detector sim file')
+parser.add_argument('--n_workers', type=int, default=None,
+                    help='the number of processes of the sharded mode (default: serial run)')
+parser.add_argument('--kill_after', type=int, default=None,
+                    help='kill the process after the trigger was simulated for the given number of events')
 args = parser.parse_args()
 
 sim = mySimulation(inputfilename=args.inputfilename,
@@ -81,6 +93,7 @@ sim = mySimulation(inputfilename=args.inputfilename,
                             config_file=args.config,
                             write_mode='mini',
                             default_detector_station=101,
-                            file_overwrite=True)
+                            file_overwrite=True,
+                            n_workers=args.n_workers)
 sim.run()
 
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+import sys
+import os
+import h5py
+
+"""
+checks that the datasets of the hdf5 output file are stored in the same layout as in the reference file (which was
+written with all data at once) and that the output file is not larger than the reference file
+"""
+
+file1 = sys.argv[1]
+file2 = sys.argv[2]
+print("Testing the layout of the file {} against {}".format(file1, file2))
+
+max_size_ratio = 1.1
+
+error = 0
+with h5py.File(file1, 'r') as fin1, h5py.File(file2, 'r') as fin2:
+    datasets = []
+    fin2.visititems(lambda name, obj: datasets.append(name) if isinstance(obj, h5py.Dataset) else None)
+    for name in datasets:
+        if name not in fin1:
+            continue
+        if fin1[name].chunks != fin2[name].chunks:
+            print(f"dataset {name} has the chunks {fin1[name].chunks} but {fin2[name].chunks} in the reference file")
+            error = -1
+
+size1 = os.path.getsize(file1)
+size2 = os.path.getsize(file2)
+if size1 > max_size_ratio * size2:
+    print(f"the file size of {size1} bytes is more than {max_size_ratio} times the size of the reference file ({size2} bytes)")
+    error = -1
+
+if error == -1:
+    sys.exit(-1)
+print("The file layout is the same as in the reference file.")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import h5py
+import numpy as np
+import NuRadioReco.modules.io.eventReader
+
+"""
+checks that two hdf5 output files (and optionally two nur files) of the simulation are identical, e.g. the output
+of an interrupted and resumed run and the one of an uninterrupted run, or the outputs of sharded runs with different
+numbers of workers
+"""
+
+parser = argparse.ArgumentParser(description='check that two simulation outputs are identical')
+parser.add_argument('hdf5_files', type=str, nargs=2, help='the hdf5 output files')
+parser.add_argument('--nur_files', type=str, nargs=2, default=None, help='the nur output files')
+parser.add_argument('--expect_different', action='store_true',
+                    help='check that the hdf5 files are not identical instead (e.g. for different random numbers)')
+args = parser.parse_args()
+
+print("Testing the files {} and {} for equality".format(*args.hdf5_files))
+
+
+def get_differences(fin1, fin2):
+    differences = []
+    for key in sorted(set(fin1.attrs.keys()) | set(fin2.attrs.keys())):
+        if key not in fin1.attrs or key not in fin2.attrs:
+            differences.append(f"attribute {fin1.name}:{key} exists only in one file")
+        elif not np.array_equal(fin1.attrs[key], fin2.attrs[key]):
+            differences.append(f"attribute {fin1.name}:{key} differs")
+    for key in sorted(set(fin1.keys()) | set(fin2.keys())):
+        if key not in fin1 or key not in fin2:
+            differences.append(f"{fin1.name}/{key} exists only in one file")
+        elif isinstance(fin1[key], h5py.Group):
+            differences.extend(get_differences(fin1[key], fin2[key]))
+        else:
+            value1 = fin1[key][()]
+            value2 = fin2[key][()]
+            equal_nan = value1.dtype.kind in 'fc' and value2.dtype.kind in 'fc'
+            if value1.shape != value2.shape or not np.array_equal(value1, value2, equal_nan=equal_nan):
+                differences.append(f"dataset {fin1[key].name} differs")
+    return differences
+
+
+with h5py.File(args.hdf5_files[0], 'r') as fin1, h5py.File(args.hdf5_files[1], 'r') as fin2:
+    differences = get_differences(fin1, fin2)
+
+if args.expect_different:
+    if len(differences) == 0:
+        print("The hdf5 files are identical but should differ")
+        sys.exit(-1)
+    print("The hdf5 files differ as expected: {}".format(", ".join(differences)))
+    sys.exit(0)
+elif len(differences):
+    print("\n".join(differences))
+    sys.exit(-1)
+
+
+def get_events(filename):
+    event_reader = NuRadioReco.modules.io.eventReader.eventReader()
+    event_reader.begin(filename)
+    return [event for event in event_reader.run()]
+
+
+if args.nur_files is not None:
+    print("Testing the files {} and {} for equality".format(*args.nur_files))
+    events1 = get_events(args.nur_files[0])
+    events2 = get_events(args.nur_files[1])
+    error = 0
+    if len(events1) != len(events2):
+        print(f"the files contain {len(events1)} and {len(events2)} events")
+        sys.exit(-1)
+    for event1, event2 in zip(events1, events2):
+        event_id = (event1.get_run_number(), event1.get_id())
+        if event_id != (event2.get_run_number(), event2.get_id()):
+            print(f"event {event_id} differs from {(event2.get_run_number(), event2.get_id())}")
+            error = -1
+            continue
+        for station1, station2 in zip(event1.get_stations(), event2.get_stations()):
+            traces1 = [channel.get_trace() for channel in station1.iter_channels()]
+            traces1 += [efield.get_trace() for efield in station1.get_sim_station().get_electric_fields()]
+            traces2 = [channel.get_trace() for channel in station2.iter_channels()]
+            traces2 += [efield.get_trace() for efield in station2.get_sim_station().get_electric_fields()]
+            if len(traces1) != len(traces2) or not all(np.array_equal(trace1, trace2) for trace1, trace2 in zip(traces1, traces2)):
+                print(f"the traces of station {station1.get_id()} of event {event_id} differ")
+                error = -1
+            if station1.get_triggers().keys() != station2.get_triggers().keys() or \
+                    any(station1.has_triggered(name) != station2.has_triggered(name) for name in station1.get_triggers()):
+                print(f"the triggers of station {station1.get_id()} of event {event_id} differ")
+                error = -1
+    if error == -1:
+        sys.exit(-1)
+
+print("The files are identical")
@@ -3,9 +3,34 @@ set -e
 
 python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config.yaml NuRadioMC/test/SingleEvents/1e18_output.hdf5 NuRadioMC/test/SingleEvents/1e18_output.nur
 python3 NuRadioMC/test/SingleEvents/T04validate_allmost_equal.py NuRadioMC/test/SingleEvents/1e18_output.hdf5 NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5
+python3 NuRadioMC/test/SingleEvents/T06validate_file_layout.py NuRadioMC/test/SingleEvents/1e18_output.hdf5 NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5
 python3 NuRadioMC/test/SingleEvents/T05validate_nur_file.py NuRadioMC/test/SingleEvents/1e18_output.nur NuRadioMC/test/SingleEvents/1e18_output_reference.nur
 python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise.yaml NuRadioMC/test/SingleEvents/1e18_output_noise.hdf5
 python3 NuRadioMC/test/SingleEvents/T04validate_allmost_equal.py NuRadioMC/test/SingleEvents/1e18_output_noise.hdf5 NuRadioMC/test/SingleEvents/1e18_output_noise_reference.hdf5
 
+# the output of the sharded mode does not depend on the number of workers. Without random numbers (no noise), it is
+# the same as the output of a serial run, but the random numbers are derived per event group and differ from the ones
+# of a serial run.
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config.yaml NuRadioMC/test/SingleEvents/1e18_output_workers2.hdf5 NuRadioMC/test/SingleEvents/1e18_output_workers2.nur --n_workers 2
+python3 NuRadioMC/test/SingleEvents/T07validate_identical.py NuRadioMC/test/SingleEvents/1e18_output.hdf5 NuRadioMC/test/SingleEvents/1e18_output_workers2.hdf5 --nur_files NuRadioMC/test/SingleEvents/1e18_output.nur NuRadioMC/test/SingleEvents/1e18_output_workers2.nur
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise.yaml NuRadioMC/test/SingleEvents/1e18_output_noise_workers1.hdf5 NuRadioMC/test/SingleEvents/1e18_output_noise_workers1.nur --n_workers 1
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise.yaml NuRadioMC/test/SingleEvents/1e18_output_noise_workers2.hdf5 NuRadioMC/test/SingleEvents/1e18_output_noise_workers2.nur --n_workers 2
+python3 NuRadioMC/test/SingleEvents/T07validate_identical.py NuRadioMC/test/SingleEvents/1e18_output_noise_workers1.hdf5 NuRadioMC/test/SingleEvents/1e18_output_noise_workers2.hdf5 --nur_files NuRadioMC/test/SingleEvents/1e18_output_noise_workers1.nur NuRadioMC/test/SingleEvents/1e18_output_noise_workers2.nur
+python3 NuRadioMC/test/SingleEvents/T07validate_identical.py NuRadioMC/test/SingleEvents/1e18_output_noise.hdf5 NuRadioMC/test/SingleEvents/1e18_output_noise_workers1.hdf5 --expect_different
+
+# a simulation that is killed and resumed from its checkpoint gives the same output as an uninterrupted one, and the
+# checkpoint files are removed when the simulation has finished
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise_checkpoint.yaml NuRadioMC/test/SingleEvents/1e18_output_checkpoint.hdf5 NuRadioMC/test/SingleEvents/1e18_output_checkpoint.nur
+test -z "$(ls NuRadioMC/test/SingleEvents/1e18_output_checkpoint.hdf5.checkpoint* 2> /dev/null)"
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise_checkpoint.yaml NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5 NuRadioMC/test/SingleEvents/1e18_output_resumed.nur --kill_after 5 || true
+test ! -e NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5
+test -e NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5.checkpoint
+python3 NuRadioMC/test/SingleEvents/T02RunSimulation.py NuRadioMC/test/SingleEvents/1e18_output_reference.hdf5 NuRadioMC/test/SingleEvents/surface_station_1GHz.json NuRadioMC/test/SingleEvents/config_noise_checkpoint.yaml NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5 NuRadioMC/test/SingleEvents/1e18_output_resumed.nur
+python3 NuRadioMC/test/SingleEvents/T07validate_identical.py NuRadioMC/test/SingleEvents/1e18_output_checkpoint.hdf5 NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5 --nur_files NuRadioMC/test/SingleEvents/1e18_output_checkpoint.nur NuRadioMC/test/SingleEvents/1e18_output_resumed.nur
+test -z "$(ls NuRadioMC/test/SingleEvents/1e18_output_resumed.hdf5.checkpoint* 2> /dev/null)"  # .checkpoint, .checkpoint.hdf5 and their .tmp files
+
 # cleanup 
-rm -v NuRadioMC/test/SingleEvents/{1e18_output_noise.hdf5,1e18_output.hdf5,1e18_output.nur}
\ No newline at end of file
+rm -v NuRadioMC/test/SingleEvents/{1e18_output_noise.hdf5,1e18_output.hdf5,1e18_output.nur}
+rm -v NuRadioMC/test/SingleEvents/{1e18_output_workers2.hdf5,1e18_output_workers2.nur}
+rm -v NuRadioMC/test/SingleEvents/{1e18_output_noise_workers1.hdf5,1e18_output_noise_workers1.nur,1e18_output_noise_workers2.hdf5,1e18_output_noise_workers2.nur}
+rm -v NuRadioMC/test/SingleEvents/{1e18_output_checkpoint.hdf5,1e18_output_checkpoint.nur,1e18_output_resumed.hdf5,1e18_output_resumed.nur}
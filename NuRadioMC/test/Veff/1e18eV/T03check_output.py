@@ -56,6 +56,17 @@ Veff_utl, Veff_utl_error, utl_weighed_sum, t1, t2 = data['veff']['highlow_2sigma
 Veff_utl = Veff_utl * 4 * np.pi
 np.testing.assert_almost_equal(Veff_utl, Veff, decimal=3)
 
+# the summary file (written by the first call, read by the second) gives the same effective volumes
+for i in range(2):
+    data_summary = NuRadioMC.utilities.Veff.get_Veff_Aeff(os.path.join(path, "output.hdf5"), summary=True)[0]
+    assert data_summary['veff'] == data['veff']
+
+# datasets that are not in the summary are read from the hdf5 file, which is closed together with the summary
+with NuRadioMC.utilities.Veff.veffSummary(os.path.join(path, "output.hdf5")) as fin:
+    dataset = fin['energies']
+    assert dataset.id.valid
+assert not dataset.id.valid
+
 ###########################
 # Code to generate new average values for this test
 ###########################
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import numpy as np
+from numpy import testing
+from NuRadioReco.utilities import units
+from NuRadioMC.utilities import cross_sections
+from NuRadioMC.utilities.earth_attenuation import get_weight
+
+"""
+this unit test checks that the tabulated cross sections agree with the direct calculation to the documented
+relative accuracy of 1e-7, for single neutrinos and arrays
+"""
+
+rnd = np.random.default_rng(42)
+n = 10000
+# the tables cover 1e4 GeV to 1e12 GeV (the range of validity of the ctw parameterization)
+energies = 10 ** rnd.uniform(13, 21, n) * units.eV
+flavors = rnd.choice([12, -12, 14, -14, 16, -16], n)
+inttypes = rnd.choice(['cc', 'nc'], n)
+
+for cross_section_type in ['ctw', 'hedis_bgr18', 'ghandi', 'csms']:
+    E = energies
+    if cross_section_type == 'csms':
+        # the csms table ends at 5e20 eV
+        E = np.minimum(E, 5e20 * units.eV)
+    elif cross_section_type == 'ghandi':
+        # energies outside of the tabulated range are calculated directly
+        E = energies * 10 ** rnd.uniform(-1, 1, n)
+    for inttype in ['cc', 'nc', 'total']:
+        testing.assert_allclose(
+            cross_sections.get_nu_cross_section(E, flavors, inttype=inttype, cross_section_type=cross_section_type, tabulated=True),
+            cross_sections.get_nu_cross_section(E, flavors, inttype=inttype, cross_section_type=cross_section_type),
+            rtol=1e-7)
+        if cross_section_type == 'csms':
+            # the csms cross sections are only available for arrays and are not tabulated again
+            continue
+        for i in range(0, n, 500):
+            testing.assert_allclose(
+                cross_sections.get_nu_cross_section(E[i], flavors[i], inttype=inttype, cross_section_type=cross_section_type, tabulated=True),
+                cross_sections.get_nu_cross_section(E[i], flavors[i], inttype=inttype, cross_section_type=cross_section_type),
+                rtol=1e-7)
+    testing.assert_allclose(
+        cross_sections.get_nu_cross_section(E, flavors, inttype=inttypes, cross_section_type=cross_section_type, tabulated=True),
+        cross_sections.get_nu_cross_section(E, flavors, inttype=inttypes, cross_section_type=cross_section_type),
+        rtol=1e-7)
+    testing.assert_allclose(
+        cross_sections.get_interaction_length(E, flavor=flavors, cross_section_type=cross_section_type, tabulated=True),
+        cross_sections.get_interaction_length(E, flavor=flavors, cross_section_type=cross_section_type),
+        rtol=1e-7)
+
+# the Earth attenuation weights of neutrinos that are not fully absorbed
+zeniths = rnd.uniform(0, 100 * units.deg, n)
+for mode in ['simple', 'core_mantle_crust_simple']:
+    testing.assert_allclose(get_weight(zeniths, energies, flavors, mode=mode, tabulated_cross_sections=True),
+                            get_weight(zeniths, energies, flavors, mode=mode), rtol=1e-6)
+print("T01test_tabulated_cross_sections passed without issues")
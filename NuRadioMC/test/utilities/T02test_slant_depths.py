@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import numpy as np
+from numpy import testing
+from NuRadioReco.utilities import units
+from NuRadioMC.utilities import earth_attenuation
+
+"""
+this unit test checks the exact slant depths of `PREM.slant_depths` against the closed form of the chord length
+through an Earth of constant density, and against the numerical integration of `PREM.slant_depth` with a small
+step size for the PREM and core-mantle-crust models
+"""
+
+
+class ConstantDensityModel(earth_attenuation.PREM):
+    """
+    Earth of constant density
+    """
+    radii = (earth_attenuation.PREM.earth_radius,)
+    density_coefficients = (np.array([2.5]) * units.g / units.cm ** 3,)
+    densities = earth_attenuation._get_density_functions(density_coefficients)
+
+
+rnd = np.random.default_rng(42)
+n = 1000
+# endpoints from the surface down to 3km depth, and isotropic directions (chords pointing upwards have a slant depth
+# of zero)
+endpoints = np.zeros((n, 3))
+endpoints[:, :2] = rnd.uniform(-5, 5, (n, 2)) * units.km
+endpoints[:, 2] = -rnd.uniform(0, 3, n) * units.km
+zeniths = np.arccos(rnd.uniform(-1, 1, n))
+azimuths = rnd.uniform(0, 2 * np.pi, n)
+directions = -np.array([np.sin(zeniths) * np.cos(azimuths), np.sin(zeniths) * np.sin(azimuths), np.cos(zeniths)]).T
+
+# constant density: the slant depth is the density times the distance from the endpoint to the surface
+model = ConstantDensityModel()
+positions = endpoints + np.array([0, 0, model.earth_radius])
+dot_prod = np.sum(positions * directions, axis=-1)
+lengths = -dot_prod + np.sqrt(dot_prod ** 2 - np.sum(positions ** 2, axis=-1) + model.earth_radius ** 2)
+testing.assert_allclose(model.slant_depths(endpoints, directions),
+                        model.density_coefficients[0][0] * lengths,
+                        rtol=1e-9, atol=1e-9 * model.density_coefficients[0][0] * units.km)
+
+# PREM and core-mantle-crust model: numerical integration with a step size of 1m. The trapezoidal integration of
+# `slant_depth` has an error of the order of the step size times the density jumps along the chord (the density is
+# zero at the point where the chord leaves the Earth), which is bounded by the step size times the maximum density
+step = 1 * units.m
+for model in [earth_attenuation.PREM(), earth_attenuation.CoreMantleCrustModel()]:
+    depths = model.slant_depths(endpoints, directions)
+    max_density = np.max(model.density(np.linspace(0, model.earth_radius, 10000)))
+    for i in range(0, n, 100):
+        testing.assert_allclose(depths[i], model.slant_depth(endpoints[i], directions[i].copy(), step=step),
+                                rtol=0, atol=step * max_density)
+        testing.assert_allclose(model.slant_depths(endpoints[i], directions[i]), depths[i:i + 1], rtol=1e-12)
+print("T02test_slant_depths passed without issues")
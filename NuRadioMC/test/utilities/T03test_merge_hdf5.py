@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import h5py
+import numpy as np
+from NuRadioMC.utilities.merge_hdf5 import merge2
+
+"""
+this unit test merges three NuRadioMC output files with overlapping event group ids and compares the merged file to
+a reference that was merged by the previous implementation of `merge2`, which read all files into memory. The
+merge is repeated with a station group that is missing from one of the files, which only removes the rows of this
+file from the merged station group.
+"""
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--create_reference', help='create new reference instead of comparing to current reference', action='store_true')
+args = parser.parse_args()
+
+output_dir = 'NuRadioMC/test/utilities/'
+reference_filename = output_dir + 'merge_hdf5_reference.hdf5'
+# the first event group id and the number of event groups of the input files, the ids of neighbouring files overlap
+event_group_ranges = [(0, 12), (8, 15), (20, 10)]
+
+
+def write_file(filename, i_file, missing_station=None):
+    """
+    writes an output file with a structure similar to the one of the simulation, with a random number of showers per
+    event group and two stations that trigger on a subset of the showers
+    """
+    rnd = np.random.default_rng(i_file)
+    first_id, n_groups = event_group_ranges[i_file]
+    event_group_ids = np.repeat(np.arange(first_id, first_id + n_groups), rnd.integers(1, 4, n_groups))
+    n = len(event_group_ids)
+    with h5py.File(filename, 'w') as fout:
+        fout.attrs['n_events'] = 100 * (i_file + 1)
+        fout.attrs['trigger_names'] = np.array(['trigger_a', 'trigger_b'], dtype=h5py.string_dtype())
+        fout.attrs['Emin'] = 1e18
+        fout.attrs['start_event_id'] = 1000 * i_file
+        fout['event_group_ids'] = event_group_ids
+        fout['event_ids'] = np.arange(n) + 1000 * i_file
+        fout['weights'] = rnd.uniform(0, 1, n)
+        fout['multiple_triggers'] = rnd.uniform(0, 1, (n, 2)) > 0.3
+        fout['triggered'] = np.any(fout['multiple_triggers'][...], axis=1)
+        for station_id in [101, 102]:
+            mask = rnd.uniform(0, 1, n) > 0.4
+            if station_id == missing_station:
+                continue
+            g = fout.create_group(f'station_{station_id}')
+            g.attrs['Vrms'] = 1e-5 * station_id
+            g['event_group_ids'] = event_group_ids[mask]
+            g['event_ids'] = fout['event_ids'][mask]
+            g['max_amp_shower_and_ray'] = rnd.uniform(0, 1, (np.sum(mask), 4, 2))
+            g['multiple_triggers'] = rnd.uniform(0, 1, (np.sum(mask), 2)) > 0.5
+
+
+def read_file(filename):
+    data = {}
+    with h5py.File(filename, 'r') as fin:
+        fin.visititems(lambda name, obj: data.update({name: obj[...]}) if isinstance(obj, h5py.Dataset) else None)
+        attrs = {key: fin.attrs[key] for key in fin.attrs}
+        for key in fin:
+            if isinstance(fin[key], h5py.Group):
+                attrs.update({f"{key}:{key2}": fin[key].attrs[key2] for key2 in fin[key].attrs})
+    return data, attrs
+
+
+def compare(filename, reference, description):
+    data, attrs = read_file(filename)
+    reference_data, reference_attrs = reference
+    error = 0
+    for key in sorted(set(data.keys()) | set(reference_data.keys())):
+        if key not in data or key not in reference_data:
+            print(f"{description}: data set {key} exists only in one file")
+            error = -1
+        elif data[key].dtype != reference_data[key].dtype or not np.array_equal(data[key], reference_data[key]):
+            print(f"{description}: data set {key} differs")
+            error = -1
+    for key in sorted(set(attrs.keys()) | set(reference_attrs.keys())):
+        if key not in attrs or key not in reference_attrs or not np.array_equal(attrs[key], reference_attrs[key]):
+            print(f"{description}: attribute {key} differs")
+            error = -1
+    if error == -1:
+        sys.exit(-1)
+    print(f"{description}: the merged file is identical to the reference")
+
+
+filenames = [output_dir + f'merge_hdf5_input{i_file}.hdf5' for i_file in range(3)]
+for i_file, filename in enumerate(filenames):
+    write_file(filename, i_file)
+merged_filename = output_dir + 'merge_hdf5_merged.hdf5'
+if args.create_reference:
+    merge2(filenames, reference_filename)
+    for filename in filenames:
+        os.remove(filename)
+    sys.exit(0)
+merge2(filenames, merged_filename, buffer_size=100)  # small buffer to copy the data sets in several chunks
+reference = read_file(reference_filename)
+compare(merged_filename, reference, "three files")
+
+# a station group that is missing from the first or the second file, the rows of this file are missing from the
+# station group of the merged file
+n_rows = []
+for filename in filenames:
+    with h5py.File(filename, 'r') as fin:
+        n_rows.append(len(fin['station_102/event_ids']))
+for i_missing in [0, 1]:
+    write_file(filenames[i_missing], i_missing, missing_station=102)
+    merge2(filenames, merged_filename)
+    write_file(filenames[i_missing], i_missing)
+    data = dict(reference[0])
+    missing_rows = np.arange(sum(n_rows[:i_missing]), sum(n_rows[:i_missing + 1]))
+    for key in data:
+        if key.startswith('station_102/'):
+            data[key] = np.delete(data[key], missing_rows, axis=0)
+    compare(merged_filename, (data, reference[1]), f"station group missing from file {i_missing}")
+
+for filename in filenames + [merged_filename]:
+    os.remove(filename)
+print("T03test_merge_hdf5 passed without issues")
@@ -0,0 +1,6 @@
+#!/bin/bash
+
+set -e
+NuRadioMC/test/utilities/T01test_tabulated_cross_sections.py
+NuRadioMC/test/utilities/T02test_slant_depths.py
+NuRadioMC/test/utilities/T03test_merge_hdf5.py
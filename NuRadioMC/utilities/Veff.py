@@ -8,6 +8,7 @@ import json
 import os
 import copy
 import time
+import hashlib
 
 from NuRadioReco.utilities import units
 
@@ -167,9 +168,148 @@ def get_veff_output(volume, counts, all_events):
     return [v_eff, v_eff_error, counts, v_eff_low, v_eff_high]
 
 
+# the datasets of a NuRadioMC hdf5 output file (and of its station groups) that are stored in the summary files
+_summary_datasets = ['weights', 'zeniths', 'triggered', 'multiple_triggers', 'event_group_ids']
+_summary_station_datasets = ['event_group_ids', 'maximum_amplitudes_envelope']
+
+
+def get_summary_filename(filename, summary_folder=None):
+    """
+    returns the filename of the summary of a NuRadioMC hdf5 output file (see `veffSummary`)
+
+    Parameters
+    ----------
+    filename: string
+        filename of the hdf5 file
+    summary_folder: string or None
+        the folder of the summary files. If None, the summary is stored next to the hdf5 file, otherwise the
+        absolute path of the hdf5 file is encoded in the filename of the summary
+    """
+    if summary_folder is None:
+        return filename + ".veff_summary.hdf5"
+    path_hash = hashlib.sha1(os.path.abspath(filename).encode()).hexdigest()[:8]
+    return os.path.join(summary_folder, f"{os.path.basename(filename)}.{path_hash}.veff_summary.hdf5")
+
+
+def write_summary(filename, summary_filename):
+    """
+    writes the summary of a NuRadioMC hdf5 output file, i.e., all attributes and the datasets needed for the
+    effective volume calculation, together with the size and modification time of the hdf5 file
+    """
+    logger.info(f"writing summary of {filename} to {summary_filename}")
+    stat = os.stat(filename)
+    tmp_filename = f"{summary_filename}.tmp{os.getpid()}"
+    with h5py.File(filename, 'r') as fin, h5py.File(tmp_filename, 'w') as fout:
+        for key in fin.attrs:
+            fout.attrs.create(key, fin.attrs[key], dtype=fin.attrs.get_id(key).dtype)
+        fout.attrs['summary_source_size'] = stat.st_size
+        fout.attrs['summary_source_mtime_ns'] = stat.st_mtime_ns
+        for key in fin:
+            if key in _summary_datasets:
+                fin.copy(fin[key], fout, name=key)
+            elif key.startswith("station_"):
+                group = fout.create_group(key)
+                for station_key in _summary_station_datasets:
+                    if station_key in fin[key]:
+                        fin.copy(fin[key][station_key], group, name=station_key)
+    os.replace(tmp_filename, summary_filename)
+
+
+class veffSummary:
+    """
+    the summary of a NuRadioMC hdf5 output file for the effective volume calculation
+
+    The summary is a small hdf5 file that contains all attributes and only the datasets that are needed to
+    calculate effective volumes (weights, zenith angles, triggers and event group ids, and per station the event group
+    ids and maximum amplitudes). It is written on first use and rewritten whenever the size or the modification time of
+    the hdf5 file changes. All datasets of the summary are held in memory, the remaining datasets are read from the
+    hdf5 file on request, which stays open until `close` is called. The object can be used in place of the `h5py.File`
+    of the hdf5 file, also as a context manager.
+    """
+
+    def __init__(self, filename, summary_folder=None):
+        """
+        Parameters
+        ----------
+        filename: string
+            filename of the hdf5 file
+        summary_folder: string or None
+            the folder of the summary files (see `get_summary_filename`)
+        """
+        self._filename = filename
+        self._file = None
+        summary_filename = get_summary_filename(filename, summary_folder)
+        if not self.__is_valid(summary_filename):
+            write_summary(filename, summary_filename)
+        self.attrs = {}
+        self._data = {}
+        with h5py.File(summary_filename, 'r') as fin:
+            for key in fin.attrs:
+                if not key.startswith("summary_source_"):
+                    self.attrs[key] = fin.attrs[key]
+            for key in fin:
+                if isinstance(fin[key], h5py.Group):
+                    self._data[key] = {station_key: fin[key][station_key][()] for station_key in fin[key]}
+                else:
+                    self._data[key] = fin[key][()]
+
+    def __is_valid(self, summary_filename):
+        if not os.path.exists(summary_filename):
+            return False
+        stat = os.stat(self._filename)
+        try:
+            with h5py.File(summary_filename, 'r') as fin:
+                return (fin.attrs['summary_source_size'] == stat.st_size and
+                        fin.attrs['summary_source_mtime_ns'] == stat.st_mtime_ns)
+        except (OSError, KeyError):
+            logger.warning(f"summary file {summary_filename} is corrupt, rewriting it")
+            return False
+
+    def keys(self):
+        return self._data.keys()
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        if key in self._data:
+            return self._data[key]
+        if self._file is None:
+            self._file = h5py.File(self._filename, 'r')
+        return self._file[key]
+
+    def close(self):
+        """
+        closes the hdf5 file if datasets were read from it
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_file(filename, summary=False, summary_folder=None):
+    """
+    opens a NuRadioMC hdf5 output file for the effective volume calculation, returns the `h5py.File` or, if
+    `summary` is True, the `veffSummary` of the file
+    """
+    if summary:
+        return veffSummary(filename, summary_folder)
+    return h5py.File(filename, 'r')
+
+
 def get_Veff_Aeff_single(
         filename, trigger_names, trigger_names_dict, trigger_combinations, 
-        deposited, station, veff_aeff="veff", bounds_theta=[0, np.pi]):
+        deposited, station, veff_aeff="veff", bounds_theta=[0, np.pi],
+        summary=False, summary_folder=None):
     """
     Calculates the effective volume or effective area from surface muons from 
     a single NuRadioMC hdf5 file
@@ -224,6 +364,12 @@ def get_Veff_Aeff_single(
         restrict theta to sub-range wrt. the simulated range in the file
         Note: assumes events were simulated uniformly in cos(theta)
         bounds_theta should be a (two-item) list, but will care only about the min/max values
+
+    summary: bool
+        if True, the datasets are read from the summary of the file (see `veffSummary`)
+
+    summary_folder: string or None
+        the folder of the summary files. If None, the summary is stored next to the hdf5 file
     
     Returns
     -------
@@ -236,7 +382,16 @@ def get_Veff_Aeff_single(
         raise AttributeError(f"the paramter `veff_aeff` needs to be one of either `veff` or `aeff_surface_muons`")
     
     logger.warning(f"processing file  {filename}")
-    fin = h5py.File(filename, 'r')
+    with open_file(filename, summary, summary_folder) as fin:
+        return _get_Veff_Aeff_single(fin, filename, trigger_names, trigger_names_dict, trigger_combinations, deposited,
+                                     station, veff_aeff, bounds_theta)
+
+
+def _get_Veff_Aeff_single(fin, filename, trigger_names, trigger_names_dict, trigger_combinations, deposited, station,
+                          veff_aeff, bounds_theta):
+    """
+    calculates the effective volume or area of the opened hdf5 file `fin` (see `get_Veff_Aeff_single`)
+    """
     n_events = fin.attrs['n_events']
 
     out = {}
@@ -487,7 +642,8 @@ def get_Veff_Aeff(folder,
              trigger_combinations={},
              station=101,
              veff_aeff="veff",
-             n_cores=1, oversampling_theta=1):
+             n_cores=1, oversampling_theta=1,
+             summary=False, summary_folder=None):
     """
     calculates the effective volume or effective area from surface muons from NuRadioMC hdf5 files
 
@@ -537,6 +693,14 @@ def get_Veff_Aeff(folder,
         * >1: oversampling with <oversampling_theta> equal-size cos(theta) bins within thetamin/max of the input file
         
         .. Note:: oversampling assumes that events were simulated uniformly in cos(theta)
+
+    summary: bool
+        if True, a compact summary of each hdf5 file with only the datasets needed for the effective volume
+        calculation is written on first use (and rewritten whenever the hdf5 file changes), repeated calculations
+        read only the summaries (see `veffSummary`)
+
+    summary_folder: string or None
+        the folder of the summary files. If None (default), the summaries are stored next to the hdf5 files
     
     Returns
     -------
@@ -559,24 +723,24 @@ def get_Veff_Aeff(folder,
         filenames = sorted(filenames)
 
     for iF, filename in enumerate(filenames):
-        fin = h5py.File(filename, 'r')
-        if 'deposited' in fin.attrs:
-            deposited = fin.attrs['deposited']
-            if prev_deposited is None:
-                prev_deposited = deposited
-            elif prev_deposited != deposited:
-                raise AttributeError("The deposited parameter is not consistent among the input files!")
+        with open_file(filename, summary, summary_folder) as fin:
+            if 'deposited' in fin.attrs:
+                deposited = fin.attrs['deposited']
+                if prev_deposited is None:
+                    prev_deposited = deposited
+                elif prev_deposited != deposited:
+                    raise AttributeError("The deposited parameter is not consistent among the input files!")
 
     for iF, filename in enumerate(filenames):
-        fin = h5py.File(filename, 'r')
-        if 'trigger_names' in fin.attrs:
-            trigger_names = fin.attrs['trigger_names']
-            if len(trigger_names) > 0:
-                for iT, trigger_name in enumerate(trigger_names):
-                    trigger_names_dict[trigger_name] = iT
-                
-                logger.info(f"first file with triggernames {filename}: {trigger_names}")
-                break
+        with open_file(filename, summary, summary_folder) as fin:
+            if 'trigger_names' in fin.attrs:
+                trigger_names = fin.attrs['trigger_names']
+                if len(trigger_names) > 0:
+                    for iT, trigger_name in enumerate(trigger_names):
+                        trigger_names_dict[trigger_name] = iT
+                    
+                    logger.info(f"first file with triggernames {filename}: {trigger_names}")
+                    break
 
     trigger_combinations['all_triggers'] = {'triggers': trigger_names}
     logger.info(f"Trigger names:  {trigger_names}")
@@ -594,19 +758,21 @@ def get_Veff_Aeff(folder,
     args = []
     if oversampling_theta == 1:
         for f in filenames:
-            args.append([f, trigger_names, trigger_names_dict, trigger_combinations, deposited, station, veff_aeff])
+            args.append([f, trigger_names, trigger_names_dict, trigger_combinations, deposited, station, veff_aeff,
+                         [0, np.pi], summary, summary_folder])
     else:
         # get the thetamin, thetamax from the files and do oversampling
         logger.info("Calculating effective volumes with finer binning, {} bins per input file".format(oversampling_theta))
         for f in filenames:
-            fin = h5py.File(f, 'r')
-            costhetamin = np.cos(fin.attrs['thetamin'])
-            costhetamax = np.cos(fin.attrs['thetamax'])
+            with open_file(f, summary, summary_folder) as fin:
+                costhetamin = np.cos(fin.attrs['thetamin'])
+                costhetamax = np.cos(fin.attrs['thetamax'])
             thetas = np.arccos(np.linspace(costhetamin, costhetamax, oversampling_theta + 1))
             thetas_min = thetas[:-1]
             thetas_max = thetas[1:]
             for bounds_theta in zip(thetas_min, thetas_max):
-                args.append([f, trigger_names, trigger_names_dict, trigger_combinations, deposited, station, veff_aeff, bounds_theta])
+                args.append([f, trigger_names, trigger_names_dict, trigger_combinations, deposited, station, veff_aeff,
+                             bounds_theta, summary, summary_folder])
 
     if n_cores == 1:
         output = []
@@ -7,6 +7,7 @@ logging.basicConfig()
 logger.setLevel(logging.INFO)
 
 import scipy.interpolate
+import functools
 import os
 
 model_to_int = {"SP1": 1, "GL1": 2, "MB1": 3, "GL2": 4, "GL3": 5}
@@ -194,6 +195,87 @@ def get_attenuation_length(z, frequency, model):
     return att_length_f
 
 
+class attenuation_length_table:
+    """
+    tabulates the inverse attenuation length 1/L(z, f) of an attenuation model on a regular grid of depths
+    for a fixed set of frequencies
+
+    The inverse attenuation length at arbitrary depths is obtained via linear interpolation, which makes integrals of
+    the attenuation along ray paths much faster than evaluating the attenuation model for every point and frequency.
+    """
+
+    def __init__(self, model, frequencies, z_min=-5 * units.km, dz=0.5 * units.m):
+        """
+        Parameters
+        ----------
+        model: string
+            the attenuation model (see `get_attenuation_length`)
+        frequencies: array of floats
+            the frequencies for which the attenuation length is tabulated
+        z_min: float
+            the deepest point of the table. The attenuation length of deeper points is calculated directly.
+        dz: float
+            the spacing of the depth grid
+        """
+        self.model = model
+        self.frequencies = np.array(frequencies, dtype=float)
+        self._z_min = z_min
+        self._dz = dz
+        self._z = np.arange(0, z_min - 0.5 * dz, -dz)[::-1]
+        self._z_min = self._z[0]
+        self._table = self.__calculate(self._z)
+
+    def __calculate(self, z):
+        result = np.zeros((len(z), len(self.frequencies)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # some models are not defined for depths below the ice of the corresponding site
+            for iF, frequency in enumerate(self.frequencies):
+                result[:, iF] = 1. / get_attenuation_length(z, frequency, self.model)
+        return result
+
+    def get_inverse_attenuation_length(self, z):
+        """
+        returns the inverse attenuation length 1/L(z, f) for all tabulated frequencies
+
+        Parameters
+        ----------
+        z: float or array of floats
+            depth in default units
+
+        Returns
+        -------
+        array of shape z.shape + (number of frequencies,), zero above the ice surface
+        """
+        z = np.asarray(z, dtype=float)
+        index = np.clip(((z - self._z_min) // self._dz).astype(int), 0, len(self._z) - 2)
+        weight = ((z - self._z[index]) / self._dz)[..., None]
+        result = (1 - weight) * self._table[index] + weight * self._table[index + 1]
+        result[z > 0] = 0
+        outside = z < self._z_min
+        if np.any(outside):
+            result[outside] = self.__calculate(z[outside])
+        return result
+
+
+@functools.lru_cache(maxsize=32)
+def get_attenuation_length_table(model, frequencies):
+    """
+    returns the (cached) table of the inverse attenuation length of an attenuation model
+
+    Parameters
+    ----------
+    model: string
+        the attenuation model (see `get_attenuation_length`)
+    frequencies: tuple of floats
+        the frequencies for which the attenuation length is tabulated
+
+    Returns
+    -------
+    attenuation_length_table
+    """
+    return attenuation_length_table(model, frequencies)
+
+
 if __name__ == "__main__":
     import matplotlib.pyplot as plt
 
@@ -10,10 +10,12 @@ AMU = 1.66e-27 * units.kg
 
 
 def get_weight(theta_nu, pnu, flavors, mode='simple', cross_section_type='ctw',
-               vertex_position=None, phi_nu=None):
+               vertex_position=None, phi_nu=None, tabulated_cross_sections=False):
     """
     calculates neutrino weight due to Earth absorption for different models
 
+    All arguments can be arrays to calculate the weights of many neutrinos at once.
+
     Parameters
     ----------
     theta_nu: float or array of floats
@@ -27,30 +29,29 @@ def get_weight(theta_nu, pnu, flavors, mode='simple', cross_section_type='ctw',
         * 'PREM': density of Earth is parameterized as a fuction of radius, path through Earth to interaction vertex is considered
     cross_section_type: string
         'ghandi', 'ctw' or 'csms' (see description in `cross_sections.py`)
-    vertex_position: 3-dim array or None (default)
+    vertex_position: 3-dim array, array of shape (n, 3) or None (default)
         the position of the neutrino interaction
-    phi_nu: float
+    phi_nu: float or array of floats
         the azimuth angle of the neutrino direction
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
     """
     if(mode == 'simple'):
-        return get_simple_weight(theta_nu, pnu, cross_section_type=cross_section_type)
+        return get_simple_weight(theta_nu, pnu, cross_section_type=cross_section_type,
+                                 tabulated_cross_sections=tabulated_cross_sections)
     elif (mode == "core_mantle_crust_simple"):
-        return get_core_mantle_crust_weight(theta_nu, pnu, flavors, cross_section_type=cross_section_type)
-    elif (mode == "core_mantle_crust"):
-        earth = CoreMantleCrustModel()
-        direction = hp.spherical_to_cartesian(theta_nu, phi_nu)
-        slant_depth = earth.slant_depth(vertex_position, direction)
-        # by requesting the interaction length for a density of 1, we get it in units of length**2/weight
-        L_int = cross_sections.get_interaction_length(pnu, density=1., flavor=flavors, inttype='total',
-                                                      cross_section_type=cross_section_type)
-        return np.exp(-slant_depth / L_int)
-    elif (mode == "PREM"):
-        earth = PREM()
+        return get_core_mantle_crust_weight(theta_nu, pnu, flavors, cross_section_type=cross_section_type,
+                                            tabulated_cross_sections=tabulated_cross_sections)
+    elif (mode == "core_mantle_crust" or mode == "PREM"):
         direction = hp.spherical_to_cartesian(theta_nu, phi_nu)
-        slant_depth = earth.slant_depth(vertex_position, direction)
+        slant_depth = _earth_models[mode].slant_depths(vertex_position, direction)
+        if(np.ndim(theta_nu) == 0):
+            slant_depth = slant_depth[0]
         # by requesting the interaction length for a density of 1, we get it in units of length**2/weight
         L_int = cross_sections.get_interaction_length(pnu, density=1., flavor=flavors, inttype='total',
-                                                      cross_section_type=cross_section_type)
+                                                      cross_section_type=cross_section_type,
+                                                      tabulated=tabulated_cross_sections)
         return np.exp(-slant_depth / L_int)
     elif (mode == "None"):
         return 1.
@@ -59,7 +60,7 @@ def get_weight(theta_nu, pnu, flavors, mode='simple', cross_section_type='ctw',
         raise NotImplementedError
 
 
-def get_simple_weight(theta_nu, pnu, cross_section_type='ctw'):
+def get_simple_weight(theta_nu, pnu, cross_section_type='ctw', tabulated_cross_sections=False):
     """
     calculates neutrino weight due to Earth absorption, i.e. probability of the
     neutrino to reach the detector
@@ -73,18 +74,21 @@ def get_simple_weight(theta_nu, pnu, cross_section_type='ctw'):
         the zenith angle of the neutrino direction (where it came from, i.e., opposite to the direction of propagation)
     pnu: float or array of floats
         the momentum of the neutrino
+    cross_section_type: string
+        'ghandi', 'ctw' or 'csms' (see description in `cross_sections.py`)
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables
     """
     R_earth = 6357390 * units.m
     DensityCRUST = 2900 * units.kg / units.m ** 3
-    if(theta_nu <= 0.5 * np.pi):  # coming from above
-        return np.ones_like(theta_nu)
-    else:  # coming from below
-        sigma = cross_sections.get_nu_cross_section(pnu, flavors=0, cross_section_type=cross_section_type)
-        d = -2 * R_earth * np.cos(theta_nu)
-        return np.exp(-d * sigma * DensityCRUST / AMU)
+    sigma = cross_sections.get_nu_cross_section(pnu, flavors=0, cross_section_type=cross_section_type,
+                                                tabulated=tabulated_cross_sections)
+    # neutrinos coming from above are not attenuated
+    d = np.maximum(-2 * R_earth * np.cos(theta_nu), 0)
+    return np.exp(-d * sigma * DensityCRUST / AMU)
 
 
-def get_core_mantle_crust_weight(theta_nu, pnu, flavors, cross_section_type='ctw'):
+def get_core_mantle_crust_weight(theta_nu, pnu, flavors, cross_section_type='ctw', tabulated_cross_sections=False):
     """
     calculates neutrino weight due to Earth absorption with a three layers earth model, i.e. probability of the
     neutrino to reach the detector
@@ -102,26 +106,49 @@ def get_core_mantle_crust_weight(theta_nu, pnu, flavors, cross_section_type='ctw
         the momentum of the neutrino
     flavors: float or array of floats
         the flavor of the neutrino
+    cross_section_type: string
+        'ghandi', 'ctw' or 'csms' (see description in `cross_sections.py`)
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables
     """
     R_EARTH = 6.378140e6 * units.m
     densities = np.array([14000.0, 3400.0, 2900.0]) * units.kg / units.m ** 3  # inner layer, middle layer, outer layer
     radii = np.array([3.46e6 * units.m, R_EARTH - 4.0e4 * units.m, R_EARTH])  # average radii of boundaries between earth layers
-    sigma = cross_sections.get_nu_cross_section(pnu, flavors, cross_section_type=cross_section_type)
-    if(theta_nu <= 0.5 * np.pi):  # coming from above
-        return np.ones_like(theta_nu)
-    elif (theta_nu <= np.pi - np.arcsin(radii[1] / radii[2])):  # only go through the outer layer
-        d_outer = -2 * R_EARTH * np.cos(theta_nu)
-        weight = np.exp(-d_outer * sigma * densities[2] / AMU)
-    elif (theta_nu <= np.pi - np.arcsin(radii[0] / radii[2])):  # only go through the outer and middle layer
-        d_middle = 2 * np.sqrt(radii[1] * radii[1] - radii[2] * radii[2] * np.sin(np.pi - theta_nu) * np.sin(np.pi - theta_nu))
-        d_outer = -2 * R_EARTH * np.cos(theta_nu) - d_middle
-        weight = np.exp(-d_outer * sigma * densities[2] / AMU - d_middle * sigma * densities[1] / AMU)
-    else:  # go through all three layers
-        d_inner = 2 * np.sqrt(radii[0] * radii[0] - radii[2] * radii[2] * np.sin(np.pi - theta_nu) * np.sin(np.pi - theta_nu))
-        d_middle = 2 * np.sqrt(radii[1] * radii[1] - radii[2] * radii[2] * np.sin(np.pi - theta_nu) * np.sin(np.pi - theta_nu)) - d_inner
-        d_outer = -2 * R_EARTH * np.cos(theta_nu) - d_middle - d_inner
-        weight = np.exp(-d_outer * sigma * densities[2] / AMU - d_middle * sigma * densities[1] / AMU - d_inner * sigma * densities[0] / AMU)
-    return weight
+    sigma = cross_sections.get_nu_cross_section(pnu, flavors, cross_section_type=cross_section_type,
+                                                tabulated=tabulated_cross_sections)
+    # the path lengths through the layers, neutrinos coming from above are not attenuated
+    from_below = np.asarray(theta_nu) > 0.5 * np.pi
+    d_inner = np.where(from_below, 2 * np.sqrt(np.maximum(radii[0] * radii[0] - radii[2] * radii[2] * np.sin(np.pi - theta_nu) * np.sin(np.pi - theta_nu), 0)), 0)
+    d_middle = np.where(from_below, 2 * np.sqrt(np.maximum(radii[1] * radii[1] - radii[2] * radii[2] * np.sin(np.pi - theta_nu) * np.sin(np.pi - theta_nu), 0)), 0) - d_inner
+    d_outer = np.where(from_below, -2 * R_EARTH * np.cos(theta_nu), 0) - d_middle - d_inner
+    weight = np.exp(-d_outer * sigma * densities[2] / AMU - d_middle * sigma * densities[1] / AMU - d_inner * sigma * densities[0] / AMU)
+    return weight[()]
+
+
+def _get_density_functions(density_coefficients):
+    """
+    returns the density functions of the radius ranges of an Earth model (see `PREM.densities`) from the
+    coefficients of the density polynomials
+    """
+    return tuple(coefficients[0] if len(coefficients) == 1 else np.polynomial.Polynomial(coefficients)
+                 for coefficients in density_coefficients)
+
+
+def _get_chord_integrals(b, s):
+    """
+    returns the integrals of r**j (j = 0, 1, 2, 3) along a straight line from the point of closest approach
+    to the center to the position s, where b is the distance of closest approach and r = sqrt(b**2 + s**2)
+    """
+    b2 = b ** 2
+    r = np.sqrt(b2 + s ** 2)
+    # b**2 * arcsinh(s / b) which goes to 0 for b -> 0
+    b2_arcsinh = np.zeros_like(r)
+    mask = b > 0
+    b2_arcsinh[mask] = b2[mask] * np.arcsinh(s[mask] / b[mask])
+    return np.array([s,
+                     0.5 * (s * r + b2_arcsinh),
+                     b2 * s + s ** 3 / 3.,
+                     0.25 * s * r ** 3 + 0.375 * b2 * s * r + 0.375 * b2 * b2_arcsinh])
 
 
 # PREM class from pyrex: https://github.com/bhokansonfasig/pyrex/blob/d84a3270efa19fb4a21590510f7c3458845c9600/pyrex/earth_model.py
@@ -140,6 +167,11 @@ class PREM:
         Earth changes. The density function in `densities` at index `i`
         corresponds to the radius range from radius at index `i-1` to radius
         at index `i`.
+    density_coefficients : tuple
+        The coefficients of the densities in each radius range as described by
+        `radii` as polynomials of the fractional radius, i.e. the density at
+        the fractional radius `x` is `sum(c[j] * x ** j)`. They are used for the
+        exact calculation of the slant depths in `slant_depths`.
     densities : tuple
         Functions which calculate the density of the Earth in a
         specific radius range as described by `radii`. The parameter of each
@@ -163,19 +195,21 @@ class PREM:
     radii = (1.2215e6 * units.m, 3.4800e6 * units.m, 5.7010e6 * units.m, 5.7710e6 * units.m, 5.9710e6 * units.m,
              6.1510e6 * units.m, 6.3466e6 * units.m, 6.3560e6 * units.m, 6.3680e6 * units.m, earth_radius)
 
-    # `x` is fraction of earth radius
-    densities = (
-        lambda x: (13.0885 * units.g / units.cm ** 3 - 8.8381 * units.g / units.cm ** 3 * x ** 2),
-        lambda x: 12.5815 * units.g / units.cm ** 3 - 1.2638 * units.g / units.cm ** 3 * x - 3.6426 * units.g / units.cm ** 3 * x ** 2 - 5.5281 * units.g / units.cm ** 3 * x ** 3,
-        lambda x: 7.9565 * units.g / units.cm ** 3 - 6.4761 * units.g / units.cm ** 3 * x + 5.5283 * units.g / units.cm ** 3 * x ** 2 - 3.0807 * units.g / units.cm ** 3 * x ** 3,
-        lambda x: 5.3197 * units.g / units.cm ** 3 - 1.4836 * units.g / units.cm ** 3 * x,
-        lambda x: 11.2494 * units.g / units.cm ** 3 - 8.0298 * units.g / units.cm ** 3 * x,
-        lambda x: 7.1089 * units.g / units.cm ** 3 - 3.8045 * units.g / units.cm ** 3 * x,
-        lambda x: 2.691 * units.g / units.cm ** 3 + 0.6924 * units.g / units.cm ** 3 * x,
-        2.9 * units.g / units.cm ** 3,
-        2.6 * units.g / units.cm ** 3,
-        1.02 * units.g / units.cm ** 3
+    # the densities in each radius range as polynomial of `x`, the fraction of earth radius,
+    # i.e. c[0] + c[1] * x + c[2] * x ** 2 + c[3] * x ** 3
+    density_coefficients = (
+        np.array([13.0885, 0, -8.8381]) * units.g / units.cm ** 3,
+        np.array([12.5815, -1.2638, -3.6426, -5.5281]) * units.g / units.cm ** 3,
+        np.array([7.9565, -6.4761, 5.5283, -3.0807]) * units.g / units.cm ** 3,
+        np.array([5.3197, -1.4836]) * units.g / units.cm ** 3,
+        np.array([11.2494, -8.0298]) * units.g / units.cm ** 3,
+        np.array([7.1089, -3.8045]) * units.g / units.cm ** 3,
+        np.array([2.691, 0.6924]) * units.g / units.cm ** 3,
+        np.array([2.9]) * units.g / units.cm ** 3,
+        np.array([2.6]) * units.g / units.cm ** 3,
+        np.array([1.02]) * units.g / units.cm ** 3
     )
+    densities = _get_density_functions(density_coefficients)
 
     def density(self, r):
         """
@@ -229,6 +263,7 @@ class PREM:
         See Also
         --------
         PREM.density : Calculates the Earth's density at a given radius.
+        PREM.slant_depths : Calculates the column densities of many chords exactly.
 
         """
         # Convert to Earth-centric coordiante system (e.g. center of the Earth
@@ -258,6 +293,59 @@ class PREM:
         rhos = self.density(rs)
         return np.trapz(rhos * distance, ts)
 
+    def slant_depths(self, endpoints, directions):
+        """
+        Calculates the column densities of many chords cutting through Earth at once.
+
+        Same as `slant_depth` but for arrays of endpoints and directions. The
+        integral of the density along each chord is calculated exactly from
+        the intersections of the chord with the spherical shells of the model
+        and the analytic integrals of the density polynomials
+        (see `density_coefficients`) instead of a numerical integration.
+
+        Parameters
+        ----------
+        endpoints : array_like (n, 3) or (3,)
+            Vector positions of the chord endpoints, in a coordinate system
+            centered on the surface of the Earth (e.g. a negative third
+            coordinate represents the depth below the surface).
+        directions : array_like (n, 3) or (3,)
+            Vector directions of the chords, in a coordinate system
+            centered on the surface of the Earth (e.g. a negative third
+            coordinate represents the chord pointing into the Earth).
+
+        Returns
+        -------
+        array of floats (n,)
+            Column densities along the chords starting at the endpoints and
+            passing through the Earth in the directions.
+
+        """
+        endpoints, directions = np.broadcast_arrays(np.atleast_2d(np.asarray(endpoints, dtype=float)),
+                                                    np.atleast_2d(np.asarray(directions, dtype=float)))
+        directions = directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+        # Convert to Earth-centric coordinate system in units of the earth radius
+        endpoints = (endpoints + np.array([0, 0, self.earth_radius])) / self.earth_radius
+        # the position along the chord is parameterized by the distance s to the point of closest approach to
+        # the center (at distance b), the chord starts at the endpoint and ends where it leaves the Earth
+        s_start = np.sum(endpoints * directions, axis=-1)
+        b = np.sqrt(np.maximum(np.sum(endpoints ** 2, axis=-1) - s_start ** 2, 0))
+        s_stop = np.sqrt(np.maximum(1 - b ** 2, 0))
+        s_stop = np.maximum(s_stop, s_start)
+
+        radius_bounds = np.concatenate(([0], self.radii)) / self.earth_radius
+        depths = np.zeros(len(endpoints))
+        for lower_radius, upper_radius, coefficients in zip(radius_bounds[:-1], radius_bounds[1:], self.density_coefficients):
+            # the chord is within the radius range for s_inner <= |s| < s_outer
+            s_inner = np.sqrt(np.maximum(lower_radius ** 2 - b ** 2, 0))
+            s_outer = np.sqrt(np.maximum(upper_radius ** 2 - b ** 2, 0))
+            for s_lower, s_upper in ((s_inner, s_outer), (-s_outer, -s_inner)):
+                s_lower = np.clip(s_lower, s_start, s_stop)
+                s_upper = np.clip(s_upper, s_start, s_stop)
+                integrals = _get_chord_integrals(b, s_upper) - _get_chord_integrals(b, s_lower)
+                depths += np.dot(coefficients, integrals[:len(coefficients)])
+        return depths * self.earth_radius
+
 
 class CoreMantleCrustModel(PREM):
     """
@@ -274,6 +362,9 @@ class CoreMantleCrustModel(PREM):
         Earth changes. The density function in `densities` at index `i`
         corresponds to the radius range from radius at index `i-1` to radius
         at index `i`.
+    density_coefficients : tuple
+        The densities of the Earth (g/cm^3) in each radius range as described by
+        `radii` (constant density).
     densities : tuple
         Functions which calculate the density of the Earth (g/cm^3) in a
         specific radius range as described by `radii`. The parameter of each
@@ -286,5 +377,10 @@ class CoreMantleCrustModel(PREM):
 
     radii = (np.sqrt(1.2e13) * units.m, earth_radius - 4e4 * units.m, earth_radius)
 
-    densities = (14 * units.g / units.cm ** 3, 3.4 * units.g / units.cm ** 3, 2.9 * units.g / units.cm ** 3)
+    density_coefficients = (np.array([14]) * units.g / units.cm ** 3, np.array([3.4]) * units.g / units.cm ** 3,
+                            np.array([2.9]) * units.g / units.cm ** 3)
+    densities = _get_density_functions(density_coefficients)
+
 
+# the Earth models of the weight modes that consider the path through the Earth to the interaction vertex
+_earth_models = {'core_mantle_crust': CoreMantleCrustModel(), 'PREM': PREM()}
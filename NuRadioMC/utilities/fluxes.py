@@ -49,7 +49,8 @@ def get_limit_flux(energy, veff_sr,
                     energyBinsPerDecade=1.000,
                     upperLimOnEvents=2.44,
                     nuCrsScn='ctw',
-                    inttype="total"):
+                    inttype="total",
+                    tabulated_cross_sections=False):
 
     """
     Limit from effective volume
@@ -71,13 +72,16 @@ def get_limit_flux(energy, veff_sr,
          2.44 for F-C UL w/ 0 background, etc
     nuCrsScn: str
         type of neutrino cross-section
-
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
 
     """
 
     evtsPerFluxPerEnergy = veff_sr * signalEff
     evtsPerFluxPerEnergy *= livetime
-    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype)
+    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype,
+                                                                  tabulated=tabulated_cross_sections)
 
     ul = upperLimOnEvents / evtsPerFluxPerEnergy
     ul *= energyBinsPerDecade / np.log(10)
@@ -132,7 +136,8 @@ def get_limit_e1_flux(energy, veff_sr,
                     energyBinsPerDecade=1.000,
                     upperLimOnEvents=2.44,
                     nuCrsScn='ctw',
-                    inttype="total"):
+                    inttype="total",
+                    tabulated_cross_sections=False):
 
     """
     Limit from effective volume on E^1 flux plot
@@ -154,13 +159,16 @@ def get_limit_e1_flux(energy, veff_sr,
          2.44 for F-C UL w/ 0 background, etc
     nuCrsScn: str
         type of neutrino cross-section
-
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
 
     """
 
     evtsPerFluxPerEnergy = veff_sr * signalEff
     evtsPerFluxPerEnergy *= livetime
-    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype)
+    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype,
+                                                                  tabulated=tabulated_cross_sections)
 
     ul = upperLimOnEvents / evtsPerFluxPerEnergy
     ul *= energyBinsPerDecade / np.log(10)
@@ -174,7 +182,8 @@ def get_limit_e2_flux(energy, veff_sr,
                     energyBinsPerDecade=1.000,
                     upperLimOnEvents=2.44,
                     nuCrsScn='ctw',
-                    inttype="total"):
+                    inttype="total",
+                    tabulated_cross_sections=False):
     """
     Limit from effective volume on E^2 flux plot
 
@@ -195,14 +204,16 @@ def get_limit_e2_flux(energy, veff_sr,
          2.44 for F-C UL w/ 0 background, etc
     nuCrsScn: str
         type of neutrino cross-section
-
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
 
     """
     return energy ** 2 * get_limit_flux(energy, veff_sr, livetime, signalEff, energyBinsPerDecade, upperLimOnEvents,
-                                        nuCrsScn, inttype)
+                                        nuCrsScn, inttype, tabulated_cross_sections)
 
 
-def get_number_of_events_for_flux(energies, flux, Veff, livetime, nuCrsScn='ctw'):
+def get_number_of_events_for_flux(energies, flux, Veff, livetime, nuCrsScn='ctw', tabulated_cross_sections=False):
     """
     calculates the number of expected neutrinos for a certain flux assumption
 
@@ -216,6 +227,11 @@ def get_number_of_events_for_flux(energies, flux, Veff, livetime, nuCrsScn='ctw'
         the effective volume per energy logE
     livetime: float
         the livetime of the detector (including signal efficiency)
+    nuCrsScn: str
+        type of neutrino cross-section
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
 
     Returns
     -------
@@ -225,10 +241,11 @@ def get_number_of_events_for_flux(energies, flux, Veff, livetime, nuCrsScn='ctw'
     Veff = np.array(Veff)
     logE = np.log10(energies)
     dlogE = logE[1] - logE[0]
-    return np.log(10) * livetime * flux * energies * Veff / cross_sections.get_interaction_length(energies, cross_section_type=nuCrsScn) * dlogE
+    return np.log(10) * livetime * flux * energies * Veff / \
+        cross_sections.get_interaction_length(energies, cross_section_type=nuCrsScn, tabulated=tabulated_cross_sections) * dlogE
 
 
-def get_exposure(energy, Veff, field_of_view=2 * np.pi):
+def get_exposure(energy, Veff, field_of_view=2 * np.pi, tabulated_cross_sections=False):
     """
     calculate exposure from effective volume
 
@@ -240,12 +257,15 @@ def get_exposure(energy, Veff, field_of_view=2 * np.pi):
         effective volume
     field_of_view: float
         the field of view of the detector
+    tabulated_cross_sections: bool (default False)
+        if True, the cross sections are interpolated from precalculated tables (see
+        `cross_sections.get_nu_cross_section`)
 
     Returns
     -------
     float: exposure
     """
-    return Veff / field_of_view / cross_sections.get_interaction_length(energy)
+    return Veff / field_of_view / cross_sections.get_interaction_length(energy, tabulated=tabulated_cross_sections)
 
 
 def get_integrated_exposure(exp_func, E_low, E_high):
@@ -13,19 +13,67 @@ logging.basicConfig(format='%(asctime)s %(levelname)s:%(name)s:%(message)s')
 logger.setLevel(logging.WARNING)
 
 
-def merge2(filenames, output_filename):
+def _remap_event_group_ids(event_group_ids, old_ids, new_ids):
+    """
+    replaces the event group ids `old_ids` (sorted) by `new_ids`
+    """
+    if(len(old_ids) == 0):
+        return event_group_ids
+    index = np.minimum(np.searchsorted(old_ids, event_group_ids), len(old_ids) - 1)
+    mask = old_ids[index] == event_group_ids
+    event_group_ids = np.array(event_group_ids)
+    event_group_ids[mask] = new_ids[index[mask]]
+    return event_group_ids
+
+
+def _copy_dataset(dset_in, dset_out, offset, buffer_size, event_group_id_map=None):
+    """
+    copies the data set `dset_in` in chunks of at most `buffer_size` bytes into the rows of `dset_out` starting
+    at `offset`, the event group ids are replaced if `event_group_id_map` (old ids, new ids) is given
+
+    Returns the number of copied rows
+    """
+    n_rows = len(dset_in)
+    row_size = dset_in.dtype.itemsize * int(np.prod(dset_in.shape[1:]))
+    n_chunk = max(1, int(buffer_size // max(row_size, 1)))
+    for start in range(0, n_rows, n_chunk):
+        chunk = dset_in[start:start + n_chunk]
+        if(event_group_id_map is not None):
+            chunk = _remap_event_group_ids(chunk, *event_group_id_map)
+        dset_out[offset + start:offset + start + len(chunk)] = chunk
+    return n_rows
+
+
+def merge2(filenames, output_filename, compression='gzip', buffer_size=2 ** 26):
+    """
+    merges NuRadioMC hdf5 output files
+
+    The files are merged in two passes: the first pass only reads the attributes, the shapes of the data sets and the
+    event group ids (to make them unique across the files), the second pass copies the data sets in chunks into
+    the preallocated data sets of the output file. Hence, the memory consumption does not depend on the number
+    and the size of the input files.
+
+    Parameters
+    ----------
+    filenames: list of strings
+        the input files
+    output_filename: string
+        the output file
+    compression: string or None (default 'gzip')
+        the compression filter of the output data sets
+    buffer_size: int (default 64MB)
+        the maximum number of bytes that are copied at once
+    """
     logger.warning(f"merging {len(filenames)} files into {os.path.basename(output_filename)}")
-    data = OrderedDict()
     attrs = OrderedDict()
-    groups = OrderedDict()
     group_attrs = OrderedDict()
-    n_data = {}
-    n_groups = {}
+    data_sets = OrderedDict()  # the shapes and dtypes of the data sets per file
+    groups = OrderedDict()  # the shapes and dtypes of the data sets of each group per file
     non_empty_filenames = []
     n_events_total = 0
 
     for f in filenames:
-        logger.info("adding file {}".format(f))
+        logger.info("reading meta data of file {}".format(f))
         fin = h5py.File(f, 'r')
         n_events_total += fin.attrs['n_events']
         logger.debug(f"increasing total number of events by {fin.attrs['n_events']:d} to {n_events_total:d} ")
@@ -37,19 +85,14 @@ def merge2(filenames, output_filename):
             non_empty_filenames.append(f)
             logger.debug(f"file {f} contains {np.sum(np.array(fin['triggered']))} triggered events.")
 
-        data[f] = {}
+        data_sets[f] = {}
         groups[f] = {}
 
         for key in fin:
             if isinstance(fin[key], h5py._hl.group.Group):  # loop through station groups
                 groups[f][key] = {}
-                if(key not in n_groups):
-                    n_groups[key] = {}
                 for key2 in fin[key]:
-                    groups[f][key][key2] = fin[key][key2][...]
-                    if(key2 not in n_groups[key]):
-                        n_groups[key][key2] = 0
-                    n_groups[key][key2] += len(groups[f][key][key2])
+                    groups[f][key][key2] = (fin[key][key2].shape, fin[key][key2].dtype)
                 if(key not in group_attrs):
                     group_attrs[key] = {}
                     for key2 in fin[key].attrs:
@@ -59,10 +102,7 @@ def merge2(filenames, output_filename):
                         if(not np.all(group_attrs[key][key2] == fin[key].attrs[key2])):
                             logger.warning(f"attribute {key2} of group {key} of file {filenames[0]} and {f} are different ({group_attrs[key][key2]} vs. {fin[key].attrs[key2]}. Using attribute value of first file, but you have been warned!")
             else:
-                data[f][key] = fin[key][...]
-                if(key not in n_data):
-                    n_data[key] = 0
-                n_data[key] += len(data[f][key])
+                data_sets[f][key] = (fin[key].shape, fin[key].dtype)
 
         for key in fin.attrs:
             if(key not in attrs):
@@ -90,105 +130,102 @@ def merge2(filenames, output_filename):
     if(len(non_empty_filenames)):
         # check event group ids for uniqueness (this is important because effective volume/area calculation uses the event
         # group id to determine if a multi station coincidence exists
-        # to start, get the 'event_group_ids' for the first file name only
+        # to start, get the unique 'event_group_ids' for the first file name only
         # then, loop over all the other files (iF-th file) in the set, and check to see if there
-        # is any overlap (intersection) between the iF-th file and the first file
-        # if so, then identify what the overlap is, and increment the id number in the iF-th file by 1
-        # so that it again becomes unique; then use a np mask to replace the overlapping
-        # number with the new unique number in the iF-th file
+        # is any overlap (intersection) between the iF-th file and the previous files
+        # if so, then identify what the overlap is, and map each overlapping id of the iF-th file to a new unique id
+        # (the map is applied to the event group ids of the file and of its station groups when the data is copied)
         # then, append the now totally unique list of id's from the iF-th file
-        # to the list from the first file, and so on
-        unique_uegids = np.unique(data[non_empty_filenames[0]]['event_group_ids'])
+        # to the list of the previous files, and so on
+        event_group_id_maps = {}
         for iF, f in enumerate(non_empty_filenames):
+            with h5py.File(f, 'r') as fin:
+                current_uegids = np.unique(np.array(fin['event_group_ids']))
             if(iF == 0):
+                unique_uegids = current_uegids
                 continue
-            current_uegids = np.unique(data[f]['event_group_ids'])
             intersect = np.intersect1d(unique_uegids, current_uegids, assume_unique=True)
-            if(np.sum(intersect)):
-                current_egids = data[f]['event_group_ids']
+            if(len(intersect)):
                 new_egid = max(unique_uegids.max(), current_uegids.max()) + 1
-                for gid in intersect:
-                    mask = gid == current_egids  # there can be multiple entries per unique event group id, we need to change all of them to the new id
-                    current_egids[mask] = new_egid
-                    # also change the event_group_id arrays of the station groups
-                    if f in non_empty_filenames:
-                        for key in groups[f]:  # loop through all groups
-                            if 'event_group_ids' in groups[f][key]:
-                                g_egids = groups[f][key]['event_group_ids']
-                                mask_g = gid == g_egids
-                                if(np.sum(mask_g)):  # station might not have this event group id, so skip stations where this egid is not present
-                                    g_egids[mask_g] = new_egid
-                    new_egid += 1
+                event_group_id_maps[f] = (intersect, np.arange(new_egid, new_egid + len(intersect)))
+                current_uegids = np.unique(_remap_event_group_ids(current_uegids, *event_group_id_maps[f]))
 
                 logger.warning(f"event group ids are not unique per file, current file is {f}, new unique ids have been generated.")
                 logger.debug(f"non-unique event ids: {intersect}")
-            current_uegids = np.unique(data[f]['event_group_ids'])  # get the updated list of unique event group ids. Now there should be no intersection with the ids of the previous files
             # test again for uniqueness
             intersect = np.intersect1d(unique_uegids, current_uegids, assume_unique=True)
-            if(np.sum(intersect)):
+            if(len(intersect)):
                 raise IndexError(f"event group ids are not unique per file, current file is {f}")
             unique_uegids = np.append(unique_uegids, current_uegids)
 
-        keys = data[non_empty_filenames[0]]
+        # preallocate the output data sets
+        keys = data_sets[non_empty_filenames[0]]
+        merged_keys = []
         for key in keys:
-            logger.info(f"merging key {key}")
             all_files_have_key = True
             for f in non_empty_filenames:
-                if(not key in data[f]):
+                if(not key in data_sets[f]):
                     logger.debug(f"key {key} not in {f}")
                     all_files_have_key = False
             if(not all_files_have_key):
                 logger.warning(f"not all files have the key {key}. This key will not be present in the merged file.")
                 continue
-            shape = list(data[non_empty_filenames[0]][key].shape)
-            shape[0] = n_data[key]
-
-            tmp = np.zeros(shape, dtype=data[non_empty_filenames[0]][key].dtype)
-
-            i = 0
-            for f in non_empty_filenames:
-                tmp[i:(i + len(data[f][key]))] = data[f][key]
-                i += len(data[f][key])
-
-            fout.create_dataset(key, tmp.shape, dtype=tmp.dtype,
-                                compression='gzip')[...] = tmp
+            shape, dtype = data_sets[non_empty_filenames[0]][key]
+            shape = list(shape)
+            shape[0] = sum([data_sets[f][key][0][0] for f in non_empty_filenames])
+            fout.create_dataset(key, shape, dtype=dtype, chunks=True, compression=compression)
+            merged_keys.append(key)
 
-        keys = groups[non_empty_filenames[0]]
+        # the station groups of all files, a station might not be present in every file
+        keys = []
+        for f in non_empty_filenames:
+            keys.extend([key for key in groups[f] if key not in keys])
+        merged_group_keys = {}
         for key in keys:  # loop through all groups
-            logger.info("writing group {}".format(key))
             # first loop through all keys of this group(station) to find all available entries (necessary because some
             # of the files might be empty
-            list_of_keys = list(groups[non_empty_filenames[0]][key].keys())
+            list_of_keys = []
             list_of_dtypes = {}
             list_of_shapes = {}
             for f in non_empty_filenames:
-                for key2 in groups[f][key]:  # loop through all datasets of this group
+                for key2, (shape, dtype) in groups[f].get(key, {}).items():  # loop through all datasets of this group
                     if(key2 not in list_of_dtypes):
-                        list_of_dtypes[key2] = groups[f][key][key2].dtype
-                        list_of_shapes[key2] = list(groups[f][key][key2].shape)
-                    groups[f][key][key2].dtype
+                        list_of_dtypes[key2] = dtype
+                        list_of_shapes[key2] = list(shape)
+                        list_of_shapes[key2][0] = 0
+                    list_of_shapes[key2][0] += shape[0]
                     if(key2 not in list_of_keys):
                         list_of_keys.append(key2)
 
             g = fout.create_group(key)
             for key2 in list_of_keys:  # loop through all datasets of this group
-                shape = list_of_shapes[key2]
-                shape[0] = n_groups[key][key2]
-
-                tmp = np.zeros(shape, dtype=list_of_dtypes[key2])
-                i = 0
-                for f in non_empty_filenames:
-                    if(key2 in groups[f][key]):
-                        tmp[i:(i + len(groups[f][key][key2]))] = groups[f][key][key2]
-                        i += len(groups[f][key][key2])
-                    else:
-                        logger.info(f"data set {key2} not in file {f} of station {key}")
-
-                g.create_dataset(key2, shape, dtype=list_of_dtypes[key2],
-                                 compression='gzip')[...] = tmp
+                g.create_dataset(key2, list_of_shapes[key2], dtype=list_of_dtypes[key2], chunks=True,
+                                 compression=compression)
+            merged_group_keys[key] = list_of_keys
             # save group attributes
             for key2 in group_attrs[key]:
                 fout[key].attrs[key2] = group_attrs[key][key2]
+
+        # copy the data file by file
+        offsets = {key: 0 for key in merged_keys}
+        for key in merged_group_keys:
+            for key2 in merged_group_keys[key]:
+                offsets[f"{key}/{key2}"] = 0
+        for f in non_empty_filenames:
+            logger.info("adding file {}".format(f))
+            event_group_id_map = event_group_id_maps.get(f)
+            with h5py.File(f, 'r') as fin:
+                for key in merged_keys:
+                    offsets[key] += _copy_dataset(fin[key], fout[key], offsets[key], buffer_size,
+                                                  event_group_id_map if key == 'event_group_ids' else None)
+                for key in merged_group_keys:
+                    for key2 in merged_group_keys[key]:
+                        if(key in fin and key2 in fin[key]):
+                            path = f"{key}/{key2}"
+                            offsets[path] += _copy_dataset(fin[path], fout[path], offsets[path], buffer_size,
+                                                           event_group_id_map if key2 == 'event_group_ids' else None)
+                        else:
+                            logger.info(f"data set {key2} not in file {f} of station {key}")
         # save all atrributes
         attrs['n_events'] = n_events_total
         for key in attrs:
@@ -207,13 +244,14 @@ def merge2(filenames, output_filename):
             if isinstance(fin[key], h5py._hl.group.Group):
                 g = fout.create_group(key)
                 for key2 in fin[key]:
-                    g.create_dataset(key2, fin[key][key2].shape, dtype=fin[key][key2].dtype,
-                                     compression='gzip')[...] = fin[key][key2]
+                    _copy_dataset(fin[key][key2], g.create_dataset(key2, fin[key][key2].shape, dtype=fin[key][key2].dtype,
+                                                                   chunks=True, compression=compression), 0, buffer_size)
                 for key2 in fin[key].attrs:
                     g.attrs[key2] = fin[key].attrs[key2]
             else:
-                fout.create_dataset(key, fin[key].shape, dtype=fin[key].dtype,
-                                    compression='gzip')[...] = fin[key]
+                _copy_dataset(fin[key], fout.create_dataset(key, fin[key].shape, dtype=fin[key].dtype, chunks=True,
+                                                            compression=compression), 0, buffer_size)
+        fin.close()
 
     fout.close()
 
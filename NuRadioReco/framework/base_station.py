@@ -231,13 +231,13 @@ class BaseStation():
             raise ValueError("parameter key needs to be of type NuRadioReco.framework.parameters.ARIANNAParameters")
         self._ARIANNA_parameters[key] = value
 
-    def serialize(self, save_efield_traces):
+    def serialize(self, save_efield_traces, trace_buffers=None):
         trigger_pkls = []
         for trigger in self._triggers.values():
             trigger_pkls.append(trigger.serialize())
         efield_pkls = []
         for efield in self.get_electric_fields():
-            efield_pkls.append(efield.serialize(save_trace=save_efield_traces))
+            efield_pkls.append(efield.serialize(save_trace=save_efield_traces, trace_buffers=trace_buffers))
         if self._station_time is None:
             station_time_dict = None
         else:
@@ -256,7 +256,7 @@ class BaseStation():
                 'electric_fields': efield_pkls}
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
 
         if ('triggers' in data):
@@ -267,7 +267,7 @@ class BaseStation():
 
         for electric_field in data['electric_fields']:
             efield = NuRadioReco.framework.electric_field.ElectricField([])
-            efield.deserialize(electric_field)
+            efield.deserialize(electric_field, trace_buffers=trace_buffers, lazy_traces=lazy_traces)
             self.add_electric_field(efield)
 
         self._parameters = NuRadioReco.framework.parameter_serialization.deserialize(data['_parameters'],
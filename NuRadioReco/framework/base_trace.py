@@ -5,6 +5,7 @@ import fractions
 import decimal
 import numbers
 from NuRadioReco.utilities import fft, bandpass_filter
+import NuRadioReco.framework.trace_serialization
 import scipy.signal
 import copy
 try:
@@ -22,6 +23,22 @@ class BaseTrace:
         self._frequency_spectrum = None
         self.__time_domain_up_to_date = True
         self._trace_start_time = 0
+        self.__serialized_trace = None
+
+    def __decode_trace(self):
+        """
+        decodes the trace of a lazily deserialized object (see `deserialize`) when the trace is accessed first
+        """
+        if(self.__serialized_trace is not None):
+            data_pkl, trace_buffers = self.__serialized_trace
+            self.__serialized_trace = None
+            self.__deserialize_trace(data_pkl, trace_buffers)
+
+    def has_undecoded_trace(self):
+        """
+        returns True if the trace was deserialized lazily and has not been accessed yet
+        """
+        return self.__serialized_trace is not None
 
     def get_trace(self):
         """
@@ -36,6 +53,7 @@ class BaseTrace:
         trace: np.array of floats
             the time trace
         """
+        self.__decode_trace()
         if(not self.__time_domain_up_to_date):
             self._time_trace = fft.freq2time(self._frequency_spectrum, self._sampling_rate)
             self.__time_domain_up_to_date = True
@@ -62,6 +80,7 @@ class BaseTrace:
         return fft.freq2time(spec, self.get_sampling_rate())
 
     def get_frequency_spectrum(self):
+        self.__decode_trace()
         if(self.__time_domain_up_to_date):
             self._frequency_spectrum = fft.time2freq(self._time_trace, self._sampling_rate)
             self._time_trace = None
@@ -80,6 +99,7 @@ class BaseTrace:
         sampling_rate: float
             the sampling rage of the trace, i.e., the inverse of the bin width
         """
+        self.__decode_trace()
         if trace is not None:
             if trace.shape[trace.ndim - 1] % 2 != 0:
                 raise ValueError('Attempted to set trace with an uneven number ({}) of samples. Only traces with an even number of samples are allowed.'.format(trace.shape[trace.ndim - 1]))
@@ -89,6 +109,7 @@ class BaseTrace:
         self._frequency_spectrum = None
 
     def set_frequency_spectrum(self, frequency_spectrum, sampling_rate):
+        self.__decode_trace()
         self.__time_domain_up_to_date = False
         self._frequency_spectrum = np.copy(frequency_spectrum)
         self._sampling_rate = sampling_rate
@@ -103,9 +124,11 @@ class BaseTrace:
         sampling_rate: float
             sampling rate, i.e., the inverse of the bin width
         """
+        self.__decode_trace()
         return self._sampling_rate
 
     def get_times(self):
+        self.__decode_trace()
         try:
             length = self.get_number_of_samples()
             times = np.arange(0, length / self._sampling_rate - 0.1 / self._sampling_rate, 1. / self._sampling_rate) + self._trace_start_time
@@ -117,12 +140,15 @@ class BaseTrace:
         return times
 
     def set_trace_start_time(self, start_time):
+        self.__decode_trace()
         self._trace_start_time = start_time
 
     def add_trace_start_time(self, start_time):
+        self.__decode_trace()
         self._trace_start_time += start_time
 
     def get_trace_start_time(self):
+        self.__decode_trace()
         return self._trace_start_time
 
     def get_frequencies(self):
@@ -148,6 +174,7 @@ class BaseTrace:
         n_samples: int
             number of samples in time domain
         """
+        self.__decode_trace()
         if(self.__time_domain_up_to_date):
             length = self._time_trace.shape[-1]  # returns the correct length independent of the dimension of the array (channels are 1dim, efields are 3dim)
         else:
@@ -192,14 +219,58 @@ class BaseTrace:
             resampled_trace = resampled_trace.T[:-1].T
         self.set_trace(resampled_trace, sampling_rate)
 
-    def serialize(self):
-        data = {'sampling_rate': self.get_sampling_rate(),
-                'time_trace': self.get_trace(),
-                'trace_start_time': self.get_trace_start_time()}
+    def serialize(self, trace_buffers=None):
+        """
+        serializes the trace
+
+        Parameters
+        ----------
+        trace_buffers: list or None
+            If None, the trace is pickled. Otherwise the trace is added to the list of trace buffers of the event and
+            only its index is pickled (see `NuRadioReco.framework.trace_serialization`)
+        """
+        time_trace = self.get_trace()
+        if(trace_buffers is None or time_trace.dtype == object):  # traces that are not set are always pickled
+            data = {'sampling_rate': self.get_sampling_rate(),
+                    'time_trace': time_trace,
+                    'trace_start_time': self.get_trace_start_time()}
+        else:
+            data = {'trace_buffer': NuRadioReco.framework.trace_serialization.add_trace(
+                trace_buffers, time_trace, self.get_sampling_rate(), self.get_trace_start_time())}
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
+        """
+        deserializes the trace
+
+        Parameters
+        ----------
+        data_pkl: bytes
+            the serialized trace
+        trace_buffers: list or None
+            the trace buffers of the event (see `NuRadioReco.framework.trace_serialization`)
+        lazy_traces: bool (default False)
+            If True, the trace, the sampling rate and the trace start time are decoded only when one of them is
+            accessed first
+        """
+        if(lazy_traces):
+            self.__serialized_trace = (data_pkl, trace_buffers)
+        else:
+            self.__serialized_trace = None
+            self.__deserialize_trace(data_pkl, trace_buffers)
+
+    def __deserialize_trace(self, data_pkl, trace_buffers=None):
         data = pickle.loads(data_pkl)
+        if('trace_buffer' in data):
+            trace, sampling_rate, trace_start_time = trace_buffers[data['trace_buffer']]
+            # the trace is a view of the serialized event and is not copied. It is never modified in place,
+            # all methods that change the trace replace the array
+            self.__time_domain_up_to_date = True
+            self._time_trace = trace
+            self._sampling_rate = sampling_rate
+            self._frequency_spectrum = None
+            self.set_trace_start_time(trace_start_time)
+            return
         self.set_trace(data['time_trace'], data['sampling_rate'])
         if('trace_start_time' in data.keys()):
             self.set_trace_start_time(data['trace_start_time'])
@@ -286,8 +357,9 @@ class BaseTrace:
 
     def __mul__(self, x):
         if isinstance(x, numbers.Number):
+            self.__decode_trace()
             if self._time_trace is not None:
-                self._time_trace *= x
+                self._time_trace = self._time_trace * x
                 return self
             if self._frequency_spectrum is not None:
                 self._frequency_spectrum *= x
@@ -301,6 +373,7 @@ class BaseTrace:
 
     def __truediv__(self, x):
         if isinstance(x, numbers.Number):
+            self.__decode_trace()
             if self._time_trace is not None:
                 self._time_trace = self._time_trace / x
                 return self
@@ -47,9 +47,9 @@ class Channel(NuRadioReco.framework.base_trace.BaseTrace):
     def get_id(self):
         return self._id
 
-    def serialize(self, save_trace):
+    def serialize(self, save_trace, trace_buffers=None):
         if save_trace:
-            base_trace_pkl = NuRadioReco.framework.base_trace.BaseTrace.serialize(self)
+            base_trace_pkl = NuRadioReco.framework.base_trace.BaseTrace.serialize(self, trace_buffers=trace_buffers)
         else:
             base_trace_pkl = None
         data = {'parameters': NuRadioReco.framework.parameter_serialization.serialize(self._parameters),
@@ -58,9 +58,9 @@ class Channel(NuRadioReco.framework.base_trace.BaseTrace):
 
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
         if(data['base_trace'] is not None):
-            NuRadioReco.framework.base_trace.BaseTrace.deserialize(self, data['base_trace'])
+            NuRadioReco.framework.base_trace.BaseTrace.deserialize(self, data['base_trace'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         self._parameters = NuRadioReco.framework.parameter_serialization.deserialize(data['parameters'], parameters.channelParameters)
         self._id = data['id']
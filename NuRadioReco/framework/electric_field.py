@@ -125,9 +125,9 @@ class ElectricField(NuRadioReco.framework.base_trace.BaseTrace):
         """
         self._position = position
 
-    def serialize(self, save_trace):
+    def serialize(self, save_trace, trace_buffers=None):
         if(save_trace):
-            base_trace_pkl = NuRadioReco.framework.base_trace.BaseTrace.serialize(self)
+            base_trace_pkl = NuRadioReco.framework.base_trace.BaseTrace.serialize(self, trace_buffers=trace_buffers)
         else:
             base_trace_pkl = None
         data = {'parameters': NuRadioReco.framework.parameter_serialization.serialize(self._parameters),
@@ -139,10 +139,10 @@ class ElectricField(NuRadioReco.framework.base_trace.BaseTrace):
                 'base_trace': base_trace_pkl}
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
         if(data['base_trace'] is not None):
-            NuRadioReco.framework.base_trace.BaseTrace.deserialize(self, data['base_trace'])
+            NuRadioReco.framework.base_trace.BaseTrace.deserialize(self, data['base_trace'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         if 'position' in data:  # for backward compatibility
             self._position = data['position']
         self._parameters = NuRadioReco.framework.parameter_serialization.deserialize(data['parameters'], parameters.electricFieldParameters)
@@ -5,6 +5,7 @@ import NuRadioReco.framework.radio_shower
 import NuRadioReco.framework.hybrid_information
 import NuRadioReco.framework.particle
 import NuRadioReco.framework.parameters as parameters
+import NuRadioReco.framework.trace_serialization
 import NuRadioReco.utilities.version
 from six import itervalues
 import collections
@@ -421,8 +422,23 @@ class Event:
         """
         return self.__hybrid_information
 
-    def serialize(self, mode):
+    def serialize(self, mode, typed_traces=False):
+        """
+        serializes the event
+
+        Parameters
+        ----------
+        mode: dict
+            specifies which traces are saved (see `eventWriter.run`)
+        typed_traces: bool (default False)
+            If True, the traces are not pickled but stored as contiguous typed buffers behind the pickled metadata,
+            which are decoded without copying them (see `NuRadioReco.framework.trace_serialization`).
+            Otherwise the event is serialized as a single pickle.
+        """
         stations_pkl = []
+        trace_buffers = None
+        if(typed_traces):
+            trace_buffers = []
         try:
             commit_hash = NuRadioReco.utilities.version.get_NuRadioMC_commit_hash()
             self.set_parameter(parameters.eventParameters.hash_NuRadioMC, commit_hash)
@@ -430,7 +446,7 @@ class Event:
             self.set_parameter(parameters.eventParameters.hash_NuRadioMC, None)
 
         for station in self.get_stations():
-            stations_pkl.append(station.serialize(mode))
+            stations_pkl.append(station.serialize(mode, trace_buffers=trace_buffers))
 
         showers_pkl = []
         for shower in self.get_showers():
@@ -465,14 +481,32 @@ class Event:
                 '__modules_event': modules_out_event,
                 '__modules_station': modules_out_station
                 }
-        return pickle.dumps(data, protocol=4)
+        data_pkl = pickle.dumps(data, protocol=4)
+        if(trace_buffers is None):
+            return data_pkl
+        return NuRadioReco.framework.trace_serialization.encode(data_pkl, trace_buffers)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, lazy_traces=False):
+        """
+        deserializes an event, both events serialized as a single pickle and events with typed trace buffers are
+        supported
+
+        Parameters
+        ----------
+        data_pkl: bytes-like object
+            the serialized event
+        lazy_traces: bool (default False)
+            If True, only the meta data of the stations, channels and electric fields is decoded. The traces are
+            decoded when they are accessed first.
+        """
+        trace_buffers = None
+        if(NuRadioReco.framework.trace_serialization.is_encoded(data_pkl)):
+            data_pkl, trace_buffers = NuRadioReco.framework.trace_serialization.decode(data_pkl)
         data = pickle.loads(data_pkl)
 
         for station_pkl in data['stations']:
             station = NuRadioReco.framework.station.Station(0)
-            station.deserialize(station_pkl)
+            station.deserialize(station_pkl, trace_buffers=trace_buffers, lazy_traces=lazy_traces)
             self.set_station(station)
         if 'showers' in data.keys():
             for shower_pkl in data['showers']:
@@ -1,5 +1,14 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+# the string representations of the parameter enums, which are slow to compute, are determined only once
+_enum_names = {}
+
+
+def _get_enum_names(parameter_enum):
+    if parameter_enum not in _enum_names:
+        _enum_names[parameter_enum] = [(str(entry), entry) for entry in parameter_enum]
+    return _enum_names[parameter_enum]
+
 
 def serialize(target_object):
     reply = {}
@@ -10,9 +19,9 @@ def serialize(target_object):
 
 def deserialize(target_object, parameter_enum):
     reply = {}
-    for entry in parameter_enum:
-        if str(entry) in target_object:
-            reply[entry] = target_object[str(entry)]
+    for name, entry in _get_enum_names(parameter_enum):
+        if name in target_object:
+            reply[entry] = target_object[name]
     return reply
 
 
@@ -28,10 +37,10 @@ def deserialize_covariances(target_object, parameter_enum):
     for entry in target_object:
         first_key = None
         second_key = None
-        for enum in parameter_enum:
-            if str(enum) == entry[0]:
+        for name, enum in _get_enum_names(parameter_enum):
+            if name == entry[0]:
                 first_key = enum
-            if str(enum) == entry[1]:
+            if name == entry[1]:
                 second_key = enum
         if first_key is not None and second_key is not None:
             reply[(first_key, second_key)] = target_object[entry]
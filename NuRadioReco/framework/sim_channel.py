@@ -47,8 +47,8 @@ class SimChannel(NuRadioReco.framework.channel.Channel):
         """
         return (self._id, self._shower_id, self._ray_tracing_id)
 
-    def serialize(self, save_trace):
-        channel_pkl = NuRadioReco.framework.channel.Channel.serialize(self, save_trace)
+    def serialize(self, save_trace, trace_buffers=None):
+        channel_pkl = NuRadioReco.framework.channel.Channel.serialize(self, save_trace, trace_buffers=trace_buffers)
         data = {'parameters': NuRadioReco.framework.parameter_serialization.serialize(self._parameters),
                 'shower_id': self.get_shower_id(),
                 'ray_tracing_id': self.get_ray_tracing_solution_id(),
@@ -56,8 +56,8 @@ class SimChannel(NuRadioReco.framework.channel.Channel):
 
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
-        NuRadioReco.framework.channel.Channel.deserialize(self, data['channel'])
+        NuRadioReco.framework.channel.Channel.deserialize(self, data['channel'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         self._shower_id = data['shower_id']
         self._ray_tracing_id = data['ray_tracing_id']
@@ -108,24 +108,25 @@ class SimStation(NuRadioReco.framework.base_station.BaseStation):
             if channel.get_ray_tracing_solution_id() == ray_tracing_id:
                 yield channel
 
-    def serialize(self, save_channel_traces, save_efield_traces):
-        base_station_pkl = NuRadioReco.framework.base_station.BaseStation.serialize(self, save_efield_traces=save_efield_traces)
+    def serialize(self, save_channel_traces, save_efield_traces, trace_buffers=None):
+        base_station_pkl = NuRadioReco.framework.base_station.BaseStation.serialize(self, save_efield_traces=save_efield_traces,
+                                                                                    trace_buffers=trace_buffers)
         channels_pkl = []
         for channel in self.iter_channels():
-            channels_pkl.append(channel.serialize(save_trace=save_channel_traces))
+            channels_pkl.append(channel.serialize(save_trace=save_channel_traces, trace_buffers=trace_buffers))
         data = {'__magnetic_field_vector': self.__magnetic_field_vector,
                 '__simulation_weight': self.__simulation_weight,
                 'channels': channels_pkl,
                 'base_station': base_station_pkl}
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
-        NuRadioReco.framework.base_station.BaseStation.deserialize(self, data['base_station'])
+        NuRadioReco.framework.base_station.BaseStation.deserialize(self, data['base_station'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         self.__magnetic_field_vector = data['__magnetic_field_vector']
         self.__simulation_weight = data['__simulation_weight']
         if 'channels' in data.keys():
             for channel_pkl in data['channels']:
                 channel = NuRadioReco.framework.sim_channel.SimChannel(0, 0, 0)
-                channel.deserialize(channel_pkl)
+                channel.deserialize(channel_pkl, trace_buffers=trace_buffers, lazy_traces=lazy_traces)
                 self.add_channel(channel)
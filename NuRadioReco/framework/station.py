@@ -71,19 +71,21 @@ class Station(NuRadioReco.framework.base_station.BaseStation):
             from radiotools import helper
             return helper.get_magnetic_field_vector('arianna')
 
-    def serialize(self, mode):
+    def serialize(self, mode, trace_buffers=None):
         save_efield_traces = 'ElectricFields' in mode and mode['ElectricFields'] is True
-        base_station_pkl = NuRadioReco.framework.base_station.BaseStation.serialize(self, save_efield_traces=save_efield_traces)
+        base_station_pkl = NuRadioReco.framework.base_station.BaseStation.serialize(self, save_efield_traces=save_efield_traces,
+                                                                                    trace_buffers=trace_buffers)
         channels_pkl = []
         save_channel_trace = 'Channels' in mode and mode['Channels'] is True
         for channel in self.iter_channels():
-            channels_pkl.append(channel.serialize(save_channel_trace))
+            channels_pkl.append(channel.serialize(save_channel_trace, trace_buffers=trace_buffers))
         save_sim_channel_trace = 'SimChannels' in mode and mode['SimChannels'] is True
         save_sim_efield_trace = 'SimElectricFields' in mode and mode['SimElectricFields'] is True
         sim_station_pkl = None
         if(self.has_sim_station()):
             sim_station_pkl = self.get_sim_station().serialize(save_channel_traces=save_sim_channel_trace,
-                                                               save_efield_traces=save_sim_efield_trace)
+                                                               save_efield_traces=save_sim_efield_trace,
+                                                               trace_buffers=trace_buffers)
 
         data = {'__reference_reconstruction': self.__reference_reconstruction,
                 'channels': channels_pkl,
@@ -91,17 +93,17 @@ class Station(NuRadioReco.framework.base_station.BaseStation):
                 'sim_station': sim_station_pkl}
         return pickle.dumps(data, protocol=4)
 
-    def deserialize(self, data_pkl):
+    def deserialize(self, data_pkl, trace_buffers=None, lazy_traces=False):
         data = pickle.loads(data_pkl)
-        NuRadioReco.framework.base_station.BaseStation.deserialize(self, data['base_station'])
+        NuRadioReco.framework.base_station.BaseStation.deserialize(self, data['base_station'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         if(data['sim_station'] is None):
             self.__sim_station = None
         else:
             self.__sim_station = NuRadioReco.framework.sim_station.SimStation(None)
-            self.__sim_station.deserialize(data['sim_station'])
+            self.__sim_station.deserialize(data['sim_station'], trace_buffers=trace_buffers, lazy_traces=lazy_traces)
         for channel_pkl in data['channels']:
             channel = NuRadioReco.framework.channel.Channel(0)
-            channel.deserialize(channel_pkl)
+            channel.deserialize(channel_pkl, trace_buffers=trace_buffers, lazy_traces=lazy_traces)
             self.add_channel(channel)
 
         self.__reference_reconstruction = data['__reference_reconstruction']
@@ -0,0 +1,134 @@
+"""
+typed binary encoding of serialized events
+
+The metadata of an event (parameters, ids, ...) is pickled as before, but the traces of the channels and electric
+fields are not pickled. They are collected in a list of trace buffers while the event is serialized and stored as
+contiguous arrays behind the pickled metadata. The traces are decoded with `np.frombuffer`, i.e., without copying
+them, and the data structures refer to a trace by its index in the list of trace buffers.
+
+Layout of an encoded event (all integers are 6 bytes little endian):
+
+* `MAGIC`
+* encoding version
+* length of the pickled trace table and the trace table, a list of
+  (dtype, shape, offset, sampling rate, trace start time) tuples, one per trace buffer
+* length of the pickled metadata and the pickled metadata
+* zero padding up to the next multiple of `ALIGNMENT` bytes
+* the trace buffers, each starting at a multiple of `ALIGNMENT` bytes relative to the start of the first buffer
+
+Events serialized as a single pickle (all events written before the encoding was introduced) start with the pickle
+protocol opcode and are recognized by `is_encoded`.
+"""
+
+from __future__ import absolute_import, division, print_function
+import numpy as np
+import logging
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+logger = logging.getLogger('trace_serialization')
+
+MAGIC = b'\x93NURTB'
+ENCODING_VERSION = 1
+ALIGNMENT = 16
+
+
+def add_trace(trace_buffers, trace, sampling_rate, trace_start_time):
+    """
+    adds a trace to the list of trace buffers of an event that is serialized and returns the index of the trace
+    buffer
+    """
+    trace_buffers.append((np.ascontiguousarray(trace), sampling_rate, trace_start_time))
+    return len(trace_buffers) - 1
+
+
+def is_encoded(data):
+    """
+    returns True if the serialized event uses the typed encoding and False if it is a single pickle
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def encode(data_pkl, trace_buffers):
+    """
+    combines the pickled metadata of an event and its trace buffers into the typed encoding
+
+    Parameters
+    ----------
+    data_pkl: bytes
+        the pickled metadata of the event
+    trace_buffers: list
+        the trace buffers that were collected while the event was serialized (see `add_trace`)
+
+    Returns
+    -------
+    bytearray
+    """
+    trace_table = []
+    offset = 0
+    for trace, sampling_rate, trace_start_time in trace_buffers:
+        offset += -offset % ALIGNMENT
+        trace_table.append((trace.dtype.str, trace.shape, offset, sampling_rate, trace_start_time))
+        offset += trace.nbytes
+    trace_table_pkl = pickle.dumps(trace_table, protocol=4)
+    b = bytearray()
+    b.extend(MAGIC)
+    b.extend(ENCODING_VERSION.to_bytes(6, 'little'))
+    b.extend(len(trace_table_pkl).to_bytes(6, 'little'))
+    b.extend(trace_table_pkl)
+    b.extend(len(data_pkl).to_bytes(6, 'little'))
+    b.extend(data_pkl)
+    b.extend(bytes(-len(b) % ALIGNMENT))
+    buffer_start = len(b)
+    for (trace, _, _), (_, _, offset, _, _) in zip(trace_buffers, trace_table):
+        b.extend(bytes(buffer_start + offset - len(b)))
+        b.extend(trace.reshape(-1).view(np.uint8))
+    return b
+
+
+def decode(data):
+    """
+    splits an event in the typed encoding into the pickled metadata and the trace buffers
+
+    The traces are views of `data`, i.e., they are not copied and they are read-only if `data` is read-only.
+
+    Parameters
+    ----------
+    data: bytes-like object
+        the serialized event
+
+    Returns
+    -------
+    data_pkl: memoryview
+        the pickled metadata of the event
+    trace_buffers: list
+        the (trace, sampling rate, trace start time) tuples of the event
+    """
+    view = memoryview(data)
+    encoding_version = int.from_bytes(view[6:12], 'little')
+    if(encoding_version > ENCODING_VERSION):
+        msg = f"event is encoded with version {encoding_version} but only versions up to {ENCODING_VERSION} are supported"
+        logger.error(msg)
+        raise IOError(msg)
+    position = 12
+    length = int.from_bytes(view[position:position + 6], 'little')
+    position += 6
+    trace_table = pickle.loads(view[position:position + length])
+    position += length
+    length = int.from_bytes(view[position:position + 6], 'little')
+    position += 6
+    data_pkl = view[position:position + length]
+    position += length
+    buffer_start = position + (-position % ALIGNMENT)
+    trace_buffers = []
+    for dtype, shape, offset, sampling_rate, trace_start_time in trace_table:
+        count = 1
+        for n in shape:
+            count *= n
+        if(count == 0):
+            trace = np.zeros(shape, dtype=dtype)
+        else:
+            trace = np.frombuffer(view, dtype=np.dtype(dtype), count=count, offset=buffer_start + offset).reshape(shape)
+        trace_buffers.append((trace, sampling_rate, trace_start_time))
+    return data_pkl, trace_buffers
@@ -312,6 +312,18 @@ class channelGenericNoiseAdder:
         if debug:
             self.logger.setLevel(logging.DEBUG)
 
+    def get_random_state(self):
+        """
+        returns the state of the random number generator, which can be restored with `set_random_state`
+        """
+        return self.__random_generator.get_state()
+
+    def set_random_state(self, state):
+        """
+        restores the state of the random number generator returned by `get_random_state`
+        """
+        self.__random_generator.set_state(state)
+
     @register_run()
     def run(self, event, station, detector,
             amplitude=1 * units.mV,
@@ -3,20 +3,81 @@ import NuRadioReco.framework.event
 import NuRadioReco.detector.detector
 import NuRadioReco.detector.generic_detector
 import NuRadioReco.modules.io.event_parser_factory
+import NuRadioReco.modules.io.compression
 import numpy as np
 import logging
+import pickle
+import mmap
 import time
 import os
+import concurrent.futures
+from collections import OrderedDict, deque
 
 VERSION = 2
-VERSION_MINOR = 2
+VERSION_MINOR = 4
+INDEX_VERSION = 2
+
+
+def get_index_filename(filename):
+    """
+    returns the filename of the index file of a .nur file (see `eventWriter.begin`)
+    """
+    return filename + '.idx'
+
+
+def _deserialize_event(event_bytes, lazy_traces=False, codec_id=0):
+    """
+    decompresses and deserializes an event (called in the worker threads of `NuRadioRecoio.get_events`)
+    """
+    event = NuRadioReco.framework.event.Event(0, 0)
+    event.deserialize(NuRadioReco.modules.io.compression.decompress(event_bytes, codec_id), lazy_traces=lazy_traces)
+    return event
+
+
+class mmapFile(object):
+    """
+    read-only file object on top of a memory map of a file
+
+    `read` returns memoryview slices of the memory map instead of copies of the data, i.e., the events are
+    deserialized directly from the page cache of the operating system, which is shared between all processes that
+    read the same file.
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__mmap)
+        self.__position = 0
+
+    def seek(self, position):
+        self.__position = position
+
+    def tell(self):
+        return self.__position
+
+    def read(self, n=-1):
+        start = self.__position
+        if(n < 0):
+            stop = len(self.__view)
+        else:
+            stop = min(start + n, len(self.__view))
+        self.__position = max(start, stop)
+        return self.__view[start:stop]
+
+    def close(self):
+        self.__view.release()
+        try:
+            self.__mmap.close()
+        except BufferError:
+            # some data is still referenced, the memory map is closed once the last reference is gone
+            pass
 
 
 class NuRadioRecoio(object):
 
     def __init__(self, filenames, parse_header=True, parse_detector=True, fail_on_version_mismatch=True,
                  fail_on_minor_version_mismatch=False,
-                 max_open_files=10, log_level=None, buffer_size=104857600):
+                 max_open_files=10, log_level=None, buffer_size=104857600, use_mmap=True, lazy_traces=False):
         """
         Initialize NuRadioReco io
 
@@ -33,13 +94,20 @@ class NuRadioRecoio(object):
         fail_on_version_mismatch: boolean
             Controls if the module should try to read files with a different major version
         fail_on_minor_version_mismatch: boolean
-            Controls if the module should try to read files with a different minor version
+            Controls if the module should try to read files with a higher minor version
         max_open_files: int
-            the maximum number of files that remain open simultaneously
+            the maximum number of files that remain open simultaneously, the least recently used file is closed
+            if more files are opened
         log_level: None or log level
             the log level of this class
         buffer_size: int
-            the size of the read buffer in bytes (default 100MB)
+            the size of the read buffer in bytes (default 100MB), only used if `use_mmap` is False
+        use_mmap: boolean
+            If True (default), the files are memory mapped and the events are deserialized directly from the
+            memory map (see `mmapFile`), otherwise the files are read with a read buffer of size `buffer_size`
+        lazy_traces: boolean
+            If True, the traces of the channels and electric fields are decoded only when they are accessed first
+            (see `Event.deserialize`), which speeds up loops over events that only use parameters
         """
         if(not isinstance(filenames, list)):
             filenames = [filenames]
@@ -56,6 +124,7 @@ class NuRadioRecoio(object):
         self._bytes_length_header = None
         self._bytes_start = None
         self._bytes_length = None
+        self._codec_ids = None
         self.__event_ids = None
         self.__open_files = None
         self._detector_dicts = None
@@ -71,6 +140,8 @@ class NuRadioRecoio(object):
         self.__read_lock = False
         self.__max_open_files = max_open_files
         self.__buffer_size = buffer_size
+        self.__use_mmap = use_mmap
+        self._lazy_traces = lazy_traces
         self.openFile(filenames)
         self._current_file_id = 0
         self.logger.info("... finished in {:.0f} seconds".format(time.time() - t))
@@ -79,20 +150,17 @@ class NuRadioRecoio(object):
         if(iF not in self.__open_files):
             self.logger.debug("file {} is not yet open, opening file".format(iF))
             self.__open_files[iF] = {}
-            self.__open_files[iF]['file'] = open(self._filenames[iF], 'rb', buffering=self.__buffer_size)  # 100 MB buffering
-            self.__open_files[iF]['time'] = time.time()
+            if(self.__use_mmap and os.path.getsize(self._filenames[iF]) > 0):  # empty files can not be memory mapped
+                self.__open_files[iF]['file'] = mmapFile(self._filenames[iF])
+            else:
+                self.__open_files[iF]['file'] = open(self._filenames[iF], 'rb', buffering=self.__buffer_size)  # 100 MB buffering
             self.__check_file_version(iF)
             if(len(self.__open_files) > self.__max_open_files):
-                self.logger.debug("more than {} file are open, closing oldest file".format(self.__max_open_files))
-                tnow = time.time()
-                iF_close = 0
-                for key, value in self.__open_files.items():
-                    if(value['time'] < tnow):
-                        tnow = value['time']
-                        iF_close = key
-                self.logger.debug("closing file {} that was opened at {}".format(iF_close, tnow))
-                self.__open_files[iF_close]['file'].close()
-                del self.__open_files[iF_close]
+                iF_close, open_file = self.__open_files.popitem(last=False)
+                self.logger.debug("more than {} file are open, closing least recently used file {}".format(self.__max_open_files, iF_close))
+                open_file['file'].close()
+        else:
+            self.__open_files.move_to_end(iF)
         return self.__open_files[iF]['file']
 
     def __check_file_version(self, iF):
@@ -123,7 +191,7 @@ class NuRadioRecoio(object):
             )
             if(self.__fail_on_version_mismatch):
                 raise IOError
-        elif(self.__file_version_minor != VERSION_MINOR):
+        elif(self.__file_version_minor > VERSION_MINOR):  # files with a lower minor version are readable
             self.logger.error(
                 "Data file might not readable, File has version {}.{} but current version is {}.{}".format(
                     self.__file_version,
@@ -145,7 +213,8 @@ class NuRadioRecoio(object):
         self._bytes_length_header = [[]]
         self._bytes_start = [[]]
         self._bytes_length = [[]]
-        self.__open_files = {}
+        self._codec_ids = [[]]
+        self.__open_files = OrderedDict()
         self._detector_dicts = {}
         self.__detectors = {}
         self._event_specific_detector_changes = {}
@@ -190,14 +259,106 @@ class NuRadioRecoio(object):
                     else:
                         self.__event_headers[station_id][key].append(value)
 
+    def _parse_detector_dict(self, iF, detector_dict):
+        if 'generic_detector' not in detector_dict.keys():
+            is_generic_detector = False
+        else:
+            is_generic_detector = detector_dict['generic_detector']
+        if iF not in self._detector_dicts.keys():
+            self._detector_dicts[iF] = {
+                'generic_detector': is_generic_detector,
+                'channels': {},
+                'stations': {}
+            }
+        if is_generic_detector:
+            # add default_station and default_channel to the dict to support older files using these
+            if 'default_station' not in detector_dict:
+                detector_dict['default_station'] = None
+            if 'default_channel' not in detector_dict:
+                detector_dict['default_channel'] = None
+            self._detector_dicts[iF]['default_station'] = detector_dict['default_station']
+            self._detector_dicts[iF]['default_channel'] = detector_dict['default_channel']
+        for station in detector_dict['stations'].values():
+            if len(self._detector_dicts[iF]['stations'].keys()) == 0:
+                index = 0
+            else:
+                index = max(self._detector_dicts[iF]['stations'].keys()) + 1
+            self._detector_dicts[iF]['stations'][index] = station
+        for channel in detector_dict['channels'].values():
+            if len(self._detector_dicts[iF]['channels'].keys()) == 0:
+                index = 0
+            else:
+                index = max(self._detector_dicts[iF]['channels'].keys()) + 1
+            self._detector_dicts[iF]['channels'][index] = channel
+
+    def _parse_detector_changes(self, iF, changes_dict):
+        if iF not in self._event_specific_detector_changes.keys():
+            self._event_specific_detector_changes[iF] = []
+        for change in changes_dict:
+            self._event_specific_detector_changes[iF].append(change)
+
+    def __read_index(self, iF):
+        """
+        reads the index file of a data file (written by the eventWriter), returns the list of index records or None if
+        the file has no valid index file
+        """
+        index_filename = get_index_filename(self._filenames[iF])
+        if(not os.path.exists(index_filename)):
+            return None
+        records = []
+        try:
+            with open(index_filename, 'rb') as fidx:
+                index_header = pickle.load(fidx)
+                if(index_header[0] != 'nur_index' or index_header[1] > INDEX_VERSION):
+                    self.logger.warning(f"index file {index_filename} has an unsupported format, scanning the data file")
+                    return None
+                while True:
+                    record = pickle.load(fidx)
+                    if(record[0] == 'end'):
+                        break
+                    records.append(record)
+        except (EOFError, pickle.UnpicklingError, IndexError):
+            self.logger.warning(f"index file {index_filename} is incomplete, scanning the data file")
+            return None
+        stat = os.stat(self._filenames[iF])
+        if(record[1] != stat.st_size or record[2] != stat.st_mtime_ns):
+            self.logger.warning(f"index file {index_filename} does not match the data file, scanning the data file")
+            return None
+        return records
+
     def __scan_files(self):
-        current_byte = 12  # skip datafile header
-        iF = 0
-        while True:
-            self._get_file(iF).seek(current_byte)
-            continue_loop, iF, current_byte = self.__scan_files(self, iF, current_byte)
-            if not continue_loop:
-                break
+        # the byte positions, the event headers and the detector descriptions are read from the index files if all
+        # data files have one, otherwise the data files are scanned
+        indices = [self.__read_index(iF) for iF in range(len(self._filenames))]
+        if(all([index is not None for index in indices])):
+            self.logger.info("reading the index files")
+            for iF, records in enumerate(indices):
+                if(iF > 0):
+                    self._bytes_start_header.append([])
+                    self._bytes_length_header.append([])
+                    self._bytes_start.append([])
+                    self._bytes_length.append([])
+                    self._codec_ids.append([])
+                for record in records:
+                    if(record[0] == 'event'):
+                        self._bytes_start_header[iF].append(record[1])
+                        self._bytes_length_header[iF].append(record[2])
+                        self._bytes_start[iF].append(record[3])
+                        self._bytes_length[iF].append(record[4])
+                        self._codec_ids[iF].append(record[6] if len(record) > 6 else 0)  # index version 1 has no codecs
+                        self._parse_event_header(pickle.loads(record[5]))
+                    elif(record[1] == 1):  # object is detector info
+                        self._parse_detector_dict(iF, pickle.loads(record[2]))
+                    elif(record[1] == 2):  # object is list of event-specific changes to the detector
+                        self._parse_detector_changes(iF, pickle.loads(record[2]))
+        else:
+            current_byte = 12  # skip datafile header
+            iF = 0
+            while True:
+                self._get_file(iF).seek(current_byte)
+                continue_loop, iF, current_byte = self.__scan_files(self, iF, current_byte)
+                if not continue_loop:
+                    break
 
         self.__event_ids = np.array(self.__event_ids)
         self.__file_scanned = True
@@ -252,8 +413,7 @@ class NuRadioRecoio(object):
 
         self._get_file(file_id).seek(self._bytes_start[file_id][event_id])
         evtstr = self._get_file(file_id).read(self._bytes_length[file_id][event_id])
-        event = NuRadioReco.framework.event.Event(0, 0)
-        event.deserialize(evtstr)
+        event = _deserialize_event(evtstr, self._lazy_traces, self._codec_ids[file_id][event_id])
         self.__read_lock = False
         self._current_file_id = file_id
         self._current_event_id = event.get_id()
@@ -281,10 +441,54 @@ class NuRadioRecoio(object):
         i = np.argwhere(mask)[0][0]
         return self.get_event_i(i)
 
-    def get_events(self):
+    def __prefetch_events(self, n_threads, look_ahead):
+        """
+        reads up to `look_ahead` events ahead and decompresses and deserializes them in `n_threads` threads, yields
+        tuples of the file id and the event in file order
+        """
+        if(look_ahead is None):
+            look_ahead = 2 * n_threads
+        queue = deque()
+        with concurrent.futures.ThreadPoolExecutor(n_threads) as executor:
+            try:
+                # the serialized events are views of the memory mapped files and not copies. A memory map that is
+                # closed while its events are read ahead stays valid until the last view is released (see `mmapFile`).
+                for file_id, event_bytes, codec_id in self.__iter_events(self, deserialize=False):
+                    queue.append((file_id, executor.submit(_deserialize_event, event_bytes, self._lazy_traces, codec_id)))
+                    if(len(queue) > look_ahead):
+                        file_id, future = queue.popleft()
+                        yield file_id, future.result()
+                while(len(queue)):
+                    file_id, future = queue.popleft()
+                    yield file_id, future.result()
+            finally:
+                # the iteration was stopped early, the events that were read ahead are discarded
+                for file_id, future in queue:
+                    future.cancel()
+
+    def get_events(self, n_threads=None, look_ahead=None):
+        """
+        iterates over all events of the files
+
+        Parameters
+        ----------
+        n_threads: int or None
+            If None (default), the events are deserialized one after the other when they are requested. Otherwise,
+            the following events are read ahead and deserialized in `n_threads` threads while the current event
+            is processed, the events are still returned in the order of the files. The deserialization runs in
+            parallel to the processing of the current event whenever the processing releases the global interpreter
+            lock (file access, numpy functions, ...).
+        look_ahead: int or None
+            the maximum number of events that are read ahead if `n_threads` is set (default: 2 * `n_threads`)
+        """
         self._current_file_id = 0
         self._get_file(self._current_file_id).seek(12)  # skip file header
-        for event in self.__iter_events(self):
+        if(n_threads is None):
+            events = self.__iter_events(self)
+        else:
+            events = self.__prefetch_events(n_threads, look_ahead)
+        for file_id, event in events:
+            self._current_file_id = file_id
             self._current_event_id = event.get_id()
             self._current_run_number = event.get_run_number()
             if self._current_file_id in self.__detectors.keys():
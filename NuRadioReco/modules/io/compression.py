@@ -0,0 +1,84 @@
+"""
+compression codecs of the events in .nur files
+
+The eventWriter can compress the serialized events (the event headers are not compressed, such that the files can
+still be scanned quickly). The id of the codec is stored in the second byte of the type marker of an event, the id 0
+means that the event is not compressed. zlib (id 1) and lzma (id 2) are available by default, further codecs can be
+added with `register_codec`.
+"""
+import zlib
+import lzma
+import logging
+logger = logging.getLogger('NuRadioReco.compression')
+
+_codecs_by_id = {}
+_codecs_by_name = {}
+
+
+def register_codec(name, codec_id, compress, decompress):
+    """
+    registers a compression codec
+
+    Parameters
+    ----------
+    name: string
+        the name of the codec, which is passed to `eventWriter.begin`
+    codec_id: int
+        the id of the codec (1 to 255), which is stored in the files. The id needs to be the same whenever the codec
+        is registered, otherwise the files can not be read.
+    compress: function
+        compresses a bytes-like object, called with the data and the compression level (None for the default level)
+    decompress: function
+        decompresses a bytes-like object
+    """
+    if(codec_id < 1 or codec_id > 255):
+        msg = f"the id of a compression codec needs to be between 1 and 255 but is {codec_id}"
+        logger.error(msg)
+        raise ValueError(msg)
+    if(codec_id in _codecs_by_id and _codecs_by_id[codec_id]['name'] != name):
+        msg = f"the codec id {codec_id} is already used by the compression codec {_codecs_by_id[codec_id]['name']}"
+        logger.error(msg)
+        raise ValueError(msg)
+    codec = {'name': name, 'id': codec_id, 'compress': compress, 'decompress': decompress}
+    _codecs_by_id[codec_id] = codec
+    _codecs_by_name[name] = codec
+
+
+def get_codec_id(name):
+    """
+    returns the id of a compression codec, None means no compression (id 0)
+    """
+    if(name is None):
+        return 0
+    if(name not in _codecs_by_name):
+        msg = f"compression codec {name} is unknown, available codecs are {list(_codecs_by_name.keys())}"
+        logger.error(msg)
+        raise ValueError(msg)
+    return _codecs_by_name[name]['id']
+
+
+def compress(data, codec_id, level=None):
+    """
+    compresses data with the codec with the given id, the data is returned unchanged for the codec id 0
+    """
+    if(codec_id == 0):
+        return data
+    return _codecs_by_id[codec_id]['compress'](data, level)
+
+
+def decompress(data, codec_id):
+    """
+    decompresses data that was compressed with the codec with the given id, the data is returned unchanged for the
+    codec id 0
+    """
+    if(codec_id == 0):
+        return data
+    if(codec_id not in _codecs_by_id):
+        msg = f"event is compressed with the unknown codec {codec_id}, the codec needs to be registered with `register_codec`"
+        logger.error(msg)
+        raise IOError(msg)
+    return _codecs_by_id[codec_id]['decompress'](data)
+
+
+register_codec('zlib', 1, lambda data, level: zlib.compress(data, -1 if level is None else level), zlib.decompress)
+register_codec('lzma', 2, lambda data, level: lzma.compress(data, preset=level), lzma.decompress)
@@ -10,7 +10,8 @@ class eventReader:
     read events from file
     """
 
-    def begin(self, filename, read_detector=False, log_level=logging.WARNING):
+    def begin(self, filename, read_detector=False, log_level=logging.WARNING, n_threads=None, look_ahead=None,
+              lazy_traces=False):
         """
         Setup function for the eventReader module
 
@@ -22,13 +23,23 @@ class eventReader:
             If True, the eventReader will parse the detector description and event event headers
              in the event files. This is necessary to use the get_detector functions
         log_level: logging enum
+        n_threads: int or None
+            If set, the events are read ahead and deserialized in `n_threads` threads while the current event is
+            processed (see `NuRadioRecoio.get_events`)
+        look_ahead: int or None
+            the maximum number of events that are read ahead (default: 2 * `n_threads`)
+        lazy_traces: boolean
+            If True, the traces are decoded only when they are accessed first (see `NuRadioRecoio`)
         """
 
-        self.__fin = NuRadioRecoio.NuRadioRecoio(filename, parse_header=read_detector, log_level=log_level)
+        self.__fin = NuRadioRecoio.NuRadioRecoio(filename, parse_header=read_detector, log_level=log_level,
+                                                 lazy_traces=lazy_traces)
+        self.__n_threads = n_threads
+        self.__look_ahead = look_ahead
 
     @register_run()
     def run(self):
-        return self.__fin.get_events()
+        return self.__fin.get_events(n_threads=self.__n_threads, look_ahead=self.__look_ahead)
 
     def end(self):
         self.__fin.close_files()
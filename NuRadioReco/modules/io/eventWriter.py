@@ -1,7 +1,11 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pickle
+import os
+import queue
+import threading
 from NuRadioReco.modules.base.module import register_run
-from NuRadioReco.modules.io.NuRadioRecoio import VERSION, VERSION_MINOR
+from NuRadioReco.modules.io.NuRadioRecoio import VERSION, VERSION_MINOR, INDEX_VERSION, get_index_filename
+import NuRadioReco.modules.io.compression
 import logging
 from NuRadioReco.framework.parameters import stationParameters as stnp
 from NuRadioReco.detector import generic_detector
@@ -38,19 +42,129 @@ class eventWriter:
         self.__event_ids_and_runs = None
         self.__events_per_file = None
         self.__events_in_current_file = 0
+        self.__write_index = None
+        self.__fidx = None
+        self.__typed_traces = None
+        self.__codec_id = 0
+        self.__compression_level = None
+        self.__queue = None
+        self.__writer_thread = None
+        self.__writer_error = None
 
-    def __write_fout_header(self):
-        if self.__number_of_files > 1:
-            self.__fout = open("{}_part{:02d}.nur".format(self.__filename, self.__number_of_files), 'wb')
+    def __get_output_filename(self, i_file):
+        if i_file > 1:
+            return "{}_part{:02d}.nur".format(self.__filename, i_file)
+        else:
+            return "{}.nur".format(self.__filename)
+
+    def __submit(self, function, *args):
+        """
+        executes a file operation, in the background thread if the writer is asynchronous (see `begin`)
+        """
+        if self.__queue is None:
+            function(*args)
         else:
-            self.__fout = open("{}.nur".format(self.__filename), 'wb')
+            self.__raise_writer_error()
+            self.__queue.put((function, args))
+
+    def __write_in_background(self):
+        """
+        executes the queued file operations, after an error all following operations are discarded and the error is
+        raised in the calling thread
+        """
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    return
+                if self.__writer_error is None:
+                    function, args = item
+                    function(*args)
+            except Exception as e:
+                logger.error(f"writing to the output file failed: {e}")
+                self.__writer_error = e
+            finally:
+                self.__queue.task_done()
+
+    def __raise_writer_error(self):
+        if self.__writer_error is not None:
+            raise self.__writer_error
+
+    def __wait_for_writer(self):
+        """
+        blocks until all queued file operations are executed
+        """
+        if self.__queue is not None:
+            self.__queue.join()
+            self.__raise_writer_error()
+
+    def __stop_writer(self):
+        if self.__queue is not None:
+            self.__queue.put(None)
+            self.__writer_thread.join()
+            self.__queue = None
+            self.__writer_thread = None
+            self.__raise_writer_error()
+
+    def __write_fout_header(self):
+        self.__submit(self.__open_file, self.__get_output_filename(self.__number_of_files))
+        self.__header_written = True
+
+    def __open_file(self, filename):
+        self.__fout = open(filename, 'wb')
         b = bytearray()
         b.extend(VERSION.to_bytes(6, 'little'))
         b.extend(VERSION_MINOR.to_bytes(6, 'little'))
         self.__fout.write(b)
-        self.__header_written = True
+        if self.__write_index:
+            self.__fidx = open(get_index_filename(filename), 'wb')
+            pickle.dump(('nur_index', INDEX_VERSION, VERSION, VERSION_MINOR), self.__fidx, protocol=4)
+
+    def __close_file(self):
+        self.__submit(self.__close_output_file, self.__get_output_filename(self.__number_of_files))
+        self.__header_written = False
+
+    def __close_output_file(self, filename):
+        """
+        closes the current output file, the index file is completed with the size and modification time of the
+        output file
+        """
+        self.__fout.close()
+        if self.__fidx is not None:
+            stat = os.stat(filename)
+            pickle.dump(('end', stat.st_size, stat.st_mtime_ns), self.__fidx, protocol=4)
+            self.__fidx.close()
+            self.__fidx = None
 
-    def begin(self, filename, max_file_size=1024, check_for_duplicates=False, events_per_file=None, log_level=logging.WARNING):
+    def __write_object(self, object_bytearray):
+        """
+        writes an event or a detector description into the current output file and adds it to the index
+        """
+        self.__add_to_index(self.__fout.tell(), object_bytearray)
+        n_bytes_written = self.__fout.write(object_bytearray)
+        logger.debug(f"{n_bytes_written} bytes written to disk")
+
+    def __add_to_index(self, position, object_bytearray):
+        """
+        adds an object that was written at `position` of the output file to the index: the byte positions and the
+        header of an event or the content of a detector description
+        """
+        if self.__fidx is None:
+            return
+        type_marker = int.from_bytes(object_bytearray[:6], 'little')
+        object_type = type_marker & 0xff
+        length = int.from_bytes(object_bytearray[6:12], 'little')
+        if object_type == 0:
+            evt_length = int.from_bytes(object_bytearray[12 + length:18 + length], 'little')
+            record = ('event', position + 12, length, position + 18 + length, evt_length,
+                      bytes(object_bytearray[12:12 + length]), type_marker >> 8)
+        else:
+            record = ('object', object_type, bytes(object_bytearray[12:12 + length]))
+        pickle.dump(record, self.__fidx, protocol=4)
+
+    def begin(self, filename, max_file_size=1024, check_for_duplicates=False, events_per_file=None, write_index=False,
+              typed_traces=True, compression=None, compression_level=None, async_write=False, queue_size=10,
+              log_level=logging.WARNING):
         """
         begin method
 
@@ -67,6 +181,30 @@ class eventWriter:
             Maximum number of events to be written into the same file. After more than events_per_file have been written
             into the same file, the output will be split into another file. If max_file_size and events_per_file are
             both set, the file will be split whenever any of the two conditions is fullfilled.
+        write_index: bool (default False)
+            if True, an index file (`<output file>.idx`) is written next to every output file. It contains the byte
+            positions and headers of the events and the detector descriptions, such that `NuRadioRecoio` does not
+            need to scan the output file when it is opened.
+        typed_traces: bool (default True)
+            if True, the traces are stored as typed binary buffers next to the pickled event data, which are read
+            without unpickling and copying them (see `NuRadioReco.framework.trace_serialization`). If False, the
+            events are stored as single pickles, which can also be read by NuRadioReco versions that do not support
+            the typed traces.
+        compression: string or None (default None)
+            the codec that compresses the events ('zlib' or 'lzma', see `NuRadioReco.modules.io.compression` to
+            register other codecs). The event headers and detector descriptions are not compressed. If None, the
+            events are not compressed.
+        compression_level: int or None (default None)
+            the compression level (zlib: 0-9, lzma: 0-9), if None the default level of the codec is used
+        async_write: bool (default False)
+            if True, the files are written by a background thread, such that `run` does not wait for the file
+            system. The events are still serialized (and compressed) in `run`, i.e., they can be modified after
+            `run` returned. An error of the background thread is raised by the next call of `run`,
+            `get_checkpoint` or `end`, the events after the failed write are discarded. `end` needs to be called to
+            make sure that all events are written.
+        queue_size: int (default 10)
+            the maximum number of events and detector descriptions that wait to be written if `async_write` is
+            True, `run` blocks if the queue is full
         """
         logger.setLevel(log_level)
         if filename[-4:] == '.nur':
@@ -85,6 +223,15 @@ class eventWriter:
         self.__event_ids_and_runs = []  # Remember which event IDs are already in file to catch duplicates
         self.__header_written = False  # Remember if we still have to write the current file header
         self.__events_per_file = events_per_file
+        self.__write_index = write_index
+        self.__typed_traces = typed_traces
+        self.__codec_id = NuRadioReco.modules.io.compression.get_codec_id(compression)
+        self.__compression_level = compression_level
+        self.__writer_error = None
+        if async_write:
+            self.__queue = queue.Queue(maxsize=queue_size)
+            self.__writer_thread = threading.Thread(target=self.__write_in_background, daemon=True)
+            self.__writer_thread.start()
 
     @register_run()
     def run(self, evt, det=None, mode=None):
@@ -108,6 +255,25 @@ class eventWriter:
 
             if no dictionary is passed, the default option is to save all of the above
 
+        """
+        self.write_event_record(self.get_event_record(evt, mode), evt, det)
+
+    def get_event_record(self, evt, mode=None):
+        """
+        serializes an event (and its header) into the record that is written into the file
+
+        The settings of `begin` (typed traces, compression) are applied. Together with `write_event_record`, this
+        allows to serialize the events in other processes than the one that writes the file.
+
+        Parameters
+        ----------
+        evt: NuRadioReco event object
+        mode: dictionary, optional
+            Specifies what will saved into the `*.nur` output file (see `run`)
+
+        Returns
+        -------
+        bytearray
         """
         if mode is None:
             mode = {
@@ -116,13 +282,28 @@ class eventWriter:
                 'SimChannels': True,
                 'SimElectricFields': True
             }
+        return self.__get_event_bytearray(evt, mode)
+
+    def write_event_record(self, event_bytearray, evt, det=None):
+        """
+        writes an event record returned by `get_event_record` into the file
+
+        Parameters
+        ----------
+        event_bytearray: bytes-like object
+            the event record
+        evt: NuRadioReco event object
+            the event of the record. Only the run number, event id, stations, station times and channel ids are
+            used, i.e., it can be an event without traces.
+        det: detector object
+            If a detector object is passed, the detector description for the
+            events is written in the file as well
+        """
         self.__check_for_duplicate_ids(evt.get_run_number(), evt.get_id())
         if not self.__header_written:
             self.__write_fout_header()
 
-        event_bytearray = self.__get_event_bytearray(evt, mode)
-        n_bytes_written = self.__fout.write(event_bytearray)
-        logger.debug(f"{n_bytes_written} bytes written to diks")
+        self.__submit(self.__write_object, event_bytearray)
         self.__current_file_size += event_bytearray.__sizeof__()
         self.__number_of_events += 1
         self.__event_ids_and_runs.append([evt.get_run_number(), evt.get_id()])
@@ -132,12 +313,12 @@ class eventWriter:
             detector_dict = self.__get_detector_dict(evt, det)  # returns None if detector is already saved
             if detector_dict is not None:
                 detector_bytearray = self.__get_detector_bytearray(detector_dict)
-                self.__fout.write(detector_bytearray)
+                self.__submit(self.__write_object, detector_bytearray)
                 self.__current_file_size += detector_bytearray.__sizeof__()
             if isinstance(det, generic_detector.GenericDetector):
                 changes_bytearray = self.__get_detector_changes_byte_array(evt, det)
                 if changes_bytearray is not None:
-                    self.__fout.write(changes_bytearray)
+                    self.__submit(self.__write_object, changes_bytearray)
                     self.__current_file_size += changes_bytearray.__sizeof__()
 
         logger.debug("current file size is {} bytes, event number {}".format(self.__current_file_size,
@@ -146,13 +327,12 @@ class eventWriter:
         if(self.__current_file_size > self.__max_file_size or self.__events_in_current_file == self.__events_per_file):
             logger.info("current output file exceeds max file size -> closing current output file and opening new one")
             self.__current_file_size = 0
-            self.__fout.close()
+            self.__close_file()
             self.__number_of_files += 1
             # self.__filename = "{}_part{:02d}".format(self.__filename, self.__number_of_files)
             self.__stored_stations = []
             self.__stored_channels = []
             self.__event_ids_and_runs = []
-            self.__header_written = False
             self.__events_in_current_file = 0
 
     def __get_event_bytearray(self, event, mode):
@@ -160,12 +340,13 @@ class eventWriter:
         b = bytearray()
         b.extend(evt_header_str)
         evt_header_length = len(b)
-        evt_string = event.serialize(mode)
+        evt_string = event.serialize(mode, typed_traces=self.__typed_traces)
+        evt_string = NuRadioReco.modules.io.compression.compress(evt_string, self.__codec_id, self.__compression_level)
         b = bytearray()
         b.extend(evt_string)
         evt_length = len(b)
         event_bytearray = bytearray()
-        type_marker = 0
+        type_marker = 0 + (self.__codec_id << 8)  # the codec of the event is stored in the second byte
         event_bytearray.extend(type_marker.to_bytes(6, 'little'))
         event_bytearray.extend(evt_header_length.to_bytes(6, 'little'))
         event_bytearray.extend(evt_header_str)
@@ -300,8 +481,81 @@ class eventWriter:
                 raise ValueError("An event with ID {} and run number {} already exists in the file\nif you don't want unique event ids enforced you can turn it of by passing `check_for_duplicates=True` to the begin method.".format(event_id, run_number))
         return
 
+    def get_checkpoint(self):
+        """
+        flushes the current output file and returns the state of the event writer
+
+        The state can be passed to `resume` to continue writing into the same files, e.g., after a job was aborted.
+
+        Returns
+        -------
+        checkpoint: dict
+        """
+        self.__wait_for_writer()
+        file_position = None
+        index_position = None
+        if self.__header_written:
+            self.__fout.flush()
+            file_position = self.__fout.tell()
+            if self.__fidx is not None:
+                self.__fidx.flush()
+                index_position = self.__fidx.tell()
+        return {
+            'number_of_events': self.__number_of_events,
+            'current_file_size': self.__current_file_size,
+            'number_of_files': self.__number_of_files,
+            'stored_stations': list(self.__stored_stations),
+            'stored_channels': list(self.__stored_channels),
+            'header_written': self.__header_written,
+            'file_position': file_position,
+            'index_position': index_position,
+            'event_ids_and_runs': list(self.__event_ids_and_runs),
+            'events_in_current_file': self.__events_in_current_file
+        }
+
+    def resume(self, checkpoint):
+        """
+        continues writing into the files of a previous run from a checkpoint
+
+        Everything that was written after the checkpoint was taken is discarded. The `begin` method needs
+        to be called with the same filename before.
+
+        Parameters
+        ----------
+        checkpoint: dict
+            the state of the event writer as returned by `get_checkpoint`
+        """
+        self.__wait_for_writer()
+        self.__number_of_events = checkpoint['number_of_events']
+        self.__current_file_size = checkpoint['current_file_size']
+        self.__number_of_files = checkpoint['number_of_files']
+        self.__stored_stations = list(checkpoint['stored_stations'])
+        self.__stored_channels = list(checkpoint['stored_channels'])
+        self.__header_written = checkpoint['header_written']
+        self.__event_ids_and_runs = list(checkpoint['event_ids_and_runs'])
+        self.__events_in_current_file = checkpoint['events_in_current_file']
+        if self.__header_written:
+            self.__fout = open(self.__get_output_filename(self.__number_of_files), 'r+b')
+            self.__fout.truncate(checkpoint['file_position'])
+            self.__fout.seek(checkpoint['file_position'])
+            if self.__write_index and checkpoint.get('index_position') is not None:
+                self.__fidx = open(get_index_filename(self.__get_output_filename(self.__number_of_files)), 'r+b')
+                self.__fidx.truncate(checkpoint['index_position'])
+                self.__fidx.seek(checkpoint['index_position'])
+        # remove files that were started after the checkpoint was taken
+        i_file = self.__number_of_files + 1
+        while os.path.exists(self.__get_output_filename(i_file)):
+            logger.info(f"removing {self.__get_output_filename(i_file)} which was written after the checkpoint")
+            os.remove(self.__get_output_filename(i_file))
+            if os.path.exists(get_index_filename(self.__get_output_filename(i_file))):
+                os.remove(get_index_filename(self.__get_output_filename(i_file)))
+            i_file += 1
+
     def end(self):
-        if(hasattr(self, "__fout")):
-            self.__fout.close()
-            self.debug(f"closing file.")
+        try:
+            if self.__header_written:
+                self.__close_file()
+                logger.debug(f"closing file.")
+        finally:
+            self.__stop_writer()
         return self.__number_of_events
@@ -1,5 +1,6 @@
 import pickle
 import NuRadioReco.framework.event
+import NuRadioReco.modules.io.compression
 
 
 def scan_files_function(version_major, version_minor):
@@ -23,6 +24,7 @@ def scan_files_function(version_major, version_minor):
                 self._bytes_length_header.append([])
                 self._bytes_start.append([])
                 self._bytes_length.append([])
+                self._codec_ids.append([])
             else:
                 return False, iF, current_byte
         current_byte += 6
@@ -39,10 +41,12 @@ def scan_files_function(version_major, version_minor):
         bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
         self._bytes_start[iF].append(current_byte)
         self._bytes_length[iF].append(bytes_to_read)
+        self._codec_ids[iF].append(0)
         current_byte += bytes_to_read
         return True, iF, current_byte
 
     def scan_files_2_2(self, iF, current_byte):
+        # the lowest byte of the type marker is the object type, the second byte the compression codec of an event
         object_type_hex = self._get_file(iF).read(6)
         object_type = int.from_bytes(object_type_hex, 'little')
         current_byte += 6
@@ -62,10 +66,13 @@ def scan_files_function(version_major, version_minor):
                 self._bytes_length_header.append([])
                 self._bytes_start.append([])
                 self._bytes_length.append([])
+                self._codec_ids.append([])
                 current_byte += 6
             else:
                 return False, iF, current_byte
         current_byte += 6
+        codec_id = object_type >> 8
+        object_type = object_type & 0xff
         if object_type == 0:    # object is an event
             self._bytes_start_header[iF].append(current_byte)
             self._bytes_length_header[iF].append(bytes_to_read)
@@ -80,44 +87,11 @@ def scan_files_function(version_major, version_minor):
             bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
             self._bytes_start[iF].append(current_byte)
             self._bytes_length[iF].append(bytes_to_read)
+            self._codec_ids[iF].append(codec_id)
         elif object_type == 1:  # object is detector info
-            detector_dict = pickle.loads(self._get_file(iF).read(bytes_to_read))
-            if 'generic_detector' not in detector_dict.keys():
-                is_generic_detector = False
-            else:
-                is_generic_detector = detector_dict['generic_detector']
-            if iF not in self._detector_dicts.keys():
-                self._detector_dicts[iF] = {
-                    'generic_detector': is_generic_detector,
-                    'channels': {},
-                    'stations': {}
-                }
-            if is_generic_detector:
-                # add default_station and default_channel to the dict to support older files using these
-                if 'default_station' not in detector_dict:
-                    detector_dict['default_station'] = None
-                if 'default_channel' not in detector_dict:
-                    detector_dict['default_channel'] = None                    
-                self._detector_dicts[iF]['default_station'] = detector_dict['default_station']
-                self._detector_dicts[iF]['default_channel'] = detector_dict['default_channel']
-            for station in detector_dict['stations'].values():
-                if len(self._detector_dicts[iF]['stations'].keys()) == 0:
-                    index = 0
-                else:
-                    index = max(self._detector_dicts[iF]['stations'].keys()) + 1
-                self._detector_dicts[iF]['stations'][index] = station
-            for channel in detector_dict['channels'].values():
-                if len(self._detector_dicts[iF]['channels'].keys()) == 0:
-                    index = 0
-                else:
-                    index = max(self._detector_dicts[iF]['channels'].keys()) + 1
-                self._detector_dicts[iF]['channels'][index] = channel
+            self._parse_detector_dict(iF, pickle.loads(self._get_file(iF).read(bytes_to_read)))
         elif object_type == 2:   # object is list of event-specific changes to the detector
-            changes_dict = pickle.loads(self._get_file(iF).read(bytes_to_read))
-            if iF not in self._event_specific_detector_changes.keys():
-                self._event_specific_detector_changes[iF] = []
-            for change in changes_dict:
-                self._event_specific_detector_changes[iF].append(change)
+            self._parse_detector_changes(iF, pickle.loads(self._get_file(iF).read(bytes_to_read)))
         current_byte += bytes_to_read
         return True, iF, current_byte
 
@@ -134,55 +108,75 @@ def scan_files_function(version_major, version_minor):
 
 
 def iter_events_function(version_major, version_minor):
+    """
+    Returns the function to iterate over the events of a file with the given file version. The function yields
+    tuples of the file id and the event or, if called with `deserialize=False`, tuples of the file id, the
+    serialized event and the id of its compression codec.
+
+    The serialized events are not copied, i.e., if the file is memory mapped (see `NuRadioRecoio.mmapFile`) they are
+    memoryviews of the memory map. Such a view is only valid while the file is open, it needs to be deserialized
+    (or copied) before the file is closed.
+    """
 
-    def iter_events_2_0(self):
+    def iter_events_2_0(self, deserialize=True):
+        file_id = self._current_file_id
         while True:
-            bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+            bytes_to_read_hex = self._get_file(file_id).read(6)
             bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
             if(bytes_to_read == 0):
                 # we are at the end of the file
-                if(self._current_file_id < (len(self._filenames) - 1)):  # are there more files to be parsed?
-                    self._current_file_id += 1
-                    self._get_file(self._current_file_id).seek(12)  # skip datafile header
-                    bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+                if(file_id < (len(self._filenames) - 1)):  # are there more files to be parsed?
+                    file_id += 1
+                    self._get_file(file_id).seek(12)  # skip datafile header
+                    bytes_to_read_hex = self._get_file(file_id).read(6)
                     bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
                 else:
                     break
-            self._get_file(self._current_file_id).read(bytes_to_read)
-            bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+            self._get_file(file_id).read(bytes_to_read)
+            bytes_to_read_hex = self._get_file(file_id).read(6)
             bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
-            evtstr = self._get_file(self._current_file_id).read(bytes_to_read)
-            event = NuRadioReco.framework.event.Event(0, 0)
-            event.deserialize(evtstr)
-            yield event
+            evtstr = self._get_file(file_id).read(bytes_to_read)
+            if deserialize:
+                event = NuRadioReco.framework.event.Event(0, 0)
+                event.deserialize(evtstr, lazy_traces=self._lazy_traces)
+                yield file_id, event
+            else:
+                yield file_id, evtstr, 0
 
-    def iter_events_2_2(self):
+    def iter_events_2_2(self, deserialize=True):
+        file_id = self._current_file_id
         while True:
-            object_type_hex = self._get_file(self._current_file_id).read(6)
+            object_type_hex = self._get_file(file_id).read(6)
             object_type = int.from_bytes(object_type_hex, 'little')
-            bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+            bytes_to_read_hex = self._get_file(file_id).read(6)
             bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
             if(bytes_to_read == 0):
                 # we are at the end of the file
-                if(self._current_file_id < (len(self._filenames) - 1)):  # are there more files to be parsed?
-                    self._current_file_id += 1
-                    self._get_file(self._current_file_id).seek(12)  # skip datafile header
-                    object_type_hex = self._get_file(self._current_file_id).read(6)
+                if(file_id < (len(self._filenames) - 1)):  # are there more files to be parsed?
+                    file_id += 1
+                    self._get_file(file_id).seek(12)  # skip datafile header
+                    object_type_hex = self._get_file(file_id).read(6)
                     object_type = int.from_bytes(object_type_hex, 'little')
-                    bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+                    bytes_to_read_hex = self._get_file(file_id).read(6)
                     bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
                 else:
                     break
+            codec_id = object_type >> 8
+            object_type = object_type & 0xff
             if object_type == 0:
-                self._get_file(self._current_file_id).read(bytes_to_read)
-                bytes_to_read_hex = self._get_file(self._current_file_id).read(6)
+                self._get_file(file_id).read(bytes_to_read)
+                bytes_to_read_hex = self._get_file(file_id).read(6)
                 bytes_to_read = int.from_bytes(bytes_to_read_hex, 'little')
-                evtstr = self._get_file(self._current_file_id).read(bytes_to_read)
-                event = NuRadioReco.framework.event.Event(0, 0)
-                event.deserialize(evtstr)
-                yield event
+                evtstr = self._get_file(file_id).read(bytes_to_read)
+                if deserialize:
+                    event = NuRadioReco.framework.event.Event(0, 0)
+                    event.deserialize(NuRadioReco.modules.io.compression.decompress(evtstr, codec_id),
+                                      lazy_traces=self._lazy_traces)
+                    yield file_id, event
+                else:
+                    yield file_id, evtstr, codec_id
             elif object_type == 1 or object_type == 2:
-                self._get_file(self._current_file_id).read(bytes_to_read)
+                self._get_file(file_id).read(bytes_to_read)
     if version_major == 2:
         if version_minor < 2:
             return iter_events_2_0
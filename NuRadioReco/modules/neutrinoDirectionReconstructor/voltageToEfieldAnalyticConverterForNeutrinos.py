@@ -136,6 +136,16 @@ class voltageToAnalyticEfieldConverterNeutrinos:
 
             nu_direction = -1*hp.spherical_to_cartesian(nu_zenith, nu_azimuth)
 
+            # calculate the efield spectra of all antennas and ray tracing solutions at once
+            solutions = [(iA, iS) for iA in range(len(antenna_positions)) for iS in range(n_ray_tracing_solutions[iA])]
+            spectra = {}
+            if len(solutions):
+                viewing_angles = np.array([hp.get_angle(nu_direction, launch_vectors[iA, iS]) for iA, iS in solutions])
+                distances = np.array([travel_distance[iA, iS] for iA, iS in solutions])
+                for solution, spectrum in zip(solutions, ask.get_frequency_spectra(shower_energy, viewing_angles, n_samples, dt,
+                                                                                   shower_type, n_index, distances, parametrization)):
+                    spectra[solution] = spectrum
+
             for iA, position in enumerate(antenna_positions):
                 trace_spectrum = np.zeros(len(ff), dtype=complex)
                 # loop through both ray tracing solutions and add up resulting voltage traces
@@ -153,9 +163,7 @@ class voltageToAnalyticEfieldConverterNeutrinos:
                         thetas[iA] = {}
                     thetas[iA][iS] = theta
                     # get the efield at the antenna
-                    spectrum = ask.get_frequency_spectrum(shower_energy, theta, n_samples, dt, shower_type=shower_type, n_index=n_index,
-                                               R=travel_distance[iA, iS], model=parametrization)
-                    spectrum *= attenuation[iA, iS]  # apply ice attenuation
+                    spectrum = spectra[(iA, iS)] * attenuation[iA, iS]  # apply ice attenuation
                     eR, eTheta, ePhi = np.outer(polarization_on_sky, spectrum)
                     eTheta *= reflection_coefficients_theta[iA, iS]  # apply reflection coefficients
                     ePhi *= reflection_coefficients_phi[iA, iS]  # apply reflection coefficients
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import sys
+import NuRadioReco.modules.io.eventWriter
+import NuRadioReco.modules.io.eventReader
+import NuRadioReco.framework.trace_serialization
+from NuRadioReco.modules.io.NuRadioRecoio import VERSION, VERSION_MINOR
+import io_test_utilities
+
+"""
+writes events with and without typed trace buffers, reads them back and compares them to the original events.
+Also reads a file that was written before the typed trace buffers were introduced (file version 2.2).
+"""
+
+output_dir = 'NuRadioReco/test/io_tests/'
+
+
+def get_file_version(filename):
+    with open(filename, 'rb') as fin:
+        header = fin.read(12)
+    return int.from_bytes(header[:6], 'little'), int.from_bytes(header[6:12], 'little')
+
+
+def read_events(filename, **kwargs):
+    event_reader = NuRadioReco.modules.io.eventReader.eventReader()
+    event_reader.begin(filename, **kwargs)
+    events = [event for event in event_reader.run()]
+    event_reader.end()
+    return events
+
+
+events = io_test_utilities.create_events()
+
+for typed_traces in [True, False]:
+    filename = output_dir + f'typed_traces_{typed_traces}.nur'
+    event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+    event_writer.begin(filename, typed_traces=typed_traces)
+    for event in events:
+        event_writer.run(event)
+    event_writer.end()
+
+    if get_file_version(filename) != (VERSION, VERSION_MINOR):
+        print(f"{filename} has the version {get_file_version(filename)} instead of {(VERSION, VERSION_MINOR)}")
+        sys.exit(-1)
+    with open(filename, 'rb') as fin:
+        if (NuRadioReco.framework.trace_serialization.MAGIC in fin.read()) != typed_traces:
+            print(f"the events in {filename} are not stored with typed_traces={typed_traces}")
+            sys.exit(-1)
+
+    events_read = read_events(filename)
+    io_test_utilities.check_events(events_read, events, f"typed_traces={typed_traces}")
+    io_test_utilities.check_events(read_events(filename, lazy_traces=True), events,
+                                   f"typed_traces={typed_traces}, lazy traces")
+    # the traces can be read-only views of the file, modifying them must not change the file content
+    for event in events_read:
+        for channel in event.get_station(11).iter_channels():
+            channel * 2.
+    io_test_utilities.check_events(read_events(filename), events, f"typed_traces={typed_traces}, read again")
+
+filename = output_dir + 'events_version_2.2.nur'
+if get_file_version(filename) != (2, 2):
+    print(f"{filename} has the version {get_file_version(filename)} instead of (2, 2)")
+    sys.exit(-1)
+io_test_utilities.check_events(read_events(filename), events, "file version 2.2")
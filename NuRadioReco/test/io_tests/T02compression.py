@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import os
+import sys
+import pickle
+import shutil
+import NuRadioReco.modules.io.eventWriter
+import NuRadioReco.modules.io.eventReader
+import NuRadioReco.modules.io.compression
+import NuRadioReco.framework.trace_serialization
+from NuRadioReco.modules.io.NuRadioRecoio import NuRadioRecoio, get_index_filename
+import io_test_utilities
+
+"""
+writes compressed events with all default codecs, with and without index file, reads them back (also with lazy
+traces, through the index file and by event id) and compares them to the original events. Checks that the codec id
+is stored in the type marker of the events and in the index file, and that events of an unknown codec can not be
+read.
+"""
+
+output_dir = 'NuRadioReco/test/io_tests/'
+
+
+def read_events(filename, **kwargs):
+    event_reader = NuRadioReco.modules.io.eventReader.eventReader()
+    event_reader.begin(filename, **kwargs)
+    events = [event for event in event_reader.run()]
+    event_reader.end()
+    return events
+
+
+def get_type_marker(filename):
+    """
+    returns the type marker of the first object in the file
+    """
+    with open(filename, 'rb') as fin:
+        fin.seek(12)  # skip the file header
+        return int.from_bytes(fin.read(6), 'little')
+
+
+events = io_test_utilities.create_events()
+
+for compression, compression_level in [('zlib', None), ('zlib', 9), ('lzma', None), ('lzma', 1)]:
+    codec_id = NuRadioReco.modules.io.compression.get_codec_id(compression)
+    for write_index in [False, True]:
+        description = f"compression {compression}, level {compression_level}, write_index={write_index}"
+        filename = output_dir + 'compression.nur'
+        event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+        event_writer.begin(filename, write_index=write_index, compression=compression,
+                           compression_level=compression_level)
+        for event in events:
+            event_writer.run(event)
+        event_writer.end()
+
+        type_marker = get_type_marker(filename)
+        if type_marker & 0xff != 0 or type_marker >> 8 != codec_id:
+            print(f"{description}: the type marker of the first event is {type_marker:#x}, expected {codec_id << 8:#x}")
+            sys.exit(-1)
+        with open(filename, 'rb') as fin:
+            if NuRadioReco.framework.trace_serialization.MAGIC in fin.read():
+                print(f"{description}: the traces are stored without compression")
+                sys.exit(-1)
+        if os.path.exists(get_index_filename(filename)) != write_index:
+            print(f"{description}: the index file exists: {os.path.exists(get_index_filename(filename))}")
+            sys.exit(-1)
+        if write_index:
+            with open(get_index_filename(filename), 'rb') as fidx:
+                pickle.load(fidx)  # index header
+                record = pickle.load(fidx)
+            if record[0] != 'event' or record[6] != codec_id:
+                print(f"{description}: the index file does not store the codec id {codec_id}: {record}")
+                sys.exit(-1)
+
+        io_test_utilities.check_events(read_events(filename), events, description)
+        io_test_utilities.check_events(read_events(filename, lazy_traces=True), events, description + ", lazy traces")
+        io_test_utilities.check_events(read_events(filename, n_threads=2), events, description + ", read ahead")
+        nurio = NuRadioRecoio(filename)
+        io_test_utilities.check_events([nurio.get_event((1, i)) for i in reversed(range(len(events)))],
+                                       events[::-1], description + ", random access")
+        nurio.close_files()
+        if write_index:
+            os.remove(get_index_filename(filename))
+            io_test_utilities.check_events(read_events(filename), events, description + ", without the index file")
+
+# events of an unknown codec can not be read
+filename = output_dir + 'compression_unknown_codec.nur'
+shutil.copy(output_dir + 'compression.nur', filename)
+with open(filename, 'r+b') as fout:
+    fout.seek(12)
+    fout.write((200 << 8).to_bytes(6, 'little'))
+try:
+    read_events(filename)
+    print("events of the unknown codec 200 were read without an error")
+    sys.exit(-1)
+except IOError:
+    print("events of the unknown codec 200 can not be read")
+
+try:
+    NuRadioReco.modules.io.eventWriter.eventWriter().begin(filename, compression='unknown_codec')
+    print("the unknown codec unknown_codec was accepted by the eventWriter")
+    sys.exit(-1)
+except ValueError:
+    print("the unknown codec unknown_codec is rejected by the eventWriter")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import os
+import sys
+import glob
+import threading
+import NuRadioReco.modules.io.eventWriter
+import NuRadioReco.modules.io.eventReader
+import io_test_utilities
+
+"""
+checks that the eventWriter writes the same files with `async_write=True` as without it, also when the output is
+split into several files, that `get_checkpoint` and `end` wait for the queued events and that an error of the
+writer thread is raised in the calling thread
+"""
+
+output_dir = 'NuRadioReco/test/io_tests/'
+
+
+def write_events(filename, events, **kwargs):
+    event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+    event_writer.begin(filename, **kwargs)
+    for event in events:
+        event_writer.run(event)
+    event_writer.end()
+
+
+def read_events(filenames):
+    event_reader = NuRadioReco.modules.io.eventReader.eventReader()
+    event_reader.begin(filenames)
+    events = [event for event in event_reader.run()]
+    event_reader.end()
+    return events
+
+
+def get_output_files(filename):
+    return sorted(glob.glob(filename[:-4] + '*.nur'))
+
+
+events = io_test_utilities.create_events(n_events=6)
+
+# the files are identical to the ones of a synchronous writer, the event size is about 16kB, i.e., the output is
+# split after every event for a maximum file size of 0.01MB
+for options in [{}, {'events_per_file': 4}, {'max_file_size': 0.01},
+                {'events_per_file': 2, 'write_index': True, 'compression': 'zlib'}]:
+    # new events for every file, because the eventWriter is registered in the events that it writes
+    write_events(output_dir + 'sync.nur', io_test_utilities.create_events(n_events=6), **options)
+    write_events(output_dir + 'async.nur', io_test_utilities.create_events(n_events=6), async_write=True,
+                 queue_size=2, **options)
+    filenames_sync = get_output_files(output_dir + 'sync.nur')
+    filenames_async = get_output_files(output_dir + 'async.nur')
+    if len(filenames_sync) != len(filenames_async) or (len(options) and len(filenames_sync) == 1):
+        print(f"{options}: {len(filenames_async)} files written asynchronously and {len(filenames_sync)} synchronously")
+        sys.exit(-1)
+    for filename_sync, filename_async in zip(filenames_sync, filenames_async):
+        with open(filename_sync, 'rb') as fin_sync, open(filename_async, 'rb') as fin_async:
+            if fin_sync.read() != fin_async.read():
+                print(f"{options}: the files {filename_sync} and {filename_async} differ")
+                sys.exit(-1)
+        if options.get('write_index', False) and not os.path.exists(filename_async + '.idx'):
+            print(f"{options}: the index file of {filename_async} is missing")
+            sys.exit(-1)
+    io_test_utilities.check_events(read_events(filenames_async), events, f"async_write, {options}, {len(filenames_async)} files")
+    for filename in glob.glob(output_dir + 'sync*.nur*') + glob.glob(output_dir + 'async*.nur*'):
+        os.remove(filename)
+
+# get_checkpoint and end wait until all queued events are written
+many_events = io_test_utilities.create_events(n_events=50)
+filename = output_dir + 'async.nur'
+event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+event_writer.begin(filename, async_write=True, queue_size=100)
+for event in many_events[:25]:
+    event_writer.run(event)
+checkpoint = event_writer.get_checkpoint()
+io_test_utilities.check_events(read_events(filename), many_events[:25], "async_write, get_checkpoint")
+for event in many_events[25:]:
+    event_writer.run(event)
+event_writer.end()
+io_test_utilities.check_events(read_events(filename), many_events, "async_write, end")
+os.remove(filename)
+
+# an error of the writer thread is raised by `run` or `end`, and `end` stops the writer thread
+n_threads = threading.active_count()
+event_writer = NuRadioReco.modules.io.eventWriter.eventWriter()
+event_writer.begin(output_dir + 'not_existing_directory/async.nur', async_write=True)
+errors = []
+for event in events:
+    try:
+        event_writer.run(event)
+    except FileNotFoundError as e:
+        errors.append(e)
+try:
+    event_writer.end()
+except FileNotFoundError as e:
+    errors.append(e)
+if len(errors) == 0:
+    print("async_write: the error of the writer thread was not raised")
+    sys.exit(-1)
+print(f"async_write: the error of the writer thread was raised {len(errors)} times")
+if threading.active_count() != n_threads:
+    print("async_write: the writer thread is still running after the error")
+    sys.exit(-1)
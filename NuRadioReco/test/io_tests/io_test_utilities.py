@@ -0,0 +1,87 @@
+import sys
+import numpy as np
+import NuRadioReco.framework.event
+import NuRadioReco.framework.station
+import NuRadioReco.framework.sim_station
+import NuRadioReco.framework.channel
+import NuRadioReco.framework.electric_field
+from NuRadioReco.framework.parameters import stationParameters as stnp
+
+"""
+helper functions of the io tests: deterministic test events and the comparison of events that were read from a file
+"""
+
+n_samples = 256
+sampling_rate = 3.2
+
+
+def create_events(n_events=2, n_channels=2, seed=1234):
+    """
+    creates events with one station with channels and with electric fields of the sim station, the traces are
+    random numbers of a fixed seed
+    """
+    rnd = np.random.default_rng(seed)
+    events = []
+    for i_event in range(n_events):
+        event = NuRadioReco.framework.event.Event(1, i_event)
+        station = NuRadioReco.framework.station.Station(11)
+        station.set_parameter(stnp.zenith, 0.1 * i_event)
+        sim_station = NuRadioReco.framework.sim_station.SimStation(11)
+        for channel_id in range(n_channels):
+            channel = NuRadioReco.framework.channel.Channel(channel_id)
+            channel.set_trace(rnd.normal(size=n_samples), sampling_rate)
+            channel.set_trace_start_time(10. * channel_id + i_event)
+            station.add_channel(channel)
+            efield = NuRadioReco.framework.electric_field.ElectricField([channel_id])
+            efield.set_trace(rnd.normal(size=(3, n_samples)), sampling_rate)
+            efield.set_trace_start_time(5. * channel_id)
+            sim_station.add_electric_field(efield)
+        station.set_sim_station(sim_station)
+        event.set_station(station)
+        events.append(event)
+    return events
+
+
+def get_differences(events, reference_events):
+    """
+    compares the ids, station parameters and the traces (including sampling rate and trace start time) of the
+    channels and electric fields of two lists of events and returns a list of the differences
+    """
+    differences = []
+    if len(events) != len(reference_events):
+        return [f"{len(events)} events instead of {len(reference_events)}"]
+    for event, reference_event in zip(events, reference_events):
+        event_id = (reference_event.get_run_number(), reference_event.get_id())
+        if (event.get_run_number(), event.get_id()) != event_id:
+            differences.append(f"event {(event.get_run_number(), event.get_id())} instead of {event_id}")
+            continue
+        for station, reference_station in zip(event.get_stations(), reference_event.get_stations()):
+            if station.get_id() != reference_station.get_id() or \
+                    station.get_parameter(stnp.zenith) != reference_station.get_parameter(stnp.zenith):
+                differences.append(f"the station {station.get_id()} of event {event_id} differs")
+            traces = list(zip(station.iter_channels(), reference_station.iter_channels()))
+            traces += list(zip(station.get_sim_station().get_electric_fields(),
+                               reference_station.get_sim_station().get_electric_fields()))
+            n_traces = station.get_number_of_channels() + len(station.get_sim_station().get_electric_fields())
+            n_reference_traces = reference_station.get_number_of_channels() + \
+                len(reference_station.get_sim_station().get_electric_fields())
+            if n_traces != n_reference_traces:
+                differences.append(f"the station {station.get_id()} of event {event_id} has {n_traces} traces "
+                                   f"instead of {n_reference_traces}")
+            for i_trace, (trace, reference_trace) in enumerate(traces):
+                if not np.array_equal(trace.get_trace(), reference_trace.get_trace()) or \
+                        trace.get_sampling_rate() != reference_trace.get_sampling_rate() or \
+                        trace.get_trace_start_time() != reference_trace.get_trace_start_time():
+                    differences.append(f"the trace {i_trace} of station {station.get_id()} of event {event_id} differs")
+    return differences
+
+
+def check_events(events, reference_events, description):
+    """
+    exits with an error if the events differ from the reference events
+    """
+    differences = get_differences(events, reference_events)
+    if len(differences):
+        print(f"{description}:\n" + "\n".join(differences))
+        sys.exit(-1)
+    print(f"{description}: the events are identical")
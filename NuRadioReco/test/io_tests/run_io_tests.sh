@@ -0,0 +1,10 @@
+#!/bin/bash
+
+set -e
+python3 NuRadioReco/test/io_tests/T01typed_traces.py
+python3 NuRadioReco/test/io_tests/T02compression.py
+python3 NuRadioReco/test/io_tests/T03async_write.py
+
+# clean up
+rm -v NuRadioReco/test/io_tests/{typed_traces_True.nur,typed_traces_False.nur}
+rm -v NuRadioReco/test/io_tests/{compression.nur,compression_unknown_codec.nur}
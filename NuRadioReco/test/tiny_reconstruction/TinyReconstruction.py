@@ -121,7 +121,7 @@ channelResampler = NuRadioReco.modules.channelResampler.channelResampler()
 channelResampler.begin()
 eventWriter = NuRadioReco.modules.io.eventWriter.eventWriter()
 output_filename = "MC_example_station_{}.nur".format(station_id)
-eventWriter.begin(output_filename)
+eventWriter.begin(output_filename, write_index=True)
 
 
 event_counter = 0
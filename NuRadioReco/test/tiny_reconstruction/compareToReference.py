@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import json
 import NuRadioReco.modules.io.eventReader
+import NuRadioReco.modules.io.NuRadioRecoio
 import argparse
 import numpy as np
 from NuRadioReco.framework.parameters import stationParameters as stnp
@@ -15,7 +16,8 @@ parser.add_argument('--create_reference', help='create new reference instead of
 args = parser.parse_args()
 
 event_reader = NuRadioReco.modules.io.eventReader.eventReader()
-event_reader.begin(args.filename)
+# only the parameters are compared, the traces are never decoded
+event_reader.begin(args.filename, lazy_traces=True)
 
 parameter_values = {}
 
@@ -57,6 +59,10 @@ for event in event_reader.run():
             else:
                 parameter_values[f"{event.get_id():d}"]['electric_field_parameters'][param_name.name].append(None)
 
+# the event ids and headers are read from the index file that was written with the events
+event_io = NuRadioReco.modules.io.NuRadioRecoio.NuRadioRecoio(args.filename)
+np.testing.assert_equal([f"{event_id[1]:d}" for event_id in event_io.get_event_ids()], list(parameter_values.keys()))
+
 
 def assertDeepAlmostEqual(expected, actual, *args, **kwargs):
     """
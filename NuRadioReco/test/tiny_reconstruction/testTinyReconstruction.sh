@@ -4,4 +4,4 @@ python3 TinyReconstruction.py
 python3 compareToReference.py MC_example_station_32.nur reference.json
 
 # clean up
-rm -v MC_example_station_32.nur
\ No newline at end of file
+rm -v MC_example_station_32.nur MC_example_station_32.nur.idx
\ No newline at end of file
@@ -1,16 +1,26 @@
 from subprocess import Popen, PIPE
 import os
 import re
+import json
 import logging
+try:
+    import importlib.metadata as importlib_metadata
+except ModuleNotFoundError:
+    import importlib_metadata
 logger = logging.getLogger("utilities.version")
 logging.basicConfig()
 
+# the commit hashes of the packages are determined only once per process
+_commit_hashes = {}
+
 
 def get_git_commit_hash(path):
     try:
-        gitproc = Popen(['git', 'show'], stdout=PIPE, cwd=path)
+        gitproc = Popen(['git', 'rev-parse', 'HEAD'], stdout=PIPE, stderr=PIPE, cwd=path)
         (stdout, stderr) = gitproc.communicate()
-        h = stdout.decode('utf-8').split('\n')[0].split()[1]
+        if(gitproc.returncode != 0):  # not a git repository
+            return "none"
+        h = stdout.decode('utf-8').strip()
         check = re.compile(r"^[a-f0-9]{40}(:.+)?$", re.IGNORECASE)
         if(not check.match(h)):
             logging.error("NuRadioMC version could not be determined, returning None")
@@ -20,19 +30,46 @@ def get_git_commit_hash(path):
     return h
 
 
+def get_installed_commit_hash(distribution='NuRadioMC'):
+    """
+    returns the commit hash that is stored in the installation metadata of a package, which is only available if
+    the package was installed (with pip) from a git repository
+    """
+    try:
+        direct_url = json.loads(importlib_metadata.distribution(distribution).read_text('direct_url.json'))
+        return direct_url['vcs_info']['commit_id']
+    except Exception:
+        return "none"
+
+
+def get_package_commit_hash(package):
+    """
+    returns the commit hash of the NuRadioMC or NuRadioReco package
+
+    The hash is determined once per process, from the git repository the package is imported from or, if the
+    package is not imported from a git repository, from the installation metadata of the package.
+    """
+    if(package not in _commit_hashes):
+        if(package == 'NuRadioMC'):
+            import NuRadioMC as module
+        else:
+            import NuRadioReco as module
+        commit_hash = get_git_commit_hash(os.path.dirname(module.__file__))
+        if(commit_hash == "none"):
+            commit_hash = get_installed_commit_hash()
+        _commit_hashes[package] = commit_hash
+    return _commit_hashes[package]
+
+
 def get_NuRadioMC_commit_hash():
     """
     returns the hash of the current commit of the NuRadioMC git repository
     """
-    import NuRadioMC
-    path = os.path.dirname(NuRadioMC.__file__)
-    return get_git_commit_hash(path)
+    return get_package_commit_hash('NuRadioMC')
 
 
 def get_NuRadioReco_commit_hash():
     """
     returns the hash of the current commit of the NuRadioReco git repository
     """
-    import NuRadioReco
-    path = os.path.dirname(NuRadioReco.__file__)
-    return get_git_commit_hash(path)
+    return get_package_commit_hash('NuRadioReco')